@@ -0,0 +1,39 @@
+"""Benchmark repeated exports of unchanged chants, which reuse the cached
+serialized chant (see :meth:`Chant.toObject`), against exporting the chant
+from scratch every time. HTML is rendered from the cached serialized chant,
+but the template is rendered on every call. Clearing the cache with ``clearCache()``
+before every export reproduces the uncached behaviour. Cached exports are 
+validated with a fingerprint of the chant, so the cached times include 
+computing the fingerprint.
+
+Usage: python benchmarks/benchmark_cached_exports.py
+"""
+import os
+import sys
+import timeit
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+from music21 import converter
+from chant21.examples import gabcExamples
+
+def benchmark(func, number=5, repeat=5):
+    """Return the best time per call in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+def compare(label, ch, export):
+    def uncached():
+        ch.clearCache()
+        return export()
+    uncachedTime = benchmark(uncached)
+    cachedTime = benchmark(export)
+    print(f'  {label}: {uncachedTime:.2f} ms uncached, {cachedTime:.3f} ms '
+          f'cached ({uncachedTime / cachedTime:,.0f}x)')
+
+if __name__ == '__main__':
+    for name, filename in gabcExamples.items():
+        ch = converter.parse(filename, format='gabc', forceSource=True,
+            storePickle=False)
+        print(f'{name} ({len(ch.flat.notes)} notes)')
+        compare('toHTML  ', ch, lambda: ch.toHTML())
+        compare('toObject', ch, lambda: ch.toObject(cached=True))
@@ -0,0 +1,87 @@
+"""Benchmark the cached structural indexes of chants 
+(``Chant21Object.childrenByClass`` and ``flatNotes``, used by e.g. 
+``Word.flatLyrics`` and ``Syllable.lyric``) on serialization and text 
+alignment. The cached indexes are compared to the same indexes implemented
+with ``getElementsByClass`` and ``flat.notes``, as before the caches were 
+added. The public accessors such as ``Word.syllables`` still return 
+``getElementsByClass`` iterators.
+Note that serialization (see :meth:`Chant.toObject`), and thus HTML export,
+hardly uses the indexes.
+
+Usage: python benchmarks/benchmark_cached_indexes.py
+"""
+import os
+import sys
+import timeit
+from contextlib import contextmanager
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+import pandas as pd
+from music21 import converter
+from chant21 import chant
+from chant21.cantus import convertCantusData
+from chant21.examples import gabcExamples
+
+def _uncachedLyric(self):
+    notes = self.flat.notes
+    if len(notes) > 0:
+        return notes[0].lyric
+    else:
+        return self.editorial.get('lyric')
+
+UNCACHED = {
+    (chant.Chant21Object, 'childrenByClass'): 
+        lambda self, cls: self.getElementsByClass(cls),
+    (chant.Syllable, 'lyric'): property(_uncachedLyric, chant.Syllable.lyric.fset),
+    (chant.Chant21Object, 'flatNotes'): property(
+        lambda self: tuple(self.flat.notes)),
+}
+
+@contextmanager
+def uncached():
+    """Temporarily replace the cached indexes by uncached ones"""
+    originals = {key: cls.__dict__[name] for key in UNCACHED 
+                 for cls, name in [key]}
+    try:
+        for (cls, name), prop in UNCACHED.items():
+            setattr(cls, name, prop)
+        yield
+    finally:
+        for (cls, name), prop in originals.items():
+            setattr(cls, name, prop)
+
+def benchmark(func, number=5, repeat=5):
+    """Return the best time per call in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+def compare(label, func, **kwargs):
+    with uncached():
+        uncachedTime = benchmark(func, **kwargs)
+    cachedTime = benchmark(func, **kwargs)
+    print(f'  {label}: {uncachedTime:.2f} ms uncached, {cachedTime:.2f} ms '
+          f'cached ({uncachedTime / cachedTime:.1f}x)')
+
+def accessLyrics(ch):
+    return [word.flatLyrics for section in ch.sections for word in section.words
+            if word.hasLyrics]
+
+if __name__ == '__main__':
+    for name, filename in gabcExamples.items():
+        ch = converter.parse(filename, format='gabc', forceSource=True,
+            storePickle=False)
+        print(f'{name} ({len(ch.flat.notes)} notes)')
+        compare('toObject    ', lambda: ch.toObject(includeVolpiano=True))
+        compare('word lyrics ', lambda: accessLyrics(ch))
+
+    examples = pd.read_csv(os.path.join(ROOT_DIR,
+        'chant21/examples/cantus-volpiano-examples.csv'))
+    rows = [row for _, row in examples.iterrows()]
+    def convertAll():
+        for row in rows:
+            try:
+                convertCantusData(row)
+            except Exception:
+                pass
+    print(f'Cantus examples with text alignment ({len(rows)} chants)')
+    compare('convert     ', convertAll, number=1, repeat=3)
@@ -0,0 +1,40 @@
+"""Benchmark the binary CHBIN format against CHSON: file sizes, and the time
+to load objects, chants and (for CHBIN) arrays.
+
+Usage: python benchmarks/benchmark_chbin.py
+"""
+import os
+import sys
+import json
+import gzip
+import timeit
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+from music21 import converter
+import chant21
+from chant21.chbin import encodeCHBIN
+from chant21.chbin import decodeCHBIN
+from chant21.chbin import readCHBINArrays
+from chant21.examples import gabcExamples
+
+def benchmark(func, number=10, repeat=5):
+    """Return the best time per call in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+if __name__ == '__main__':
+    for name, filename in gabcExamples.items():
+        ch = converter.parse(filename, format='gabc', forceSource=True,
+            storePickle=False)
+        chson = ch.toCHSON()
+        chbin = ch.toCHBIN()
+        print(f'{name} ({len(ch.flat.notes)} notes)')
+        print(f'  size:   CHSON {len(chson):>6} bytes ({len(gzip.compress(chson.encode())):>5} gzipped), '
+              f'CHBIN {len(chbin):>5} bytes ({len(gzip.compress(chbin)):>5} gzipped)')
+        print(f'  encode: CHSON {benchmark(lambda: ch.toCHSON()):.2f} ms, '
+              f'CHBIN {benchmark(lambda: ch.toCHBIN()):.2f} ms')
+        print(f'  object: CHSON {benchmark(lambda: json.loads(chson)):.2f} ms, '
+              f'CHBIN {benchmark(lambda: decodeCHBIN(chbin)):.2f} ms')
+        print(f'  chant:  CHSON {benchmark(lambda: converter.parse(chson, format="chson"), number=2):.2f} ms, '
+              f'CHBIN {benchmark(lambda: converter.parseData(chbin, format="chbin"), number=2):.2f} ms')
+        print(f'  arrays: CHBIN {benchmark(lambda: readCHBINArrays(chbin)):.2f} ms')
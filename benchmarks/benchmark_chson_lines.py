@@ -0,0 +1,58 @@
+"""Benchmark storing a corpus of chants in a single CHSON Lines file against
+storing every chant in a separate CHSON file. Times are reported for writing
+and reading the corpus, for reading a single chant by id using the index,
+and for reading with several worker processes.
+
+Usage: python benchmarks/benchmark_chson_lines.py
+"""
+import os
+import sys
+import tempfile
+import timeit
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+from music21 import converter
+from chant21.cantus import readCantusCSV
+from chant21.cantus import convertCantusData
+from chant21.cantus.reader import EXAMPLES_CSV
+from chant21.chson import writeCHSONLines
+from chant21.chson import iterCHSONLines
+from chant21.chson import readCHSONLine
+from chant21.chson import CHSONLinesIndex
+
+def benchmark(func, number=1, repeat=3):
+    """Return the best time per call in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+def writeFiles(chants, directory):
+    for i, chant in enumerate(chants):
+        chant.toCHSON(os.path.join(directory, f'{i}.chson'))
+
+def readFiles(directory, num):
+    return [converter.parse(os.path.join(directory, f'{i}.chson'),
+                forceSource=True, storePickle=False) for i in range(num)]
+
+if __name__ == '__main__':
+    rows = [row for chunk in readCantusCSV(EXAMPLES_CSV) for row in chunk]
+    chants = [convertCantusData(row) for row in rows] * 10
+    ids = list(range(len(chants)))
+    print(f'{len(chants)} chants')
+    with tempfile.TemporaryDirectory() as tmpdir:
+        writeTime = benchmark(lambda: writeFiles(chants, tmpdir))
+        readTime = benchmark(lambda: readFiles(tmpdir, len(chants)))
+        print(f'  separate files:  write {writeTime:.0f} ms, read {readTime:.0f} ms')
+
+        for filename in ['chants.chsonl', 'chants.chsonl.gz']:
+            path = os.path.join(tmpdir, filename)
+            writeTime = benchmark(lambda: writeCHSONLines(chants, path, ids=ids))
+            readTime = benchmark(lambda: list(iterCHSONLines(path)))
+            parallelTime = benchmark(lambda: list(iterCHSONLines(path,
+                numWorkers=4)))
+            index = CHSONLinesIndex(path)
+            lookupTime = benchmark(lambda: readCHSONLine(path, 250,
+                index=index), number=10)
+            size = os.path.getsize(path) / 1024
+            print(f'  {filename + ":":16} write {writeTime:.0f} ms, read '
+                  f'{readTime:.0f} ms ({parallelTime:.0f} ms with 4 workers), '
+                  f'read by id {lookupTime:.2f} ms, {size:.0f} kB')
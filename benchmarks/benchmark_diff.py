@@ -0,0 +1,67 @@
+"""Benchmark syncing an edited chant by sending a patch (see
+:mod:`chant21.diff`) against sending the full CHSON. For every example, a
+single note is changed. Reported are the sizes of the patch and the CHSON,
+the time to compute the patch (with and without cached subtree hashes),
+and the time to apply it, compared to rebuilding the chant from CHSON.
+
+Usage: python benchmarks/benchmark_diff.py
+"""
+import os
+import sys
+import copy
+import json
+import timeit
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+from music21 import converter
+from chant21.diff import diff
+from chant21.diff import patch
+from chant21.examples import gabcExamples
+
+def benchmark(func, number=5, repeat=5):
+    """Return the best time per call in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+def parseCHSON(data):
+    return converter.parse(data, format='chson', forceSource=True, 
+        storePickle=False)
+
+def editNote(obj):
+    """Change the pitch of a note halfway the chant"""
+    obj = copy.deepcopy(obj)
+    notes = []
+    todo = [obj]
+    while todo:
+        el = todo.pop()
+        if el['type'] == 'note':
+            notes.append(el)
+        todo.extend(el.get('elements', []))
+    note = notes[len(notes) // 2]
+    note['pitch'] = 'C5' if note['pitch'] != 'C5' else 'D5'
+    return obj
+
+if __name__ == '__main__':
+    for name, filename in gabcExamples.items():
+        chA = converter.parse(filename, format='gabc', forceSource=True,
+            storePickle=False)
+        chB = parseCHSON(json.dumps(editNote(chA.toObject())))
+        chson = chB.toCHSON()
+        delta = json.dumps(diff(chA, chB))
+        print(f'{name} ({len(chA.flat.notes)} notes)')
+        print(f'  size: {len(delta):,} bytes patch, {len(chson):,} bytes CHSON')
+
+        def uncachedDiff():
+            chA.clearCache()
+            chB.clearCache()
+            return diff(chA, chB)
+        uncachedTime = benchmark(uncachedDiff)
+        cachedTime = benchmark(lambda: diff(chA, chB))
+        print(f'  diff: {uncachedTime:.2f} ms, {cachedTime:.2f} ms with '
+              f'cached hashes')
+
+        copies = [parseCHSON(chA.toCHSON()) for _ in range(25)]
+        patchTime = benchmark(lambda: patch(copies.pop(), json.loads(delta)))
+        rebuildTime = benchmark(lambda: parseCHSON(chson))
+        print(f'  apply: {patchTime:.2f} ms patch, {rebuildTime:.2f} ms '
+              f'rebuilding from CHSON')
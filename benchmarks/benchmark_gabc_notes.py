@@ -0,0 +1,77 @@
+"""Benchmark the construction of notes in the gabc visitor: memory allocated
+and time per note. Notes are built from a compiled table that maps the gabc of
+a note (e.g. ``-fo~``) to its note information, instead of by applying a
+modifier function for every prefix and suffix.
+
+The allocations are measured with tracemalloc: for every note, the peak of the
+traced memory while visiting the note (allocated) and the memory still used
+afterwards (retained, mostly the note itself). Only the note nodes are visited;
+the parse trees are created in advance. Uses salve_regina.gabc and a synthetic
+chant with 10,000 notes with many different suffixes.
+
+Usage: python benchmarks/benchmark_gabc_notes.py
+"""
+import os
+import sys
+import random
+import timeit
+import tracemalloc
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+from arpeggio import NonTerminal
+from chant21.gabc import ParserGABC
+from chant21.gabc import VisitorGABC
+from chant21.examples import gabcExamples
+
+NOTES = ['f', 'g', 'h', 'fo~', 'g.', '-h', 'hw', "e'", 'fr', 'g_', 'hv',
+    'f.1', 'Go', 'hs<']
+
+def benchmark(func, number=5, repeat=5):
+    """Return the best time per call in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+def syntheticGABC(numNotes=10000, notesPerSyllable=4, seed=0):
+    random.seed(seed)
+    syllables = [''.join(random.choices(NOTES, k=notesPerSyllable))
+        for _ in range(numNotes // notesPerSyllable)]
+    body = ' '.join(f'la({syllable})' for syllable in syllables)
+    return f'name: synthetic;\n%%\n(c4) {body} (::)'
+
+def noteNodes(node):
+    if node.rule_name == 'note':
+        yield node
+    elif isinstance(node, NonTerminal):
+        for child in node:
+            yield from noteNodes(child)
+
+def measureAllocations(nodes, visitor):
+    """Return the memory allocated and retained per note (in bytes)"""
+    notes = []
+    allocated = 0
+    tracemalloc.start()
+    for node in nodes:
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        notes.append(node.visit(visitor))
+        allocated += tracemalloc.get_traced_memory()[1] - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated / len(nodes), retained / len(nodes)
+
+def report(name, gabc):
+    nodes = list(noteNodes(ParserGABC().parse(gabc)))
+    visitor = VisitorGABC()
+    # Warm up caches (compiled notes, interned note information)
+    for node in nodes:
+        node.visit(visitor)
+    allocated, retained = measureAllocations(nodes, visitor)
+    time = benchmark(lambda: [node.visit(visitor) for node in nodes], number=1)
+    print(f'{name} ({len(nodes)} notes)')
+    print(f'  per note: {allocated:.0f} bytes allocated, {retained:.0f} bytes '
+          f'retained, {time / len(nodes) * 1000:.1f} µs')
+
+if __name__ == '__main__':
+    with open(gabcExamples['salveRegina'], 'r') as handle:
+        report('salve_regina.gabc', handle.read())
+    report('synthetic', syntheticGABC())
@@ -0,0 +1,37 @@
+"""Benchmark the MIDI writer against music21's MIDI translation (as used by
+``chant.flatter.write('midi')``) on the GABC examples, and rendering from
+CHBIN arrays.
+
+Usage: python benchmarks/benchmark_midi.py
+"""
+import os
+import sys
+import timeit
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+from music21 import converter
+from music21.midi.translate import music21ObjectToMidiFile
+from chant21.midi import toMIDI
+from chant21.chbin import readCHBINArrays
+from chant21.examples import gabcExamples
+
+def renderMusic21(chant):
+    return music21ObjectToMidiFile(chant.flatter).writestr()
+
+def benchmark(func, number=5, repeat=5):
+    """Return the best time per call in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+if __name__ == '__main__':
+    for name, filename in gabcExamples.items():
+        ch = converter.parse(filename, format='gabc', forceSource=True,
+            storePickle=False)
+        chbin = ch.toCHBIN()
+        music21Time = benchmark(lambda: renderMusic21(ch), number=1)
+        chantTime = benchmark(lambda: toMIDI(ch))
+        arraysTime = benchmark(lambda: toMIDI(readCHBINArrays(chbin)))
+        print(f'{name} ({len(ch.flat.notes)} notes)')
+        print(f'  music21:      {music21Time:.2f} ms')
+        print(f'  chant21:      {chantTime:.2f} ms ({music21Time / chantTime:.1f}x)')
+        print(f'  CHBIN arrays: {arraysTime:.2f} ms ({music21Time / arraysTime:.1f}x)')
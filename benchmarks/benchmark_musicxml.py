@@ -0,0 +1,32 @@
+"""Benchmark the direct MusicXML writer against music21's MusicXML exporter
+(as used by ``chant.flatter.write('musicxml')``) on the GABC examples.
+
+Usage: python benchmarks/benchmark_musicxml.py
+"""
+import os
+import sys
+import timeit
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+from music21 import converter
+from music21.musicxml.m21ToXml import GeneralObjectExporter
+from chant21.musicxml import toMusicXML
+from chant21.examples import gabcExamples
+
+def exportMusic21(chant):
+    return GeneralObjectExporter(chant.flatter).parse()
+
+def benchmark(func, number=5, repeat=5):
+    """Return the best time per call in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+if __name__ == '__main__':
+    for name, filename in gabcExamples.items():
+        ch = converter.parse(filename, format='gabc', forceSource=True,
+            storePickle=False)
+        music21Time = benchmark(lambda: exportMusic21(ch), number=1)
+        directTime = benchmark(lambda: toMusicXML(ch))
+        print(f'{name} ({len(ch.flat.notes)} notes)')
+        print(f'  music21: {music21Time:.2f} ms')
+        print(f'  chant21: {directTime:.2f} ms ({music21Time / directTime:.1f}x)')
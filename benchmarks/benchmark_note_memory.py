@@ -0,0 +1,57 @@
+"""Benchmark the memory used by the editorial information of notes.
+
+The converters store the editorial information of notes (positions, gabc
+prefixes and suffixes, liquescence) in shared, interned NoteInfo objects. The
+information is only copied to a separate editorial dictionary per note when
+``note.editorial`` is accessed. This benchmark reports the memory per note 
+after conversion, and after materializing all editorial dictionaries (which
+corresponds to the old situation).
+
+Usage: python benchmarks/benchmark_note_memory.py
+"""
+import os
+import sys
+import gc
+import tracemalloc
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+import pandas as pd
+from music21 import converter
+import chant21
+from chant21.examples import gabcExamples
+from chant21.examples import EXAMPLES_DIR
+
+def measure(func):
+    """Return the result of func and the memory it retains (in bytes)"""
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+def materializeEditorials(chant):
+    for n in chant.flat.notes:
+        n.editorial
+
+def report(name, parse):
+    # Warm up caches (parsers, interned NoteInfo objects)
+    parse()
+    chant, compact = measure(parse)
+    numNotes = len(chant.flat.notes)
+    _, editorials = measure(lambda: materializeEditorials(chant))
+    print(f'{name} ({numNotes} notes)')
+    print(f'  per note, compact:      {compact / numNotes:.0f} bytes')
+    print(f'  per note, dictionaries: {(compact + editorials) / numNotes:.0f} bytes'
+          f' (editorial: {editorials / numNotes:.0f} bytes)')
+
+if __name__ == '__main__':
+    for name, filename in gabcExamples.items():
+        report(name, lambda: converter.parse(filename, format='gabc', 
+            forceSource=True, storePickle=False))
+
+    csvPath = os.path.join(EXAMPLES_DIR, 'cantus-volpiano-examples.csv')
+    volpiano = pd.read_csv(csvPath, index_col=0)['volpiano'].iloc[0]
+    report('cantus', lambda: converter.parse('cantus: ' + volpiano))
@@ -0,0 +1,54 @@
+"""Benchmark pickling of chants: the compact encoding used by chant21 objects
+versus music21's default pickling of streams.
+
+Usage: python benchmarks/benchmark_pickle.py
+"""
+import os
+import io
+import sys
+import pickle
+import timeit
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+from music21 import converter
+import chant21
+from chant21 import chant
+from chant21.examples import gabcExamples
+
+class DefaultPickler(pickle.Pickler):
+    """Pickler that ignores the compact encoding of chant21 objects"""
+    def reducer_override(self, obj):
+        if isinstance(obj, chant.Chant21Object):
+            return object.__reduce_ex__(obj, pickle.HIGHEST_PROTOCOL)
+        return NotImplemented
+
+def defaultDumps(obj):
+    buffer = io.BytesIO()
+    DefaultPickler(buffer, pickle.HIGHEST_PROTOCOL).dump(obj)
+    return buffer.getvalue()
+
+def benchmark(func, number=5, repeat=5):
+    """Return the best time per call in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+if __name__ == '__main__':
+    for name, filename in gabcExamples.items():
+        ch = converter.parse(filename, format='gabc', forceSource=True,
+            storePickle=False)
+        numNotes = len(ch.flat.notes)
+        compact = pickle.dumps(ch)
+        default = defaultDumps(ch)
+        try:
+            pickle.loads(default)
+            defaultLoads = f'{benchmark(lambda: pickle.loads(default)):.2f} ms'
+        except Exception as e:
+            defaultLoads = f'fails ({type(e).__name__})'
+
+        print(f'{name} ({numNotes} notes)')
+        print(f'  default: {len(default):>7} bytes, '
+              f'dumps {benchmark(lambda: defaultDumps(ch)):.2f} ms, '
+              f'loads {defaultLoads}')
+        print(f'  compact: {len(compact):>7} bytes, '
+              f'dumps {benchmark(lambda: pickle.dumps(ch)):.2f} ms, '
+              f'loads {benchmark(lambda: pickle.loads(compact)):.2f} ms')
@@ -0,0 +1,28 @@
+"""Benchmark the export of chants to plain objects, CHSON and HTML.
+
+Usage: python benchmarks/benchmark_serialization.py
+"""
+import os
+import sys
+import timeit
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+from music21 import converter
+import chant21
+from chant21.examples import gabcExamples
+
+def benchmark(func, number=20, repeat=5):
+    """Return the best time per call in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+if __name__ == '__main__':
+    for name, filename in gabcExamples.items():
+        ch = converter.parse(filename, format='gabc', forceSource=True,
+            storePickle=False)
+        numNotes = len(ch.flat.notes)
+        print(f'{name} ({numNotes} notes)')
+        print(f'  toObject:                  {benchmark(lambda: ch.toObject()):.2f} ms')
+        print(f'  toObject(includeVolpiano): {benchmark(lambda: ch.toObject(includeVolpiano=True)):.2f} ms')
+        print(f'  toCHSON:                   {benchmark(lambda: ch.toCHSON()):.2f} ms')
+        print(f'  toHTML:                    {benchmark(lambda: ch.toHTML(), number=5):.2f} ms')
@@ -0,0 +1,49 @@
+"""Benchmark the computation of melodic edit distances between many chants.
+
+Usage: python benchmarks/benchmark_similarity.py [numChants] [numWorkers]
+"""
+import os
+import sys
+import random
+from time import perf_counter
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+from chant21.similarity import encodeMelodies
+from chant21.similarity import editDistance
+from chant21.similarity import distanceMatrix
+from chant21.similarity import topKSimilar
+
+def randomVolpiano(rng, notes='9abcdefghjklmnop'):
+    """A random volpiano string with 30-120 neumes of 1-3 notes"""
+    neumes = [''.join(rng.choice(notes) for _ in range(rng.randint(1, 3)))
+              for _ in range(rng.randint(30, 120))]
+    return '1---' + '-'.join(neumes)
+
+if __name__ == '__main__':
+    numChants = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    numWorkers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    rng = random.Random(0)
+    melodies = [randomVolpiano(rng) for _ in range(numChants)]
+    numPairs = numChants * (numChants - 1) / 2
+    print(f'{numChants} chants, {numPairs:.0f} pairs, {numWorkers} worker(s)')
+
+    sequences, _ = encodeMelodies(melodies[:100])
+    sequences = [s.tolist() for s in sequences]
+    start = perf_counter()
+    for i, a in enumerate(sequences):
+        for b in sequences[i + 1:]:
+            editDistance(a, b)
+    duration = perf_counter() - start
+    print(f'  editDistance (per pair):  {duration / 4950 * 1e6:.1f} µs')
+
+    for granularity in ['note', 'neume', 'syllable']:
+        start = perf_counter()
+        distanceMatrix(melodies, granularity=granularity, numWorkers=numWorkers)
+        duration = perf_counter() - start
+        print(f'  distanceMatrix ({granularity}): {duration:.2f} s '
+              f'({duration / numPairs * 1e6:.1f} µs per pair)')
+
+    start = perf_counter()
+    topKSimilar(melodies, k=10, numWorkers=numWorkers)
+    print(f'  topKSimilar (note, k=10): {perf_counter() - start:.2f} s')
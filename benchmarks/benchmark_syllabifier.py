@@ -0,0 +1,60 @@
+"""Benchmark the chant syllabifier against the original CLTK implementation,
+in words per second, on all words in the Cantus examples. Also compares bulk
+syllabification of complete texts (syllabifyMany) to parsing the texts with
+the Cantus text parser and syllabifying every word.
+
+Usage: python benchmarks/benchmark_syllabifier.py
+"""
+import os
+import sys
+import timeit
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+import pandas as pd
+from arpeggio import NonTerminal
+from chant21.cantus import ChantSyllabifier
+from chant21.cantus import ParserCantusText
+from chant21.cantus import syllabifyMany
+from chant21.cantus.syllabifier import CHANT_LATIN
+from chant21.cantus.cltk_syllabifier import Syllabifier
+
+def parseAndSyllabify(parser, syllabifier, texts):
+    """Syllabify texts by parsing them, as done when adding text to chants"""
+    syllables = []
+    def visit(node):
+        if node.rule_name == 'word':
+            syllables.extend(syllabifier.syllabify(node.value))
+        elif isinstance(node, NonTerminal):
+            for child in node:
+                visit(child)
+    for text in texts:
+        visit(parser.parse(text))
+    return syllables
+
+def benchmark(func, number=5, repeat=5):
+    """Return the best time per call in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+if __name__ == '__main__':
+    examples = pd.read_csv(os.path.join(ROOT_DIR, 
+        'chant21/examples/cantus-volpiano-examples.csv'))
+    words = [word.lower() for text in examples['full_text_manuscript'].dropna()
+             for word in text.split()]
+    reference = Syllabifier(CHANT_LATIN)
+    syllabifier = ChantSyllabifier()
+    cltkTime = benchmark(lambda: [reference.syllabify(w) for w in words])
+    fastTime = benchmark(lambda: [syllabifier.syllabifyWord(w) for w in words])
+    print(f'{len(words)} words')
+    print(f'  CLTK:  {cltkTime:.2f} ms ({len(words) / cltkTime * 1000:,.0f} words/s)')
+    print(f'  chant: {fastTime:.2f} ms ({len(words) / fastTime * 1000:,.0f} words/s, '
+          f'{cltkTime / fastTime:.1f}x)')
+
+    texts = examples['full_text_manuscript'].dropna().tolist() * 20
+    parser = ParserCantusText()
+    parseTime = benchmark(lambda: parseAndSyllabify(parser, syllabifier, texts),
+        number=1, repeat=3)
+    bulkTime = benchmark(lambda: syllabifyMany(texts), number=1, repeat=3)
+    print(f'{len(texts)} texts')
+    print(f'  parser:        {parseTime:.2f} ms')
+    print(f'  syllabifyMany: {bulkTime:.2f} ms ({parseTime / bulkTime:.1f}x)')
@@ -0,0 +1,73 @@
+"""Benchmark building chants in the gabc and Cantus volpiano visitors: bulk
+insertion of the children of every container (appendElements) compared to
+appending the children one by one with ``Stream.append``. Only the visitors
+are timed; the parse trees are created in advance.
+
+Usage: python benchmarks/benchmark_visitors.py
+"""
+import os
+import sys
+import timeit
+from contextlib import contextmanager
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+import pandas as pd
+from arpeggio import visit_parse_tree as visitParseTree
+from chant21 import chant
+from chant21.gabc import ParserGABC
+from chant21.gabc import VisitorGABC
+from chant21.cantus import ParserCantusVolpiano
+from chant21.cantus import VisitorCantusVolpiano
+from chant21.cantus import converter as cantusConverter
+from chant21.examples import gabcExamples
+
+def appendEach(container, elements):
+    for element in elements:
+        container.append(element)
+
+@contextmanager
+def appendingEach():
+    """Temporarily build containers by appending children one by one"""
+    try:
+        chant.appendElements = appendEach
+        cantusConverter.appendElements = appendEach
+        yield
+    finally:
+        chant.appendElements = appendElements
+        cantusConverter.appendElements = appendElements
+
+appendElements = chant.appendElements
+
+def benchmark(func, number=5, repeat=5):
+    """Return the best time per call in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+def compare(label, parses, visitor, **kwargs):
+    visit = lambda: [visitParseTree(parse, visitor) for parse in parses]
+    with appendingEach():
+        appendTime = benchmark(visit, **kwargs)
+    bulkTime = benchmark(visit, **kwargs)
+    print(f'{label}: {appendTime:.2f} ms appending, {bulkTime:.2f} ms bulk '
+          f'({appendTime / bulkTime:.2f}x)')
+
+if __name__ == '__main__':
+    parser = ParserGABC()
+    parses = []
+    for filename in gabcExamples.values():
+        with open(filename, 'r') as handle:
+            parses.append(parser.parse(handle.read()))
+    compare(f'gabc ({len(parses)} chants)', parses, VisitorGABC(), number=3,
+        repeat=10)
+
+    examples = pd.read_csv(os.path.join(ROOT_DIR, 
+        'chant21/examples/cantus-volpiano-examples.csv'))
+    parser = ParserCantusVolpiano()
+    parses = []
+    for volpiano in examples['volpiano']:
+        try:
+            parses.append(parser.parse(volpiano))
+        except Exception:
+            pass
+    compare(f'volpiano ({len(parses)} chants)', parses, VisitorCantusVolpiano(),
+        number=2, repeat=10)
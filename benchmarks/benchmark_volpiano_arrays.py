@@ -0,0 +1,50 @@
+"""Benchmark computing the melodies of volpiano strings as arrays, directly
+from the strings, against converting the strings to chants and reading the
+notes from their CHBIN encoding. Reports the number of notes per second.
+
+Usage: python benchmarks/benchmark_volpiano_arrays.py
+"""
+import os
+import sys
+import timeit
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+from music21 import converter
+from chant21.cantus import volpianoToArrays
+from chant21.cantus.reader import EXAMPLES_CSV
+from chant21.chbin import encodeCHBIN
+from chant21.chbin import readCHBINArrays
+
+def benchmark(func, number=1, repeat=3):
+    """Return the best time per call in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+def convertAll(volpianos):
+    arrays = []
+    for volpiano in volpianos:
+        try:
+            ch = converter.parse(volpiano, format='cantus', forceSource=True,
+                storePickle=False)
+            arrays.append(readCHBINArrays(encodeCHBIN(ch.toObject())))
+        except Exception:
+            pass
+    return arrays
+
+if __name__ == '__main__':
+    import pandas as pd
+    examples = pd.read_csv(EXAMPLES_CSV, index_col=0)
+    volpianos = examples['volpiano'].tolist()
+    numNotes = len(volpianoToArrays(volpianos).pitches)
+    print(f'{len(volpianos)} chants, {numNotes} notes')
+
+    convertTime = benchmark(lambda: convertAll(volpianos))
+    print(f'  converter:        {convertTime:8.1f} ms, '
+          f'{numNotes / convertTime * 1000:12,.0f} notes/s')
+
+    for factor in [1, 100]:
+        corpus = volpianos * factor
+        arraysTime = benchmark(lambda: volpianoToArrays(corpus))
+        print(f'  volpianoToArrays: {arraysTime:8.1f} ms, '
+              f'{numNotes * factor / arraysTime * 1000:12,.0f} notes/s '
+              f'({len(corpus)} chants)')
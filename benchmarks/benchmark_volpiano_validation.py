@@ -0,0 +1,47 @@
+"""Benchmark the bulk validation of volpiano strings against preprocessing the
+strings one by one with the volpiano parser. Most of the Cantus examples 
+deliberately contain errors; the clean corpus contains the corrected examples
+and is more representative of the Cantus database.
+
+Usage: python benchmarks/benchmark_volpiano_validation.py
+"""
+import os
+import sys
+import timeit
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+import pandas as pd
+from chant21.cantus import ParserCantusVolpiano
+from chant21.cantus import validateVolpiano
+
+def benchmark(func, number=3, repeat=3):
+    """Return the best time per call in milliseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1000
+
+def validateOneByOne(parser, volpianos, strict):
+    results = []
+    for volpiano in volpianos:
+        try:
+            results.append(parser.preprocess(volpiano, strict=strict))
+        except Exception as e:
+            results.append(type(e))
+    return results
+
+if __name__ == '__main__':
+    examples = pd.read_csv(os.path.join(ROOT_DIR, 
+        'chant21/examples/cantus-volpiano-examples.csv'), index_col=0)
+    corpora = {
+        'examples': examples['volpiano'],
+        'clean': validateVolpiano(examples['volpiano'])['volpiano'].dropna()
+    }
+    parser = ParserCantusVolpiano()
+    for name, strings in corpora.items():
+        for repeats in [1, 100, 1000]:
+            volpianos = pd.concat([strings] * repeats, ignore_index=True)
+            print(f'{name}: {len(volpianos)} volpiano strings')
+            for strict in [False, True]:
+                loop = benchmark(lambda: validateOneByOne(parser, volpianos, strict))
+                bulk = benchmark(lambda: validateVolpiano(volpianos, strict=strict))
+                print(f'  strict={strict!s:<5}: one by one {loop:.1f} ms, '
+                      f'bulk {bulk:.1f} ms ({loop / bulk:.1f}x)')
@@ -0,0 +1,55 @@
+"""Profile the reference and optimized gabc grammars on a corpus of gabc files.
+
+Usage: python benchmarks/profile_gabc_grammar.py [directory]
+
+Without a directory, the gabc examples bundled with chant21 are used.
+"""
+import os
+import sys
+import glob
+import timeit
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir))
+sys.path.append(ROOT_DIR)
+
+import pandas as pd
+from chant21.gabc import ParserGABC
+from chant21.gabc import GRAMMAR_PATH
+from chant21.gabc import REFERENCE_GRAMMAR_PATH
+from chant21.profiling import profileGrammar
+from chant21.examples import gabcExamples
+
+def readCorpus(directory=None):
+    if directory is None:
+        filenames = gabcExamples.values()
+    else:
+        filenames = sorted(glob.glob(os.path.join(directory, '*.gabc')))
+    corpus = []
+    for filename in filenames:
+        with open(filename, 'r') as handle:
+            corpus.append(handle.read())
+    return corpus
+
+def parseAll(parser, corpus):
+    for gabc in corpus:
+        try:
+            parser.parse(gabc)
+        except Exception:
+            pass
+
+if __name__ == '__main__':
+    pd.set_option('display.width', 200)
+    corpus = readCorpus(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f'Corpus: {len(corpus)} files\n')
+    parsers = {
+        'reference grammar (memoized)': 
+            ParserGABC(grammarPath=REFERENCE_GRAMMAR_PATH, memoization=True),
+        'reference grammar': ParserGABC(grammarPath=REFERENCE_GRAMMAR_PATH),
+        'optimized grammar': ParserGABC(grammarPath=GRAMMAR_PATH),
+    }
+    for name, parser in parsers.items():
+        print(f'=== {name} ===')
+        stats = profileGrammar(parser, corpus)
+        print(stats.head(15).to_string(float_format='{:.4f}'.format))
+        duration = min(timeit.repeat(lambda: parseAll(parser, corpus), 
+            number=1, repeat=5))
+        print(f'\nParsing time (without profiling): {duration * 1000:.1f} ms\n')
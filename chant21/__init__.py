@@ -16,6 +16,7 @@ from ._version import __version__
 from .gabc import *
 from .cantus import *
 from .chson import *
+from .chbin import *
 
 # Don't import .chant to encourage the use of 'from chant21 import chant', 
 # and then use things like chant.Note to distinguishes the chant21 classes
@@ -3,11 +3,21 @@ from .parser_volpiano import *
 from .parser_text import *
 from .syllabifier import *
 from .converter import *
+from .validation import *
+from .reader import *
+from .arrays import *
 
 __all__ = [
     'ConverterCantusVolpiano',
     'ConverterCantusVolpianoStrict',
     'convertCantusData',
     'addTextToChant',
-    'addCantusMetadataToChant'
+    'addCantusMetadataToChant',
+    'validateVolpiano',
+    'VolpianoArrays',
+    'volpianoToArrays',
+    'readCantusCSV',
+    'convertCantusCSV',
+    'syllabifyText',
+    'syllabifyMany'
 ]
@@ -0,0 +1,319 @@
+"""
+Fast extraction of the melodies of Cantus volpiano strings. Many analyses
+only need the pitches of chants, not the chants themselves.
+:func:`volpianoToArrays` reads those directly from the volpiano strings,
+without parsing them or creating notes. All strings are joined into a single
+byte string, which is mapped to character classes and note positions using
+translate tables; pitches, accidentals and the structure of the chants are
+then computed with vectorized numpy operations:
+
+>>> arrays = volpianoToArrays(['1---f-g--h---3', '1---fy--j---4'])
+>>> arrays.pitches
+array([32, 33, 34, 32, 35], dtype=int16)
+>>> arrays.alterations
+array([ 0,  0,  0,  0, -1], dtype=int8)
+>>> arrays.offsets
+array([0, 3, 5])
+>>> arrays[1].syllable
+array([1, 2], dtype=int32)
+
+The result is the same as converting the strings (see
+:class:`ConverterCantusVolpiano`) and reading the notes of the chants: the
+strings are first checked and corrected as by
+:meth:`ParserCantusVolpiano.preprocess`, and the clefs, flats and naturals
+are handled as by :class:`VisitorCantusVolpiano`. Strings are not validated
+against the full volpiano grammar, however: only characters that do not occur
+in volpiano are detected.
+"""
+import re
+import numpy as np
+from ..chbin import ChantArrays
+from ..chbin import PAUSAS
+from .converter import CHARACTERS
+from .converter import volpianoPositionToStep
+from .validation import _validate
+
+__all__ = [
+    'VolpianoArrays',
+    'volpianoToArrays'
+]
+
+# Character classes
+(_SEPARATOR, _HYPHEN, _NOTE, _LIQUESCENT, _FLAT, _NATURAL, _G_CLEF, _F_CLEF,
+    _SECTION_END, _CHANT_END, _MISSING_PITCHES, _IGNORED, _INVALID) = range(13)
+
+# Missing pitches are replaced by a single character before classifying
+_MISSING_PITCHES_PATTERN = re.compile(r'6---\??---6')
+_MISSING_PITCHES_CHAR = '\x01'
+
+def _translateTable(mapping: dict, default: int) -> bytes:
+    table = bytearray([default] * 256)
+    for chars, value in mapping.items():
+        for char in chars:
+            table[ord(char)] = value
+    return bytes(table)
+
+_CLASSES = _translateTable({
+    '\0': _SEPARATOR,
+    '-': _HYPHEN,
+    CHARACTERS['notes']: _NOTE,
+    CHARACTERS['liquescents']: _LIQUESCENT,
+    CHARACTERS['flats']: _FLAT,
+    CHARACTERS['naturals']: _NATURAL,
+    '1': _G_CLEF,
+    '2': _F_CLEF,
+    '3': _SECTION_END,
+    '4': _CHANT_END,
+    _MISSING_PITCHES_CHAR: _MISSING_PITCHES,
+    # Barlines and line, page and column breaks contain no notes
+    '67': _IGNORED,
+}, default=_INVALID)
+
+# The index of the (note) position of notes and alterations
+_POSITIONS = _translateTable({
+    **{note: i for i, note in enumerate(CHARACTERS['notes'])},
+    **{liquescent: i for i, liquescent in enumerate(CHARACTERS['liquescents'])},
+    **{alteration: CHARACTERS['notes'].index(position)
+        for alterations in (CHARACTERS['flats'], CHARACTERS['naturals'])
+        for alteration, position in zip(alterations,
+            CHARACTERS['alteration_positions'])}
+}, default=0)
+
+def _diatonicNoteNumbers(clef: str) -> np.ndarray:
+    """The diatonic note numbers of all positions for a clef (C4 is 29)"""
+    numbers = []
+    for position in CHARACTERS['notes']:
+        name = volpianoPositionToStep(position, clef)
+        numbers.append(int(name[1:]) * 7 + 'CDEFGAB'.index(name[0]) + 1)
+    return np.array(numbers, dtype=np.int16)
+
+_G_CLEF_PITCHES = _diatonicNoteNumbers('g')
+_F_CLEF_PITCHES = _diatonicNoteNumbers('f')
+
+# Steps (diatonic note number minus 1, modulo 7) that can be altered
+_STEP_B = 6
+_STEP_E = 2
+
+# Accidental states: the last alteration in the current word (if any)
+_NO_ALTERATION, _B_FLAT, _B_NATURAL, _E_FLAT, _E_NATURAL = range(5)
+
+class VolpianoArrays:
+    """The melodies of many volpiano strings, computed by
+    :func:`volpianoToArrays`. All notes of all chants are stored in the same
+    arrays; the notes of chant ``i`` are those from ``offsets[i]`` up to
+    ``offsets[i + 1]``. The arrays of a single chant can be obtained as a
+    :class:`chant21.chbin.ChantArrays` object by indexing (``arrays[i]``).
+
+    The arrays ``neume``, ``syllable``, ``word`` and ``section`` contain the
+    index of the container of every note within its chant. As for
+    :class:`chant21.chbin.ChantArrays`, those indices count all containers
+    of that type, also those without notes (e.g. syllables with only a clef).
+    Boundaries between for example words are therefore found where the word
+    index changes.
+
+    Attributes
+    ----------
+    pitches : numpy.ndarray
+        Diatonic note numbers (C4 is 29)
+    alterations : numpy.ndarray
+        -1 for flats, and 0 otherwise (also for naturals)
+    liquescent : numpy.ndarray
+        Whether the notes are liquescent
+    pausas : numpy.ndarray
+        The pausa following the note (before the next note): the index in
+        :data:`chant21.chbin.PAUSAS` plus one, or 0 if there is no pausa
+    neume, syllable, word, section : numpy.ndarray
+        The index of the neume, syllable, word and section of every note
+    offsets : numpy.ndarray
+        The index of the first note of every chant, followed by the total
+        number of notes
+    numSyllables : numpy.ndarray
+        The number of syllables of every chant
+    errors : numpy.ndarray
+        The error code of every string (or None), see
+        :data:`chant21.cantus.validation.VOLPIANO_ERRORS`. Strings that contain
+        characters that do not occur in volpiano get the code
+        ``'invalid_character'``. Strings with errors have no notes.
+    """
+    __slots__ = ('pitches', 'alterations', 'liquescent', 'pausas', 'neume',
+        'syllable', 'word', 'section', 'offsets', 'numSyllables', 'errors')
+
+    def __init__(self, pitches, alterations, liquescent, pausas, neume,
+        syllable, word, section, offsets, numSyllables, errors):
+        self.pitches = pitches
+        self.alterations = alterations
+        self.liquescent = liquescent
+        self.pausas = pausas
+        self.neume = neume
+        self.syllable = syllable
+        self.word = word
+        self.section = section
+        self.offsets = offsets
+        self.numSyllables = numSyllables
+        self.errors = errors
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __repr__(self):
+        return (f'<chant21.cantus.VolpianoArrays chants={len(self)} '
+            f'notes={len(self.pitches)}>')
+
+    def __getitem__(self, index: int) -> ChantArrays:
+        """Return the arrays of a single chant"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Chant index out of range')
+        notes = slice(self.offsets[index], self.offsets[index + 1])
+        return ChantArrays(pitches=self.pitches[notes],
+            alterations=self.alterations[notes],
+            liquescent=self.liquescent[notes], pausas=self.pausas[notes],
+            neume=self.neume[notes], syllable=self.syllable[notes],
+            word=self.word[notes], section=self.section[notes],
+            lyrics=[None] * int(self.numSyllables[index]), metadata=None)
+
+def _classify(strings: list) -> tuple:
+    """Join the strings and classify all characters. Returns the character
+    classes, positions and the index of the string of every character"""
+    joined = '\0' + '\0'.join(strings) + '\0'
+    joined = _MISSING_PITCHES_PATTERN.sub(_MISSING_PITCHES_CHAR, joined)
+    data = joined.encode('utf-8')
+    classes = np.frombuffer(data.translate(_CLASSES), dtype=np.uint8)
+    positions = np.frombuffer(data.translate(_POSITIONS), dtype=np.uint8)
+    rows = np.cumsum(classes == _SEPARATOR) - 1
+    return classes, positions, rows
+
+def _countWithin(starts, rows, firstOfRow):
+    """Index of the current container (counted by ``starts``) within every
+    string, at every position"""
+    counts = np.cumsum(starts)
+    return counts - counts[firstOfRow[rows]] - 1
+
+def volpianoToArrays(volpianos, strict: bool = False) -> VolpianoArrays:
+    """Compute the pitches and structure of many volpiano strings at once.
+    See :class:`VolpianoArrays` for details.
+
+    >>> arrays = volpianoToArrays(['1---f--g---3---h', 'f---g'])
+    >>> arrays.section
+    array([0, 0, 1], dtype=int32)
+    >>> arrays.errors
+    array([None, 'missing_clef'], dtype=object)
+
+    Parameters
+    ----------
+    volpianos : iterable
+        The volpiano strings
+    strict : bool, optional
+        Whether to check the strings in strict mode, by default False. See
+        :class:`ParserCantusVolpiano`.
+
+    Returns
+    -------
+    VolpianoArrays
+        The arrays
+    """
+    volpianos = np.fromiter(volpianos, dtype=object)
+    strings, errors = _validate(volpianos, strict=strict)
+    strings[errors != None] = ''
+    classes, positions, rows = _classify(strings.tolist())
+
+    # Strings with characters that do not occur in volpiano are left out
+    invalid = np.unique(rows[classes == _INVALID])
+    if len(invalid) > 0:
+        errors[invalid] = 'invalid_character'
+        strings[invalid] = ''
+        classes, positions, rows = _classify(strings.tolist())
+    numStrings = len(strings)
+    length = len(classes)
+    separators = np.flatnonzero(classes == _SEPARATOR)
+
+    # Boundaries: the number of hyphens before every character
+    isHyphen = classes == _HYPHEN
+    changes = np.diff(isHyphen.view(np.int8))
+    runStarts = np.flatnonzero(changes == 1) + 1
+    runEnds = np.flatnonzero(changes == -1) + 1
+    hyphens = np.zeros(length, dtype=np.int64)
+    hyphens[runEnds] = runEnds - runStarts
+    isContent = ~isHyphen & (classes != _SEPARATOR)
+    follows = np.zeros(length, dtype=bool)
+    follows[1:] = classes[:-1] == _SEPARATOR
+    wordStarts = isContent & ((hyphens >= 3) | follows)
+    syllableStarts = isContent & ((hyphens >= 2) | wordStarts)
+    neumeStarts = isContent & ((hyphens >= 1) | syllableStarts)
+
+    # Syllables with a clef, barline or missing pitches contain no neumes
+    syllableIds = np.cumsum(syllableStarts) - 1
+    isSpecial = ((classes >= _G_CLEF) & (classes <= _MISSING_PITCHES))
+    specialSyllables = np.zeros(syllableIds[-1] + 2, dtype=bool)
+    specialSyllables[syllableIds[isSpecial]] = True
+    neumeStarts &= ~specialSyllables[syllableIds]
+
+    # Sections start at words containing a barline, unless it is the last
+    # word of the chant
+    isPausa = (classes == _SECTION_END) | (classes == _CHANT_END)
+    pausaCounts = np.cumsum(isPausa)
+    wordPositions = np.flatnonzero(wordStarts)
+    wordRows = rows[wordPositions]
+    wordEnds = np.append(wordPositions[1:], length)
+    hasPausa = pausaCounts[wordEnds - 1] > pausaCounts[wordPositions - 1]
+    isLastWord = np.append(wordRows[1:] != wordRows[:-1], True)
+    sectionStarts = hasPausa & ~isLastWord
+    firstWords = np.searchsorted(wordRows, wordRows)
+    sectionCounts = np.cumsum(sectionStarts)
+    wordSections = sectionCounts - (sectionCounts[firstWords]
+        - sectionStarts[firstWords])
+
+    # Pitches depend on the last clef
+    isClef = (classes == _G_CLEF) | (classes == _F_CLEF)
+    lastClef = np.maximum.accumulate(np.where(isClef, np.arange(length), 0))
+    pitches = np.where(classes[lastClef] == _G_CLEF,
+        _G_CLEF_PITCHES[positions], _F_CLEF_PITCHES[positions])
+    steps = (pitches - 1) % 7
+
+    # Accidentals apply until the next alteration, barline or word
+    isFlat = classes == _FLAT
+    isAlteration = isFlat | (classes == _NATURAL)
+    states = np.zeros(length, dtype=np.int8)
+    states[isAlteration & (steps == _STEP_B)] = _B_NATURAL
+    states[isAlteration & (steps == _STEP_E)] = _E_NATURAL
+    states[isFlat & (steps == _STEP_B)] = _B_FLAT
+    states[isFlat & (steps == _STEP_E)] = _E_FLAT
+    isReset = isAlteration | wordStarts | isPausa
+    lastReset = np.maximum.accumulate(np.where(isReset, np.arange(length), 0))
+    states = states[lastReset]
+
+    # Notes
+    isNote = (classes == _NOTE) | (classes == _LIQUESCENT)
+    notes = np.flatnonzero(isNote)
+    noteSteps = steps[notes]
+    noteStates = states[notes]
+    isFlatNote = (((noteStates == _B_FLAT) & (noteSteps == _STEP_B))
+        | ((noteStates == _E_FLAT) & (noteSteps == _STEP_E)))
+    alterations = np.where(isFlatNote, -1, 0).astype(np.int8)
+    wordIds = np.cumsum(wordStarts) - 1
+
+    # Pausas are assigned to the last note before them in the same chant
+    pausas = np.zeros(len(notes), dtype=np.int8)
+    pausaPositions = np.flatnonzero(isPausa)
+    previousNotes = np.cumsum(isNote)[pausaPositions] - 1
+    hasNote = ((previousNotes >= 0)
+        & (rows[notes[np.maximum(previousNotes, 0)]] == rows[pausaPositions]))
+    values = np.where(classes[pausaPositions] == _SECTION_END,
+        PAUSAS.index('pausamajor') + 1, PAUSAS.index('pausafinalis') + 1)
+    np.maximum.at(pausas, previousNotes[hasNote], values[hasNote])
+
+    noteRows = rows[notes]
+    return VolpianoArrays(
+        pitches=pitches[notes].astype(np.int16),
+        alterations=alterations,
+        liquescent=classes[notes] == _LIQUESCENT,
+        pausas=pausas,
+        neume=_countWithin(neumeStarts, rows, separators)[notes].astype(np.int32),
+        syllable=_countWithin(syllableStarts, rows, separators)[notes].astype(np.int32),
+        word=_countWithin(wordStarts, rows, separators)[notes].astype(np.int32),
+        section=wordSections[wordIds[notes]].astype(np.int32),
+        offsets=np.searchsorted(noteRows, np.arange(numStrings + 1)),
+        numSyllables=np.bincount(rows[syllableStarts],
+            minlength=numStrings).astype(np.int64)[:numStrings],
+        errors=errors)
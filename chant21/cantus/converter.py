@@ -11,6 +11,7 @@ from arpeggio import visit_parse_tree as visitParseTree
 from ..chant import Chant
 from ..chant import Section
 from ..chant import Note
+from ..chant import NoteInfo
 from ..chant import Neume
 from ..chant import Syllable
 from ..chant import Word
@@ -28,6 +29,7 @@ from ..chant import LineBreak
 from ..chant import ColumnBreak
 from ..chant import PageBreak
 from ..chant import MissingPitches
+from ..chant import appendElements
 
 from .parser_volpiano import ParserCantusVolpiano
 from .parser_text import ParserCantusText
@@ -62,7 +64,10 @@ class VisitorCantusVolpiano(PTNodeVisitor):
     
     def visit_volpiano(self, node, children):
         ch = Chant()
-        curSection = Section()
+        # Words are collected per section, and only added to sections once
+        # all sections are known
+        sections = []
+        curWords = []
         curClef = None
         ch.editorial.metadata = {
             'conversion': {
@@ -72,10 +77,11 @@ class VisitorCantusVolpiano(PTNodeVisitor):
             }
         }
 
-        for word in children: 
-            # Ignore dashes at the very end of the chant
-            if word == '-': continue
-            curSection.append(word)
+        # Ignore dashes at the very end of the chant
+        words = [word for word in children if not isinstance(word, str)]
+        for i, word in enumerate(words): 
+            curWords.append(word)
+            endsSection = False
             
             # Scope of accidentals ends at word boundaries
             bIsFlat = False
@@ -87,7 +93,7 @@ class VisitorCantusVolpiano(PTNodeVisitor):
                 if isinstance(el, Note):
                     if curClef is None: 
                         raise MissingClef('Missing clef! Cannot process notes without a clef.')
-                    position = el.editorial.volpianoPosition
+                    position = el.noteInfo.volpianoPosition
                     stepWithOctave = volpianoPositionToStep(position, curClef)
                     el.nameWithOctave = stepWithOctave
 
@@ -134,54 +140,59 @@ class VisitorCantusVolpiano(PTNodeVisitor):
                     # because annotations below them always refer to the next sections.
                     # The very last pausa finalis is part of the last section though
                     if isinstance(el, PausaMajor) or isinstance(el, PausaFinalis):
-                        if not word == children[-1]:
-                            curSection.remove(word)
-                            ch.append(curSection)
-                            curSection = Section()
-                            curSection.append(word)
-                        else:
-                            ch.append(curSection)
-                            curSection = Section()
+                        endsSection = True
 
                 if isinstance(el, Clef):
                     volpiano = el.editorial.get('volpiano')
                     curClef = 'g' if volpiano == '1' else 'f'
+            
+            if endsSection:
+                if i < len(words) - 1:
+                    curWords.pop()
+                    sections.append(curWords)
+                    curWords = [word]
+                else:
+                    sections.append(curWords)
+                    curWords = []
         
         # Append cursection if this didn't happen yet: incipits for example
         # do not always contain a final barline
-        if len(curSection) > len(ch):
-            ch.append(curSection)
-
+        if len(curWords) > 0:
+            sections.append(curWords)
+
+        sectionObjects = []
+        for words in sections:
+            section = Section()
+            appendElements(section, words)
+            sectionObjects.append(section)
+        appendElements(ch, sectionObjects)
         return ch
     
     def visit_word(self, node, children):
         word = Word()
-        for child in children:
-            word.append(child)
+        appendElements(word, children)
         return word
     
     def visit_syllable(self, node, children):
         syllable = Syllable()
-        for child in children:
-            syllable.append(child)
+        appendElements(syllable, children)
         return syllable
 
     def visit_neume(self, node, children):
         neume = Neume()
-        for child in children:
-            neume.append(child)
+        appendElements(neume, children)
         return neume
     
     def visit_note(self, node, children):
         n = Note()
-        n.editorial.volpianoPosition = node.value
+        n.noteInfo = NoteInfo.intern(volpianoPosition=node.value)
         return n
 
     def visit_liquescent(self, node, children):
         n = Note()
         noteIndex = CHARACTERS['liquescents'].index(node.value)
-        n.editorial.volpianoPosition = CHARACTERS['notes'][noteIndex]
-        n.editorial.liquescence = True
+        n.noteInfo = NoteInfo.intern(
+            volpianoPosition=CHARACTERS['notes'][noteIndex], liquescence=True)
         n.notehead = 'x'
         return n
 
@@ -260,7 +271,7 @@ class VisitorCantusText(PTNodeVisitor):
             zip(txt_sections, mus_sections)):
 
             # Ignore words without notes: these cannot be aligned to text anyway
-            mus_section_words = [w for w in mus_section if len(w.flat.notes) > 0]
+            mus_section_words = [w for w in mus_section if len(w.flatNotes) > 0]
 
             # Music is not aligned to text. Add lyrics to first syllable.
             if type(txt_section) == str:    
@@ -354,7 +365,8 @@ class SyllableAlignmentError(TextAlignmentError):
 
 ###
 
-def addTextToChant(chant: Chant, text: str, strict: bool = False):
+def addTextToChant(chant: Chant, text: str, strict: bool = False,
+    limits=None):
     """Parses the Cantus manuscript text and adds it as lyrics to a Chant 
     object.
 
@@ -399,28 +411,79 @@ def addTextToChant(chant: Chant, text: str, strict: bool = False):
         are misaligned (e.g. more syllables in the text than in the music).
         In normal mode such misalignments are accepted but flagged in the
         editorial information.
+    limits : ConversionLimits or dict, optional
+        Limits on parsing the text, see :class:`chant21.limits.ConversionLimits`
     """
     syllabifier = ChantSyllabifier()
     visitor = VisitorCantusText(chant, syllabifier, strict=strict)
     parser = ParserCantusText()
-    parse = parser.parse(text)
+    parse = parser.parse(text, limits=limits)
     visitParseTree(parse, visitor)
+    # The visitor also changes editorial information of the chant
+    chant._clearCachedExports()
+
+def _isText(value):
+    """Whether a field contains text: missing values are NaN in pandas and
+    None (or empty strings) in plain mappings"""
+    return type(value) == str and value != ''
 
 def addCantusMetadataToChant(chant, data):
-    chant.editorial.metadata.update(data.to_dict())
-
-def convertCantusData(data, **kwargs):
-    chant = converter.parse(data['volpiano'], format='cantus', **kwargs)
-    if type(data['full_text_manuscript']) == str:
-        addTextToChant(chant, data['full_text_manuscript'])
-    elif type(data['incipit']) == str:
-        addTextToChant(chant, data['incipit'])
-    chant.editorial.metadata.update(data.to_dict())
+    """Store the fields of a row of Cantus data in the chant's metadata.
+
+    Parameters
+    ----------
+    chant : Chant
+        The chant
+    data : pandas.Series or mapping
+        The Cantus data, e.g. a row read by :func:`readCantusCSV`
+    """
+    if hasattr(data, 'to_dict'):
+        data = data.to_dict()
+    chant.editorial.metadata.update(data)
+    chant._clearCachedExports()
+
+def convertCantusData(data, limits=None, **kwargs):
+    """Convert a row of Cantus data to a chant, with the manuscript text (or
+    else the incipit) aligned to the music and all fields stored as metadata.
+
+    Parameters
+    ----------
+    data : pandas.Series or mapping
+        The Cantus data, with at least the fields ``volpiano``, 
+        ``full_text_manuscript`` and ``incipit``. This can for example be a
+        row of a data frame, or a plain dictionary read by 
+        :func:`readCantusCSV`.
+    limits : ConversionLimits or dict, optional
+        Limits on parsing the volpiano and the text, see
+        :class:`chant21.limits.ConversionLimits`
+    **kwargs
+        Other keywords are passed to :func:`music21.converter.parse`
+
+    Returns
+    -------
+    Chant
+        The chant
+
+    Raises
+    ------
+    chant21.limits.ConversionLimitError
+        If a limit is exceeded
+    """
+    chant = converter.parse(data['volpiano'], format='cantus', limits=limits,
+        **kwargs)
+    if _isText(data.get('full_text_manuscript')):
+        addTextToChant(chant, data['full_text_manuscript'], limits=limits)
+    elif _isText(data.get('incipit')):
+        addTextToChant(chant, data['incipit'], limits=limits)
+    addCantusMetadataToChant(chant, data)
     return chant
 
 ###
 
 class ConverterCantusVolpiano(converter.subConverters.SubConverter):
+    """Music21 subconverter for Cantus volpiano, optionally followed by a 
+    slash and the text. Limits on the conversion can be passed using the
+    keyword ``limits`` (see :class:`chant21.limits.ConversionLimits`)."""
     registerFormats = ('cantus', 'Cantus', 'CANTUS')
     registerInputExtensions = ('cantus', 'Cantus', 'CANTUS')
     
@@ -436,10 +499,12 @@ class ConverterCantusVolpiano(converter.subConverters.SubConverter):
         else:
             volpiano = strData
             text = None
-        parse = self.volpianoParser.parse(volpiano, strict=self.strict)
+        limits = self.keywords.get('limits')
+        parse = self.volpianoParser.parse(volpiano, strict=self.strict,
+            limits=limits)
         ch = visitParseTree(parse, self.volpianoVisitor)
         if text is not None:
-            addTextToChant(ch, text, strict=self.strict)
+            addTextToChant(ch, text, strict=self.strict, limits=limits)
         self.stream = ch
 
 converter.registerSubconverter(ConverterCantusVolpiano)
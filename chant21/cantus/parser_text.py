@@ -1,6 +1,7 @@
 import re
 import os.path
 from arpeggio.cleanpeg import ParserPEG
+from ..limits import limitParsing
 
 GRAMMAR_PATH = os.path.join(os.path.dirname(__file__), 'cantus_text.peg')
 
@@ -26,7 +27,8 @@ class ParserCantusText():
             grammar = handle.read()        
         self.parser = ParserPEG(grammar, root, skipws=False, **kwargs)
 
-    def parse(self, text: str, debug: bool = True):
+    def parse(self, text: str, debug: bool = True, limits=None):
         # TODO docstring
         if not type(text) == str: return None
-        return self.parser.parse(text)
\ No newline at end of file
+        with limitParsing(limits, self.parser, text):
+            return self.parser.parse(text)
\ No newline at end of file
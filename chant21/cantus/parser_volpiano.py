@@ -1,6 +1,7 @@
 import re
 import os.path
 from arpeggio.cleanpeg import ParserPEG
+from ..limits import limitParsing
 
 GRAMMAR_PATH = os.path.join(os.path.dirname(__file__), 'cantus_volpiano.peg')
 
@@ -223,7 +224,7 @@ class ParserCantusVolpiano():
         # TODO the same problem occurs for non-standard hyphenation. Perhaps add this?
         return volpiano
 
-    def parse(self, volpiano: str, strict = None):
+    def parse(self, volpiano: str, strict = None, limits = None):
         """Parse a Cantus Volpiano string.
 
         >>> parser = ParserCantusVolpiano()
@@ -241,14 +242,24 @@ class ParserCantusVolpiano():
             syntax. In non-strict mode, some deviations will be automatically 
             corrected. See :meth:`ParserCantusVolpiano.preprocess` for details.
             By default True
+        limits : ConversionLimits or dict, optional
+            Limits on the length of the string and on the time and memory
+            spent parsing it, see :class:`chant21.limits.ConversionLimits`.
+            By default None
 
         Returns
         -------
         arpeggio.NonTerminal
             The parse tree
+
+        Raises
+        ------
+        chant21.limits.ConversionLimitError
+            If a limit is exceeded
         """
         volpiano = self.preprocess(volpiano, strict=strict)
-        return self.parser.parse(volpiano)
+        with limitParsing(limits, self.parser, volpiano):
+            return self.parser.parse(volpiano)
 
 class HyphenationError(Exception):
     pass
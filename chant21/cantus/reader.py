@@ -0,0 +1,141 @@
+"""
+Streaming access to Cantus data in CSV format. :func:`readCantusCSV` reads a
+CSV export of the Cantus database in chunks of plain dictionaries, using only
+the :mod:`csv` module from the standard library, so that files of any size
+can be processed in bounded memory:
+
+>>> from chant21.cantus.reader import EXAMPLES_CSV
+>>> chunks = readCantusCSV(EXAMPLES_CSV, chunkSize=10)
+>>> chunk = next(chunks)
+>>> len(chunk)
+10
+>>> chunk[0]['id'], chunk[0]['volpiano']
+('chant_000572', '1---h--g--g--g--3--l--l--m--l--k--jk---4')
+
+Empty fields are returned as None; all other values are strings.
+:func:`convertCantusCSV` converts all chants in a CSV file and writes them to
+a CHSON Lines file: a file with one chant in CHSON format per line, 
+optionally compressed and with an index (see :mod:`chant21.chson`).
+"""
+import os
+import csv
+from contextlib import contextmanager
+from .converter import convertCantusData
+from ..chson import _writeConversions
+
+__all__ = [
+    'readCantusCSV',
+    'convertCantusCSV'
+]
+
+EXAMPLES_CSV = os.path.join(os.path.dirname(__file__), os.path.pardir,
+    'examples', 'cantus-volpiano-examples.csv')
+
+@contextmanager
+def _openFile(file, mode, **kwargs):
+    """Open a file by filename, or use an open file object as is"""
+    if hasattr(file, 'read') or hasattr(file, 'write'):
+        yield file
+    else:
+        with open(file, mode, **kwargs) as handle:
+            yield handle
+
+def readCantusCSV(file, chunkSize: int = 1000, columns: list = None,
+    encoding: str = 'utf-8', **csvKwargs):
+    """Read a CSV file with Cantus data in chunks. The file is read lazily:
+    only one chunk of rows is kept in memory at a time.
+
+    Parameters
+    ----------
+    file : str or file object
+        The filename of the CSV file, or an open file object
+    chunkSize : int, optional
+        The (maximum) number of rows per chunk, by default 1000
+    columns : list, optional
+        The columns to read. By default, all columns are read.
+    encoding : str, optional
+        The encoding of the file, by default 'utf-8'
+    **csvKwargs
+        Other keywords are passed to :class:`csv.DictReader`
+
+    Yields
+    ------
+    list
+        A list of dictionaries, one for every row, that map column names to
+        values. Empty values are replaced by None.
+    """
+    if chunkSize < 1:
+        raise ValueError('The chunk size should be at least 1')
+    with _openFile(file, 'r', encoding=encoding, newline='') as handle:
+        reader = csv.DictReader(handle, **csvKwargs)
+        if columns is None:
+            columns = reader.fieldnames
+        chunk = []
+        for row in reader:
+            chunk.append({col: row[col] if row[col] != '' else None
+                          for col in columns})
+            if len(chunk) == chunkSize:
+                yield chunk
+                chunk = []
+        if len(chunk) > 0:
+            yield chunk
+
+def convertCantusCSV(file, outputFile, chunkSize: int = 1000,
+    idColumn: str = 'id', encoding: str = 'utf-8', limits=None,
+    compression='infer', index: bool = True, **kwargs) -> list:
+    """Convert all chants in a Cantus CSV file to CHSON, and write them to a
+    CHSON Lines file with one chant per line (see 
+    :func:`chant21.chson.writeCHSONLines`). The CSV file is processed in
+    chunks (see :func:`readCantusCSV`), so that memory use does not depend on
+    the size of the file. Rows that cannot be converted are skipped. This
+    includes rows for which the conversion exceeds the ``limits``, so that a
+    single malformed row cannot stall the conversion.
+
+    Parameters
+    ----------
+    file : str or file object
+        The CSV file
+    outputFile : str or file object
+        The output file
+    chunkSize : int, optional
+        The number of rows per chunk, by default 1000
+    idColumn : str, optional
+        The column used to identify rows in the index and the list of errors,
+        by default 'id'. If the column does not exist, rows are identified by
+        their (0-based) row number.
+    encoding : str, optional
+        The encoding of the CSV file, by default 'utf-8'. CHSON Lines files
+        are always encoded in utf-8.
+    limits : ConversionLimits or dict, optional
+        Limits on the conversion of every row, see 
+        :class:`chant21.limits.ConversionLimits`. By default None
+    compression : str, optional
+        The compression of the output file: None, 'gzip' or 'zstd'. By 
+        default this is inferred from the extension of the filename.
+    index : bool, optional
+        Whether to write an index next to the output file, by default True
+    **kwargs
+        Other keywords are passed to :meth:`Chant.toObject`, for example
+        ``includeEditorial``.
+
+    Returns
+    -------
+    list
+        A list of ``(id, error)`` tuples for all rows that could not be
+        converted
+    """
+    def iterResults():
+        rowNumber = 0
+        for chunk in readCantusCSV(file, chunkSize=chunkSize,
+            encoding=encoding):
+            for row in chunk:
+                chantId = row.get(idColumn, rowNumber)
+                try:
+                    chant = convertCantusData(row, limits=limits)
+                    yield chantId, chant.toObject(**kwargs), None
+                except Exception as error:
+                    yield chantId, None, repr(error)
+                rowNumber += 1
+    _, errors = _writeConversions(iterResults(), outputFile, 
+        compression=compression, index=index)
+    return errors
@@ -1,12 +1,25 @@
 """
 Latin Syllabifier Wrapper around the CLTK syllabifier, specifically adjusted for
 chant.
+
+The CLTK syllabifier tests characters by scanning lists and calls a method for
+every test. :class:`ChantSyllabifier` implements the same algorithm, but
+precomputes frozensets of the character classes, a regular expression
+matching the prefixes and a lookup table of the vowels in each word. Its
+output is identical to that of the CLTK syllabifier.
+
+For syllabifying complete manuscript texts in bulk, :func:`syllabifyText` and
+:func:`syllabifyMany` tokenize the texts without parsing them and return the
+character offsets of all syllables as arrays.
 """
 from .cltk_syllabifier import Syllabifier
 from .cltk_syllabifier import LATIN
 from copy import deepcopy
 import yaml
 import os
+import re
+from itertools import chain
+import numpy as np
 
 # Make adjustments to the CLTK settings for Latin, to optimize it for chant
 CHANT_LATIN = deepcopy(LATIN)
@@ -19,14 +32,126 @@ with open(exceptions_fn, 'r') as stream:
     CHANT_LATIN['exceptions'].update(exceptions)
 
 class ChantSyllabifier(Syllabifier):
-    def __init__(self):
-        super().__init__(CHANT_LATIN)
-    
+    def __init__(self, language=CHANT_LATIN):
+        super().__init__(language)
+        self._vowels = frozenset(language['vowels'])
+        self._diphthongs = frozenset(language['diphthongs'])
+        self._muteConsonants = frozenset(language['mute_consonants_and_f'])
+        self._liquidConsonants = frozenset(language['liquid_consonants'])
+        self._exceptions = {word: tuple(syllables)
+            for word, syllables in language['exceptions'].items()}
+        # Prefixes are tried from long to short; the first match is removed
+        prefixes = sorted(language['single_syllable_prefixes'], key=len,
+            reverse=True)
+        if len(prefixes) > 0:
+            self._prefixPattern = re.compile('|'.join(map(re.escape, prefixes)))
+        else:
+            self._prefixPattern = None
+
+    def _is_consonant(self, char):
+        return char not in self._vowels
+
+    def _is_vowel(self, char):
+        return char in self._vowels
+
+    def _is_diphthong(self, char_1, char_2):
+        return char_1 + char_2 in self._diphthongs
+
+    def _is_mute_consonant_or_f(self, char):
+        return char in self._muteConsonants
+
+    def _is_liquid_consonant(self, char):
+        return char in self._liquidConsonants
+
+    def syllabifyWord(self, word: str) -> list:
+        """Syllabifies a lowercased Latin word. This gives the same result as
+        the ``syllabify`` method of the CLTK syllabifier.
+
+        >>> syllabifier = ChantSyllabifier()
+        >>> syllabifier.syllabifyWord('alleluia')
+        ['al', 'le', 'lu', 'ia']
+
+        Parameters
+        ----------
+        word : str
+            The lowercased word
+
+        Returns
+        -------
+        list
+            A list of syllables
+        """
+        if word in self._exceptions:
+            return list(self._exceptions[word])
+
+        syllables = []
+        if self._prefixPattern is not None:
+            match = self._prefixPattern.match(word)
+            if match:
+                syllables.append(match.group())
+                word = word[match.end():]
+
+        vowels = self._vowels
+        diphthongs = self._diphthongs
+        mute = self._muteConsonants
+        liquid = self._liquidConsonants
+        isVowel = list(map(vowels.__contains__, word))
+        length = len(word)
+        start = 0
+        # The last character always completes the syllable; see below
+        for i in range(length - 1):
+            char = word[i]
+            nextChar = word[i + 1]
+            charIsVowel = isVowel[i]
+
+            # An i at the beginning of a word or between vowels is a
+            # consonant (y)
+            if (char == 'i' and isVowel[i + 1]
+                and (i == 0 or isVowel[i - 1])):
+                charIsVowel = False
+
+            if charIsVowel:
+                afterNext = i < length - 2
+                complete = (
+                    # The next character is a vowel, but not part of a
+                    # diphthong or a qu
+                    (isVowel[i + 1]
+                        and char + nextChar not in diphthongs
+                        and not (i > 0 and word[i - 1] == 'q'
+                                 and char == 'u' and nextChar != 'u'))
+                    or (afterNext and (
+                        (char == 'u' and isVowel[i + 2]
+                            and (i == 0 or word[i - 1] != 'q'))
+                        or (char != 'u' and isVowel[i + 2]
+                            and char + nextChar not in diphthongs)
+                        or (nextChar in mute and word[i + 2] in liquid)
+                    ))
+                )
+            else:
+                # The next character is a consonant too (but not the
+                # last one), there is no mute consonant followed by a
+                # liquid consonant or ch/ph/th, and the syllable is
+                # not just this character
+                complete = (
+                    not isVowel[i + 1] and i < length - 2
+                    and not (char in mute and nextChar in liquid)
+                    and not (nextChar == 'h' and char in 'cpt'
+                             and (i == 0 or not isVowel[i - 1]))
+                    and i > start
+                )
+
+            if complete:
+                syllables.append(word[start:i + 1])
+                start = i + 1
+        if length > 0:
+            syllables.append(word[start:])
+        return syllables
+
     def syllabify(self, text: str) -> list:
-        """Syllabifies a string of Latin. 
-        
-        CLTK works best with lowercased input, so we first syllabify the 
-        lowercased text and then copy the segmentation to the original input 
+        """Syllabifies a string of Latin.
+
+        CLTK works best with lowercased input, so we first syllabify the
+        lowercased text and then copy the segmentation to the original input
         string.
 
         >>> syllabifier = ChantSyllabifier()
@@ -47,7 +172,10 @@ class ChantSyllabifier(Syllabifier):
         list
             A list of syllables.
         """
-        lowercased_syllables = super().syllabify(text.lower())
+        lowercased = text.lower()
+        lowercased_syllables = self.syllabifyWord(lowercased)
+        if lowercased == text:
+            return lowercased_syllables
         syllables = []
         pos = 0
         for lowercased_syllable in lowercased_syllables:
@@ -55,3 +183,164 @@ class ChantSyllabifier(Syllabifier):
             syllables.append(syllable)
             pos += len(lowercased_syllable)
         return syllables
+
+###
+
+# Tokens in Cantus manuscript texts (see cantus_text.peg): barlines separate
+# sections, text after a tilde is not aligned to the music and missing pitches
+# are marked by {...} or #. All of those are not syllabified.
+_TEXT_TOKENS = re.compile(
+    r"(?P<barline>\|)|~[^|]*|(?P<missing>\{[^}]*\}?|#)|(?P<word>[a-zA-Z.,'\-]+)")
+
+_DEFAULT_SYLLABIFIER = None
+
+def _getDefaultSyllabifier():
+    global _DEFAULT_SYLLABIFIER
+    if _DEFAULT_SYLLABIFIER is None:
+        _DEFAULT_SYLLABIFIER = ChantSyllabifier()
+    return _DEFAULT_SYLLABIFIER
+
+class SyllabifiedTexts:
+    """The syllables of one or more texts, as returned by 
+    :func:`syllabifyText` and :func:`syllabifyMany`. Every syllable has an 
+    entry in each of the arrays.
+
+    Attributes
+    ----------
+    texts : list
+        The syllabified texts
+    text : numpy.ndarray
+        Index of the text containing the syllable
+    section : numpy.ndarray
+        Index of the section (within the text) containing the syllable.
+        Sections are separated by barlines (``|``).
+    word : numpy.ndarray
+        Index of the word (within the text) containing the syllable. Missing
+        pitches (``{...}``, ``#``) also take up a word, as they do when the 
+        text is aligned to the music.
+    start : numpy.ndarray
+        Character offset of the start of the syllable in the text
+    end : numpy.ndarray
+        Character offset of the end of the syllable in the text
+    """
+    __slots__ = ('texts', 'text', 'section', 'word', 'start', 'end')
+
+    def __init__(self, texts, text, section, word, start, end):
+        self.texts = texts
+        self.text = text
+        self.section = section
+        self.word = word
+        self.start = start
+        self.end = end
+
+    def __len__(self):
+        return len(self.start)
+
+    def __repr__(self):
+        return (f'<chant21.cantus.SyllabifiedTexts texts={len(self.texts)} '
+                f'syllables={len(self)}>')
+
+    @property
+    def syllables(self) -> list:
+        """A list with the text of all syllables"""
+        texts = self.texts
+        return [texts[i][start:end] for i, start, end 
+                in zip(self.text.tolist(), self.start.tolist(), 
+                       self.end.tolist())]
+
+def syllabifyMany(texts, syllabifier: ChantSyllabifier = None):
+    """Syllabify many Cantus manuscript texts at once. The texts are split in
+    sections and words by a tokenizer that follows the Cantus text grammar
+    (without parsing them), and every distinct word is syllabified only once.
+    Unaligned text (after a tilde ``~``) and missing pitches (``{...}``, 
+    ``#``) are skipped, but missing pitches do count as words.
+
+    >>> result = syllabifyMany(['Gloria patri | ~Seculorum', 'Alleluia'])
+    >>> result.syllables
+    ['Glo', 'ri', 'a', 'pa', 'tri', 'Al', 'le', 'lu', 'ia']
+    >>> result.text
+    array([0, 0, 0, 0, 0, 1, 1, 1, 1], dtype=int32)
+    >>> result.word
+    array([0, 0, 0, 1, 1, 0, 0, 0, 0], dtype=int32)
+    >>> result.start
+    array([0, 3, 5, 7, 9, 0, 2, 4, 6])
+
+    Parameters
+    ----------
+    texts : list
+        A list (or other iterable) of texts. Missing texts (e.g. None or NaN)
+        do not contain any syllables.
+    syllabifier : ChantSyllabifier, optional
+        The syllabifier to use, by default a :class:`ChantSyllabifier`
+
+    Returns
+    -------
+    SyllabifiedTexts
+        The syllables, with their offsets in the texts
+    """
+    if syllabifier is None:
+        syllabifier = _getDefaultSyllabifier()
+    texts = list(texts)
+    textIndices, sections, wordIndices, starts, words = [], [], [], [], []
+    for textIndex, text in enumerate(texts):
+        if type(text) != str:
+            continue
+        section = 0
+        wordIndex = 0
+        for match in _TEXT_TOKENS.finditer(text):
+            if match.lastgroup == 'word':
+                textIndices.append(textIndex)
+                sections.append(section)
+                wordIndices.append(wordIndex)
+                starts.append(match.start())
+                words.append(match.group())
+                wordIndex += 1
+            elif match.lastgroup == 'missing':
+                wordIndex += 1
+            elif match.lastgroup == 'barline':
+                section += 1
+
+    # Syllabify distinct words, and store the offsets of the syllables
+    boundaries = {}
+    for word in set(words):
+        offsets = [0]
+        for syllable in syllabifier.syllabify(word):
+            offsets.append(offsets[-1] + len(syllable))
+        boundaries[word] = offsets
+
+    counts = np.fromiter((len(boundaries[word]) - 1 for word in words),
+        dtype=np.int64, count=len(words))
+    offsets = np.fromiter(chain.from_iterable(boundaries[word] for word in words),
+        dtype=np.int64, count=int(counts.sum()) + len(words))
+    # Offsets of the syllables start, ignoring the last offset of every word
+    isStart = np.ones(len(offsets), dtype=bool)
+    isStart[np.cumsum(counts + 1) - 1] = False
+    wordStarts = np.repeat(np.array(starts, dtype=np.int64), counts)
+    start = wordStarts + offsets[isStart]
+    end = wordStarts + offsets[np.roll(isStart, 1)]
+    repeat = lambda values: np.repeat(np.array(values, dtype=np.int32), counts)
+    return SyllabifiedTexts(texts, repeat(textIndices), repeat(sections),
+        repeat(wordIndices), start, end)
+
+def syllabifyText(text: str, syllabifier: ChantSyllabifier = None):
+    """Syllabify a single Cantus manuscript text; see :func:`syllabifyMany`.
+
+    >>> result = syllabifyText('Ave maria | ~Gratia plena')
+    >>> result.syllables
+    ['A', 've', 'ma', 'ri', 'a']
+    >>> result.end
+    array([1, 3, 6, 8, 9])
+
+    Parameters
+    ----------
+    text : str
+        The text
+    syllabifier : ChantSyllabifier, optional
+        The syllabifier to use, by default a :class:`ChantSyllabifier`
+
+    Returns
+    -------
+    SyllabifiedTexts
+        The syllables, with their offsets in the text
+    """
+    return syllabifyMany([text], syllabifier=syllabifier)
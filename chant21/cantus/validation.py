@@ -0,0 +1,257 @@
+"""
+Bulk validation of Cantus volpiano strings. :func:`validateVolpiano` applies
+the checks and corrections of :meth:`ParserCantusVolpiano.preprocess` to a
+whole column of volpiano strings at once, using vectorized string operations
+rather than parsing the strings one by one:
+
+>>> import pandas as pd
+>>> volpianos = pd.Series(['1---f-g', 'f---g', '1--f-g--h', '1---f-33-g'])
+>>> validateVolpiano(volpianos)
+        volpiano         error  corrected
+0        1---f-g          None      False
+1           None  missing_clef      False
+2   1---f--g---h          None       True
+3  1---f---4---g          None       True
+>>> validateVolpiano(volpianos, strict=True)['error'].tolist()
+[None, 'missing_clef', 'no_word_boundaries', 'double_barline']
+"""
+import re
+import numpy as np
+from .parser_volpiano import ClefError
+from .parser_volpiano import HyphenationError
+from .parser_volpiano import BarlineError
+from .parser_volpiano import UnsupportedCharacterError
+
+__all__ = [
+    'VOLPIANO_ERRORS',
+    'validateVolpiano'
+]
+
+VOLPIANO_ERRORS = {
+    'empty': ClefError,
+    'missing_clef': ClefError,
+    'clef_hyphenation': HyphenationError,
+    'mixed_hyphenation': HyphenationError,
+    'no_word_boundaries': HyphenationError,
+    'long_boundary': HyphenationError,
+    'missing_pitches_hyphens': HyphenationError,
+    'missing_pitches_boundary': HyphenationError,
+    'dot': UnsupportedCharacterError,
+    'double_barline': BarlineError,
+    'thick_barline': BarlineError,
+    'barline_preceding_hyphens': HyphenationError,
+    'barline_following_hyphens': HyphenationError,
+}
+"""dict: Maps the error codes returned by :func:`validateVolpiano` to the
+exception that :class:`ParserCantusVolpiano` raises for the same problem. The
+codes are listed in the order in which the checks are applied."""
+
+_CLEF_HYPHENATION = re.compile(r'[12]-?[^-]')
+_STANDARD_HYPHENATION = re.compile(r'[12]---')
+_WORD_BOUNDARY = re.compile(r'[^-]---[^-]')
+
+def _missingPitchesReplacer(match):
+    vol = match.group()
+    if vol[2] != '-': vol = '-' + vol
+    if vol[-3] != '-': vol += '-'
+    return vol
+
+def _barlineReplacer(match):
+    vol = match.group()
+    return vol[0] + '---' + vol[-1]
+
+# The remaining checks of ParserCantusVolpiano.preprocess, in the same order:
+# (error code, pattern to detect, pattern to correct, replacement, whether the
+# check only applies to chants with standard hyphenation)
+_CHECKS = [
+    ('long_boundary',
+        re.compile(r'[^-]-{4,5}[^-]'),
+        re.compile(r'(?<=[^-])-{4,5}(?=[^-])'), '---', False),
+    ('missing_pitches_hyphens',
+        re.compile(r'6-{7,}6'),
+        re.compile(r'6-{7,}6'), '6------6', False),
+    ('missing_pitches_boundary',
+        re.compile(r'[^-]--7*6------6|6------67*--[^-]'),
+        re.compile(r'-+7*6------67*-+'), _missingPitchesReplacer, False),
+    ('dot', re.compile(r'\.'), re.compile(r'\.'), '', False),
+    ('double_barline', re.compile(r'33'), re.compile(r'33'), '4', False),
+    ('thick_barline', re.compile(r'5'), re.compile(r'5'), '4', False),
+    ('barline_preceding_hyphens',
+        re.compile(r'[^-]-{1,2}[34]'),
+        re.compile(r'[^-]-{1,2}[34]'), _barlineReplacer, True),
+    ('barline_following_hyphens',
+        re.compile(r'[34]-{1,2}[^-]'),
+        re.compile(r'[34]-{1,2}[^-]'), _barlineReplacer, True),
+]
+
+_SEPARATOR = 0
+_HYPHEN, _THREE, _FOUR, _FIVE, _SIX, _DOT = b'-3456.'
+_ONE, _TWO = b'12'
+
+def _toBytes(volpianos: list):
+    """Join the (utf-8 encoded) volpiano strings into a single byte array, 
+    separated by null bytes and padded at both ends. Returns the array and the
+    offsets of the strings in it."""
+    encoded = [volpiano.encode('utf-8') for volpiano in volpianos]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    offsets = np.cumsum(lengths + 1) - lengths
+    joined = b'\0' + b'\0'.join(encoded) + b'\0' * 4
+    return np.frombuffer(joined, dtype=np.uint8), offsets
+
+def _hyphenRuns(data):
+    """Find all runs of hyphens in a (padded) byte array. Returns the start and
+    end positions of the runs, and the characters directly before and after
+    them"""
+    changes = np.diff((data == _HYPHEN).view(np.int8))
+    starts = np.flatnonzero(changes == 1) + 1
+    ends = np.flatnonzero(changes == -1) + 1
+    return starts, ends, data[starts - 1], data[ends]
+
+def _rowsOf(positions, offsets, numRows):
+    """Boolean array indicating which rows contain any of the positions"""
+    rows = np.zeros(numRows, dtype=bool)
+    rows[np.searchsorted(offsets, positions, side='right') - 1] = True
+    return rows
+
+def _suspects(data, offsets, runs):
+    """Find the rows that could fail one of the checks in ``_CHECKS``. For
+    every check, this selects (at least) all rows the check's pattern matches,
+    so rows that are not selected pass all checks unchanged."""
+    numRows = len(offsets)
+    starts, ends, before, after = runs
+    lengths = ends - starts
+    barlines = (_THREE, _FOUR, _FIVE)
+    candidates = (
+        # 4 or 5 hyphens, or missing pitches (6------6) with too many hyphens
+        # or a syllable boundary around them
+        (lengths >= 4)
+        # barlines with too few hyphens; 5 and 33 are replaced by barlines
+        | ((lengths <= 2) & (np.isin(before, barlines) | np.isin(after, barlines)))
+    )
+    suspect = _rowsOf(starts[candidates], offsets, numRows)
+    characters = (data == _DOT) | (data == _FIVE)
+    characters[:-1] |= (data[:-1] == _THREE) & (data[1:] == _THREE)
+    suspect |= _rowsOf(np.flatnonzero(characters), offsets, numRows)
+    return suspect
+
+def _correct(volpiano: str, standard: bool, strict: bool):
+    """Apply the checks in ``_CHECKS`` to a single volpiano string. Returns
+    the corrected string and an error code (or None)"""
+    for code, pattern, correction, replacement, standardOnly in _CHECKS:
+        if standardOnly and not standard: 
+            continue
+        if pattern.search(volpiano):
+            if strict:
+                return None, code
+            volpiano = correction.sub(replacement, volpiano)
+    return volpiano, None
+
+def validateVolpiano(series, strict: bool = False):
+    """Validate (and correct) a series of volpiano strings in bulk. This
+    applies the same checks as :meth:`ParserCantusVolpiano.preprocess`, but
+    operates on all strings at once and does not parse the strings. The 
+    strings are joined into a single byte array, on which the checks are run
+    using vectorized numpy operations. Only the (usually few) strings that 
+    fail a check are matched against the regular expressions used by the 
+    parser, to find the error or correct the string.
+
+    Every row gets an error code (see :data:`VOLPIANO_ERRORS`) for the
+    problem that would make the parser raise an exception, or ``None`` if the
+    string is valid. In strict mode that is the first deviation from the
+    standard syntax; otherwise only a missing clef or an invalid clef
+    hyphenation are errors, and all other deviations are corrected. Note that
+    the checks are not exhaustive: strings that pass can still fail to parse,
+    for example when they contain characters that are not part of the
+    volpiano grammar.
+
+    >>> validateVolpiano(['1---a----b', '1---a---b.c'], strict=True)
+      volpiano          error  corrected
+    0     None  long_boundary      False
+    1     None            dot      False
+
+    Parameters
+    ----------
+    series : pandas.Series or list
+        The volpiano strings. Missing values and empty strings get the error
+        code ``'empty'``.
+    strict : bool, optional
+        Whether to validate in strict mode, by default False. See
+        :class:`ParserCantusVolpiano`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A data frame with the same index as the series, with columns
+        ``volpiano`` (the corrected string, or None if the string contains an
+        error), ``error`` (the error code) and ``corrected`` (whether the
+        string was changed).
+    """
+    import pandas as pd
+    series = pd.Series(series).astype(object)
+    corrected, errors = _validate(series.to_numpy(), strict=strict)
+    result = pd.DataFrame({
+        'volpiano': pd.Series(corrected, index=series.index, dtype=object),
+        'error': pd.Series(errors, index=series.index, dtype=object)
+    })
+    result['corrected'] = (result['volpiano'].notna()
+        & (result['volpiano'] != series))
+    return result
+
+def _validate(volpianos, strict: bool = False):
+    """Validate (and correct) an array of volpiano strings; this implements
+    :func:`validateVolpiano`. Returns arrays with the corrected strings (or 
+    None) and the error codes (or None)."""
+    volpianos = np.asarray(volpianos, dtype=object)
+    errors = np.full(len(volpianos), None, dtype=object)
+    corrected = np.full(len(volpianos), None, dtype=object)
+
+    isValid = np.fromiter((isinstance(vol, str) and len(vol) > 0 
+        for vol in volpianos), dtype=bool, count=len(volpianos))
+    errors[~isValid] = 'empty'
+    rows = np.flatnonzero(isValid)
+    volpianos = volpianos[rows]
+    data, offsets = _toBytes(volpianos)
+    first, second, third, fourth = (data[offsets + i] for i in range(4))
+
+    hasClef = (first == _ONE) | (first == _TWO)
+    errors[rows[~hasClef]] = 'missing_clef'
+    
+    # Clef hyphenation ^[12]-?[^-]
+    isNonHyphen = lambda char: (char != _HYPHEN) & (char != _SEPARATOR)
+    invalidHyphenation = hasClef & (isNonHyphen(second) 
+        | ((second == _HYPHEN) & isNonHyphen(third)))
+    errors[rows[invalidHyphenation]] = 'clef_hyphenation'
+
+    # Mixed hyphenation: the chant starts with 1-- (2 hyphens), but still
+    # contains word boundaries [^-]---[^-]; otherwise the chant uses the 
+    # alternative hyphenation with 2 hyphens between words and 1 between 
+    # syllables
+    isValid = hasClef & ~invalidHyphenation
+    standard = (second == _HYPHEN) & (third == _HYPHEN) & (fourth == _HYPHEN)
+    runs = _hyphenRuns(data)
+    starts, ends, before, after = runs
+    wordBoundaries = ((ends - starts == 3) & (before != _SEPARATOR) 
+        & (after != _SEPARATOR))
+    hasWordBoundaries = _rowsOf(starts[wordBoundaries], offsets, len(rows))
+    mixed = isValid & ~standard & hasWordBoundaries
+    alternative = isValid & ~standard & ~hasWordBoundaries
+    if strict:
+        errors[rows[mixed]] = 'mixed_hyphenation'
+        errors[rows[alternative]] = 'no_word_boundaries'
+        isValid &= standard
+    else:
+        volpianos = volpianos.copy()
+        volpianos[mixed] = [vol[0] + '---' + vol[3:] 
+            for vol in volpianos[mixed]]
+        volpianos[alternative] = [vol.replace('--', '$$$')
+                                     .replace('-', '--')
+                                     .replace('$$$', '---')
+                                  for vol in volpianos[alternative]]
+
+    corrected[rows[isValid]] = volpianos[isValid]
+    suspect = isValid & (_suspects(data, offsets, runs) | ~standard)
+    for i in np.flatnonzero(suspect):
+        volpiano, error = _correct(volpianos[i], standard[i], strict)
+        corrected[rows[i]] = volpiano
+        errors[rows[i]] = error
+    return corrected, errors
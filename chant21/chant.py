@@ -10,6 +10,7 @@
 # ------------------------------------------------------------------------------
 from copy import deepcopy
 import json
+import weakref
 
 from music21 import base
 from music21 import articulations
@@ -22,6 +23,7 @@ from music21 import spanner
 from music21 import expressions
 from music21 import metadata
 from music21 import pitch
+from music21.editorial import Editorial
 
 from .html import toFile
 from .html import toWidget
@@ -50,6 +52,13 @@ def pitchToVolpiano(pitch, liquescence=False):
     else:
         return volpianoNotes[index]
 
+# Keys of the exports cached by Chant21Object.toObject and chant21.diff
+_EXPORT_CACHE_KEYS = ('chant21.toObject', 'chant21.subtreeHashes')
+
+# All objects that (may) have cached exports, by id. Cached exports only need
+# to be cleared while there are any, e.g. not when converting chants.
+_EXPORT_CACHES = weakref.WeakValueDictionary()
+
 class Chant21Object:
     """Base class for objects in Chant21. Most importantly, all those object can
     be exported to simple Python objects (dictionaries and lists), which in turn
@@ -72,23 +81,138 @@ class Chant21Object:
     def _reprInternal(self) -> str:
         return ''
 
+    def __reduce_ex__(self, protocol):
+        """Pickle chant21 objects using a compact encoding of the hierarchy 
+        (see :func:`encodeHierarchy`), rather than music21's generic pickling
+        of streams. This makes transferring chants between processes much 
+        faster. Objects that contain elements that cannot be encoded, such as
+        slurs, are pickled in the usual way.
+
+        Streams that have been prepared for pickling by music21's 
+        StreamFreezer (e.g. when caching parsed files) are also pickled in the
+        usual way: the freezer moves their elements to 
+        ``_storedElementOffsetTuples``, which the encoding does not include."""
+        if self.isStream and hasattr(self, '_storedElementOffsetTuples'):
+            return super().__reduce_ex__(protocol)
+        try:
+            encoding = encodeHierarchy(self)
+        except UnencodableError:
+            return super().__reduce_ex__(protocol)
+        return (decodeHierarchy, (encoding, type(self)))
+
+    def __copy__(self):
+        # Shallow copies (used by music21, e.g. in Stream.flat) should not 
+        # use the compact encoding, so reconstruct the default copy
+        newObject, args, state = object.__reduce_ex__(self, 4)[:3]
+        copied = newObject(*args)
+        if state:
+            copied.__setstate__(state)
+        # The copy should not share the cached data of the original
+        if '_cache' in copied.__dict__:
+            copied._cache = {}
+        return copied
+
+    def childrenByClass(self, cls) -> tuple:
+        """Return the child elements of a given class, in order. Unlike
+        ``getElementsByClass``, the result is cached: the children are
+        only looked up again after the elements of the stream have changed
+        (music21 then calls ``coreElementsChanged``, which clears the cache).
+
+        Parameters
+        ----------
+        cls : type
+            The class of the children
+
+        Returns
+        -------
+        tuple
+            The children
+        """
+        key = ('chant21.childrenByClass', cls)
+        children = self._cache.get(key)
+        if children is None:
+            children = tuple(el for el in self.elements if isinstance(el, cls))
+            self._cache[key] = children
+        return children
+
+    @property
+    def flatNotes(self) -> tuple:
+        """tuple: All notes in the stream and its substreams, in order. This 
+        corresponds to ``stream.flat.notes``, but does not create a flat 
+        stream and is cached until the stream (or one of its substreams) 
+        changes."""
+        notes = self._cache.get('chant21.flatNotes')
+        if notes is None:
+            notes = []
+            for el in self.elements:
+                if isinstance(el, note.NotRest):
+                    notes.append(el)
+                elif isinstance(el, Chant21Object) and el.isStream:
+                    notes.extend(el.flatNotes)
+                elif el.isStream:
+                    notes.extend(el.flat.notes)
+            notes = tuple(notes)
+            self._cache['chant21.flatNotes'] = notes
+        return notes
+
+    def _cachedExport(self, key, export):
+        """Return the cached result of ``export()``, or export and cache it.
+        Changes to the elements of streams clear the cache, but many other
+        changes are not tracked by music21 (e.g. changing the step of a 
+        pitch). The cached result is therefore only reused while the 
+        fingerprint of the object (see :func:`_exportFingerprint`) is 
+        unchanged."""
+        fingerprint = _exportFingerprint(self)
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+        result = export()
+        # Exporting may add information, such as the chant21 version
+        self._cache[key] = (_exportFingerprint(self), result)
+        _EXPORT_CACHES[id(self)] = self
+        return result
+
+    def _clearCachedExports(self):
+        """Remove the cached exports (see :meth:`toObject`) of the object and
+        of all streams that contain it. Changes to the elements of streams
+        clear all cached data, but this is needed after changes that music21
+        does not track, such as changes to lyrics or editorial information."""
+        if len(_EXPORT_CACHES) == 0:
+            return
+        visited = set()
+        todo = [self]
+        while todo:
+            obj = todo.pop()
+            if id(obj) in visited:
+                continue
+            visited.add(id(obj))
+            cache = obj._cache
+            if cache:
+                for key in [key for key in cache if type(key) is tuple 
+                            and key[0] in _EXPORT_CACHE_KEYS]:
+                    del cache[key]
+            todo.extend(obj.sites.get(excludeNone=True))
+
     @property
     def annotation(self):
-        return self.editorial.get('annotation')
+        # Do not create empty editorial information as a side effect
+        return _getAnnotation(self)
     
     @annotation.setter
     def annotation(self, value):
         self.editorial.annotation = value
+        self._clearCachedExports()
 
     @property
     def hasAnnotation(self):
         """True if the element has a non-empty annotation"""
         return self.annotation is not None
 
-    def toObject(self, includeChildren : bool = True, 
-        includeEditorial : bool = True, includeVolpiano : bool = False) -> dict:
+    def toObject(self, includeChildren : bool = True,
+        includeEditorial : bool = True, includeVolpiano : bool = False,
+        omitEmptyEditorial : bool = False, cached : bool = False) -> dict:
         """Export the object to a plain Python dictionary. The returned object
-        can have the following properties: 
+        can have the following properties:
 
         - ``type``: the name of the chant21 class, such as `'note'`
         - ``elements``: a list of dictionaries representing child elements
@@ -121,6 +245,20 @@ class Chant21Object:
         includeVolpiano : bool, optional
             Wether to include a Volpiano representation, by default False.
             The Volpiano version is exported as ``obj['volpiano']``.
+        omitEmptyEditorial : bool, optional
+            Whether to leave out empty ``editorial`` dictionaries, by default
+            False. Empty dictionaries appear whenever the editorial information
+            of an object has been accessed without being set.
+        cached : bool, optional
+            Whether to reuse the object exported by an earlier call with the
+            same options, by default False. The object is cached until the 
+            object or one of its descendants changes, and is shared between
+            calls: it should not be modified. :meth:`Chant.toHTML` uses 
+            cached objects. Adding or removing elements clears the cache; 
+            other changes, such as changes to pitches, lyrics or editorial
+            information, are detected by comparing a fingerprint of the 
+            object and its descendants, which is much cheaper than exporting 
+            the object again.
 
         Returns
         -------
@@ -128,31 +266,17 @@ class Chant21Object:
             A dictionary with at least a field ``type``, but possibly also
             ``editorial``, ``annotation``, ``volpiano`` and ``elements``.
         """
-        obj = dict()
-        obj['type'] = type(self).__name__.lower()
-
-        if includeEditorial and self.hasEditorialInformation:
-            obj['editorial'] = dict(self.editorial)
-            # Remove annotation from editorial info, since that's already 
-            # stored as the objects `annotation` property
-            if 'annotation' in obj['editorial']:
-                del obj['editorial']['annotation']
-                if len(obj['editorial']) == 0:
-                    del obj['editorial']
-            
-        if includeVolpiano and hasattr(self, 'volpiano'):
-            obj['volpiano'] = self.volpiano
-
-        if hasattr(self, 'annotation') and self.hasAnnotation:
-            obj['annotation'] = self.annotation
-
-        if includeChildren and hasattr(self, 'elements'):
-            children = [el for el in self.elements if isinstance(el, Chant21Object)]
-            kwargs = dict(includeEditorial=includeEditorial, 
-                          includeVolpiano=includeVolpiano)
-            obj['elements'] = [child.toObject(**kwargs) for child in children]
-
-        return obj
+        if not cached:
+            return serializeObject(self, includeChildren=includeChildren,
+                includeEditorial=includeEditorial, 
+                includeVolpiano=includeVolpiano,
+                omitEmptyEditorial=omitEmptyEditorial)
+        key = ('chant21.toObject', includeChildren, includeEditorial, 
+            includeVolpiano, omitEmptyEditorial)
+        return self._cachedExport(key, lambda: serializeObject(self, 
+            includeChildren=includeChildren, includeEditorial=includeEditorial,
+            includeVolpiano=includeVolpiano, 
+            omitEmptyEditorial=omitEmptyEditorial))
 
     def fromObject(self, obj : dict, parent=None, parseChildren=True):
         """Set the properties of the current class instance using a dictionary
@@ -232,36 +356,50 @@ class Chant(Chant21Object, stream.Part):
         else:
             return super().show(*args, **kwargs)
     
-    def toObject(self, **kwargs):
-        """Export the object to a simple dictionary. See 
-        :meth:`chant21.chant.Chant21Object.toObject`"""
-        metadata = self.editorial.get('metadata', {})
-        metadata['chant21version'] = __version__
-        obj = {
-            'type': 'chant',
-            'metadata': metadata,
-            'elements': [section.toObject(**kwargs) for section in self.sections]
-        }
-        if self.editorial:
-            obj['editorial'] = { k: v for k, v in self.editorial.items() 
-                if k != 'metadata'}
-        return obj
-
     def fromObject(self, obj, **kwargs):
         """Set properties from a dictionary. 
         See :meth:`chant21.chant.Chant21Object.toObject`"""
         super().fromObject(obj, **kwargs)
         metadata = obj.get('metadata', {})
         self.editorial.metadata = metadata
+        self._clearCachedExports()
     
-    def toCHSON(self, fp=None, includeEditorial=True, **jsonKwargs):
-        toObjectKwargs = dict(includeEditorial=includeEditorial)
+    def toCHSON(self, fp=None, includeEditorial=True, omitEmptyEditorial=False,
+        **jsonKwargs):
+        toObjectKwargs = dict(includeEditorial=includeEditorial,
+                              omitEmptyEditorial=omitEmptyEditorial)
         if fp is None:
             return json.dumps(self.toObject(**toObjectKwargs), **jsonKwargs)
         else:
             with open(fp, 'w') as handle:
                 json.dump(self.toObject(**toObjectKwargs), handle, **jsonKwargs)
     
+    def toCHBIN(self, fp=None, includeEditorial=True, omitEmptyEditorial=False):
+        """Export the chant in the compact binary CHBIN format; see 
+        :mod:`chant21.chbin`. Returns the data if no filename is passed."""
+        from .chbin import encodeCHBIN
+        data = encodeCHBIN(self.toObject(includeEditorial=includeEditorial,
+            omitEmptyEditorial=omitEmptyEditorial))
+        if fp is None:
+            return data
+        else:
+            with open(fp, 'wb') as handle:
+                handle.write(data)
+
+    def toMusicXML(self, fp=None, **kwargs):
+        """Export the chant to MusicXML, without going through music21's 
+        exporter; see :mod:`chant21.musicxml`. Returns the MusicXML if no 
+        filename is passed."""
+        from .musicxml import toMusicXML
+        return toMusicXML(self, fp=fp, **kwargs)
+
+    def toMIDI(self, fp=None, **kwargs):
+        """Render the chant to MIDI, with configurable durations of 
+        liquescents, neume ends and pausas; see :mod:`chant21.midi`. Returns
+        the data if no filename is passed."""
+        from .midi import toMIDI
+        return toMIDI(self, fp=fp, **kwargs)
+
     def toHTML(self, filepath=None, chantOnly=True, **kwargs):
         """Export the chant to HTML and render the music in the Volpiano 
         typeface. There are two ways of exporting the chant: either a complete
@@ -285,7 +423,11 @@ class Chant(Chant21Object, stream.Part):
         Returns
         -------
         str or none
-            A html string if the html is not written to a file.
+            A html string if the html is not written to a file. The serialized
+            chant is cached until the chant changes, so that repeatedly 
+            showing a chant is fast (see the option ``cached`` of 
+            :meth:`toObject`). The html itself is rendered on every call, as
+            every widget needs a unique id.
         """
         if filepath is not None or not chantOnly:
             return toFile(self, filepath=filepath, **kwargs)
@@ -467,13 +609,19 @@ class Chant(Chant21Object, stream.Part):
             #TODO add custom metadata fields: office part and mode
 
     def joinTextAcrossPausas(self):
-        for section in self.sections:
+        for section in self.childrenByClass(Section):
             section.joinWordsAcrossPausas()
 
     # def addCantusText(self, text):
     #     visitor = VisitorCantusText(chant=self)
     #     visitParseTree(text, visitor)
 
+SECTION_NAMES = {
+    'V': 'verse',
+    'R': 'respond',
+    'A': 'antiphon'
+}
+
 class Section(Chant21Object, stream.Stream):
     _name = None
 
@@ -481,14 +629,10 @@ class Section(Chant21Object, stream.Stream):
     def name(self):
         if self._name is not None:
             return self._name
-        elif len(self.words) > 0 and self.words[0].hasAnnotation:
-            annotation = self.words[0][0].annotation
-            if annotation == 'V':
-                return 'verse'
-            elif annotation == 'R':
-                return 'respond'
-            elif annotation == 'A':
-                return 'antiphon'
+        words = self.childrenByClass(Word)
+        if len(words) > 0 and words[0].hasAnnotation:
+            annotation = words[0][0].annotation
+            return SECTION_NAMES.get(annotation)
         return None
     
     @name.setter
@@ -501,11 +645,11 @@ class Section(Chant21Object, stream.Stream):
     
     def joinWordsAcrossPausas(self, joinSyllablesAcrossPausas=True):
         """Merge words containing pausas"""
-        if len(self.words) == 1: return
+        if len(self.childrenByClass(Word)) == 1: return
         joinWords = False
         i = 1
-        while i < len(self.words):
-            prevWord, curWord = self.words[i-1:i+1]
+        while i < len(self.childrenByClass(Word)):
+            prevWord, curWord = self.childrenByClass(Word)[i-1:i+1]
             curWordIsBreathMark = isinstance(curWord.flat[0], articulations.BreathMark)
             curWordIsBarline = isinstance(curWord.flat[0], bar.Barline)
             
@@ -522,16 +666,10 @@ class Section(Chant21Object, stream.Stream):
         
         # Update syllables
         if joinSyllablesAcrossPausas:
-            for word in self.words:
+            for word in self.childrenByClass(Word):
                 word.joinSyllablesAcrossPausas()
                 word.updateSyllableLyrics()
 
-    def toObject(self, **kwargs):
-        obj = super().toObject(**kwargs)
-        if self.name is not None:
-            obj['name'] = self.name
-        return obj
-
 class Word(Chant21Object, stream.Stream):
 
     musicAndTextAligned = None
@@ -543,33 +681,35 @@ class Word(Chant21Object, stream.Stream):
     @property
     def flatLyrics(self):
         try:
-            return ''.join(syll.lyric for syll in self.syllables)
+            return ''.join(syll.lyric for syll in self.childrenByClass(Syllable))
         except:
             return None
  
     @property
     def hasLyrics(self):
-        if len(self.syllables) > 0:
-            return self.syllables[0].hasLyrics
+        syllables = self.childrenByClass(Syllable)
+        if len(syllables) > 0:
+            return syllables[0].hasLyrics
         else:
             return False
 
     @property
     def hasAnnotation(self):
-        if len(self.syllables) > 0:
-            return self.syllables[0].hasAnnotation
+        syllables = self.childrenByClass(Syllable)
+        if len(syllables) > 0:
+            return syllables[0].hasAnnotation
         else:
             return False
 
     def joinSyllablesAcrossPausas(self):
         """Merge syllables if they are separated by a syllable containing only a pausa.
         This is often the case on long melismas."""
-        if len(self.syllables) == 1: return
-        numSylls = len(self.syllables)
+        if len(self.childrenByClass(Syllable)) == 1: return
+        numSylls = len(self.childrenByClass(Syllable))
         joinSyllables = False
         i = 1
-        while i < len(self.syllables):
-            prevSyll, curSyll = self.syllables[i-1:i+1]
+        while i < len(self.childrenByClass(Syllable)):
+            prevSyll, curSyll = self.childrenByClass(Syllable)[i-1:i+1]
             curSyllIsBreathMark = isinstance(curSyll.flat[0], articulations.BreathMark)
             if prevSyll.hasLyrics and not curSyll.hasLyrics and curSyllIsBreathMark:
                 joinSyllables = True
@@ -594,15 +734,11 @@ class Word(Chant21Object, stream.Stream):
                 syll.syllabic = 'middle'
             nonEmptyLyrics[0].syllabic = 'begin'
             nonEmptyLyrics[-1].syllabic = 'end'
+        self._clearCachedExports()
 
         # TODO long melisma's on a single-syllable word,
         # are those dealt with properly?
 
-    def toObject(self, **kwargs):
-        obj = super().toObject(**kwargs)
-        obj['musicAndTextAligned'] = self.musicAndTextAligned
-        return obj
-    
     def fromObject(self, obj, **kwargs):
         super().fromObject(obj, **kwargs)
         self.updateSyllableLyrics()
@@ -615,7 +751,7 @@ class Syllable(Chant21Object, stream.Stream):
 
     @property
     def lyric(self):
-        notes = self.flat.notes
+        notes = self.flatNotes
         if len(notes) > 0:
             return notes[0].lyric
         else:
@@ -623,7 +759,7 @@ class Syllable(Chant21Object, stream.Stream):
     
     @lyric.setter
     def lyric(self, value):
-        notes = self.flat.notes
+        notes = self.flatNotes
         if len(notes) > 0:
             if type(value) is str:
                 l = note.Lyric(text=value, applyRaw=True)
@@ -632,6 +768,7 @@ class Syllable(Chant21Object, stream.Stream):
                 notes[0].lyrics = [value]
         else:
             self.editorial.lyric = value
+        self._clearCachedExports()
 
     @property
     def hasLyrics(self):
@@ -641,12 +778,6 @@ class Syllable(Chant21Object, stream.Stream):
     def neumes(self):
         return self.getElementsByClass(Neume)
 
-    def toObject(self, **kwargs):
-        obj = super().toObject(**kwargs)
-        if self.lyric is not None:
-            obj['lyric'] = self.lyric
-        return obj
-    
     def fromObject(self, obj, **kwargs):
         super().fromObject(obj, **kwargs)
         if 'lyric' in obj:
@@ -664,22 +795,217 @@ class Neume(Chant21Object, stream.Stream):
             slur.priority = -1
             self.insert(0, slur)
     
+LIQUESCENT_NEUME_SHAPES = ('~', '<', '>')
+"""tuple: The characters in gabc neume shapes (e.g. ``~`` or ``o<``) that
+mark liquescent notes."""
+
+class NoteInfo:
+    """Compact, immutable storage for the editorial information that the
+    converters attach to every note: the gabc or volpiano position, gabc 
+    prefixes and suffixes, and whether the note is liquescent. Instances are
+    interned, so all notes with the same information share a single object:
+
+    >>> info = NoteInfo.intern(gabcPosition='f')
+    >>> info is NoteInfo.intern(gabcPosition='f')
+    True
+    >>> info.replace(gabcSuffixes=(('rhythmicSign', '.'),)).toDict()
+    {'gabcPosition': 'f', 'gabcSuffixes': [{'rhythmicSign': '.'}]}
+
+    Suffixes are stored as a tuple of ``(kind, value)`` pairs, but exported
+    as a list of dictionaries, the format used in the editorial information.
+    Missing fields are ``None`` (or ``False``, or an empty tuple).
+    """
+    __slots__ = FIELDS = ('gabcPosition', 'gabcPrefix', 'gabcSuffixes', 
+        'liquescence', 'volpianoPosition')
+    _cache = {}
+
+    def __init__(self, gabcPosition, gabcPrefix, gabcSuffixes, liquescence, 
+        volpianoPosition):
+        object.__setattr__(self, 'gabcPosition', gabcPosition)
+        object.__setattr__(self, 'gabcPrefix', gabcPrefix)
+        object.__setattr__(self, 'gabcSuffixes', gabcSuffixes)
+        object.__setattr__(self, 'liquescence', liquescence)
+        object.__setattr__(self, 'volpianoPosition', volpianoPosition)
+
+    @classmethod
+    def intern(cls, gabcPosition=None, gabcPrefix=None, gabcSuffixes=(), 
+        liquescence=False, volpianoPosition=None):
+        """Return the (shared) instance with the given fields"""
+        key = (gabcPosition, gabcPrefix, gabcSuffixes, liquescence, 
+            volpianoPosition)
+        info = cls._cache.get(key)
+        if info is None:
+            info = cls._cache[key] = cls(*key)
+        return info
+
+    def replace(self, **fields):
+        """Return the instance with some of the fields replaced"""
+        values = {field: getattr(self, field) for field in self.FIELDS}
+        values.update(fields)
+        return self.intern(**values)
+
+    @classmethod
+    def canStore(cls, editorial) -> bool:
+        """Whether the editorial information only contains fields that can be
+        stored in a :class:`NoteInfo`, without loss of information"""
+        for key, value in editorial.items():
+            if key == 'liquescence':
+                if value is not True: 
+                    return False
+            elif key == 'gabcSuffixes':
+                if not isinstance(value, list) or len(value) == 0: 
+                    return False
+                for suffix in value:
+                    if not isinstance(suffix, dict) or len(suffix) != 1:
+                        return False
+                    if not all(isinstance(v, str) for v in suffix.values()):
+                        return False
+            elif key not in cls.FIELDS or not isinstance(value, str):
+                return False
+        return True
+
+    @classmethod
+    def fromEditorial(cls, editorial):
+        """Return the information for the fields in an editorial dictionary;
+        other entries are ignored"""
+        suffixes = tuple(item for suffix in editorial.get('gabcSuffixes', [])
+            for item in suffix.items())
+        return cls.intern(
+            gabcPosition=editorial.get('gabcPosition'),
+            gabcPrefix=editorial.get('gabcPrefix'),
+            gabcSuffixes=suffixes,
+            liquescence=editorial.get('liquescence', False),
+            volpianoPosition=editorial.get('volpianoPosition'))
+
+    def toDict(self) -> dict:
+        """Return the information as an editorial dictionary, in which empty
+        fields are omitted. The keys are ordered as the converters used to 
+        set them, so that exported chants do not change: the position, the
+        gabc suffixes and prefix, and liquescence last. The gabc converter
+        applied suffixes before prefixes, so liquescence precedes the prefix
+        if it is due to the neume shape ``w``."""
+        editorial = {}
+        if self.gabcPosition is not None:
+            editorial['gabcPosition'] = self.gabcPosition
+        if self.gabcSuffixes:
+            editorial['gabcSuffixes'] = [{kind: value} 
+                for kind, value in self.gabcSuffixes]
+            if self.liquescence and ('neumeShape', 'w') in self.gabcSuffixes:
+                editorial['liquescence'] = True
+        if self.gabcPrefix is not None:
+            editorial['gabcPrefix'] = self.gabcPrefix
+        if self.volpianoPosition is not None:
+            editorial['volpianoPosition'] = self.volpianoPosition
+        if self.liquescence:
+            editorial['liquescence'] = True
+        return editorial
+
+    @property
+    def isLiquescent(self) -> bool:
+        """bool: Whether the note is liquescent: either ``liquescence`` is 
+        set, or the note has a liquescent gabc neume shape (see 
+        :data:`LIQUESCENT_NEUME_SHAPES`)"""
+        if self.liquescence:
+            return True
+        for kind, value in self.gabcSuffixes:
+            if kind == 'neumeShape' and any(shape in value 
+                for shape in LIQUESCENT_NEUME_SHAPES):
+                return True
+        return False
+
+    def __setattr__(self, name, value):
+        raise AttributeError('NoteInfo objects are immutable')
+
+    def __repr__(self):
+        return f'<chant21.chant.NoteInfo {self.toDict()}>'
+
+    def __reduce__(self):
+        return (NoteInfo.intern, tuple(getattr(self, f) for f in self.FIELDS))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+EMPTY_NOTE_INFO = NoteInfo.intern()
+
 class Note(Chant21Object, note.Note):
+    """A chant note. The editorial information set by the converters is 
+    stored compactly in :attr:`noteInfo`, and only turned into a
+    :class:`music21.editorial.Editorial` object when :attr:`editorial` is
+    accessed. After that, the editorial object holds all information.
+
+    >>> n = Note()
+    >>> n.noteInfo = NoteInfo.intern(gabcPosition='f', liquescence=True)
+    >>> n.hasEditorialInformation
+    True
+    >>> n.editorial.gabcPosition
+    'f'
+    """
     def __init__(self, *args, **kwargs):
         super().__init__(*args, *kwargs)
         self.stemDirection = 'noStem'
+        self._noteInfo = EMPTY_NOTE_INFO
 
     def _reprInternal(self):
         return self.name
-    
-    def toObject(self, **kwargs):
-        obj = super().toObject(**kwargs)
-        obj['pitch'] = self.pitch.nameWithOctave
-        if self.notehead != 'normal':
-            obj['notehead'] = self.notehead
-        return obj
 
+    @property
+    def noteInfo(self) -> NoteInfo:
+        """The editorial information of the note as a :class:`NoteInfo`"""
+        if self._editorial is not None:
+            return NoteInfo.fromEditorial(self._editorial)
+        return self._noteInfo
+
+    @noteInfo.setter
+    def noteInfo(self, info: NoteInfo):
+        if self._editorial is not None:
+            for field in NoteInfo.FIELDS:
+                self._editorial.pop(field, None)
+            self._editorial.update(info.toDict())
+        else:
+            self._noteInfo = info
+        self._clearCachedExports()
+
+    @property
+    def editorial(self) -> Editorial:
+        if self._editorial is None:
+            self._editorial = Editorial(self._noteInfo.toDict())
+            self._noteInfo = EMPTY_NOTE_INFO
+        return self._editorial
+
+    @editorial.setter
+    def editorial(self, editorial: Editorial):
+        self._editorial = editorial
+        self._noteInfo = EMPTY_NOTE_INFO
+        self._clearCachedExports()
+
+    def pitchChanged(self):
+        # Called by music21 whenever the pitch changes
+        super().pitchChanged()
+        self._clearCachedExports()
+
+    @property
+    def hasEditorialInformation(self) -> bool:
+        return (self._editorial is not None 
+            or self._noteInfo is not EMPTY_NOTE_INFO)
+
+    def _peekEditorial(self):
+        """Return the editorial information without creating an editorial
+        object, or None if there is none"""
+        if self._editorial is not None:
+            return self._editorial
+        elif self._noteInfo is not EMPTY_NOTE_INFO:
+            return self._noteInfo.toDict()
+        return None
+    
     def fromObject(self, obj, **kwargs):
+        editorial = obj.get('editorial')
+        if editorial and NoteInfo.canStore(editorial):
+            self.noteInfo = NoteInfo.fromEditorial(editorial)
+            obj = {key: value for key, value in obj.items() 
+                if key != 'editorial'}
         super().fromObject(obj, **kwargs)
         self.pitch.nameWithOctave = obj['pitch']
         if 'notehead' in obj:
@@ -689,7 +1015,7 @@ class Note(Chant21Object, note.Note):
     def volpiano(self):
         """A volpiano representation of the note"""
         return pitchToVolpiano(self.pitch, 
-            liquescence=self.editorial.get('liquescence', False))
+            liquescence=self.noteInfo.liquescence)
 
 ###
 
@@ -747,11 +1073,6 @@ class Alteration(Chant21Object, base.Music21Object):
         super().__init__(**kwargs)
         self.priority = -1
 
-    def toObject(self, **kwargs):
-        obj = super().toObject(**kwargs)
-        obj['pitch'] = self.pitch.nameWithOctave
-        return obj
-
     def fromObject(self, obj, **kwargs):
         super().fromObject(obj, **kwargs)
         self.pitch = pitch.Pitch(obj['pitch'])
@@ -840,5 +1161,452 @@ CLASSES = {
     'annotation': Annotation,
     'alteration': Alteration,
     'flat': Flat,
-    'natural': Natural
+    'natural': Natural,
+    'linebreak': LineBreak,
+    'pagebreak': PageBreak,
+    'columnbreak': ColumnBreak,
+    'missingpitches': MissingPitches
 }
+
+def appendElements(container, elements):
+    """Append a list of elements to a stream in a single bulk operation. The
+    elements are inserted directly after each other, as with 
+    ``Stream.append``, but the offsets are computed in one pass and the 
+    caches of the stream are only cleared once. The elements should not be
+    part of the stream already.
+
+    >>> neume = Neume()
+    >>> appendElements(neume, [Note('F4'), Note('G4')])
+    >>> neume.show('text')
+    {0.0} <chant21.chant.Note F>
+    {1.0} <chant21.chant.Note G>
+
+    Parameters
+    ----------
+    container : music21.stream.Stream
+        The stream
+    elements : list
+        The elements to append
+    """
+    if container._elements:
+        offset = container.highestTime
+        lastElement = container._elements[-1]
+    else:
+        offset = 0.0
+        lastElement = None
+    isSorted = container.isSorted
+    for element in elements:
+        container.coreInsert(offset, element, ignoreSort=True)
+        # As in Stream.append, elements following an element without 
+        # duration can require sorting
+        if lastElement is not None and not lastElement.duration.quarterLength:
+            if (element.priority < lastElement.priority
+                or element.classSortOrder < lastElement.classSortOrder):
+                isSorted = False
+        offset += element.duration.quarterLength
+        lastElement = element
+    container.coreElementsChanged()
+    container.isSorted = isSorted
+
+### Serialization
+
+class _ObjectSpec:
+    """The serialization schema of a chant21 class, resolved once per class by
+    :func:`_getObjectSpec`. The ``kind`` determines which class-specific
+    fields are exported: see :func:`serializeObject`."""
+    __slots__ = ('type', 'kind', 'isCustom', 'isContainer', 'volpiano')
+
+    def __init__(self, type, kind, isCustom, isContainer, volpiano):
+        self.type = type
+        self.kind = kind
+        self.isCustom = isCustom
+        self.isContainer = isContainer
+        self.volpiano = volpiano
+
+_OBJECT_SPECS = {}
+
+def _getObjectSpec(cls) -> _ObjectSpec:
+    """Resolve (and cache) the serialization schema of a chant21 class"""
+    spec = _OBJECT_SPECS.get(cls)
+    if spec is not None:
+        return spec
+
+    if issubclass(cls, Chant):
+        kind = 'chant'
+    elif issubclass(cls, Section):
+        kind = 'section'
+    elif issubclass(cls, Word):
+        kind = 'word'
+    elif issubclass(cls, Syllable):
+        kind = 'syllable'
+    elif issubclass(cls, Note):
+        kind = 'note'
+    elif issubclass(cls, Alteration):
+        kind = 'alteration'
+    else:
+        kind = 'object'
+
+    # Volpiano is either a constant class attribute, computed directly from 
+    # the pitch (notes), or an arbitrary property that may fail (alterations)
+    volpiano = getattr(cls, 'volpiano', None)
+    if kind == 'note' and cls.volpiano is Note.volpiano:
+        volpianoMode = 'note'
+    elif isinstance(volpiano, str):
+        volpianoMode = 'constant'
+    elif volpiano is not None:
+        volpianoMode = 'property'
+    else:
+        volpianoMode = None
+
+    # Subclasses that override toObject are exported by calling it
+    isCustom = cls.toObject is not Chant21Object.toObject
+    objectType = getattr(cls, '_objectType', None) or cls.__name__.lower()
+    spec = _ObjectSpec(type=objectType, kind=kind, isCustom=isCustom,
+        isContainer=hasattr(cls, 'elements'), volpiano=volpianoMode)
+    _OBJECT_SPECS[cls] = spec
+    return spec
+
+def _getEditorial(element):
+    """Return the editorial information of an element without creating an 
+    empty :class:`music21.editorial.Editorial` object as a side effect"""
+    if isinstance(element, Note):
+        return element._peekEditorial()
+    return element.editorial if element.hasEditorialInformation else None
+
+def _getAnnotation(element):
+    editorial = _getEditorial(element)
+    return editorial.get('annotation') if editorial is not None else None
+
+def _firstElementByClass(container, cls):
+    for el in container.elements:
+        if isinstance(el, cls):
+            return el
+    return None
+
+def _firstNote(container):
+    """Return the first note in a stream (in the order of ``stream.flat``)"""
+    for el in container.elements:
+        if isinstance(el, note.NotRest):
+            return el
+        elif el.isStream:
+            n = _firstNote(el)
+            if n is not None:
+                return n
+    return None
+
+def _exportFingerprint(element) -> tuple:
+    """Return a fingerprint of the exported state of an element and its
+    descendants that music21 does not track: editorial information, pitches, 
+    lyrics and noteheads of notes, and class-specific fields. Cached exports
+    are only reused while the fingerprint is unchanged 
+    (see :meth:`Chant21Object._cachedExport`). Structural changes are not
+    included, as they clear the cache."""
+    state = []
+    append = state.append
+    todo = [element]
+    while todo:
+        el = todo.pop()
+        editorial = getattr(el, '_editorial', None)
+        append(repr(editorial) if editorial else None)
+        if isinstance(el, note.NotRest):
+            p = el.pitch
+            accidental = p.accidental
+            append((p.step, p.octave, 
+                accidental.name if accidental is not None else None,
+                getattr(el, '_noteInfo', None), el.notehead, el.noteheadFill,
+                tuple((lyric.rawText, lyric.syllabic) for lyric in el.lyrics)))
+        elif el.isStream:
+            if isinstance(el, Section):
+                append(el._name)
+            elif isinstance(el, Word):
+                append(el.musicAndTextAligned)
+            todo.extend(el._elements)
+        elif isinstance(el, Alteration):
+            append(el.pitch.nameWithOctave if el.pitch is not None else None)
+        elif isinstance(el, Annotation):
+            append(el.content)
+    return tuple(state)
+
+def serializeObject(element, includeChildren : bool = True, 
+    includeEditorial : bool = True, includeVolpiano : bool = False,
+    omitEmptyEditorial : bool = False) -> dict:
+    """Export a chant21 object to a plain Python dictionary. This implements
+    :meth:`Chant21Object.toObject`; see there for details.
+
+    The chant is traversed iteratively rather than recursively, and which 
+    fields are exported is determined once per class (see 
+    :func:`_getObjectSpec`). Unlike accessing properties such as 
+    :attr:`Chant21Object.annotation`, serialization never creates empty 
+    editorial objects, so that repeated exports are identical.
+    """
+    root = None
+    stack = [(element, None, False)]
+    while stack:
+        el, siblings, forceEditorial = stack.pop()
+        spec = _OBJECT_SPECS.get(type(el)) or _getObjectSpec(type(el))
+        kind = spec.kind
+
+        if spec.isCustom and el is not element:
+            obj = el.toObject(includeChildren=includeChildren, 
+                includeEditorial=includeEditorial, 
+                includeVolpiano=includeVolpiano,
+                omitEmptyEditorial=omitEmptyEditorial)
+            siblings.append(obj)
+            continue
+        
+        if kind == 'chant':
+            metadata = el.editorial.get('metadata', {})
+            metadata['chant21version'] = __version__
+            children = [c for c in el.elements if isinstance(c, Section)]
+            obj = {'type': 'chant', 'metadata': metadata, 'elements': []}
+            if el.editorial:
+                chantEditorial = {k: v for k, v in el.editorial.items() 
+                    if k != 'metadata'}
+                if chantEditorial or not omitEmptyEditorial:
+                    obj['editorial'] = chantEditorial
+        else:
+            obj = {'type': spec.type}
+            editorial = _getEditorial(el)
+            if editorial is None and forceEditorial:
+                editorial = {}
+            if includeEditorial and editorial is not None:
+                # Annotations are exported separately
+                if 'annotation' in editorial:
+                    objEditorial = {k: v for k, v in editorial.items() 
+                        if k != 'annotation'}
+                    if objEditorial:
+                        obj['editorial'] = objEditorial
+                elif editorial or not omitEmptyEditorial:
+                    obj['editorial'] = dict(editorial)
+
+            if includeVolpiano and spec.volpiano is not None:
+                if spec.volpiano == 'note':
+                    liquescence = (editorial.get('liquescence', False)
+                        if editorial is not None else False)
+                    obj['volpiano'] = pitchToVolpiano(el.pitch, 
+                        liquescence=liquescence)
+                elif spec.volpiano == 'constant':
+                    obj['volpiano'] = el.volpiano
+                else:
+                    try:
+                        obj['volpiano'] = el.volpiano
+                    except AttributeError:
+                        pass
+
+            # Words are annotated if their first syllable is, but export
+            # their own annotation
+            annotation = editorial.get('annotation') if editorial is not None else None
+            if kind == 'word':
+                firstSyllable = _firstElementByClass(el, Syllable)
+                if (firstSyllable is not None 
+                    and _getAnnotation(firstSyllable) is not None):
+                    obj['annotation'] = annotation
+            elif annotation is not None:
+                obj['annotation'] = annotation
+
+            if includeChildren and spec.isContainer:
+                children = [c for c in el.elements if isinstance(c, Chant21Object)]
+                obj['elements'] = []
+            else:
+                children = None
+
+            # Class-specific fields
+            if kind == 'section':
+                name = el._name
+                if name is None:
+                    firstWord = _firstElementByClass(el, Word)
+                    firstSyllable = (_firstElementByClass(firstWord, Syllable)
+                        if firstWord is not None else None)
+                    if (firstSyllable is not None 
+                        and _getAnnotation(firstSyllable) is not None):
+                        name = SECTION_NAMES.get(_getAnnotation(firstWord[0]))
+                if name is not None:
+                    obj['name'] = name
+            elif kind == 'word':
+                obj['musicAndTextAligned'] = el.musicAndTextAligned
+            elif kind == 'syllable':
+                firstNote = _firstNote(el)
+                if firstNote is not None:
+                    lyric = firstNote.lyric
+                else:
+                    lyric = editorial.get('lyric') if editorial is not None else None
+                    # Lyrics of syllables without notes are stored in the
+                    # editorial, and are exported as text
+                    if isinstance(lyric, note.Lyric):
+                        lyric = lyric.rawText
+                        if 'lyric' in obj.get('editorial', {}):
+                            obj['editorial']['lyric'] = lyric
+                if lyric is not None:
+                    obj['lyric'] = lyric
+            elif kind == 'note':
+                obj['pitch'] = el.pitch.nameWithOctave
+                if el.notehead != 'normal':
+                    obj['notehead'] = el.notehead
+            elif kind == 'alteration':
+                obj['pitch'] = el.pitch.nameWithOctave
+
+        if siblings is None:
+            root = obj
+        else:
+            siblings.append(obj)
+        if children:
+            # For backwards compatibility: the first syllable of a word has 
+            # always been exported with (possibly empty) editorial information
+            childSiblings = obj['elements']
+            stack.extend((child, childSiblings, 
+                kind == 'word' and child is firstSyllable)
+                for child in reversed(children))
+
+    return root
+
+### Compact encoding (pickling)
+
+class UnencodableError(Exception):
+    """Raised when an element cannot be encoded by :func:`encodeHierarchy`"""
+    pass
+
+_ENCODED_CLASSES = (Chant, Section, Word, Syllable, Neume, Note, Clef, 
+    PausaMinima, PausaMinor, PausaMajor, PausaFinalis, Pausa, Flat, Natural, 
+    Alteration, Annotation, LineBreak, PageBreak, ColumnBreak, MissingPitches)
+_CLASS_CODES = {cls: code for code, cls in enumerate(_ENCODED_CLASSES)}
+_NOTE_CODE = _CLASS_CODES[Note]
+
+def _encodeEditorial(element):
+    if isinstance(element, Note) and element._editorial is None:
+        info = element._noteInfo
+        return info if info is not EMPTY_NOTE_INFO else None
+    elif element._editorial is None:
+        return None
+    return dict(element._editorial)
+
+def _encodeLyrics(n):
+    lyrics = []
+    for lyric in n.lyrics:
+        if lyric.components is not None:
+            raise UnencodableError('Lyrics with components cannot be encoded')
+        lyrics.append((lyric._text, lyric._syllabic, lyric._number, 
+            lyric._identifier))
+    return tuple(lyrics)
+
+def _encodeElement(el, offset, code):
+    editorial = _encodeEditorial(el)
+    if code == _NOTE_CODE:
+        if (el.articulations or el.expressions or el.tie is not None 
+            or el.stemDirection != 'noStem'):
+            raise UnencodableError('Cannot encode notes with articulations, '
+                'expressions, ties or stems')
+        lyrics = _encodeLyrics(el) if el.lyrics else None
+        return (code, offset, editorial, el.pitch.nameWithOctave, 
+            el.notehead, el.noteheadFill, el.duration.quarterLength, lyrics)
+    
+    if isinstance(el, Section):
+        extra = el.__dict__.get('_name')
+    elif isinstance(el, Word):
+        extra = el.__dict__.get('musicAndTextAligned')
+    elif isinstance(el, Alteration):
+        extra = el.pitch.nameWithOctave if el.pitch is not None else None
+    elif isinstance(el, Annotation):
+        extra = el.content
+    else:
+        extra = None
+
+    if el.isStream:
+        if el._endElements:
+            raise UnencodableError('Cannot encode streams with end elements')
+        children = []
+        for child in el.elements:
+            childCode = _CLASS_CODES.get(type(child))
+            if childCode is None:
+                raise UnencodableError(f'Cannot encode objects of type {type(child)}')
+            children.append(_encodeElement(child, el.elementOffset(child), 
+                childCode))
+        return (code, offset, editorial, extra, tuple(children))
+    return (code, offset, editorial, extra)
+
+def encodeHierarchy(element) -> tuple:
+    """Encode a chant21 object, and all its children, as nested tuples of
+    plain Python objects. Every element is encoded as a tuple ``(code, 
+    offset, editorial, ...)`` where the code identifies the class, followed
+    by class-specific fields and, for streams, a tuple of children. Notes 
+    keep their :class:`NoteInfo`, which is shared between notes. The 
+    encoding is used to pickle chant21 objects; see :func:`decodeHierarchy`.
+
+    >>> from music21 import converter
+    >>> ch = converter.parse('cantus: 1---f-g')
+    >>> encoding = encodeHierarchy(ch)
+    >>> decodeHierarchy(encoding).toObject() == ch.toObject()
+    True
+
+    Args:
+        element (Chant21Object): The object to encode
+
+    Raises:
+        UnencodableError: if the object contains elements that cannot be
+            encoded, such as slurs or other music21 objects.
+
+    Returns:
+        tuple: The encoding
+    """
+    # The root may be an instance of a subclass (e.g. a LazyChant), which is
+    # encoded as its nearest encodable superclass
+    for cls in type(element).__mro__:
+        if cls in _CLASS_CODES:
+            return _encodeElement(element, 0.0, _CLASS_CODES[cls])
+    raise UnencodableError(f'Cannot encode objects of type {type(element)}')
+
+def _decodeElement(encoding, cls=None):
+    code, offset, editorial = encoding[:3]
+    cls = cls or _ENCODED_CLASSES[code]
+    if code == _NOTE_CODE:
+        _, _, _, pitchName, notehead, noteheadFill, quarterLength, lyrics = encoding
+        el = cls(pitchName)
+        if notehead != 'normal':
+            el.notehead = notehead
+        if noteheadFill is not None:
+            el.noteheadFill = noteheadFill
+        if quarterLength != 1.0:
+            el.duration.quarterLength = quarterLength
+        if lyrics is not None:
+            for text, syllabic, number, identifier in lyrics:
+                lyric = note.Lyric()
+                lyric._text = text
+                lyric._syllabic = syllabic
+                lyric._number = number
+                lyric._identifier = identifier
+                el.lyrics.append(lyric)
+        if isinstance(editorial, NoteInfo):
+            el._noteInfo = editorial
+            editorial = None
+    else:
+        el = cls()
+        extra = encoding[3]
+        if extra is not None:
+            if isinstance(el, Section):
+                el._name = extra
+            elif isinstance(el, Word):
+                el.musicAndTextAligned = extra
+            elif isinstance(el, Alteration):
+                el.pitch = pitch.Pitch(extra)
+            elif isinstance(el, Annotation):
+                el.content = extra
+        if len(encoding) == 5:
+            for child in encoding[4]:
+                el.coreInsert(child[1], _decodeElement(child))
+            el.coreElementsChanged()
+    
+    if editorial is not None:
+        el.editorial = Editorial(editorial)
+    return el
+
+def decodeHierarchy(encoding: tuple, cls=None):
+    """Decode a chant21 object encoded by :func:`encodeHierarchy`.
+
+    Args:
+        encoding (tuple): The encoding
+        cls (type, optional): The class of the decoded object, which should
+            be a subclass of the encoded class. Defaults to the encoded class.
+
+    Returns:
+        Chant21Object: The decoded object
+    """
+    return _decodeElement(encoding, cls)
@@ -0,0 +1,553 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+# Name:         chbin.py
+# Purpose:      compact binary encoding of chants
+#
+# Authors:      Bas Cornelissen
+#
+# Copyright:    Copyright © 2020-present Bas Cornelissen
+# License:      see LICENSE
+# ------------------------------------------------------------------------------
+"""
+CHBIN is a compact binary alternative to CHSON. It encodes exactly the same
+content (the object returned by :meth:`chant21.chant.Chant21Object.toObject`),
+but is typically 6 to 8 times smaller:
+
+>>> from music21 import converter
+>>> ch = converter.parse('cantus: 1---f-g--h---3/Ky-ri-e')
+>>> data = encodeCHBIN(ch.toObject())
+>>> decodeCHBIN(data) == ch.toObject()
+True
+>>> arrays = readCHBINArrays(data)
+>>> arrays.pitches
+array([32, 33, 34], dtype=int16)
+>>> arrays.syllable
+array([1, 1, 2], dtype=int32)
+>>> arrays.lyrics
+[None, 'Ky-', 'ri', None]
+
+The format uses the following ideas:
+
+- All numbers are stored as variable-length integers (varints): small
+  numbers, which are by far the most common, take a single byte.
+- Object types (``'note'``, ``'syllable'``, ...) and fields (``'pitch'``,
+  ``'elements'``, ...) are stored as small integer codes.
+- Pitches are stored as a single integer, combining the diatonic note
+  number and the alteration.
+- All strings are stored once in a string table, and referenced by index.
+- Editorial information and metadata are stored once in a table of shared
+  values, and referenced by index. Most notes share the same editorial
+  information, e.g. ``{'gabcPosition': 'f'}``.
+
+A file consists of a magic number and version, the string table, the table
+of shared values, and finally the root object. Objects are stored as a type
+code, followed by tagged fields and an end tag. Besides decoding to an
+object (and then to a chant; see :class:`ConverterCHBIN`) it is possible to
+directly read the melody as arrays (:func:`readCHBINArrays`), which is much
+faster than creating a chant when only the notes are needed.
+"""
+import json
+import re
+import struct
+import numpy as np
+from music21 import converter
+from .chant import Chant
+from .chant import LIQUESCENT_NEUME_SHAPES
+
+__all__ = [
+    'encodeCHBIN',
+    'decodeCHBIN',
+    'readCHBINArrays',
+    'ChantArrays',
+    'CHBINError',
+    'ConverterCHBIN'
+]
+
+MAGIC = b'CHB'
+VERSION = 1
+
+TYPES = ('chant', 'section', 'word', 'syllable', 'neume', 'note', 'clef',
+    'pausa', 'pausaminima', 'pausaminor', 'pausamajor', 'pausafinalis',
+    'annotation', 'alteration', 'flat', 'natural')
+"""tuple: Object types with a type code (their index plus one). Other types
+are stored with code 0, followed by the type name"""
+_TYPE_CODES = {name: code + 1 for code, name in enumerate(TYPES)}
+
+PAUSAS = ('pausaminima', 'pausaminor', 'pausamajor', 'pausafinalis')
+"""tuple: The pausa types, from weak to strong; see :attr:`ChantArrays.pausas`"""
+
+FIELDS = ('elements', 'editorial', 'metadata', 'pitch', 'lyric',
+    'annotation', 'name', 'musicAndTextAligned', 'notehead', 'volpiano')
+"""tuple: Fields of objects with a tag (their index plus one). Tag 0 ends the
+object, and other fields are stored with a tag ``len(FIELDS) + 1``, followed
+by the name of the field"""
+_FIELD_TAGS = {name: tag + 1 for tag, name in enumerate(FIELDS)}
+_END = 0
+_OTHER_FIELD = len(FIELDS) + 1
+_ELEMENTS = _FIELD_TAGS['elements']
+_PITCH = _FIELD_TAGS['pitch']
+_SHARED_FIELDS = {_FIELD_TAGS['editorial'], _FIELD_TAGS['metadata']}
+
+# Tags of values
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT = range(8)
+
+# Pitches are stored as 4 * diatonic note number + alteration (0: natural,
+# 1: flat, 2: sharp), or as 0 followed by the name of the pitch.
+_STEPS = 'CDEFGAB'
+_ALTERATIONS = {'': 0, '-': 1, '#': 2}
+_PITCH_NAME = re.compile(r'^([A-G])(|-|#)(\d)$')
+
+class CHBINError(Exception):
+    """Raised when CHBIN data is invalid"""
+    pass
+
+def _pitchCode(name: str) -> int:
+    match = _PITCH_NAME.match(name)
+    if match is None:
+        return 0
+    step, alteration, octave = match.groups()
+    diatonicNoteNum = 7 * int(octave) + _STEPS.index(step) + 1
+    return 4 * diatonicNoteNum + _ALTERATIONS[alteration]
+
+def _pitchName(code: int) -> str:
+    diatonicNoteNum, alteration = divmod(code, 4)
+    octave, step = divmod(diatonicNoteNum - 1, 7)
+    return f'{_STEPS[step]}{"-#"[alteration - 1] if alteration else ""}{octave}'
+
+_PITCH_NAMES = {}
+for _code in range(4 * 7, 4 * 70):
+    if _code % 4 != 3:
+        _PITCH_NAMES[_code] = _pitchName(_code)
+
+###
+
+class _Encoder:
+    def __init__(self):
+        self.strings = {}
+        self.shared = {}
+        self.sharedData = bytearray()
+
+    def varint(self, out, value):
+        while value > 0x7F:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+
+    def string(self, out, value):
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        self.varint(out, index)
+
+    def value(self, out, value):
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, str):
+            out.append(_STR)
+            self.string(out, value)
+        elif isinstance(value, int):
+            out.append(_INT)
+            # Zigzag encoding of signed integers
+            self.varint(out, 2 * value if value >= 0 else -2 * value - 1)
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += struct.pack('<d', value)
+        elif isinstance(value, (list, tuple)):
+            out.append(_LIST)
+            self.varint(out, len(value))
+            for item in value:
+                self.value(out, item)
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            self.varint(out, len(value))
+            for key, item in value.items():
+                if not isinstance(key, str):
+                    raise CHBINError(f'Keys should be strings, not {type(key)}')
+                self.string(out, key)
+                self.value(out, item)
+        else:
+            raise CHBINError(f'Cannot encode values of type {type(value)}')
+
+    def sharedValue(self, out, value):
+        try:
+            key = json.dumps(value)
+        except TypeError as error:
+            raise CHBINError(f'Cannot encode value: {error}')
+        index = self.shared.get(key)
+        if index is None:
+            index = self.shared[key] = len(self.shared)
+            self.value(self.sharedData, value)
+        self.varint(out, index)
+
+    def object(self, out, obj):
+        objType = obj.get('type')
+        code = _TYPE_CODES.get(objType, 0)
+        self.varint(out, code)
+        if code == 0:
+            self.string(out, objType)
+        for key, value in obj.items():
+            if key == 'type':
+                continue
+            tag = _FIELD_TAGS.get(key, _OTHER_FIELD)
+            self.varint(out, tag)
+            if tag == _ELEMENTS:
+                self.varint(out, len(value))
+                for child in value:
+                    self.object(out, child)
+            elif tag in _SHARED_FIELDS:
+                self.sharedValue(out, value)
+            elif tag == _PITCH:
+                code = _pitchCode(value) if isinstance(value, str) else 0
+                self.varint(out, code)
+                if code == 0:
+                    self.value(out, value)
+            else:
+                if tag == _OTHER_FIELD:
+                    self.string(out, key)
+                self.value(out, value)
+        out.append(_END)
+
+def encodeCHBIN(obj: dict) -> bytes:
+    """Encode a chant (or any other chant21 object) exported by
+    :meth:`chant21.chant.Chant21Object.toObject` in the CHBIN format.
+
+    Args:
+        obj (dict): The object
+
+    Raises:
+        CHBINError: if the object contains values that cannot be encoded
+            (only JSON-serializable values are supported)
+
+    Returns:
+        bytes: The encoded object
+    """
+    encoder = _Encoder()
+    body = bytearray()
+    encoder.object(body, obj)
+
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    encoder.varint(out, len(encoder.strings))
+    for string in encoder.strings:
+        data = string.encode('utf-8')
+        encoder.varint(out, len(data))
+        out += data
+    encoder.varint(out, len(encoder.shared))
+    out += encoder.sharedData
+    out += body
+    return bytes(out)
+
+###
+
+class _Decoder:
+    def __init__(self, data):
+        if data[:len(MAGIC)] != MAGIC:
+            raise CHBINError('Not a CHBIN file')
+        if data[len(MAGIC)] != VERSION:
+            raise CHBINError(f'Unsupported CHBIN version {data[len(MAGIC)]}')
+        self.data = data
+        self.pos = len(MAGIC) + 1
+        numStrings = self.varint()
+        self.strings = []
+        for _ in range(numStrings):
+            length = self.varint()
+            end = self.pos + length
+            self.strings.append(data[self.pos:end].decode('utf-8'))
+            self.pos = end
+        numShared = self.varint()
+        self.shared = [self.value() for _ in range(numShared)]
+
+    def varint(self):
+        data, pos = self.data, self.pos
+        byte = data[pos]
+        pos += 1
+        if byte < 0x80:
+            self.pos = pos
+            return byte
+        result, shift = byte & 0x7F, 7
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                self.pos = pos
+                return result
+            shift += 7
+
+    def value(self):
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _STR:
+            return self.strings[self.varint()]
+        elif tag == _NONE:
+            return None
+        elif tag == _TRUE:
+            return True
+        elif tag == _FALSE:
+            return False
+        elif tag == _INT:
+            zigzag = self.varint()
+            return zigzag >> 1 if zigzag % 2 == 0 else -(zigzag >> 1) - 1
+        elif tag == _FLOAT:
+            value, = struct.unpack_from('<d', self.data, self.pos)
+            self.pos += 8
+            return value
+        elif tag == _LIST:
+            return [self.value() for _ in range(self.varint())]
+        elif tag == _DICT:
+            result = {}
+            for _ in range(self.varint()):
+                key = self.strings[self.varint()]
+                result[key] = self.value()
+            return result
+        raise CHBINError(f'Invalid value tag {tag} at position {self.pos - 1}')
+
+    def sharedValue(self):
+        value = self.shared[self.varint()]
+        return _copy(value) if isinstance(value, (dict, list)) else value
+
+    def objectType(self):
+        code = self.data[self.pos]
+        self.pos += 1
+        if code == 0:
+            return self.strings[self.varint()]
+        elif code > len(TYPES):
+            raise CHBINError(f'Invalid type code {code}')
+        return TYPES[code - 1]
+
+    def pitch(self):
+        code = self.varint()
+        if code == 0:
+            return self.value()
+        return _PITCH_NAMES.get(code) or _pitchName(code)
+
+    def object(self):
+        obj = {'type': self.objectType()}
+        data = self.data
+        while True:
+            # Tags are always a single byte
+            tag = data[self.pos]
+            self.pos += 1
+            if tag == _END:
+                return obj
+            elif tag == _ELEMENTS:
+                obj['elements'] = [self.object() for _ in range(self.varint())]
+            elif tag in _SHARED_FIELDS:
+                obj[FIELDS[tag - 1]] = self.sharedValue()
+            elif tag == _PITCH:
+                obj['pitch'] = self.pitch()
+            elif tag == _OTHER_FIELD:
+                key = self.strings[self.varint()]
+                obj[key] = self.value()
+            elif tag < _OTHER_FIELD:
+                obj[FIELDS[tag - 1]] = self.value()
+            else:
+                raise CHBINError(f'Invalid field tag {tag}')
+
+def _copy(value):
+    """Copy shared (mutable) values, which should not be shared between
+    objects after decoding"""
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    elif isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+def decodeCHBIN(data: bytes) -> dict:
+    """Decode CHBIN data to an object, as exported by
+    :meth:`chant21.chant.Chant21Object.toObject`.
+
+    Args:
+        data (bytes): The CHBIN data
+
+    Raises:
+        CHBINError: if the data is not valid CHBIN
+
+    Returns:
+        dict: The object
+    """
+    try:
+        return _Decoder(data).object()
+    except IndexError:
+        raise CHBINError('Unexpected end of CHBIN data')
+
+###
+
+class ChantArrays:
+    """A lightweight view of the melody of a chant, read directly from CHBIN
+    data by :func:`readCHBINArrays`. Every note has an entry in the arrays
+    ``pitches``, ``alterations``, ``liquescent``, ``pausas`` and the arrays
+    with the index of the ``neume``, ``syllable``, ``word`` and ``section``
+    that contain the note. Those indices count all containers of that type in
+    the chant (in order), also those without notes (e.g. syllables with only
+    a clef).
+
+    Attributes:
+        pitches (numpy.ndarray): Diatonic note numbers (C4 is 29)
+        alterations (numpy.ndarray): 0 for no alteration, -1 for flats and 1
+            for sharps
+        liquescent (numpy.ndarray): Whether the notes are liquescent
+        pausas (numpy.ndarray): The pausa following the note (before the next
+            note): the index in :data:`PAUSAS` plus one, or 0 if there is no
+            pausa. If there are several, the strongest one is used.
+        neume (numpy.ndarray): Index of the neume of every note
+        syllable (numpy.ndarray): Index of the syllable of every note
+        word (numpy.ndarray): Index of the word of every note
+        section (numpy.ndarray): Index of the section of every note
+        lyrics (list): The lyrics of every syllable (or None)
+        metadata (dict): The metadata of the chant
+    """
+    __slots__ = ('pitches', 'alterations', 'liquescent', 'pausas', 'neume',
+        'syllable', 'word', 'section', 'lyrics', 'metadata')
+
+    def __init__(self, pitches, alterations, liquescent, neume, syllable, word,
+        section, lyrics, metadata, pausas=None):
+        self.pitches = np.array(pitches, dtype=np.int16)
+        self.alterations = np.array(alterations, dtype=np.int8)
+        self.liquescent = np.array(liquescent, dtype=bool)
+        if pausas is None:
+            pausas = np.zeros(len(self.pitches), dtype=np.int8)
+        self.pausas = np.array(pausas, dtype=np.int8)
+        self.neume = np.array(neume, dtype=np.int32)
+        self.syllable = np.array(syllable, dtype=np.int32)
+        self.word = np.array(word, dtype=np.int32)
+        self.section = np.array(section, dtype=np.int32)
+        self.lyrics = lyrics
+        self.metadata = metadata
+
+    def __len__(self):
+        return len(self.pitches)
+
+    def __repr__(self):
+        return f'<chant21.chbin.ChantArrays notes={len(self)}>'
+
+def _isLiquescent(editorial) -> bool:
+    """Whether (shared) editorial information is that of a liquescent note,
+    like :attr:`chant21.chant.NoteInfo.isLiquescent`"""
+    if not isinstance(editorial, dict):
+        return False
+    if editorial.get('liquescence', False) is True:
+        return True
+    suffixes = editorial.get('gabcSuffixes')
+    if not isinstance(suffixes, list):
+        return False
+    for suffix in suffixes:
+        shape = suffix.get('neumeShape') if isinstance(suffix, dict) else None
+        if isinstance(shape, str) and any(s in shape 
+            for s in LIQUESCENT_NEUME_SHAPES):
+            return True
+    return False
+
+class _ArrayReader(_Decoder):
+    """Decoder that skips everything except the information in ChantArrays"""
+
+    _CONTAINERS = {_TYPE_CODES[name]: name
+        for name in ('section', 'word', 'syllable', 'neume')}
+    _NOTE = _TYPE_CODES['note']
+    _PAUSAS = {_TYPE_CODES[name]: index + 1 for index, name in enumerate(PAUSAS)}
+    _ALTERATIONS = (0, -1, 1)
+
+    def read(self):
+        self.counts = {name: -1 for name in self._CONTAINERS.values()}
+        self.columns = {name: [] for name in ('pitches', 'alterations',
+            'liquescent', 'pausas', 'neume', 'syllable', 'word', 'section')}
+        self.lyrics = []
+        self.metadata = None
+        # Liquescence of the shared editorial values
+        self.liquescentShared = [_isLiquescent(value) for value in self.shared]
+        self.object()
+        return ChantArrays(lyrics=self.lyrics, metadata=self.metadata,
+            **self.columns)
+
+    def object(self):
+        code = self.data[self.pos]
+        self.pos += 1
+        if code == 0:
+            self.varint()
+        container = self._CONTAINERS.get(code)
+        if container is not None:
+            self.counts[container] += 1
+        if container == 'syllable':
+            self.lyrics.append(None)
+        isNote = code == self._NOTE
+        pausa = self._PAUSAS.get(code)
+        if pausa is not None:
+            pausas = self.columns['pausas']
+            if len(pausas) > 0 and pausas[-1] < pausa:
+                pausas[-1] = pausa
+        pitchCode = liquescent = None
+        while True:
+            tag = self.data[self.pos]
+            self.pos += 1
+            if tag == _END:
+                break
+            elif tag == _ELEMENTS:
+                for _ in range(self.varint()):
+                    self.object()
+            elif tag in _SHARED_FIELDS:
+                index = self.varint()
+                if isNote:
+                    liquescent = self.liquescentShared[index]
+                elif FIELDS[tag - 1] == 'metadata':
+                    self.metadata = _copy(self.shared[index])
+            elif tag == _PITCH:
+                pitchCode = self.varint()
+                if pitchCode == 0:
+                    name = self.value()
+                    pitchCode = _pitchCode(name) if isinstance(name, str) else 0
+                    if pitchCode == 0:
+                        raise CHBINError(f'Unsupported pitch {name}')
+            elif tag == _OTHER_FIELD:
+                self.varint()
+                self.value()
+            elif container == 'syllable' and FIELDS[tag - 1] == 'lyric':
+                self.lyrics[-1] = self.value()
+            else:
+                self.value()
+
+        if isNote and pitchCode is not None:
+            columns, counts = self.columns, self.counts
+            diatonicNoteNum, alteration = divmod(pitchCode, 4)
+            columns['pitches'].append(diatonicNoteNum)
+            columns['alterations'].append(self._ALTERATIONS[alteration])
+            columns['liquescent'].append(bool(liquescent))
+            columns['pausas'].append(0)
+            for name in ('neume', 'syllable', 'word', 'section'):
+                columns[name].append(counts[name])
+
+def readCHBINArrays(data: bytes) -> ChantArrays:
+    """Read the melody of a chant from CHBIN data as arrays, without creating
+    objects for all elements of the chant. See :class:`ChantArrays`.
+
+    Args:
+        data (bytes): The CHBIN data of a chant
+
+    Raises:
+        CHBINError: if the data is not valid CHBIN
+
+    Returns:
+        ChantArrays: The arrays
+    """
+    try:
+        return _ArrayReader(data).read()
+    except IndexError:
+        raise CHBINError('Unexpected end of CHBIN data')
+
+###
+
+class ConverterCHBIN(converter.subConverters.SubConverter):
+    registerFormats = ('chbin', 'CHBIN')
+    registerInputExtensions = ('chbin', 'CHBIN')
+    readBinary = True
+
+    def parseData(self, data, number=None):
+        chantObj = decodeCHBIN(data)
+        chant = Chant()
+        chant.fromObject(chantObj)
+        self.stream = chant
+
+converter.registerSubconverter(ConverterCHBIN)
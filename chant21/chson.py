@@ -1,16 +1,421 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+# Name:         chson.py
+# Purpose:      reading and writing CHSON and CHSON Lines
+#
+# Authors:      Bas Cornelissen
+#
+# Copyright:    Copyright © 2020-present Bas Cornelissen
+# License:      see LICENSE
+# ------------------------------------------------------------------------------
+"""
+CHSON is the JSON serialization of chants (see
+:meth:`chant21.chant.Chant21Object.toObject`). Large corpora are best stored
+as CHSON Lines: a single text file with one chant in CHSON per line, which
+is also what :func:`chant21.cantus.convertCantusCSV` writes. The files can be
+compressed using gzip or zstd; this is inferred from the extension (``.gz``
+or ``.zst``). Zstd compression requires the ``zstandard`` package.
+
+>>> import os, tempfile
+>>> from music21 import converter
+>>> chants = [converter.parse('cantus: 1---f--g---3'),
+...           converter.parse('cantus: 1---h--g---3')]
+>>> path = os.path.join(tempfile.mkdtemp(), 'chants.chsonl.gz')
+>>> writeCHSONLines(chants, path, ids=['a', 'b'])
+2
+>>> [len(ch.flat.notes) for ch in iterCHSONLines(path)]
+[2, 2]
+
+By default, a byte-offset index is written next to the file (with the
+extension ``.idx``), which is used to read single chants by id, without
+reading the rest of the file:
+
+>>> readCHSONLine(path, 'b').flat.notes[0].nameWithOctave
+'A4'
+
+Compressed files are written in blocks that are compressed independently,
+so that only one block has to be decompressed to read a chant. The file is
+still an ordinary gzip or zstd file, since both formats allow concatenating
+compressed blocks. Converting objects to chants is relatively slow, so
+:func:`iterCHSONLines` can decode chunks of lines in parallel.
+"""
+import os
+import io
 import json
+import gzip
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
 from music21 import converter
 from .chant import Chant
-__all__ = ['ConverterCHSON']
+
+__all__ = [
+    'ConverterCHSON',
+    'writeCHSONLines',
+    'iterCHSONLines',
+    'readCHSONLine',
+    'CHSONLinesIndex'
+]
+
+INDEX_EXTENSION = '.idx'
+
+COMPRESSIONS = (None, 'gzip', 'zstd')
+
+def _objectToChant(obj: dict) -> Chant:
+    """Create a chant from a CHSON object"""
+    chant = Chant()
+    chant.fromObject(obj)
+    return chant
 
 class ConverterCHSON(converter.subConverters.SubConverter):
     registerFormats = ('chson', 'CHSON')
     registerInputExtensions = ('chson', 'CHSON')
-    
+
     def parseData(self, strData, number=None):
-        chantObj = json.loads(strData)
-        chant = Chant()
-        chant.fromObject(chantObj)
-        self.stream = chant
-   
-converter.registerSubconverter(ConverterCHSON)
\ No newline at end of file
+        self.stream = _objectToChant(json.loads(strData))
+
+converter.registerSubconverter(ConverterCHSON)
+
+###
+
+def _inferCompression(path, compression='infer'):
+    if compression != 'infer':
+        if compression not in COMPRESSIONS:
+            raise ValueError(f'Unknown compression: {compression}')
+        return compression
+    path = str(path)
+    if path.endswith('.gz'):
+        return 'gzip'
+    elif path.endswith(('.zst', '.zstd')):
+        return 'zstd'
+    return None
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError('Zstd compression requires the zstandard package '
+            '(pip install zstandard)') from None
+    return zstandard
+
+def _compress(data: bytes, compression: str) -> bytes:
+    if compression == 'gzip':
+        return gzip.compress(data, mtime=0)
+    elif compression == 'zstd':
+        return _zstandard().ZstdCompressor().compress(data)
+    return data
+
+def _decompress(data: bytes, compression: str) -> bytes:
+    if compression == 'gzip':
+        return gzip.decompress(data)
+    elif compression == 'zstd':
+        return _zstandard().ZstdDecompressor().decompress(data)
+    return data
+
+def _openLines(path, compression: str):
+    """Open a (compressed) file for reading lines in binary mode"""
+    if compression == 'gzip':
+        return gzip.open(path, 'rb')
+    elif compression == 'zstd':
+        decompressor = _zstandard().ZstdDecompressor()
+        reader = decompressor.stream_reader(open(path, 'rb'),
+            read_across_frames=True, closefd=True)
+        return io.BufferedReader(reader)
+    return open(path, 'rb')
+
+def _toLine(chant, includeEditorial: bool, omitEmptyEditorial: bool) -> tuple:
+    """Return the CHSON line of a chant (or CHSON object), and its object"""
+    if isinstance(chant, dict):
+        obj = chant
+    else:
+        obj = chant.toObject(includeEditorial=includeEditorial,
+            omitEmptyEditorial=omitEmptyEditorial)
+    line = json.dumps(obj, ensure_ascii=False).encode('utf-8') + b'\n'
+    return line, obj
+
+def writeCHSONLines(chants, path, compression='infer', ids=None,
+    idField: str = 'id', index: bool = True, blockSize: int = 256,
+    includeEditorial: bool = True, omitEmptyEditorial: bool = False) -> int:
+    """Write chants to a CHSON Lines file, with one chant per line.
+
+    Args:
+        chants (iterable): The chants, or CHSON objects (dictionaries). This
+            can be a generator, so that only one chant needs to be in memory
+            at the time.
+        path (str or file object): The filename, or an open file object. 
+            No index is written to file objects, and text file objects 
+            cannot be compressed.
+        compression (str, optional): The compression: None, ``'gzip'`` or
+            ``'zstd'``. By default (``'infer'``) this is inferred from the
+            extension of the filename; file objects are not compressed.
+        ids (iterable, optional): The ids of the chants, used in the index.
+            Defaults to the field ``idField`` in the metadata of the chants,
+            or else the (0-based) line number. If an index is written, the
+            ids should be unique.
+        idField (str, optional): The metadata field with the id of chants.
+            Defaults to ``'id'``.
+        index (bool, optional): Whether to write an index to the file
+            ``path + '.idx'``. Defaults to True.
+        blockSize (int, optional): The number of chants per independently
+            compressed block. Larger blocks compress better, but make reading
+            single chants slower. Defaults to 256.
+        includeEditorial (bool, optional): See :meth:`Chant.toObject`
+        omitEmptyEditorial (bool, optional): See :meth:`Chant.toObject`
+
+    Raises:
+        ValueError: If an index is written and an id occurs more than once
+
+    Returns:
+        int: The number of chants written
+    """
+    if blockSize < 1:
+        raise ValueError('The block size should be at least 1')
+    isFileObject = hasattr(path, 'write')
+    isText = isinstance(path, io.TextIOBase)
+    if isFileObject:
+        compression = None if compression == 'infer' else compression
+        index = False
+    compression = _inferCompression(path, compression)
+    if isText and compression is not None:
+        raise ValueError('Text file objects cannot be compressed')
+    ids = iter(ids) if ids is not None else None
+    indexIds = []
+    seen = set()
+    entries = []
+    block = []
+    offset = 0
+
+    def writeBlock(handle):
+        nonlocal offset
+        if compression is None:
+            for line in block:
+                entries.append((offset, len(line), 0))
+                offset += len(line)
+            data = b''.join(block)
+            handle.write(data.decode('utf-8') if isText else data)
+        else:
+            data = _compress(b''.join(block), compression)
+            entries.extend((offset, len(data), i) for i in range(len(block)))
+            offset += len(data)
+            handle.write(data)
+        block.clear()
+
+    with nullcontext(path) if isFileObject else open(path, 'wb') as handle:
+        for number, chant in enumerate(chants):
+            line, obj = _toLine(chant, includeEditorial, omitEmptyEditorial)
+            if ids is not None:
+                chantId = next(ids)
+            else:
+                chantId = obj.get('metadata', {}).get(idField, number)
+            if index:
+                if chantId in seen:
+                    raise ValueError(f'Duplicate id: {chantId}')
+                seen.add(chantId)
+            indexIds.append(chantId)
+            block.append(line)
+            if len(block) == blockSize:
+                writeBlock(handle)
+        if block:
+            writeBlock(handle)
+
+    if index:
+        data = dict(ids=indexIds, entries=entries, compression=compression,
+            size=offset)
+        with open(str(path) + INDEX_EXTENSION, 'w', encoding='utf-8') as handle:
+            json.dump(data, handle, ensure_ascii=False)
+    return len(indexIds)
+
+def _writeConversions(results, path, **kwargs) -> tuple:
+    """Write the results of a batch conversion to a CHSON Lines file, using
+    :func:`writeCHSONLines`. Failed conversions are collected, not written.
+
+    Args:
+        results (iterable): ``(id, obj, error)`` tuples, with the CHSON 
+            object of every converted chant, or the error if the conversion
+            failed (in which case ``obj`` is None)
+        path (str or file object): The output file
+        **kwargs: Other keywords are passed to :func:`writeCHSONLines`
+
+    Returns:
+        tuple: The number of chants written, and a list of ``(id, error)`` 
+            tuples for all failed conversions
+    """
+    # The ids of converted chants are passed to writeCHSONLines as the
+    # chants are written
+    convertedIds = deque()
+    errors = []
+    def iterObjects():
+        for chantId, obj, error in results:
+            if error is None:
+                convertedIds.append(chantId)
+                yield obj
+            else:
+                errors.append((chantId, error))
+    def iterIds():
+        while True:
+            yield convertedIds.popleft()
+    numConverted = writeCHSONLines(iterObjects(), path, ids=iterIds(), 
+        **kwargs)
+    return numConverted, errors
+
+class CHSONLinesIndex():
+    """The byte-offset index of a CHSON Lines file, written by
+    :func:`writeCHSONLines`. It stores the position of every chant in the
+    file, by id.
+
+    Attributes:
+        path (str): The filename of the CHSON Lines file
+        ids (list): The ids of all chants, in order
+        compression (str): The compression of the file
+        size (int): The size of the file in bytes
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): The filename of the CHSON Lines file (not of the
+                index)
+
+        Raises:
+            FileNotFoundError: If there is no index
+            ValueError: If the index does not match the file, e.g. because
+                the file has changed since the index was written
+        """
+        self.path = path
+        with open(str(path) + INDEX_EXTENSION, 'r', encoding='utf-8') as handle:
+            data = json.load(handle)
+        self.ids = data['ids']
+        self.compression = data['compression']
+        self.size = data['size']
+        self._entries = data['entries']
+        self._positions = {chantId: i for i, chantId in enumerate(self.ids)}
+        if os.path.getsize(path) != self.size:
+            raise ValueError(f'The index of {path} is out of date')
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, chantId):
+        return chantId in self._positions
+
+    def locate(self, chantId) -> tuple:
+        """Return the position of a chant in the file.
+
+        Args:
+            chantId: The id of the chant
+
+        Raises:
+            KeyError: If there is no chant with this id
+
+        Returns:
+            tuple: The offset and size (in bytes) of the block containing the
+                chant, and the line number of the chant within the block
+        """
+        return tuple(self._entries[self._positions[chantId]])
+
+    def readObject(self, chantId, handle=None) -> dict:
+        """Read the CHSON object of a single chant.
+
+        Args:
+            chantId: The id of the chant
+            handle (file object, optional): The file, opened in binary mode.
+                Passing it avoids reopening the file for every chant.
+
+        Returns:
+            dict: The CHSON object
+        """
+        offset, size, lineNumber = self.locate(chantId)
+        if handle is None:
+            with open(self.path, 'rb') as handle:
+                handle.seek(offset)
+                data = handle.read(size)
+        else:
+            handle.seek(offset)
+            data = handle.read(size)
+        data = _decompress(data, self.compression)
+        line = data.split(b'\n')[lineNumber]
+        return json.loads(line)
+
+def readCHSONLine(path: str, chantId, index: CHSONLinesIndex = None,
+    asObject: bool = False):
+    """Read a single chant from a CHSON Lines file using its index, without
+    reading the rest of the file.
+
+    Args:
+        path (str): The filename
+        chantId: The id of the chant (see :func:`writeCHSONLines`)
+        index (CHSONLinesIndex, optional): The index of the file. Pass it
+            when reading many chants, to avoid loading the index every time.
+        asObject (bool, optional): Return the CHSON object instead of a
+            chant. Defaults to False.
+
+    Raises:
+        KeyError: If there is no chant with this id
+
+    Returns:
+        chant21.chant.Chant or dict: The chant
+    """
+    if index is None:
+        index = CHSONLinesIndex(path)
+    obj = index.readObject(chantId)
+    return obj if asObject else _objectToChant(obj)
+
+def _decodeLines(args) -> list:
+    lines, asObject = args
+    objects = [json.loads(line) for line in lines]
+    if asObject:
+        return objects
+    return [_objectToChant(obj) for obj in objects]
+
+def _iterChunks(path, compression, chunkSize):
+    with _openLines(path, compression) as handle:
+        chunk = []
+        for line in handle:
+            if line.strip():
+                chunk.append(line)
+            if len(chunk) == chunkSize:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+def iterCHSONLines(path: str, compression='infer', asObject: bool = False,
+    numWorkers: int = 1, chunkSize: int = 64):
+    """Iterate lazily over the chants in a CHSON Lines file. The file does
+    not need an index.
+
+    Args:
+        path (str): The filename
+        compression (str, optional): The compression: None, ``'gzip'`` or
+            ``'zstd'``. By default (``'infer'``) this is inferred from the
+            extension of the filename.
+        asObject (bool, optional): Yield CHSON objects instead of chants.
+            Defaults to False.
+        numWorkers (int, optional): The number of worker processes that
+            decode chunks of lines. Defaults to 1: all lines are decoded in
+            the current process. If None, the number of processors is used.
+        chunkSize (int, optional): The number of lines sent to a worker at
+            once. Defaults to 64.
+
+    Yields:
+        chant21.chant.Chant or dict: The chants, in order
+    """
+    compression = _inferCompression(path, compression)
+    chunks = _iterChunks(path, compression, chunkSize)
+    if numWorkers == 1:
+        for chunk in chunks:
+            yield from _decodeLines((chunk, asObject))
+        return
+
+    if numWorkers is None:
+        numWorkers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=numWorkers) as executor:
+        # Only keep a few chunks in flight, so that memory use is bounded
+        maxPending = 2 * numWorkers
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_decodeLines, (chunk, asObject)))
+            if len(pending) >= maxPending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+# Name:         diff.py
+# Purpose:      structural diffs and patches of chants
+#
+# Authors:      Bas Cornelissen
+#
+# Copyright:    Copyright © 2020-present Bas Cornelissen
+# License:      see LICENSE
+# ------------------------------------------------------------------------------
+"""
+Structural differences between chants. :func:`diff` computes a patch that
+turns one chant into another, and :func:`patch` applies it to a chant in
+place. Rather than the full CHSON of the new chant, a patch only contains the
+parts that changed, at the level of sections, words, syllables, neumes or
+notes:
+
+>>> from music21 import converter
+>>> chantA = converter.parse('cantus: 1---f-g--h---g--f---3/Ky-ri-e e-lei')
+>>> chantB = converter.parse('cantus: 1---f-g--j---g--f---3/Ky-ri-e e-lei')
+>>> delta = diff(chantA, chantB)
+>>> delta['ops']
+[{'op': 'splice', 'path': [0, 1, 1, 0], 'start': 0, 'stop': 1, 'elements': [{'type': 'note', 'editorial': {'volpianoPosition': 'j'}, 'pitch': 'B4'}]}]
+>>> patch(chantA, delta)
+>>> chantA.toObject() == chantB.toObject()
+True
+
+A patch is a dictionary with a list of operations ``ops`` and the hash of the
+chant it applies to (``base``). Paths are lists of indices into the
+``elements`` of the CHSON objects of the chant (see
+:meth:`chant21.chant.Chant21Object.toObject`), starting from the chant. There
+are two operations:
+
+- ``splice`` replaces the elements ``start`` up to ``stop`` of the container
+  at ``path`` with new ``elements``. This also inserts (``start == stop``)
+  and deletes elements (no new ``elements``).
+- ``set`` sets the ``fields`` of the container at ``path``, such as its
+  ``lyric``, ``annotation`` or ``editorial`` information, and removes the
+  fields in ``remove``.
+
+Operations have to be applied in order: the indices in a path refer to the
+chant after applying the preceding operations. Patches only contain plain
+dictionaries and lists, so they can be serialized to JSON. Patches can also
+be applied to CHSON objects directly, using :func:`patchObject`.
+
+To compare chants quickly, every subtree of a chant is hashed: identical
+subtrees are skipped without comparing their contents, and the children of
+changed containers are aligned by their hashes. The hashes of a chant are
+cached until the chant changes, just like its CHSON object.
+"""
+import copy
+import json
+import hashlib
+from difflib import SequenceMatcher
+from .chant import CLASSES
+from .chant import Chant
+from .chant import Chant21Object
+from .chant import Section
+from .chant import Word
+from .chant import Syllable
+from .chant import Annotation
+from .chant import appendElements
+
+__all__ = [
+    'diff',
+    'patch',
+    'patchObject',
+    'PatchError'
+]
+
+_HASH_CACHE_KEY = ('chant21.subtreeHashes',)
+
+_MISSING = object()
+
+class PatchError(Exception):
+    """Raised when a patch cannot be applied to a chant"""
+    pass
+
+### Hashing
+
+def _hashTree(obj: dict, hashes: dict) -> bytes:
+    """Hash every subtree of a CHSON object. The hashes are stored in
+    ``hashes`` by the id of the (sub)object, and the hash of the object is
+    returned."""
+    fields = {key: value for key, value in obj.items() if key != 'elements'}
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(fields, sort_keys=True, 
+        ensure_ascii=False).encode('utf-8'))
+    for child in obj.get('elements', ()):
+        digest.update(_hashTree(child, hashes))
+    hashes[id(obj)] = digest.digest()
+    return hashes[id(obj)]
+
+def _hashedObject(chant) -> tuple:
+    """Return the CHSON object of a chant (or CHSON object) and the hashes of
+    all its subtrees. For chants, both are cached until the chant changes."""
+    if isinstance(chant, dict):
+        hashes = {}
+        _hashTree(chant, hashes)
+        return chant, hashes
+    def hashedObject():
+        obj = chant.toObject(cached=True)
+        hashes = {}
+        _hashTree(obj, hashes)
+        return obj, hashes
+    return chant._cachedExport(_HASH_CACHE_KEY, hashedObject)
+
+### Diffing
+
+def _size(value) -> int:
+    return len(json.dumps(value, ensure_ascii=False))
+
+def _diffFields(objA: dict, objB: dict, path: list) -> list:
+    fields = {key: value for key, value in objB.items() 
+        if key != 'elements' and objA.get(key, _MISSING) != value}
+    remove = [key for key in objA if key != 'elements' and key not in objB]
+    if not fields and not remove:
+        return []
+    op = {'op': 'set', 'path': path, 'fields': copy.deepcopy(fields)}
+    if remove:
+        op['remove'] = remove
+    return [op]
+
+def _diffObjects(objA: dict, objB: dict, hashesA: dict, hashesB: dict, 
+    path: list) -> list:
+    """Return the operations that turn objA into objB, where both are
+    containers of the same type"""
+    childrenA = objA['elements']
+    childrenB = objB['elements']
+    keysA = [hashesA[id(child)] for child in childrenA]
+    keysB = [hashesB[id(child)] for child in childrenB]
+    matcher = SequenceMatcher(None, keysA, keysB, autojunk=False)
+
+    # Process the changes from right to left, so that the indices of 
+    # elements to the left are not affected by earlier operations
+    ops = []
+    for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+        if tag == 'equal':
+            continue
+        if tag == 'replace' and i2 - i1 == j2 - j1:
+            # Patch changed elements individually where possible
+            for k in reversed(range(i2 - i1)):
+                childA, childB = childrenA[i1 + k], childrenB[j1 + k]
+                ops.extend(_diffChild(childA, childB, hashesA, hashesB, 
+                    path, i1 + k))
+        else:
+            ops.append({'op': 'splice', 'path': path, 'start': i1, 
+                'stop': i2, 'elements': copy.deepcopy(childrenB[j1:j2])})
+
+    # Fields are set after changing the elements, since e.g. the lyrics of 
+    # syllables are stored in their first note.
+    ops.extend(_diffFields(objA, objB, path))
+    return ops
+
+def _diffChild(childA: dict, childB: dict, hashesA: dict, hashesB: dict, 
+    path: list, index: int) -> list:
+    """Return the operations that turn the child at ``index`` into childB:
+    either a patch of the child, or a splice that replaces it, whichever is
+    smaller"""
+    replace = [{'op': 'splice', 'path': path, 'start': index, 
+        'stop': index + 1, 'elements': [childB]}]
+    if (childA['type'] == childB['type'] and 'elements' in childA 
+        and 'elements' in childB):
+        ops = _diffObjects(childA, childB, hashesA, hashesB, path + [index])
+        if _size(ops) <= _size(replace):
+            return ops
+    replace[0]['elements'] = copy.deepcopy(replace[0]['elements'])
+    return replace
+
+def diff(chantA, chantB) -> dict:
+    """Compute a patch that turns one chant into another. Both chants can 
+    also be CHSON objects (see :meth:`chant21.chant.Chant21Object.toObject`).
+
+    Args:
+        chantA (chant21.chant.Chant or dict): The original chant
+        chantB (chant21.chant.Chant or dict): The changed chant
+
+    Raises:
+        ValueError: If the chants are not of the same type
+
+    Returns:
+        dict: The patch, with the hash of chantA (``base``) and a list of
+            operations (``ops``)
+    """
+    objA, hashesA = _hashedObject(chantA)
+    objB, hashesB = _hashedObject(chantB)
+    if objA['type'] != objB['type']:
+        raise ValueError(f'Cannot compare a {objA["type"]} to a {objB["type"]}')
+    base = hashesA[id(objA)].hex()
+    if hashesA[id(objA)] == hashesB[id(objB)]:
+        return {'base': base, 'ops': []}
+    return {'base': base, 
+        'ops': _diffObjects(objA, objB, hashesA, hashesB, [])}
+
+### Patching
+
+def _checkBase(chant, delta):
+    obj, hashes = _hashedObject(chant)
+    if 'base' in delta and hashes[id(obj)].hex() != delta['base']:
+        raise PatchError('The patch does not apply to this chant')
+
+def patchObject(obj: dict, delta: dict, verify: bool = False) -> dict:
+    """Apply a patch to a CHSON object, in place. See :func:`patch`.
+
+    Args:
+        obj (dict): The CHSON object
+        delta (dict): The patch computed by :func:`diff`
+        verify (bool, optional): Whether to check that the patch was computed
+            for this object. Defaults to False.
+
+    Raises:
+        PatchError: If the patch cannot be applied
+
+    Returns:
+        dict: The patched object
+    """
+    if verify:
+        _checkBase(obj, delta)
+    for op in delta['ops']:
+        try:
+            node = obj
+            for index in op['path']:
+                node = node['elements'][index]
+            if op['op'] == 'splice':
+                children = node['elements']
+                if not 0 <= op['start'] <= op['stop'] <= len(children):
+                    raise IndexError('Invalid range')
+                children[op['start']:op['stop']] = copy.deepcopy(op['elements'])
+            elif op['op'] == 'set':
+                node.update(copy.deepcopy(op['fields']))
+                for key in op.get('remove', []):
+                    node.pop(key, None)
+            else:
+                raise PatchError(f'Unknown operation: {op["op"]}')
+        except (IndexError, KeyError, TypeError) as error:
+            raise PatchError(f'Cannot apply operation at {op.get("path")}: '
+                f'{error}') from error
+    return obj
+
+def _children(element) -> tuple:
+    """The elements of a chant21 stream that appear in its CHSON object"""
+    if isinstance(element, Chant):
+        return element.childrenByClass(Section)
+    return element.childrenByClass(Chant21Object)
+
+def _objectToElement(obj: dict):
+    element = CLASSES[obj['type']]()
+    element.fromObject(obj)
+    return element
+
+def _relayout(container):
+    """Place the chant21 elements of a stream directly after each other,
+    after the durations of some of them have changed"""
+    offset = 0.0
+    for element in container._elements:
+        if isinstance(element, Chant21Object):
+            container.setElementOffset(element, offset)
+            offset += element.duration.quarterLength
+    container.coreElementsChanged()
+
+def _splice(container, start: int, stop: int, objects: list, syllable=None):
+    children = _children(container)
+    if not 0 <= start <= stop <= len(children):
+        raise IndexError('Invalid range')
+
+    # Syllables store their lyrics in their first note
+    firstNote = None
+    if syllable is not None and len(syllable.flatNotes) > 0:
+        firstNote = syllable.flatNotes[0]
+        lyrics = firstNote.lyrics
+
+    tail = children[start:]
+    if tail:
+        container.remove(list(tail))
+    elements = [_objectToElement(obj) for obj in objects]
+    appendElements(container, elements + list(children[stop:]))
+
+    if firstNote is not None and lyrics:
+        notes = syllable.flatNotes
+        if len(notes) > 0 and notes[0] is not firstNote:
+            if firstNote in notes:
+                firstNote.lyrics = []
+            notes[0].lyrics = lyrics
+
+def _setAnnotation(element, annotation):
+    if annotation is None:
+        if element.hasEditorialInformation:
+            element.editorial.pop('annotation', None)
+        element._clearCachedExports()
+    else:
+        element.annotation = annotation
+    if isinstance(element, Syllable):
+        # Syllables also contain the annotation as a text expression
+        element.remove(list(element.getElementsByClass(Annotation)))
+        if annotation is not None:
+            element.insert(0, Annotation(annotation))
+
+def _setFields(element, fields: dict, remove: list):
+    if 'editorial' in fields or 'editorial' in remove:
+        editorial = element.editorial
+        keep = ('metadata', 'annotation')
+        for key in [key for key in editorial if key not in keep]:
+            del editorial[key]
+        editorial.update(fields.get('editorial', {}))
+        if not editorial:
+            # Elements without editorial information export no editorial
+            element._editorial = None
+    if 'metadata' in fields:
+        element.editorial.metadata = fields['metadata']
+    if 'annotation' in fields or 'annotation' in remove:
+        _setAnnotation(element, fields.get('annotation'))
+    if 'name' in fields or 'name' in remove:
+        element.name = fields.get('name')
+    if 'musicAndTextAligned' in fields or 'musicAndTextAligned' in remove:
+        element.musicAndTextAligned = fields.get('musicAndTextAligned')
+    if 'lyric' in fields:
+        element.lyric = fields['lyric']
+    elif 'lyric' in remove:
+        notes = element.flatNotes
+        if len(notes) > 0:
+            notes[0].lyrics = []
+        else:
+            element.editorial.pop('lyric', None)
+    element._clearCachedExports()
+
+def patch(chant, delta: dict, verify: bool = False):
+    """Apply a patch computed by :func:`diff` to a chant, in place. Only the
+    parts of the chant that changed are replaced.
+
+    Args:
+        chant (chant21.chant.Chant): The chant
+        delta (dict): The patch
+        verify (bool, optional): Whether to check that the patch was computed
+            for this chant, by comparing the hash of the chant to the
+            ``base`` of the patch. Defaults to False.
+
+    Raises:
+        PatchError: If the patch cannot be applied
+    """
+    if verify:
+        _checkBase(chant, delta)
+    changed = {}
+    for op in delta['ops']:
+        try:
+            nodes = [chant]
+            for index in op['path']:
+                nodes.append(_children(nodes[-1])[index])
+            node = nodes[-1]
+            if op['op'] == 'splice':
+                syllables = [n for n in nodes if isinstance(n, Syllable)]
+                _splice(node, op['start'], op['stop'], op['elements'], 
+                    syllable=syllables[-1] if syllables else None)
+                # The durations of all containing streams may have changed
+                for depth, container in enumerate(nodes):
+                    changed[id(container)] = (depth, container)
+                if isinstance(node, Word):
+                    node.updateSyllableLyrics()
+            elif op['op'] == 'set':
+                _setFields(node, op['fields'], op.get('remove', []))
+                if isinstance(node, Syllable) and isinstance(nodes[-2], Word):
+                    nodes[-2].updateSyllableLyrics()
+            else:
+                raise PatchError(f'Unknown operation: {op["op"]}')
+        except (IndexError, KeyError, TypeError, AttributeError) as error:
+            raise PatchError(f'Cannot apply operation at {op.get("path")}: '
+                f'{error}') from error
+    
+    # Update the offsets of the changed streams, from the inside out
+    for _, container in sorted(changed.values(), key=lambda item: -item[0]):
+        _relayout(container)
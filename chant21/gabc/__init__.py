@@ -1,5 +1,6 @@
 from .parser import *
 from .converter import *
+from .header import *
 
 __all__ = [
     'ConverterGABC'
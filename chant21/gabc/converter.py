@@ -1,3 +1,4 @@
+from concurrent.futures import ProcessPoolExecutor
 from music21 import stream
 from music21 import pitch
 from music21 import note
@@ -10,6 +11,8 @@ from arpeggio import visit_parse_tree as visitParseTree
 from .. import chant
 from .. import __version__
 from . import ParserGABC
+from .header import splitGABCHeader
+from ..chson import _writeConversions
 
 NEUME_BOUNDARY = '_NEUME_BOUNDARY_'
 
@@ -40,9 +43,45 @@ def gabcPositionToStep(notePosition, clef, adjustClefOctave=0):
     noteOctave = clefOctaves[clef] + adjustClefOctave + octavesAboveC
     return f'{noteName}{noteOctave}'
     
-def flatten(alist):
-    """Flatten a list of lists"""
-    return [item for sublist in alist for item in sublist]
+# Maps the grammar rules of gabc note suffixes to the kind of suffix stored in
+# the note information. Of the empty notes and accents, only r and r0 (empty
+# notes) are stored; the others are ignored.
+_SUFFIX_KINDS = {
+    'neume_shape': 'neumeShape',
+    'rhythmic_sign': 'rhythmicSign',
+    'empty_note_or_accent': 'emptyNote',
+}
+_EMPTY_NOTES = ('r', 'r0')
+
+# Compiled note table: maps the gabc of a note (e.g. ``-fo~``) to the note
+# information and notehead of all notes with that gabc
+_NOTE_TABLE = {}
+
+def _compileNote(node):
+    """Return the note information, whether the note is liquescent and whether
+    it is empty, for a note node in the parse tree"""
+    position = prefix = None
+    suffixes = []
+    liquescence = isEmpty = False
+    for child in node:
+        if child.rule_name == 'position':
+            position = child.value
+        elif child.rule_name == 'prefix':
+            prefix = child.value
+            liquescence = True
+        elif child.rule_name == 'suffix':
+            for token in child:
+                kind = _SUFFIX_KINDS[token.rule_name]
+                if kind == 'emptyNote':
+                    if token.value not in _EMPTY_NOTES:
+                        continue
+                    isEmpty = True
+                elif kind == 'neumeShape' and token.value == 'w':
+                    liquescence = True
+                suffixes.append((kind, token.value))
+    noteInfo = chant.NoteInfo.intern(gabcPosition=position, gabcPrefix=prefix,
+        gabcSuffixes=tuple(suffixes), liquescence=liquescence)
+    return noteInfo, liquescence, isEmpty
 
 ###
 
@@ -81,14 +120,17 @@ class VisitorGABC(PTNodeVisitor):
 
     def visit_body(self, node, children):
         ch = chant.Chant()
-        curSection = chant.Section()
+        # Words are collected per section, and only added to sections once
+        # all sections are known
+        sections = []
+        curWords = []
         curClef = chant.Clef()
         curGABCClef = None
 
         # First pass: add measurs
         for word in children:
             if not isinstance(word, chant.Word): raise Exception('Quoi?')
-            curSection.append(word)
+            curWords.append(word)
 
             # Scope of accidentals ends with word boundaries
             curClefHasFlat = curGABCClef in ['cb1', 'cb2', 'cb3', 'cb4']
@@ -103,7 +145,7 @@ class VisitorGABC(PTNodeVisitor):
                 if isinstance(el, note.Note):
                     if curGABCClef is None: 
                         raise MissingClef('Missing clef! Cannot process notes without a clef.')
-                    position = el.editorial.gabcPosition
+                    position = el.noteInfo.gabcPosition
                     stepWithOctave = gabcPositionToStep(position, curGABCClef)
                     el.nameWithOctave = stepWithOctave
                     
@@ -151,13 +193,12 @@ class VisitorGABC(PTNodeVisitor):
                     # The very last pausa finalis is part of the last section though
                     if isinstance(el, chant.PausaFinalis):
                         if not word == children[-1]:
-                            curSection.remove(word)
-                            ch.append(curSection)
-                            curSection = chant.Section()
-                            curSection.append(word)
+                            curWords.pop()
+                            sections.append(curWords)
+                            curWords = [word]
                         else:
-                            ch.append(curSection)
-                            curSection = chant.Section()
+                            sections.append(curWords)
+                            curWords = []
                         
                 elif isinstance(el, chant.Clef):
                     curClef = el
@@ -167,22 +208,29 @@ class VisitorGABC(PTNodeVisitor):
                 else:
                     raise Exception('Unknown element')
         
-        if len(curSection.flat) > 0:
-            ch.append(curSection)
+        if any(len(word.flat) > 0 for word in curWords):
+            sections.append(curWords)
+
+        sectionObjects = []
+        for words in sections:
+            section = chant.Section()
+            chant.appendElements(section, words)
+            sectionObjects.append(section)
+        chant.appendElements(ch, sectionObjects)
 
         # ch.joinTextAcrossPausas()
         return ch
         
     def visit_word(self, node, children):
         word = chant.Word()
-        word.append(children)
+        chant.appendElements(word, children)
         word.updateSyllableLyrics()
         return word
 
     def visit_syllable(self, node, children):
         elements = children.results.get('music', [[]])[0]
         syllable = chant.Syllable()
-        syllable.append(elements)
+        chant.appendElements(syllable, elements)
         
         if 'text' in children.results:
             for modifier in children.results.get('text')[0]:
@@ -193,39 +241,45 @@ class VisitorGABC(PTNodeVisitor):
     def visit_music(self, node, children):
         """Returns a list of elements"""
         elements = []
-        curNeume = chant.Neume()
+        # The notes of the current neume; the neume is created when it ends
+        curNotes = []
+
+        def makeNeume(notes):
+            neume = chant.Neume()
+            chant.appendElements(neume, notes)
+            return neume
+
         for element in children:
             # Notes are added to the current neume
             if isinstance(element, note.Note):
-                curNeume.append(element)
+                curNotes.append(element)
 
                 # End neumes on dots
-                if 'gabcSuffixes' in element.editorial:
-                    for suffix in element.editorial.gabcSuffixes:
-                        if 'rhythmicSign' in suffix and suffix['rhythmicSign'] in ['.', '..']:
-                            elements.append(curNeume)
-                            curNeume = chant.Neume()
+                for kind, value in element.noteInfo.gabcSuffixes:
+                    if kind == 'rhythmicSign' and value in ['.', '..']:
+                        elements.append(makeNeume(curNotes))
+                        curNotes = []
 
             # Special symbols that are inserted outside Neumes
             elif (isinstance(element, chant.Pausa) 
                 or isinstance(element, chant.Alteration)
                 or isinstance(element, chant.Clef)):
-                if len(curNeume) > 0:
-                    elements.append(curNeume)
-                    curNeume = chant.Neume()
+                if len(curNotes) > 0:
+                    elements.append(makeNeume(curNotes))
+                    curNotes = []
                 elements.append(element)
 
             # Close neumes on neume boundaries, ignore other spaces
             elif element is NEUME_BOUNDARY:
-                if len(curNeume) > 0:
-                    elements.append(curNeume)
-                    curNeume = chant.Neume()
+                if len(curNotes) > 0:
+                    elements.append(makeNeume(curNotes))
+                    curNotes = []
             
             else:
                 raise Exception('I dont know how to handle this')
         
-        if len(curNeume) > 0: 
-            elements.append(curNeume)
+        if len(curNotes) > 0: 
+            elements.append(makeNeume(curNotes))
         return elements
     
     def visit_pausa(self, node, children):
@@ -269,65 +323,42 @@ class VisitorGABC(PTNodeVisitor):
         will have the default pitch (C), and the gabc position is stored as
         editorial information. In the second pass the actual pitch is determined
         based on the current clef and accidentals.
-        """
-        n = chant.Note()
-        position = children.results.get('position')[0]
-        n.editorial.gabcPosition = position
-        n.editorial.gabcSuffixes = []
-
-        # Suffix and prefix nodes return modifier functions that take a
-        # music21.note.Note object as input and return a modified Note. In this
-        # way we can add e.g. editorial information
-        prefixes = children.results.get('prefix', [])
-        suffixes = flatten(children.results.get('suffix', [[]]))
-        modifiers = suffixes + prefixes
-        for modify in modifiers:
-            n = modify(n)
 
-        if len(n.editorial.gabcSuffixes) == 0:
-            del n.editorial['gabcSuffixes']
+        The prefixes and suffixes of the note are not visited separately, but
+        read from the parse tree. The resulting note information is compiled
+        once for every distinct note (e.g. ``fo~``) and stored in a table.
+        """
+        # Most notes consist of a position only; then the key is that position
+        key = node[0].value if len(node) == 1 else node.flat_str()
+        compiled = _NOTE_TABLE.get(key)
+        if compiled is None:
+            compiled = _NOTE_TABLE[key] = _compileNote(node)
+        noteInfo, liquescence, isEmpty = compiled
 
+        n = chant.Note()
+        n.noteInfo = noteInfo
+        if liquescence:
+            n.notehead = 'x'
+        if isEmpty:
+            n.noteheadFill = False
         return n
 
     def visit_position(self, node, children):
         return node.value
 
+    # Prefixes and suffixes are handled in visit_note
+
     def visit_prefix(self, node, children):
-        """Return a modifier function that adds editorial information to the
-        note to indicate it has a prefix and is liquescent"""
-        def modifier(note):
-            note.editorial.gabcPrefix = node.value
-            note.editorial.liquescence = True
-            note.notehead = 'x'
-            return note
+        return None
 
-        return modifier
-    
     def visit_suffix(self, node, children):
-        """Visits suffix nodes. When children of suffix nodes are visited,
-        a modifier function is returned that operates on music21.note.Note 
-        objects. This suffix node returns a list of modifiers"""
-        return children
+        return None
 
     def visit_neume_shape(self, node, children):
-        """Return a modifier function that writes the gabc note shape to the
-        the music21.note.Note object"""
-        def modifier(n):
-            n.editorial.gabcSuffixes.append({'neumeShape': node.value})
-            if node.value == 'w':
-                n.notehead = 'x'
-                n.editorial.liquescence = True
-            return n
+        return None
 
-        return modifier
-    
     def visit_rhythmic_sign(self, node, children):
-        """Return a modifier function that writes the gabc rhythmic sign
-        to the the music21.note.Note object"""
-        def modifier(n):
-            n.editorial.gabcSuffixes.append({'rhythmicSign': node.value})
-            return n
-        return modifier
+        return None
 
     def visit_alteration(self, node, children):
         position = children.results.get('position')[0]
@@ -384,14 +415,7 @@ class VisitorGABC(PTNodeVisitor):
     # Ignored properties
     
     def visit_empty_note_or_accent(self, node, children):
-        if node.value in ['r', 'r0']:
-            def modifier(n):
-                n.editorial.gabcSuffixes.append({'emptyNote': node.value})
-                n.noteheadFill = False
-                return n
-            return modifier
-        else: 
-            return None
+        return None
     
     def visit_end_of_line(self, node, children):
         return None
@@ -421,18 +445,195 @@ class VisitorGABC(PTNodeVisitor):
 
 ###
 
+_BODY_PARSER = None
+
+def _getBodyParser():
+    """Return a shared parser for gabc bodies: constructing the parser from 
+    the grammar is relatively expensive."""
+    global _BODY_PARSER
+    if _BODY_PARSER is None:
+        _BODY_PARSER = ParserGABC(root='body')
+    return _BODY_PARSER
+
+class LazyChant(chant.Chant):
+    """A chant whose gabc body is only parsed when it is first needed.
+
+    The header is parsed immediately and stored in ``editorial.metadata``,
+    just like :class:`VisitorGABC` does, but the body is only parsed (using
+    :meth:`VisitorGABC.visit_body`) when the elements of the chant are first 
+    accessed: when iterating over the sections, retrieving the notes, 
+    exporting the chant, and so on. After that, the chant behaves exactly 
+    like a normal :class:`chant21.chant.Chant`. Note that errors in the body
+    are also only raised at that point.
+
+    >>> ch = LazyChant('name:Kyrie;\\n%%\\n(c4) Ky(f)ri(g)e(h)')
+    >>> ch.editorial.metadata['name']
+    'Kyrie'
+    >>> ch.isLoaded
+    False
+    >>> len(ch.flat.notes)
+    3
+    >>> ch.isLoaded
+    True
+
+    Args:
+        gabc (str, optional): The gabc string of the chant
+        limits (:obj:`chant21.limits.ConversionLimits` or :obj:`dict`,
+            optional): Limits on parsing the body
+    """
+
+    # Lazy chants are exported as ordinary chants
+    _objectType = 'chant'
+
+    def __init__(self, gabc: str = None, *args, limits=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._gabcBody = None
+        self._gabcLimits = limits
+        if gabc is not None:
+            header, self._gabcBody = splitGABCHeader(gabc)
+            self.editorial.metadata = {
+                'conversion': {
+                    'originalFormat': 'gabc',
+                    'converter': 'chant21',
+                    'version': __version__
+                }
+            }
+            self.editorial.metadata.update(header)
+
+    @property
+    def isLoaded(self) -> bool:
+        """Whether the body of the chant has been parsed"""
+        return self.__dict__.get('_gabcBody') is None
+
+    def load(self):
+        """Parse the body of the chant, if that has not happened yet"""
+        body = self.__dict__.get('_gabcBody')
+        if body is None:
+            return
+        
+        # Mark the chant as loaded before inserting the elements, which
+        # accesses _elements again
+        self._gabcBody = None
+        try:
+            parse = _getBodyParser().parse(body,
+                limits=self.__dict__.get('_gabcLimits'))
+            ch = visitParseTree(parse, VisitorGABC())
+        except:
+            self._gabcBody = body
+            raise
+        for el in ch.elements:
+            self.coreInsert(ch.elementOffset(el), el)
+        self.coreElementsChanged()
+
+    # music21 streams store their elements in the _elements list; all
+    # methods that access the elements pass through here.
+    @property
+    def _elements(self):
+        if self.__dict__.get('_gabcBody') is not None:
+            self.load()
+        return self.__dict__['_elements']
+
+    @_elements.setter
+    def _elements(self, value):
+        self.__dict__['_elements'] = value
+
+    def _deepcopySubclassable(self, *args, **kwargs):
+        self.load()
+        return super()._deepcopySubclassable(*args, **kwargs)
+
+    def __getstate__(self):
+        self.load()
+        return super().__getstate__()
+
 class ConverterGABC(converter.subConverters.SubConverter):
+    """Music21 subconverter for gabc. If the keyword ``lazy=True`` is passed
+    to :func:`music21.converter.parse`, only the header is parsed immediately
+    and a :class:`LazyChant` is returned. Limits on the conversion can be
+    passed using the keyword ``limits`` (see 
+    :class:`chant21.limits.ConversionLimits`)."""
     registerFormats = ('gabc', 'GABC')
     registerInputExtensions = ('gabc', 'GABC')
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.parser = ParserGABC(root='file')
+        self._parser = None
         self.visitor = VisitorGABC()
 
+    @property
+    def parser(self):
+        # Lazy chants never need the (expensive) file parser
+        if self._parser is None:
+            self._parser = ParserGABC(root='file')
+        return self._parser
+
     def parseData(self, strData, number=None):
-        parse = self.parser.parse(strData)
-        ch = visitParseTree(parse, self.visitor)
-        self.stream = ch
+        limits = self.keywords.get('limits')
+        if self.keywords.get('lazy', False):
+            self.stream = LazyChant(strData, limits=limits)
+        else:
+            parse = self.parser.parse(strData, limits=limits)
+            ch = visitParseTree(parse, self.visitor)
+            self.stream = ch
+
+    def parseFile(self, filePath, number=None, **keywords):
+        return super().parseFile(filePath, number=number)
+
+converter.registerSubconverter(ConverterGABC)
+
+###
 
-converter.registerSubconverter(ConverterGABC)
\ No newline at end of file
+def _convertGABCFileOrError(args):
+    filename, limits, kwargs = args
+    try:
+        ch = converter.parse(filename, format='gabc', forceSource=True,
+            storePickle=False, limits=limits)
+        return ch.toObject(**kwargs), None
+    except Exception as error:
+        return None, repr(error)
+
+def _iterConversions(tasks, numWorkers, chunksize):
+    if numWorkers == 1 or len(tasks) <= 1:
+        yield from map(_convertGABCFileOrError, tasks)
+    else:
+        with ProcessPoolExecutor(max_workers=numWorkers) as executor:
+            yield from executor.map(_convertGABCFileOrError, tasks,
+                chunksize=chunksize)
+
+def convertGABCFiles(filenames: list, outputFile, numWorkers: int = None,
+    chunksize: int = 16, limits=None, compression='infer', index: bool = True,
+    **kwargs) -> list:
+    """Convert many gabc files to CHSON in parallel, and write them to a 
+    CHSON Lines file with one chant per line (see 
+    :func:`chant21.chson.writeCHSONLines`). Files that cannot be converted
+    are skipped. This includes files for which the conversion exceeds the
+    ``limits``, so that a single malformed file cannot stall the conversion.
+
+    Args:
+        filenames (list): A list of gabc files
+        outputFile (str or file object): The output file
+        numWorkers (int, optional): The number of worker processes. Defaults
+            to the number of processors. If 1, all files are converted in the
+            current process.
+        chunksize (int, optional): The number of files sent to a worker at
+            once. Defaults to 16.
+        limits (:obj:`chant21.limits.ConversionLimits` or :obj:`dict`,
+            optional): Limits on the conversion of every file
+        compression (str, optional): The compression of the output file:
+            None, ``'gzip'`` or ``'zstd'``. By default this is inferred from 
+            the extension of the filename.
+        index (bool, optional): Whether to write an index, with the chants
+            by filename, next to the output file. Defaults to True.
+        **kwargs: Other keywords are passed to :meth:`Chant.toObject`, for
+            example ``includeEditorial``.
+
+    Returns:
+        list: A list of ``(filename, error)`` tuples for all files that could
+            not be converted
+    """
+    tasks = [(filename, limits, kwargs) for filename in filenames]
+    results = _iterConversions(tasks, numWorkers, chunksize)
+    results = ((filename, obj, error) 
+        for filename, (obj, error) in zip(filenames, results))
+    _, errors = _writeConversions(results, outputFile, 
+        compression=compression, index=index)
+    return errors
\ No newline at end of file
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+# Name:         gabc/header.py
+# Purpose:      fast, header-only reading of gabc files
+#
+# Authors:      Bas Cornelissen
+#
+# Copyright:    Copyright © 2020-present Bas Cornelissen
+# License:      see LICENSE
+# ------------------------------------------------------------------------------
+"""
+Reading the header of a gabc file does not require parsing the music. The
+functions in this module read a gabc file only up to the first header
+separator (``%%``) and parse the attributes in the header directly, following
+the rules of the ``header`` and ``attribute`` rules in ``gabc.peg``. This
+is much faster than a full conversion, and convenient for building catalogues
+of large collections such as GregoBase:
+
+>>> header = readGABCHeader('chant21/examples/kyrie.gabc')
+>>> header['mode']
+'1'
+>>> catalogue = indexGABCDirectory('chant21/examples')
+>>> catalogue.loc['kyrie.gabc', 'office-part']
+'Kyriale'
+
+Note that only the first header is read: gabc files with multiple header
+sections are rare, and the full parser merges all of them.
+"""
+import re
+import os
+import glob
+from concurrent.futures import ProcessPoolExecutor
+
+from .parser import IncompleteParseError
+
+__all__ = [
+    'parseGABCHeader',
+    'splitGABCHeader',
+    'readGABCHeader',
+    'readGABCHeaders',
+    'indexGABCDirectory'
+]
+
+# The terminals of the `attribute` rule in gabc.peg. Like the PEG parser, we
+# match them one by one: the value cannot backtrack to make the ';' match.
+ATTRIBUTE_KEY = re.compile(r'[^:;%]+')
+ATTRIBUTE_COLON = re.compile(r':[ ]*')
+ATTRIBUTE_VALUE = re.compile(r'[^%;]+(;\ [^%;]+)*')
+ATTRIBUTE_END = re.compile(r';(\n)*')
+SEPARATOR = re.compile(r'(\n)*%%(\n)+')
+
+def _matchAttributes(gabc, pos=0):
+    """Match as many attributes as possible, starting at position `pos`.
+    Returns the attributes and the position after the last attribute."""
+    attributes = {}
+    while pos < len(gabc):
+        key = ATTRIBUTE_KEY.match(gabc, pos)
+        colon = key and ATTRIBUTE_COLON.match(gabc, key.end())
+        value = colon and ATTRIBUTE_VALUE.match(gabc, colon.end())
+        end = value and ATTRIBUTE_END.match(gabc, value.end())
+        if not end:
+            break
+        attributes[key.group()] = value.group()
+        pos = end.end()
+    return attributes, pos
+
+def parseGABCHeader(header: str) -> dict:
+    """Parse the attributes in a gabc header (the part before the ``%%``
+    separator). The result is identical to the header dictionary produced
+    by :class:`VisitorGABC`.
+
+    >>> parseGABCHeader('name:Kyrie;\\nmode:1;\\n')
+    {'name': 'Kyrie', 'mode': '1'}
+
+    Args:
+        header (str): The header string, without the separator
+
+    Raises:
+        IncompleteParseError: If the header does not consist of attributes
+
+    Returns:
+        dict: A dictionary with all the attributes
+    """
+    attributes, pos = _matchAttributes(header)
+    if pos < len(header):
+        raise IncompleteParseError(
+            f'Parsing of the header ended at position {pos} '
+            f'(header length {len(header)})')
+    return attributes
+
+def splitGABCHeader(gabc: str) -> tuple:
+    """Split a gabc string in the header and the body, following the rule
+    ``file = (header separator)* body EOF`` in ``gabc.peg``. The attributes
+    of all header sections are merged, as in :class:`VisitorGABC`. The body
+    is returned as a string and is not parsed.
+
+    >>> splitGABCHeader('name:Kyrie;\\n%%\\n(c4) Ky(f)')
+    ({'name': 'Kyrie'}, '(c4) Ky(f)')
+
+    Args:
+        gabc (str): A gabc string
+
+    Returns:
+        tuple: A tuple ``(header, body)`` of the header dictionary and the 
+            body string
+    """
+    header = {}
+    pos = 0
+    while True:
+        attributes, end = _matchAttributes(gabc, pos)
+        separator = SEPARATOR.match(gabc, end)
+        if not separator:
+            break
+        header.update(attributes)
+        pos = separator.end()
+    return header, gabc[pos:]
+
+def readGABCHeader(filename: str) -> dict:
+    """Read and parse the header of a gabc file. The file is read line by line
+    up to the header separator (``%%``); the body of the chant is not decoded
+    or parsed. Files without a header, which start with the music directly,
+    have an empty header.
+
+    Args:
+        filename (str): The gabc file
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        IncompleteParseError: If the header cannot be parsed
+
+    Returns:
+        dict: A dictionary with all the attributes in the header
+    """
+    lines = []
+    hasSeparator = False
+    with open(filename, 'rb') as handle:
+        for line in handle:
+            # Keys and values cannot contain a %, so the first one has to
+            # start the separator
+            if b'%' in line:
+                index = line.index(b'%')
+                lines.append(line[:index])
+                hasSeparator = line[index:].rstrip(b'\r\n') == b'%%'
+                break
+            # Bodies start with music, headers with a key
+            elif len(lines) == 0 and line.startswith(b'('):
+                break
+            lines.append(line)
+    if not hasSeparator:
+        return {}
+
+    # Use universal newlines, as when opening the file in text mode
+    header = b''.join(lines).decode('utf-8')
+    header = header.replace('\r\n', '\n').replace('\r', '\n')
+
+    # The separator can be preceded by newlines
+    header = header.rstrip('\n')
+    return parseGABCHeader(header)
+
+def _readGABCHeaderOrError(filename):
+    try:
+        return readGABCHeader(filename), None
+    except (IncompleteParseError, UnicodeDecodeError, OSError) as error:
+        return {}, f'{type(error).__name__}: {error}'
+
+def readGABCHeaders(filenames: list, numWorkers: int = None,
+    chunksize: int = 64) -> list:
+    """Read the headers of many gabc files in parallel.
+
+    Args:
+        filenames (list): A list of gabc files
+        numWorkers (int, optional): The number of worker processes. Defaults
+            to the number of processors. If 1, all headers are read in the
+            current process.
+        chunksize (int, optional): The number of files sent to a worker at
+            once. Defaults to 64.
+
+    Returns:
+        list: A list of ``(header, error)`` tuples, one for every file. If
+            the header could not be read, the header is empty and the error
+            is a string describing the exception.
+    """
+    if numWorkers == 1 or len(filenames) <= 1:
+        return [_readGABCHeaderOrError(fn) for fn in filenames]
+    with ProcessPoolExecutor(max_workers=numWorkers) as executor:
+        return list(executor.map(_readGABCHeaderOrError, filenames,
+            chunksize=chunksize))
+
+def indexGABCDirectory(directory: str, pattern: str = '*.gabc',
+    numWorkers: int = None, chunksize: int = 64):
+    """Build a catalogue of the headers of all gabc files in a directory.
+
+    Args:
+        directory (str): The directory containing the gabc files
+        pattern (str, optional): A glob pattern for the gabc files, relative
+            to the directory. Defaults to ``'*.gabc'``.
+        numWorkers (int, optional): The number of worker processes; see
+            :func:`readGABCHeaders`.
+        chunksize (int, optional): See :func:`readGABCHeaders`.
+
+    Returns:
+        pandas.DataFrame: A data frame indexed by the filenames (relative to
+            the directory), with one column per header attribute. Files whose
+            header could not be read are described in the ``error`` column.
+    """
+    import pandas as pd
+    filenames = sorted(glob.glob(os.path.join(directory, pattern)))
+    results = readGABCHeaders(filenames, numWorkers=numWorkers,
+        chunksize=chunksize)
+    index = [os.path.relpath(fn, directory) for fn in filenames]
+    rows = []
+    for header, error in results:
+        row = dict(header)
+        row['error'] = error
+        rows.append(row)
+    return pd.DataFrame(rows, index=index)
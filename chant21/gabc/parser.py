@@ -1,7 +1,15 @@
 import os.path
+from arpeggio import NoMatch
 from arpeggio.cleanpeg import ParserPEG
+from ..profiling import getRules
+from ..limits import limitParsing
 
-GRAMMAR_PATH = os.path.join(os.path.dirname(__file__), 'gabc.peg')
+# The optimized grammar parses gabc identically to the (more readable) 
+# reference grammar gabc.peg, but faster.
+GRAMMAR_PATH = os.path.join(os.path.dirname(__file__), 'gabc_optimized.peg')
+REFERENCE_GRAMMAR_PATH = os.path.join(os.path.dirname(__file__), 'gabc.peg')
+
+_NO_MATCH = object()
 
 class ParserGABC():
     """
@@ -12,34 +20,85 @@ class ParserGABC():
     """
 
     def __init__(self, grammarPath: str = GRAMMAR_PATH, root: str = 'file',
-        **kwargs) -> None:
+        memoization=False, **kwargs) -> None:
         """
         Args:
             grammar_path (:obj:`str`, optional): path to the grammar file 
-                (default is gabc/gabc.peg)
+                (default is gabc/gabc_optimized.peg)
             root (:obj:`str`, optional): the root element of the parser 
                 (default is 'file')
+            memoization (:obj:`bool` or :obj:`list`, optional): Whether to
+                memoize the results of all rules (True), of no rules (False, 
+                the default) or only of the rules in a list of rule names.
+                Memoization avoids parsing the same input twice after
+                backtracking, but has a considerable overhead. Use 
+                :func:`chant21.profiling.profileGrammar` to find the rules
+                that benefit from it.
         """
         if not os.path.exists(grammarPath):
             raise Exception(f'Grammar file ({ grammarPath }) does not exist')
 
         with open(grammarPath, 'r') as handle:
             grammar = handle.read()
-            
-        self.parser = ParserPEG(grammar, root, skipws=False, memoization=True, **kwargs)
+        
+        memoizeAll = memoization is True
+        self.parser = ParserPEG(grammar, root, skipws=False, 
+            memoization=memoizeAll, **kwargs)
+        
+        self._caches = []
+        if memoization and not memoizeAll:
+            rules = getRules(self.parser)
+            for ruleName in memoization:
+                if ruleName not in rules:
+                    raise ValueError(f'Unknown rule: {ruleName}')
+                self._memoize(rules[ruleName])
+
+    def _memoize(self, expression):
+        """Memoize the results of a single rule"""
+        parse = expression.parse
+        cache = {}
+        self._caches.append(cache)
 
-    def parse(self, gabc: str, debug=False):
+        def memoizedParse(parser):
+            position = parser.position
+            if position in cache:
+                result, parser.position = cache[position]
+                if result is _NO_MATCH:
+                    raise parser.nm
+                return result
+            try:
+                result = parse(parser)
+            except NoMatch:
+                cache[position] = (_NO_MATCH, position)
+                raise
+            cache[position] = (result, parser.position)
+            return result
+
+        expression.parse = memoizedParse
+
+    def parse(self, gabc: str, debug=False, limits=None):
         """Parse a gabc string
 
         Args:
             gabc (str): The gabc string to parse
+            limits (:obj:`chant21.limits.ConversionLimits` or :obj:`dict`,
+                optional): Limits on the length of the string and on the 
+                time and memory spent parsing it. Defaults to None.
+
+        Raises:
+            chant21.limits.ConversionLimitError: If a limit is exceeded
 
         Returns:
             arpeggio.NonTerminal: The parse tree
         """
         _debug = self.parser.debug
         self.parser.debug = debug or _debug
-        parse = self.parser.parse(gabc)
+        try:
+            with limitParsing(limits, self.parser, gabc, self._caches):
+                parse = self.parser.parse(gabc)
+        finally:
+            for cache in self._caches:
+                cache.clear()
 
         if type(parse) == list and len(parse) == 0 and len(gabc) > 0:
             raise EmptyParseError()
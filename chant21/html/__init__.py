@@ -68,7 +68,7 @@ def toWidget(chant, showOptions=False, showSections=False,
     Returns:
         str: a HTML string
     """
-    obj = chant.toObject(includeVolpiano=True)
+    obj = chant.toObject(includeVolpiano=True, cached=True)
     html = WIDGET.render(chant=obj,
                          showOptions=showOptions,
                          showSections=showSections, 
@@ -95,7 +95,7 @@ def toFile(chant, filepath=None, showOptions=True, showSections=False,
     Returns:
         str: The HTML string is returned if no ``filepath`` is specified.
     """
-    obj = chant.toObject(includeVolpiano=True)
+    obj = chant.toObject(includeVolpiano=True, cached=True)
     html = FILE.render(chant=obj, 
                        showOptions=showOptions, 
                        showSections=showSections, 
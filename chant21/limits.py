@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+# Name:         limits.py
+# Purpose:      per-input limits on the conversion of chants
+#
+# Authors:      Bas Cornelissen
+#
+# Copyright:    Copyright © 2020-present Bas Cornelissen
+# License:      see LICENSE
+# ------------------------------------------------------------------------------
+"""
+Limits on the resources used to convert a single input. Some malformed inputs
+(for example gabc files with very long lines of text) make the PEG parsers
+backtrack excessively, or fill the memoization tables of the parser. When
+converting large corpora, one such input should not stall the whole batch.
+The gabc and Cantus converters therefore accept ``limits``: a
+:class:`ConversionLimits` object or a dictionary with its arguments. When a
+limit is exceeded, a :class:`ConversionLimitError` is raised:
+
+>>> from music21 import converter
+>>> ch = converter.parse('(c4) A(f)', format='gabc', limits=dict(maxLength=5))
+Traceback (most recent call last):
+...
+chant21.limits.ConversionLimitError: Input length exceeds the limit: 9 > 5 characters
+
+Batch conversions such as :func:`chant21.cantus.convertCantusCSV` and
+:func:`chant21.gabc.convertGABCFiles` record these errors and continue with
+the next input.
+
+The length of the input is checked before parsing. The time and the size of
+the memoization tables are checked while parsing, every ``checkInterval``
+attempts to match a rule of the grammar. A single regular expression match
+cannot be interrupted, so the time limit can be exceeded somewhat; the length
+limit bounds the time spent on such matches.
+"""
+from time import perf_counter
+from contextlib import nullcontext
+from .profiling import getRules
+
+__all__ = [
+    'ConversionLimitError',
+    'ConversionLimits',
+    'limitParsing'
+]
+
+_UNITS = {
+    'time': 'seconds',
+    'length': 'characters',
+    'memo': 'entries'
+}
+
+_NAMES = {
+    'time': 'Parsing time',
+    'length': 'Input length',
+    'memo': 'Memoization table size'
+}
+
+class ConversionLimitError(Exception):
+    """Raised when the conversion of an input exceeds one of its limits.
+
+    Attributes:
+        limit (str): The limit that was exceeded: ``'time'``, ``'length'``
+            or ``'memo'``
+        value (float): The value that exceeded the limit
+        maximum (float): The limit
+    """
+
+    def __init__(self, limit: str, value, maximum):
+        # Pass all arguments to Exception, so that the error can be pickled
+        # and sent back from worker processes
+        super().__init__(limit, value, maximum)
+        self.limit = limit
+        self.value = value
+        self.maximum = maximum
+
+    def __str__(self):
+        value = f'{self.value:.2f}' if self.limit == 'time' else self.value
+        return (f'{_NAMES[self.limit]} exceeds the limit: {value} > '
+            f'{self.maximum} {_UNITS[self.limit]}')
+
+def _getExpressions(parser) -> list:
+    """Collect all parsing expressions in the model of an Arpeggio parser"""
+    expressions = []
+    visited = set()
+    todo = [parser.parser_model]
+    while todo:
+        expression = todo.pop()
+        if id(expression) in visited:
+            continue
+        visited.add(id(expression))
+        expressions.append(expression)
+        todo.extend(expression.nodes)
+    return expressions
+
+class _ParseGuard():
+    """Context manager that enforces the time and memo size limits while
+    parsing. Like :class:`chant21.profiling.GrammarProfiler`, it temporarily
+    wraps the ``parse`` method of every named rule of the parser."""
+
+    def __init__(self, limits, parser, caches=()):
+        self.limits = limits
+        self.parser = parser
+        self.caches = caches
+        self._rules = list(getRules(parser).values())
+        self._expressions = []
+        if limits.maxMemoSize is not None and parser.memoization:
+            self._expressions = _getExpressions(parser)
+        self._originalParse = {}
+        self._countdown = limits.checkInterval
+        self._start = None
+
+    def memoSize(self) -> int:
+        """The total number of entries in the memoization tables"""
+        size = sum(len(cache) for cache in self.caches)
+        size += sum(len(e._result_cache) for e in self._expressions)
+        return size
+
+    def check(self):
+        """Raise a ConversionLimitError if a limit has been exceeded"""
+        limits = self.limits
+        if limits.maxTime is not None:
+            duration = perf_counter() - self._start
+            if duration > limits.maxTime:
+                raise ConversionLimitError('time', duration, limits.maxTime)
+        if limits.maxMemoSize is not None:
+            size = self.memoSize()
+            if size > limits.maxMemoSize:
+                raise ConversionLimitError('memo', size, limits.maxMemoSize)
+
+    def _wrap(self, expression):
+        parse = expression.parse
+        interval = self.limits.checkInterval
+
+        def limitedParse(arpeggioParser):
+            self._countdown -= 1
+            if self._countdown <= 0:
+                self._countdown = interval
+                self.check()
+            return parse(arpeggioParser)
+
+        return limitedParse
+
+    def __enter__(self):
+        for expression in self._rules:
+            # Rules can already have been wrapped, e.g. to memoize them
+            if 'parse' in expression.__dict__:
+                self._originalParse[expression] = expression.parse
+            expression.parse = self._wrap(expression)
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        for expression in self._rules:
+            if expression in self._originalParse:
+                expression.parse = self._originalParse.pop(expression)
+            else:
+                del expression.parse
+
+class ConversionLimits():
+    """Limits on the conversion of a single input.
+
+    >>> limits = ConversionLimits(maxTime=10, maxLength=100_000)
+    >>> limits.checkLength('(c4) A(f)')
+
+    Attributes:
+        maxTime (float): The maximum time spent parsing, in seconds
+        maxLength (int): The maximum length of the input, in characters
+        maxMemoSize (int): The maximum number of entries in the
+            memoization tables of the parser
+        checkInterval (int): The number of attempts to match a rule after
+            which the time and the memo size are checked
+    """
+
+    def __init__(self, maxTime: float = None, maxLength: int = None,
+        maxMemoSize: int = None, checkInterval: int = 1000):
+        """
+        Args:
+            maxTime (float, optional): The maximum time spent parsing, in
+                seconds. Defaults to None (no limit).
+            maxLength (int, optional): The maximum length of the input, in
+                characters. Defaults to None (no limit).
+            maxMemoSize (int, optional): The maximum number of entries in the
+                memoization tables of the parser. Defaults to None (no limit).
+            checkInterval (int, optional): The number of attempts to match a
+                rule after which the time and the memo size are checked.
+                Defaults to 1000.
+        """
+        if checkInterval < 1:
+            raise ValueError('The check interval should be at least 1')
+        self.maxTime = maxTime
+        self.maxLength = maxLength
+        self.maxMemoSize = maxMemoSize
+        self.checkInterval = checkInterval
+
+    def __repr__(self):
+        return (f'ConversionLimits(maxTime={self.maxTime}, '
+            f'maxLength={self.maxLength}, maxMemoSize={self.maxMemoSize}, '
+            f'checkInterval={self.checkInterval})')
+
+    @classmethod
+    def create(cls, limits):
+        """Create limits from a dictionary of arguments. Limits objects and
+        None are returned as is.
+
+        Args:
+            limits (ConversionLimits, dict or None): The limits
+
+        Returns:
+            ConversionLimits: The limits, or None
+        """
+        if limits is None or isinstance(limits, cls):
+            return limits
+        return cls(**limits)
+
+    def checkLength(self, string: str):
+        """Check the length of an input.
+
+        Args:
+            string (str): The input
+
+        Raises:
+            ConversionLimitError: If the input is too long
+        """
+        if self.maxLength is not None and len(string) > self.maxLength:
+            raise ConversionLimitError('length', len(string), self.maxLength)
+
+    def guard(self, parser, string: str, caches=()):
+        """Return a context manager that enforces the limits while parsing a
+        string. The length of the string is checked immediately.
+
+        Args:
+            parser (arpeggio.Parser): The Arpeggio parser
+            string (str): The input that will be parsed
+            caches (iterable, optional): Additional memoization tables
+                (dictionaries) to include in the memo size, such as those of
+                :class:`chant21.gabc.ParserGABC`
+
+        Raises:
+            ConversionLimitError: If the input is too long
+
+        Returns:
+            A context manager
+        """
+        self.checkLength(string)
+        if self.maxTime is None and self.maxMemoSize is None:
+            return nullcontext()
+        return _ParseGuard(self, parser, caches=caches)
+
+def limitParsing(limits, parser, string: str, caches=()):
+    """Return a context manager that enforces limits while parsing a string,
+    or does nothing if there are no limits. See :meth:`ConversionLimits.guard`.
+
+    Args:
+        limits (ConversionLimits, dict or None): The limits
+        parser (arpeggio.Parser): The Arpeggio parser
+        string (str): The input that will be parsed
+        caches (iterable, optional): Additional memoization tables
+
+    Returns:
+        A context manager
+    """
+    limits = ConversionLimits.create(limits)
+    if limits is None:
+        return nullcontext()
+    return limits.guard(parser, string, caches=caches)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+# Name:         melody.py
+# Purpose:      extracting melodic sequences from chants and volpiano
+#
+# Authors:      Bas Cornelissen
+#
+# Copyright:    Copyright © 2020-present Bas Cornelissen
+# License:      see LICENSE
+# ------------------------------------------------------------------------------
+"""
+Functions that extract the melody of a chant as a sequence of integers, for
+comparing melodies at scale. Pitches are represented by their diatonic note
+number (see :attr:`music21.pitch.Pitch.diatonicNoteNum`), which ignores
+alterations: the gamut of chant is essentially diatonic. The melody can be
+extracted from a :class:`chant21.chant.Chant`, or directly from a volpiano
+string, which is much faster as it does not require parsing:
+
+>>> volpianoToPitches('1---f-g--h---g')
+[32, 33, 34, 33]
+>>> pitchesToIntervals([32, 33, 34, 33])
+[1, 1, -1]
+
+Melodies can also be segmented in neumes or syllables:
+
+>>> volpianoToSegments('1---fg-h--g---f', granularity='syllable')
+[(32, 33, 34), (33,), (32,)]
+>>> volpianoToSegments('1---fg-h--g---f', granularity='neume')
+[(32, 33), (34,), (33,), (32,)]
+"""
+import re
+from music21 import note
+from .chant import Neume
+from .chant import Syllable
+
+__all__ = [
+    'VOLPIANO_NOTES',
+    'volpianoToPitches',
+    'chantToPitches',
+    'pitchesToIntervals',
+    'volpianoToSegments',
+    'chantToSegments'
+]
+
+GRANULARITIES = ('note', 'neume', 'syllable')
+
+# In volpiano, neumes are separated by one hyphen and syllables by two (or 
+# three, at word boundaries)
+_VOLPIANO_BOUNDARIES = {
+    'note': re.compile(r''),
+    'neume': re.compile(r'-+'),
+    'syllable': re.compile(r'-{2,}')
+}
+
+# Diatonic note number of the lowest volpiano note (F3, volpiano 8); see
+# chant.pitchToVolpiano
+LOWEST_VOLPIANO_PITCH = 25
+
+VOLPIANO_NOTES = {}
+"""dict: Maps volpiano note characters (including liquescents) to diatonic
+note numbers"""
+for index, (char, liquescent) in enumerate(zip('89abcdefghjklmnopqrs',
+    '()ABCDEFGHJKLMNOPQRS')):
+    VOLPIANO_NOTES[char] = LOWEST_VOLPIANO_PITCH + index
+    VOLPIANO_NOTES[liquescent] = LOWEST_VOLPIANO_PITCH + index
+
+def volpianoToPitches(volpiano: str) -> list:
+    """Extract the pitches of all notes in a volpiano string. All other
+    characters (clefs, barlines, alterations, hyphens) are ignored.
+
+    Args:
+        volpiano (str): A volpiano string
+
+    Returns:
+        list: A list of diatonic note numbers
+    """
+    return [VOLPIANO_NOTES[char] for char in volpiano if char in VOLPIANO_NOTES]
+
+def chantToPitches(chant) -> list:
+    """Extract the pitches of all notes in a chant.
+
+    Args:
+        chant (chant21.chant.Chant): The chant, or any other music21 stream
+
+    Returns:
+        list: A list of diatonic note numbers
+    """
+    return [el.pitch.diatonicNoteNum for el in chant.recurse()
+            if isinstance(el, note.Note)]
+
+def pitchesToIntervals(pitches: list) -> list:
+    """Convert a sequence of pitches to the (diatonic) intervals between
+    consecutive pitches. Intervals do not depend on the transposition of the
+    melody.
+
+    Args:
+        pitches (list): A list of diatonic note numbers
+
+    Returns:
+        list: A list of intervals, one shorter than the list of pitches
+    """
+    return [b - a for a, b in zip(pitches[:-1], pitches[1:])]
+
+def volpianoToSegments(volpiano: str, granularity: str = 'neume') -> list:
+    """Segment the melody in a volpiano string in neumes or syllables. Every
+    segment is represented by a tuple of pitches; segments without notes
+    (e.g. the clef) are omitted.
+
+    Args:
+        volpiano (str): A volpiano string
+        granularity (str, optional): The segments: ``'note'``, ``'neume'``
+            or ``'syllable'``. Defaults to ``'neume'``.
+
+    Returns:
+        list: A list of tuples of diatonic note numbers
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f'Unknown granularity: {granularity}')
+    if granularity == 'note':
+        return [(pitch,) for pitch in volpianoToPitches(volpiano)]
+    segments = []
+    for part in _VOLPIANO_BOUNDARIES[granularity].split(volpiano):
+        pitches = volpianoToPitches(part)
+        if len(pitches) > 0:
+            segments.append(tuple(pitches))
+    return segments
+
+def chantToSegments(chant, granularity: str = 'neume') -> list:
+    """Segment the melody of a chant in neumes or syllables; see 
+    :func:`volpianoToSegments`.
+
+    Args:
+        chant (chant21.chant.Chant): The chant
+        granularity (str, optional): The segments: ``'note'``, ``'neume'``
+            or ``'syllable'``. Defaults to ``'neume'``.
+
+    Returns:
+        list: A list of tuples of diatonic note numbers
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f'Unknown granularity: {granularity}')
+    if granularity == 'note':
+        return [(pitch,) for pitch in chantToPitches(chant)]
+    cls = Neume if granularity == 'neume' else Syllable
+    segments = []
+    for segment in chant.recurse().getElementsByClass(cls):
+        pitches = chantToPitches(segment)
+        if len(pitches) > 0:
+            segments.append(tuple(pitches))
+    return segments
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+# Name:         midi.py
+# Purpose:      fast MIDI rendering of chants
+#
+# Authors:      Bas Cornelissen
+#
+# Copyright:    Copyright © 2020-present Bas Cornelissen
+# License:      see LICENSE
+# ------------------------------------------------------------------------------
+"""
+A lightweight MIDI writer for chants. Rendering chants through music21's MIDI
+translation (``chant.flatter.write('midi')``) is slow, and gives every note
+the same duration. This writer reads the melody of a chant once into arrays,
+and then encodes all MIDI events at once using numpy. The durations of
+liquescents (including notes with liquescent gabc neume shapes, such as
+``f~``), of the last notes of neumes and of the rests at pausas can be
+configured (see :data:`DEFAULT_DURATIONS`):
+
+>>> from music21 import converter
+>>> ch = converter.parse('cantus: 1---fg--h---3')
+>>> data = toMIDI(ch, durations=dict(neumeEnd=1.5))
+>>> data[:4]
+b'MThd'
+
+Melodies can also be rendered directly from arrays, for example a
+:class:`chant21.chbin.ChantArrays` read from CHBIN data, without creating a
+chant at all. :func:`writeMIDIFiles` renders many chants in parallel.
+"""
+import struct
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from music21 import note
+from .chant import Chant21Object
+from .chant import Neume
+from .chant import Note
+from .chant import PausaMinima
+from .chant import PausaMinor
+from .chant import PausaMajor
+from .chant import PausaFinalis
+from .chbin import ChantArrays
+
+__all__ = [
+    'DEFAULT_DURATIONS',
+    'toMIDI',
+    'arraysToMIDI',
+    'writeMIDIFiles'
+]
+
+TICKS_PER_QUARTER = 480
+
+DEFAULT_DURATIONS = {
+    'note': 1.0,
+    'liquescent': 0.5,
+    'neumeEnd': 1.0,
+    'pausaMinima': 0.5,
+    'pausaMinor': 1.0,
+    'pausaMajor': 2.0,
+    'pausaFinalis': 3.0
+}
+"""dict: The default durations in quarter notes. Notes last ``note`` quarter
+notes, except liquescents (``liquescent``) and the last note of every neume
+(``neumeEnd``). Pausae are rendered as rests of the given durations."""
+
+_PAUSAS = ('pausaMinima', 'pausaMinor', 'pausaMajor', 'pausaFinalis')
+_PAUSA_CLASSES = {PausaMinima: 1, PausaMinor: 2, PausaMajor: 3, PausaFinalis: 4}
+
+# Semitones above C of the diatonic steps C, D, E, F, G, A, B
+_SEMITONES = np.array([0, 2, 4, 5, 7, 9, 11])
+
+def _chantToArrays(chant) -> ChantArrays:
+    """Read the notes, neumes and pausas of a chant into a ChantArrays object.
+    This is the only place where the chant is traversed."""
+    pitches, alterations, liquescent, neumes, pausas = [], [], [], [], []
+    neumeIndex = -1
+
+    def visit(container):
+        nonlocal neumeIndex
+        for el in container.elements:
+            if isinstance(el, note.Note):
+                pitch = el.pitch
+                pitches.append(pitch.diatonicNoteNum)
+                accidental = pitch.accidental
+                alterations.append(int(accidental.alter) if accidental else 0)
+                liquescent.append(isinstance(el, Note)
+                    and el.noteInfo.isLiquescent)
+                neumes.append(neumeIndex)
+                pausas.append(0)
+            elif type(el) in _PAUSA_CLASSES:
+                if len(pausas) > 0:
+                    pausas[-1] = max(pausas[-1], _PAUSA_CLASSES[type(el)])
+            elif isinstance(el, Chant21Object) and el.isStream:
+                if isinstance(el, Neume):
+                    neumeIndex += 1
+                visit(el)
+
+    visit(chant)
+    return ChantArrays(pitches, alterations, liquescent, neume=neumes,
+        syllable=[], word=[], section=[], lyrics=[], metadata=None,
+        pausas=pausas)
+
+def _variableLengthEvents(deltas, events) -> bytes:
+    """Encode MIDI events with their delta times (as variable-length
+    quantities) at once. The events are an array with one row of bytes per
+    event."""
+    if len(deltas) == 0:
+        return b''
+    if deltas.max() >= 1 << 28:
+        raise ValueError('Durations are too long to be encoded in MIDI')
+    numBytes = (1 + (deltas >= 1 << 7) + (deltas >= 1 << 14)
+        + (deltas >= 1 << 21))
+    sizes = numBytes + events.shape[1]
+    starts = np.cumsum(sizes) - sizes
+    data = np.zeros(starts[-1] + sizes[-1], dtype=np.uint8)
+    for k in range(4):
+        hasByte = numBytes > k
+        remaining = numBytes[hasByte] - 1 - k
+        byte = (deltas[hasByte] >> (7 * remaining)) & 0x7F
+        data[starts[hasByte] + k] = byte | np.where(remaining > 0, 0x80, 0)
+    for j in range(events.shape[1]):
+        data[starts + numBytes + j] = events[:, j]
+    return data.tobytes()
+
+def _variableLength(value: int) -> bytes:
+    return _variableLengthEvents(np.array([value]),
+        np.zeros((1, 0), dtype=np.uint8))
+
+def _metaEvent(kind: int, data: bytes) -> bytes:
+    return bytes([0, 0xFF, kind]) + _variableLength(len(data)) + data
+
+def arraysToMIDI(pitches, alterations=None, liquescent=None, neume=None,
+    pausas=None, durations: dict = None, tempo: float = 120,
+    velocity: int = 80, channel: int = 0, program: int = None,
+    name: str = None) -> bytes:
+    """Render a melody given as arrays to a MIDI file (format 0).
+
+    Args:
+        pitches (array): The diatonic note numbers of the notes (C4 is 29)
+        alterations (array, optional): The alteration of every note in
+            semitones (e.g. -1 for a flat). Defaults to no alterations.
+        liquescent (array, optional): Whether the notes are liquescent.
+            Defaults to none.
+        neume (array, optional): The index of the neume of every note, used
+            to find the last notes of neumes. By default, all notes are
+            neume ends.
+        pausas (array, optional): The pausa following every note: 0 for none,
+            and 1, 2, 3, 4 for a pausa minima, minor, major and finalis.
+            Defaults to none.
+        durations (dict, optional): Durations in quarter notes, overriding
+            those in :data:`DEFAULT_DURATIONS`
+        tempo (float, optional): The tempo in quarter notes per minute.
+            Defaults to 120.
+        velocity (int, optional): The velocity of all notes. Defaults to 80.
+        channel (int, optional): The MIDI channel (0-15). Defaults to 0.
+        program (int, optional): The MIDI program (instrument, 0-127) to
+            select, if any. Defaults to None.
+        name (str, optional): The name of the track, if any
+
+    Raises:
+        ValueError: if a pitch is outside the MIDI range, an unknown or
+            negative duration is passed, the tempo is not positive or too 
+            slow to be encoded, or the channel, velocity or program is invalid
+
+    Returns:
+        bytes: The MIDI file
+    """
+    if not 0 <= channel <= 15:
+        raise ValueError('The channel should be in the range 0-15')
+    if not 0 <= velocity <= 127:
+        raise ValueError('The velocity should be in the range 0-127')
+    if program is not None and not 0 <= program <= 127:
+        raise ValueError('The program should be in the range 0-127')
+    if durations is None:
+        durations = DEFAULT_DURATIONS
+    else:
+        unknown = set(durations) - set(DEFAULT_DURATIONS)
+        if unknown:
+            raise ValueError(f'Unknown durations: {", ".join(sorted(unknown))}')
+        durations = dict(DEFAULT_DURATIONS, **durations)
+        negative = [key for key, value in durations.items() if value < 0]
+        if negative:
+            raise ValueError(
+                f'Negative durations: {", ".join(sorted(negative))}')
+    if not tempo > 0:
+        raise ValueError('The tempo should be positive')
+    microseconds = int(round(60_000_000 / tempo))
+    if microseconds >= 1 << 24:
+        raise ValueError('The tempo is too slow to be encoded in MIDI')
+    ticks = lambda key: int(round(durations[key] * TICKS_PER_QUARTER))
+
+    pitches = np.asarray(pitches, dtype=np.int64)
+    numNotes = len(pitches)
+    steps = pitches - 1
+    midiPitches = 12 * (steps // 7 + 1) + _SEMITONES[steps % 7]
+    if alterations is not None:
+        midiPitches += np.asarray(alterations, dtype=np.int64)
+    if numNotes > 0 and (midiPitches.min() < 0 or midiPitches.max() > 127):
+        raise ValueError('Pitches should be in the MIDI range 0-127')
+
+    noteTicks = np.full(numNotes, ticks('note'), dtype=np.int64)
+    isNeumeEnd = np.ones(numNotes, dtype=bool)
+    if neume is not None:
+        neume = np.asarray(neume)
+        isNeumeEnd[:-1] = neume[1:] != neume[:-1]
+    noteTicks[isNeumeEnd] = ticks('neumeEnd')
+    if liquescent is not None:
+        noteTicks[np.asarray(liquescent, dtype=bool)] = ticks('liquescent')
+
+    restTicks = np.zeros(numNotes + 1, dtype=np.int64)
+    if pausas is not None:
+        pausaTicks = np.array([0] + [ticks(key) for key in _PAUSAS])
+        restTicks[1:] = pausaTicks[np.asarray(pausas, dtype=np.int64)]
+
+    # Every note is a note on event after the rest, and a note off event
+    deltas = np.empty(2 * numNotes, dtype=np.int64)
+    deltas[0::2] = restTicks[:-1]
+    deltas[1::2] = noteTicks
+    events = np.empty((2 * numNotes, 3), dtype=np.uint8)
+    events[0::2, 0] = 0x90 | channel
+    events[1::2, 0] = 0x80 | channel
+    events[:, 1] = np.repeat(midiPitches, 2)
+    events[0::2, 2] = velocity
+    events[1::2, 2] = 0
+
+    track = []
+    if name is not None:
+        track.append(_metaEvent(0x03, name.encode('utf-8')))
+    track.append(_metaEvent(0x51, microseconds.to_bytes(3, 'big')))
+    if program is not None:
+        track.append(bytes([0, 0xC0 | channel, program]))
+    track.append(_variableLengthEvents(deltas, events))
+    track.append(_variableLength(int(restTicks[-1])) + b'\xff\x2f\x00')
+    track = b''.join(track)
+    return (b'MThd' + struct.pack('>IHHH', 6, 0, 1, TICKS_PER_QUARTER)
+        + b'MTrk' + struct.pack('>I', len(track)) + track)
+
+def toMIDI(chant, fp=None, **kwargs):
+    """Render a chant to a MIDI file. The melody is first read into arrays,
+    and then rendered by :func:`arraysToMIDI`.
+
+    Args:
+        chant (chant21.chant.Chant or chant21.chbin.ChantArrays): The chant,
+            or the arrays read from its CHBIN data
+        fp (str, optional): The filename to write to. If None, the data is
+            returned.
+        **kwargs: Keyword arguments passed to :func:`arraysToMIDI`, such as
+            ``durations`` and ``tempo``
+
+    Returns:
+        bytes: The MIDI file, or None if it was written to ``fp``
+    """
+    arrays = chant if isinstance(chant, ChantArrays) else _chantToArrays(chant)
+    data = arraysToMIDI(arrays.pitches, alterations=arrays.alterations,
+        liquescent=arrays.liquescent, neume=arrays.neume,
+        pausas=arrays.pausas, **kwargs)
+    if fp is None:
+        return data
+    with open(fp, 'wb') as handle:
+        handle.write(data)
+
+def _writeMIDIOrError(args):
+    chant, filename, kwargs = args
+    try:
+        if isinstance(chant, str):
+            from music21 import converter
+            chant = converter.parse(chant, forceSource=True,
+                storePickle=False)
+        toMIDI(chant, fp=filename, **kwargs)
+        return None
+    except Exception as error:
+        return f'{type(error).__name__}: {error}'
+
+def writeMIDIFiles(chants, filenames, numWorkers: int = None,
+    chunksize: int = 16, **kwargs) -> list:
+    """Render many chants to MIDI files in parallel.
+
+    Args:
+        chants (iterable): The chants to render. These can be chants,
+            :class:`chant21.chbin.ChantArrays` or filenames of files that
+            music21 can parse (e.g. gabc, CHSON or CHBIN files). Passing
+            filenames is the fastest, as the files are then also parsed by
+            the workers.
+        filenames (iterable): The MIDI filenames, one for every chant
+        numWorkers (int, optional): The number of worker processes. Defaults
+            to the number of processors. If 1, all chants are rendered in the
+            current process.
+        chunksize (int, optional): The number of chants sent to a worker at
+            once. Defaults to 16.
+        **kwargs: Keyword arguments passed to :func:`arraysToMIDI`
+
+    Returns:
+        list: A list with an error for every chant: None if the chant was
+            rendered, or otherwise a string describing the exception.
+    """
+    tasks = [(chant, filename, kwargs)
+             for chant, filename in zip(chants, filenames)]
+    if numWorkers == 1 or len(tasks) <= 1:
+        return [_writeMIDIOrError(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=numWorkers) as executor:
+        return list(executor.map(_writeMIDIOrError, tasks,
+            chunksize=chunksize))
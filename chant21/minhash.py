@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+# Name:         minhash.py
+# Purpose:      near-duplicate melody detection with MinHash and LSH
+#
+# Authors:      Bas Cornelissen
+#
+# Copyright:    Copyright © 2020-present Bas Cornelissen
+# License:      see LICENSE
+# ------------------------------------------------------------------------------
+"""
+Finding chants that share a melody by comparing all pairs of chants is
+infeasible for large corpora. This module represents every melody by the set
+of its *shingles*, the sequences of ``k`` consecutive pitches or intervals,
+and summarizes that set in a fixed-size MinHash signature. The fraction of
+equal entries in two signatures estimates the Jaccard similarity of the
+shingle sets. Locality-sensitive hashing (LSH) of the signatures then finds
+candidate near-duplicates without comparing all pairs:
+
+>>> index = MinHashIndex(k=4, threshold=0.5)
+>>> index.add('a', '1---f-g--h---g--f--h---g--fg')
+>>> index.add('b', '1---f-g--h---g--f--h---g--fh')
+>>> index.add('c', '1---c-d--c---e--d--c---d--cc')
+>>> index.query('1---f-g--h---g--f--h---g--f')
+['a', 'b']
+>>> index.clusters()
+[['a', 'b']]
+
+Melodies can be passed as volpiano strings (which is fastest), as
+:class:`chant21.chant.Chant` objects or as lists of pitches (see
+:mod:`chant21.melody`). By default, shingles consist of intervals, so that
+transposed melodies are considered identical. Signatures only depend on the
+parameters of the index, so an index can be saved, loaded and extended with
+new chants later:
+
+>>> index.save('melodies.npz')
+>>> index = MinHashIndex.load('melodies.npz')
+>>> index.add('d', '1---f-g--h---g--f--h---g--fg')
+"""
+import json
+import numpy as np
+from .melody import volpianoToPitches
+from .melody import chantToPitches
+from .melody import pitchesToIntervals
+
+__all__ = [
+    'MinHashIndex',
+    'shingle',
+    'minhashSignature'
+]
+
+# Hash functions have the form h(x) = (a * x + b) mod PRIME, with x, a and b
+# smaller than 2**32 and 2**31, so that all computations fit in 64 bits
+PRIME = np.uint64(4294967311)
+EMPTY_HASH = np.uint64(2**32)
+MASK_32 = np.uint64(0xFFFFFFFF)
+
+def _mix(x):
+    """The splitmix64 finalizer: a deterministic 64-bit mixing function"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def _toSequence(melody, intervals):
+    if isinstance(melody, str):
+        pitches = volpianoToPitches(melody)
+    elif hasattr(melody, 'recurse'):
+        pitches = chantToPitches(melody)
+    else:
+        pitches = list(melody)
+    return pitchesToIntervals(pitches) if intervals else pitches
+
+def shingle(sequence, k: int) -> np.ndarray:
+    """Hash all shingles (subsequences of length k) of a sequence of integers
+    to 32-bit integers. The hashes are deterministic: they do not depend on
+    the Python process or platform.
+
+    Args:
+        sequence (list): A list of integers, e.g. pitches or intervals
+        k (int): The length of the shingles
+
+    Returns:
+        numpy.ndarray: The unique hashes of all shingles
+    """
+    seq = np.asarray(sequence, dtype=np.int64).astype(np.uint64)
+    if len(seq) < k:
+        return np.zeros(0, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        hashes = np.zeros(len(seq) - k + 1, dtype=np.uint64)
+        for i in range(k):
+            hashes = _mix(hashes ^ seq[i:len(seq) - k + 1 + i])
+    return np.unique(hashes & MASK_32)
+
+def _permutations(numPerm, seed):
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, 2**31, size=numPerm, dtype=np.int64).astype(np.uint64)
+    b = rng.randint(0, 2**31, size=numPerm, dtype=np.int64).astype(np.uint64)
+    return a, b
+
+def minhashSignature(hashes: np.ndarray, a: np.ndarray,
+    b: np.ndarray) -> np.ndarray:
+    """Compute the MinHash signature of a set of shingle hashes.
+
+    Args:
+        hashes (numpy.ndarray): 32-bit hashes of the shingles
+        a (numpy.ndarray): Parameters of the hash functions
+        b (numpy.ndarray): Parameters of the hash functions
+
+    Returns:
+        numpy.ndarray: The signature, with one entry per hash function. If
+            there are no shingles, all entries are ``2**32``.
+    """
+    if len(hashes) == 0:
+        return np.full(len(a), EMPTY_HASH, dtype=np.uint64)
+    permuted = (hashes[:, np.newaxis] * a[np.newaxis, :] + b) % PRIME
+    return permuted.min(axis=0)
+
+def _optimalBands(threshold, numPerm):
+    """Choose the number of bands and rows per band such that pairs with a
+    Jaccard similarity around the threshold become candidates with
+    probability about 0.5, i.e., threshold ~= (1/bands)^(1/rows)"""
+    best = None
+    for rows in range(1, numPerm + 1):
+        bands = numPerm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+class MinHashIndex():
+    """An index of MinHash signatures of chant melodies, with an LSH table to
+    find near-duplicates.
+
+    Attributes:
+        numPerm (int): The number of hash functions (length of signatures)
+        k (int): The length of the shingles
+        intervals (bool): Whether shingles consist of intervals or pitches
+        bands (int): The number of LSH bands
+        rows (int): The number of signature entries per band
+        keys (list): The keys of all chants in the index
+    """
+
+    def __init__(self, numPerm: int = 128, k: int = 5, intervals: bool = True,
+        threshold: float = 0.8, bands: int = None, seed: int = 1):
+        """
+        Args:
+            numPerm (int, optional): Number of hash functions. Defaults to 128.
+            k (int, optional): Length of the shingles. Defaults to 5.
+            intervals (bool, optional): Use intervals rather than pitches.
+                Defaults to True.
+            threshold (float, optional): The Jaccard similarity above which
+                chants are likely to become candidates. Used to choose the
+                number of bands if that is not passed. Defaults to 0.8.
+            bands (int, optional): The number of LSH bands, at most
+                ``numPerm``. Every band consists of ``numPerm // bands`` 
+                signature entries; if ``numPerm`` is not a multiple of
+                ``bands``, the remaining entries are not used by the LSH 
+                tables (but still used to estimate similarities).
+            seed (int, optional): Seed of the hash functions. Defaults to 1.
+
+        Raises:
+            ValueError: If ``numPerm`` is not positive, or the number of bands
+                is not between 1 and ``numPerm``
+        """
+        if numPerm < 1:
+            raise ValueError('The number of permutations should be positive')
+        if bands is not None and not 0 < bands <= numPerm:
+            raise ValueError(
+                f'The number of bands should be between 1 and {numPerm}')
+        self.numPerm = numPerm
+        self.k = k
+        self.intervals = intervals
+        self.threshold = threshold
+        self.seed = seed
+        if bands is None:
+            self.bands, self.rows = _optimalBands(threshold, numPerm)
+        else:
+            self.bands, self.rows = bands, numPerm // bands
+        self._a, self._b = _permutations(numPerm, seed)
+        self.keys = []
+        self._signatures = np.zeros((0, numPerm), dtype=np.uint64)
+        self._newSignatures = []
+        self._keyToId = {}
+        self._tables = [{} for _ in range(self.bands)]
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def signatures(self) -> np.ndarray:
+        """numpy.ndarray: The signatures of all chants, one per row"""
+        if len(self._newSignatures) > 0:
+            self._signatures = np.vstack([self._signatures] + self._newSignatures)
+            self._newSignatures = []
+        return self._signatures
+
+    def signature(self, melody) -> np.ndarray:
+        """Compute the signature of a melody
+
+        Args:
+            melody: A volpiano string, chant or list of pitches
+
+        Returns:
+            numpy.ndarray: The MinHash signature
+        """
+        sequence = _toSequence(melody, self.intervals)
+        return minhashSignature(shingle(sequence, self.k), self._a, self._b)
+
+    def _bandKeys(self, signature):
+        """The LSH bucket keys of a signature, one for every band"""
+        if signature[0] == EMPTY_HASH:
+            return []
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes()
+                for i in range(self.bands)]
+
+    def _insert(self, key, signature):
+        if key in self._keyToId:
+            raise KeyError(f'Key already in index: {key}')
+        id = len(self.keys)
+        self.keys.append(key)
+        self._keyToId[key] = id
+        self._newSignatures.append(signature[np.newaxis, :])
+        for table, bandKey in zip(self._tables, self._bandKeys(signature)):
+            table.setdefault(bandKey, []).append(id)
+
+    def add(self, key, melody):
+        """Add a chant to the index. Melodies with fewer than ``k`` pitches
+        (or intervals) have no shingles and never become candidates.
+
+        Args:
+            key: A (unique) key identifying the chant, such as its Cantus id
+            melody: A volpiano string, chant or list of pitches
+        """
+        self._insert(key, self.signature(melody))
+
+    def update(self, items):
+        """Add many chants to the index
+
+        Args:
+            items: An iterable of ``(key, melody)`` tuples, or a dictionary
+        """
+        if hasattr(items, 'items'):
+            items = items.items()
+        for key, melody in items:
+            self.add(key, melody)
+
+    def similarity(self, key1, key2) -> float:
+        """Estimate the Jaccard similarity of two chants in the index"""
+        sig1 = self.signatures[self._keyToId[key1]]
+        sig2 = self.signatures[self._keyToId[key2]]
+        return float(np.mean(sig1 == sig2))
+
+    def query(self, melody, threshold: float = None) -> list:
+        """Find candidate near-duplicates of a melody
+
+        Args:
+            melody: A volpiano string, chant or list of pitches
+            threshold (float, optional): If set, only return candidates with
+                an estimated Jaccard similarity of at least the threshold
+
+        Returns:
+            list: Keys of the candidates, in the order they were added
+        """
+        signature = self.signature(melody)
+        ids = set()
+        for table, bandKey in zip(self._tables, self._bandKeys(signature)):
+            ids.update(table.get(bandKey, []))
+        ids = sorted(ids)
+        if threshold is not None and len(ids) > 0:
+            similarities = np.mean(self.signatures[ids] == signature, axis=1)
+            ids = [id for id, sim in zip(ids, similarities) if sim >= threshold]
+        return [self.keys[id] for id in ids]
+
+    def clusters(self, threshold: float = None, minSize: int = 2) -> list:
+        """Group the chants in clusters of candidate near-duplicates: the
+        connected components of the graph linking chants that share an LSH
+        bucket. Every bucket is handled in linear time, by linking all chants
+        to the first chant in the bucket, so the total time is linear in the
+        size of the index (rather than quadratic).
+
+        Args:
+            threshold (float, optional): If set, a chant is only linked to the
+                first chant in a bucket if their estimated Jaccard similarity
+                is at least the threshold
+            minSize (int, optional): The minimum size of clusters. Defaults to
+                2, which omits chants without near-duplicates.
+
+        Returns:
+            list: A list of clusters (lists of keys), largest clusters first
+        """
+        parents = list(range(len(self.keys)))
+        def find(i):
+            root = i
+            while parents[root] != root:
+                root = parents[root]
+            while parents[i] != root:
+                parents[i], i = root, parents[i]
+            return root
+
+        signatures = self.signatures
+        for table in self._tables:
+            for ids in table.values():
+                if len(ids) < 2:
+                    continue
+                first, others = ids[0], np.array(ids[1:])
+                if threshold is not None:
+                    similarity = np.mean(
+                        signatures[others] == signatures[first], axis=1)
+                    others = others[similarity >= threshold]
+                rootFirst = find(first)
+                for other in others.tolist():
+                    rootOther = find(other)
+                    if rootOther != rootFirst:
+                        parents[rootOther] = rootFirst
+
+        clusters = {}
+        for id in range(len(self.keys)):
+            clusters.setdefault(find(id), []).append(self.keys[id])
+        clusters = [c for c in clusters.values() if len(c) >= minSize]
+        return sorted(clusters, key=len, reverse=True)
+
+    def save(self, filepath: str):
+        """Store the index in a (compressed) numpy ``.npz`` file. The LSH
+        tables are not stored, but recomputed when loading. The keys are 
+        stored as JSON, so that loading the file never unpickles objects.
+
+        Args:
+            filepath (str): The file path
+
+        Raises:
+            TypeError: If a key is not a string or an integer
+        """
+        for key in self.keys:
+            if not isinstance(key, (str, int)) or isinstance(key, bool):
+                raise TypeError(
+                    f'Only string and integer keys can be saved: {key!r}')
+        params = np.array([self.numPerm, self.k, int(self.intervals),
+            self.bands, self.seed])
+        keys = np.frombuffer(json.dumps(self.keys).encode('utf-8'), 
+            dtype=np.uint8)
+        np.savez_compressed(filepath, signatures=self.signatures,
+            keys=keys, params=params, threshold=np.array(self.threshold))
+
+    @classmethod
+    def load(cls, filepath: str):
+        """Load an index stored with :meth:`save`
+
+        Args:
+            filepath (str): The file path
+
+        Returns:
+            MinHashIndex: The index
+        """
+        with np.load(filepath, allow_pickle=False) as data:
+            numPerm, k, intervals, bands, seed = [int(p) for p in data['params']]
+            index = cls(numPerm=numPerm, k=k, intervals=bool(intervals),
+                threshold=float(data['threshold']), bands=bands, seed=seed)
+            keys = json.loads(data['keys'].tobytes().decode('utf-8'))
+            for key, signature in zip(keys, data['signatures']):
+                index._insert(key, signature)
+        return index
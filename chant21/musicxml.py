@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+# Name:         musicxml.py
+# Purpose:      direct MusicXML export of chants
+#
+# Authors:      Bas Cornelissen
+#
+# Copyright:    Copyright © 2020-present Bas Cornelissen
+# License:      see LICENSE
+# ------------------------------------------------------------------------------
+"""
+A MusicXML writer specialised for chants. Exporting chants through music21
+(``chant.flatter.write('musicxml')``) deep-copies the chant and runs music21's
+general-purpose exporter, which is slow when exporting large corpora. This
+writer walks the chant21 hierarchy once and writes MusicXML 3.1 directly. The
+output follows the music21 export of :attr:`chant21.chant.Chant.flatter`:
+
+- Every pausa ends a measure. Pausae majores and finales become barlines;
+  pausae minimae and minores become a breath mark on the preceding note and a
+  dotted barline.
+- The notes of a neume are connected by a slur, as in
+  :meth:`chant21.chant.Chant.addNeumeSlurs`.
+- Lyrics are exported with their syllabic information, and accidentals are
+  shown where the chant contains a flat or natural sign.
+
+>>> from music21 import converter
+>>> ch = converter.parse('cantus: 1---fg--h---3/Kyri')
+>>> xml = toMusicXML(ch)
+>>> xml.count('<note>'), xml.count('<slur ')
+(3, 2)
+>>> print(xml[xml.index('<lyric'):xml.index('</lyric>') + 8])
+<lyric number="1"><syllabic>begin</syllabic><text>Ky</text></lyric>
+"""
+from xml.sax.saxutils import escape
+from music21 import articulations
+from music21 import bar
+from music21 import expressions
+from music21 import note
+from .chant import Chant21Object
+from .chant import Pausa
+from .chant import Neume
+from .chant import Alteration
+from .chant import Clef
+from . import __version__
+
+__all__ = [
+    'toMusicXML',
+    'writeMusicXML'
+]
+
+DIVISIONS = 10080
+"""int: The number of divisions per quarter note, as in music21"""
+
+_HEADER = ('<?xml version="1.0" encoding="utf-8"?>\n'
+    '<!DOCTYPE score-partwise PUBLIC "-//Recordare//DTD MusicXML 3.1 Partwise//EN" '
+    '"http://www.musicxml.org/dtds/partwise.dtd">\n'
+    '<score-partwise version="3.1">')
+
+_ALTERS = {'flat': '-1', 'sharp': '1', 'natural': None}
+
+class _PartWriter:
+    """Writes the measures of a single chant. The last note is kept as a list
+    of parts, so that notations (a slur stop or breath mark) can still be
+    added to it; see :meth:`_flushNote`."""
+
+    def __init__(self, neumeSlurs=True):
+        self.neumeSlurs = neumeSlurs
+        self.measures = []
+        self.measure = []
+        self.attributes = ['<divisions>', str(DIVISIONS), '</divisions>']
+        self.note = None
+        self.notations = []
+        self.showAccidental = False
+
+    def _flushNote(self):
+        if self.note is None:
+            return
+        noteParts, lyrics = self.note
+        self.measure.extend(noteParts)
+        if self.notations:
+            self.measure.append('<notations>')
+            self.measure.extend(self.notations)
+            self.measure.append('</notations>')
+        self.measure.extend(lyrics)
+        self.note = None
+        self.notations = []
+
+    def _closeMeasure(self, barStyle=None):
+        self._flushNote()
+        number = len(self.measures) + 1
+        parts = [f'<measure number="{number}">']
+        if self.attributes:
+            parts.append('<attributes>')
+            parts.extend(self.attributes)
+            parts.append('</attributes>')
+            self.attributes = []
+        parts.extend(self.measure)
+        if barStyle is not None:
+            parts.append(f'<barline location="right"><bar-style>{barStyle}'
+                '</bar-style></barline>')
+        parts.append('</measure>')
+        self.measures.append(''.join(parts))
+        self.measure = []
+
+    def _addAttributes(self, parts):
+        self._flushNote()
+        if self.measure:
+            self.measure.append('<attributes>')
+            self.measure.extend(parts)
+            self.measure.append('</attributes>')
+        else:
+            self.attributes.extend(parts)
+
+    def writeClef(self, el):
+        parts = ['<clef><sign>', el.sign, '</sign>']
+        if el.line is not None:
+            parts.extend(['<line>', str(el.line), '</line>'])
+        if el.octaveChange:
+            parts.extend(['<clef-octave-change>', str(el.octaveChange),
+                '</clef-octave-change>'])
+        parts.append('</clef>')
+        self._addAttributes(parts)
+
+    def writeDirection(self, text):
+        self._flushNote()
+        self.measure.append('<direction placement="above"><direction-type>'
+            f'<words font-style="italic">{escape(text)}</words>'
+            '</direction-type></direction>')
+
+    def writeNote(self, el, slur=None):
+        self._flushNote()
+        pitch = el.pitch
+        parts = ['<note><pitch><step>', pitch.step, '</step>']
+        accidental = pitch.accidental
+        alter = _ALTERS.get(accidental.name) if accidental is not None else None
+        if alter is not None:
+            parts.extend(['<alter>', alter, '</alter>'])
+        parts.extend(['<octave>', str(pitch.octave), '</octave></pitch>'])
+        duration = el.duration
+        parts.extend(['<duration>', str(round(duration.quarterLength * DIVISIONS)),
+            '</duration>'])
+        if duration.type not in ('complex', 'inexpressible', 'zero'):
+            parts.extend(['<type>', duration.type, '</type>'])
+            parts.extend(['<dot/>'] * duration.dots)
+        if self.showAccidental and accidental is not None:
+            parts.extend(['<accidental>', accidental.name, '</accidental>'])
+            self.showAccidental = False
+        parts.append('<stem>none</stem>')
+        if el.notehead != 'normal' or el.noteheadFill is not None:
+            filled = ''
+            if el.noteheadFill is not None:
+                filled = f' filled="{"yes" if el.noteheadFill else "no"}"'
+            parts.append(f'<notehead{filled}>{el.notehead}</notehead>')
+        if slur is not None:
+            self.notations.append(f'<slur number="1" type="{slur}"/>')
+        lyrics = []
+        for lyric in el.lyrics:
+            if lyric.text is None:
+                continue
+            lyrics.append(f'<lyric number="{lyric.number}">')
+            if lyric.syllabic is not None:
+                lyrics.append(f'<syllabic>{lyric.syllabic}</syllabic>')
+            lyrics.append(f'<text>{escape(lyric.text)}</text></lyric>')
+        parts.append('</note>')
+        # Notations (and lyrics) are added before </note> when flushing
+        self.note = (parts[:-1], lyrics + ['</note>'])
+
+    def writePausa(self, el):
+        if isinstance(el, bar.Barline):
+            self._closeMeasure(barStyle=bar.typeToMusicXMLBarStyle(el.type))
+        elif isinstance(el, articulations.BreathMark):
+            if self.note is not None:
+                self.notations.append(
+                    '<articulations><breath-mark/></articulations>')
+            self._closeMeasure(barStyle='dotted')
+
+    def write(self, container):
+        slurred = None
+        if self.neumeSlurs and isinstance(container, Neume):
+            notes = [el for el in container.elements if isinstance(el, note.Note)]
+            if len(notes) > 1:
+                slurred = (notes[0], notes[-1])
+        for el in container.elements:
+            if isinstance(el, note.Note):
+                if slurred is not None and el is slurred[0]:
+                    self.writeNote(el, slur='start')
+                else:
+                    self.writeNote(el)
+                if slurred is not None and el is slurred[1]:
+                    self.notations.append('<slur number="1" type="stop"/>')
+            elif isinstance(el, Pausa):
+                self.writePausa(el)
+            elif isinstance(el, Clef):
+                self.writeClef(el)
+            elif isinstance(el, Alteration):
+                self.showAccidental = True
+            elif isinstance(el, expressions.TextExpression):
+                self.writeDirection(el.content)
+            elif isinstance(el, Chant21Object) and el.isStream:
+                self.write(el)
+
+    def finish(self):
+        self._flushNote()
+        if self.measure or self.attributes:
+            self._closeMeasure()
+        return self.measures
+
+def _writeHeader(write, chant):
+    write(_HEADER)
+    meta = {}
+    if chant.hasEditorialInformation and 'metadata' in chant.editorial:
+        meta = chant.editorial.metadata
+    title = meta.get('title', meta.get('name'))
+    if title is not None:
+        write(f'<work><work-title>{escape(str(title))}</work-title></work>')
+    write('<identification>')
+    if meta.get('transcriber') is not None:
+        write(f'<creator type="transcriber">{escape(str(meta["transcriber"]))}'
+            '</creator>')
+    write(f'<encoding><software>chant21 {__version__}</software></encoding>')
+    write('</identification>')
+    write('<part-list><score-part id="P1"><part-name>Chant</part-name>'
+        '</score-part></part-list>')
+
+def _writeChant(write, chant, neumeSlurs=True):
+    _writeHeader(write, chant)
+    write('<part id="P1">')
+    writer = _PartWriter(neumeSlurs=neumeSlurs)
+    writer.write(chant)
+    for measure in writer.finish():
+        write(measure)
+    write('</part></score-partwise>\n')
+
+def toMusicXML(chant, fp=None, neumeSlurs: bool = True):
+    """Export a chant to MusicXML.
+
+    Args:
+        chant (chant21.chant.Chant): The chant
+        fp (str or file object, optional): A filename or open (text) file to
+            write to. If None, the MusicXML is returned as a string.
+        neumeSlurs (bool, optional): Whether to connect the notes of every
+            neume with a slur. Defaults to True.
+
+    Returns:
+        str: The MusicXML, or None if it was written to ``fp``
+    """
+    if fp is None:
+        parts = []
+        _writeChant(parts.append, chant, neumeSlurs=neumeSlurs)
+        return ''.join(parts)
+    elif hasattr(fp, 'write'):
+        _writeChant(fp.write, chant, neumeSlurs=neumeSlurs)
+    else:
+        with open(fp, 'w', encoding='utf-8') as handle:
+            _writeChant(handle.write, chant, neumeSlurs=neumeSlurs)
+
+def writeMusicXML(chants, filenames, neumeSlurs: bool = True):
+    """Export many chants to MusicXML files.
+
+    Args:
+        chants (iterable): The chants; this can be a generator, so that only
+            one chant needs to be in memory at the time.
+        filenames (iterable): The filenames, one for every chant
+        neumeSlurs (bool, optional): See :func:`toMusicXML`
+
+    Returns:
+        int: The number of files written
+    """
+    count = 0
+    for chant, filename in zip(chants, filenames):
+        toMusicXML(chant, filename, neumeSlurs=neumeSlurs)
+        count += 1
+    return count
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+# Name:         profiling.py
+# Purpose:      profiling of Arpeggio grammars
+#
+# Authors:      Bas Cornelissen
+#
+# Copyright:    Copyright © 2020-present Bas Cornelissen
+# License:      see LICENSE
+# ------------------------------------------------------------------------------
+"""
+Tools for profiling the PEG grammars used by chant21. The profiler counts, for
+every rule in the grammar, how often the parser tried to match it, how often
+that failed (i.e., the parser had to backtrack), how often the result came
+from the memoization cache and how much time was spent matching it:
+
+>>> from chant21.gabc import ParserGABC
+>>> parser = ParserGABC(root='body')
+>>> stats = profileGrammar(parser, ['(c4) A(f)B(g) C(h) (::)'])
+>>> int(stats.loc['syllable', 'attempts'])
+10
+>>> int(stats.loc['syllable', 'failures'])
+5
+
+Times are measured with :func:`time.perf_counter`; the ``time`` column includes
+the time spent matching subrules, while ``selfTime`` excludes it. Anonymous
+expressions (e.g. ``r'[^\\(]*'`` inside a rule) are counted as part of the
+rule in which they occur.
+"""
+from time import perf_counter
+from arpeggio import NoMatch
+
+__all__ = [
+    'GrammarProfiler',
+    'profileGrammar',
+    'getRules'
+]
+
+def getRules(parser) -> dict:
+    """Collect all named rules in the model of an Arpeggio parser.
+
+    Args:
+        parser (arpeggio.Parser): The Arpeggio parser
+
+    Returns:
+        dict: A dictionary mapping rule names to the parsing expressions
+    """
+    rules = {}
+    visited = set()
+    todo = [parser.parser_model]
+    while todo:
+        expression = todo.pop()
+        if id(expression) in visited:
+            continue
+        visited.add(id(expression))
+        if expression.rule_name and expression.root:
+            rules[expression.rule_name] = expression
+        todo.extend(expression.nodes)
+    return rules
+
+class _RuleStats:
+    __slots__ = ('attempts', 'cacheHits', 'failures', 'time', 'selfTime')
+
+    def __init__(self):
+        self.attempts = 0
+        self.cacheHits = 0
+        self.failures = 0
+        self.time = 0.0
+        self.selfTime = 0.0
+
+class GrammarProfiler():
+    """Profiler that collects per-rule statistics of an Arpeggio parser.
+
+    Profiling works by temporarily wrapping the ``parse`` method of every
+    named rule in the parser model. Use the profiler as a context manager;
+    all parses inside the context are profiled:
+
+    >>> from chant21.gabc import ParserGABC
+    >>> parser = ParserGABC(root='body')
+    >>> with GrammarProfiler(parser) as profiler:
+    ...     parse = parser.parse('(c4) A(f)')
+    >>> profiler.stats['note'].attempts
+    2
+
+    Attributes:
+        parser (arpeggio.Parser): The Arpeggio parser
+        stats (dict): A dictionary with the statistics of every rule
+    """
+
+    def __init__(self, parser):
+        """
+        Args:
+            parser: A chant21 parser such as :class:`ParserGABC`, or an
+                Arpeggio parser
+        """
+        self.parser = getattr(parser, 'parser', parser)
+        self.stats = {}
+        self._stack = []
+        self._rules = list(getRules(self.parser).values())
+        self._originalParse = {}
+
+    def _wrap(self, expression):
+        parse = expression.parse
+        stats = self.stats.setdefault(expression.rule_name, _RuleStats())
+        parser = self.parser
+        stack = self._stack
+
+        def profiledParse(arpeggioParser):
+            stats.attempts += 1
+            cacheHits = parser.cache_hits
+            # Every frame on the stack collects the time spent in subrules
+            stack.append(0.0)
+            start = perf_counter()
+            try:
+                return parse(arpeggioParser)
+            except NoMatch:
+                stats.failures += 1
+                raise
+            finally:
+                duration = perf_counter() - start
+                childTime = stack.pop()
+                if stack:
+                    stack[-1] += duration
+                stats.time += duration
+                stats.selfTime += duration - childTime
+                if childTime == 0.0 and parser.cache_hits == cacheHits + 1:
+                    stats.cacheHits += 1
+
+        return profiledParse
+
+    def __enter__(self):
+        for expression in self._rules:
+            # Rules can already have been wrapped, e.g. to memoize them
+            if 'parse' in expression.__dict__:
+                self._originalParse[expression] = expression.parse
+            expression.parse = self._wrap(expression)
+        return self
+
+    def __exit__(self, *args):
+        for expression in self._rules:
+            if expression in self._originalParse:
+                expression.parse = self._originalParse.pop(expression)
+            else:
+                del expression.parse
+
+    def toDataFrame(self):
+        """Return the statistics as a data frame, indexed by rule name and
+        sorted by the total time spent in the rules.
+
+        Returns:
+            pandas.DataFrame: The statistics
+        """
+        import pandas as pd
+        columns = _RuleStats.__slots__
+        data = {
+            rule: [getattr(stats, col) for col in columns]
+            for rule, stats in self.stats.items() if stats.attempts > 0
+        }
+        df = pd.DataFrame.from_dict(data, orient='index', columns=columns)
+        df['failureRate'] = df['failures'] / df['attempts']
+        return df.sort_values('time', ascending=False)
+
+def profileGrammar(parser, inputs, repeat: int = 1):
+    """Profile a parser on a corpus of input strings.
+
+    Args:
+        parser: A chant21 parser such as :class:`ParserGABC`, or an Arpeggio
+            parser
+        inputs (iterable): The input strings
+        repeat (int, optional): Number of times every input is parsed.
+            Defaults to 1.
+
+    Returns:
+        pandas.DataFrame: A data frame with per-rule statistics: the number
+            of attempts to match the rule, the number of those attempts that
+            failed or were answered from the memoization cache, and the time
+            spent matching the rule (in seconds).
+    """
+    with GrammarProfiler(parser) as profiler:
+        for string in inputs:
+            for _ in range(repeat):
+                parser.parse(string)
+    return profiler.toDataFrame()
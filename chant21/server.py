@@ -0,0 +1,491 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+# Name:         server.py
+# Purpose:      a local chant conversion service
+#
+# Authors:      Bas Cornelissen
+#
+# Copyright:    Copyright © 2020-present Bas Cornelissen
+# License:      see LICENSE
+# ------------------------------------------------------------------------------
+"""
+A small HTTP service that converts gabc and Cantus volpiano to CHSON and HTML.
+Starting Python, importing music21 and compiling the grammars takes much longer
+than converting a single chant. The service does all of that once: it keeps
+warm converters in a pool of worker processes, and sends concurrent requests
+to the workers in batches. The service only uses the standard library and
+listens on localhost or on a Unix socket:
+
+.. code-block:: bash
+
+    python -m chant21.server --port 8021 --workers 4
+    python -m chant21.server --socket /tmp/chant21.sock
+
+The service has three endpoints:
+
+- ``POST /convert`` converts a chant and returns its CHSON.
+- ``POST /render`` converts a chant and returns HTML (see
+  :meth:`chant21.chant.Chant.toHTML`).
+- ``GET /stats`` reports the number of requests, errors and batches, the
+  throughput, and the latency of recent requests.
+
+The body of a ``POST`` request is a JSON object with the ``format`` (``gabc``,
+``cantus`` or ``cantus-strict``), the chant ``data`` and optionally further
+boolean ``options``. These are passed to :meth:`chant21.chant.Chant.toObject`
+(``includeEditorial``, ``includeVolpiano`` and ``omitEmptyEditorial``) or 
+:meth:`chant21.chant.Chant.toHTML` (``showOptions``, ``showSections``, 
+``showWords``, ``showSyllables``, ``showNeumes``, ``showMetadata`` and
+``showMisalignments``); other options are rejected:
+
+.. code-block:: bash
+
+    curl -X POST localhost:8021/convert \\
+        -d '{"format": "cantus", "data": "1---f-g--h---3/Abra cadabra"}'
+
+Cantus data consists of the volpiano and optionally the text, separated by a
+slash. Errors are reported with status 400 and a JSON object with an ``error``.
+The workers convert chants with :class:`chant21.limits.ConversionLimits` (by
+default, at most 10 seconds of parsing per chant), so that a single 
+pathological input cannot occupy a worker for long.
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+__all__ = [
+    'ChantServer',
+    'serve'
+]
+
+FORMATS = ('gabc', 'cantus', 'cantus-strict')
+ACTIONS = {'/convert': 'convert', '/render': 'render'}
+MAX_BODY_SIZE = 2 ** 20
+DEFAULT_LIMITS = dict(maxTime=10.0)
+STATUS_MESSAGES = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error'
+}
+
+# The options clients can pass to toObject (convert) and toHTML (render)
+OPTIONS = {
+    'convert': ('includeEditorial', 'includeVolpiano', 'omitEmptyEditorial'),
+    'render': ('showOptions', 'showSections', 'showWords', 'showSyllables',
+        'showNeumes', 'showMetadata', 'showMisalignments')
+}
+
+# Returned by _readRequest instead of the body for an invalid Content-Length
+_INVALID_LENGTH = object()
+
+### Workers
+
+_CONVERTERS = None
+
+def _initWorker(limits=None):
+    """Initialize a worker process: import chant21 and create converters,
+    which compiles all grammars. The converters apply the limits to every
+    chant they parse."""
+    global _CONVERTERS
+    from .gabc import ConverterGABC
+    from .cantus import ConverterCantusVolpiano
+    from .cantus import ConverterCantusVolpianoStrict
+    _CONVERTERS = {
+        'gabc': ConverterGABC(limits=limits),
+        'cantus': ConverterCantusVolpiano(limits=limits),
+        'cantus-strict': ConverterCantusVolpianoStrict(limits=limits),
+    }
+    # The gabc file parser is otherwise only compiled on first use
+    _CONVERTERS['gabc'].parser
+
+def _ping():
+    return os.getpid()
+
+def _processJob(job):
+    converter = _CONVERTERS[job['format']]
+    converter.parseData(job['data'])
+    chant = converter.stream
+    # Only pass the supported options, never e.g. a file path
+    options = job.get('options', {})
+    options = {key: options[key] for key in OPTIONS[job['action']]
+        if key in options}
+    if job['action'] == 'convert':
+        return json.dumps(chant.toObject(**options))
+    else:
+        return chant.toHTML(**options)
+
+def _processBatch(jobs):
+    """Process a batch of jobs in a worker. Returns a list of ``(success,
+    result)`` tuples, where the result is either the output or an error."""
+    results = []
+    for job in jobs:
+        try:
+            results.append((True, _processJob(job)))
+        except Exception as error:
+            results.append((False, f'{type(error).__name__}: {error}'))
+    return results
+
+### Server
+
+class _Stats():
+    """Request statistics of the server"""
+
+    def __init__(self, windowSize=1000):
+        self.startTime = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batchedJobs = 0
+        self.latencies = deque(maxlen=windowSize)
+        self.finishTimes = deque(maxlen=windowSize)
+
+    def addRequest(self, latency, error=False):
+        self.requests += 1
+        self.errors += int(error)
+        self.latencies.append(latency)
+        self.finishTimes.append(time.monotonic())
+
+    def addBatch(self, size):
+        self.batches += 1
+        self.batchedJobs += size
+
+    def toObject(self):
+        now = time.monotonic()
+        uptime = now - self.startTime
+        latencies = sorted(self.latencies)
+        def percentile(p):
+            index = min(len(latencies) - 1, int(p * len(latencies)))
+            return latencies[index] * 1000
+
+        # Throughput over the most recent requests
+        recent = [t for t in self.finishTimes if now - t <= 60]
+        if len(recent) > 1 and recent[-1] > recent[0]:
+            recentThroughput = (len(recent) - 1) / (recent[-1] - recent[0])
+        else:
+            recentThroughput = 0.0
+
+        stats = {
+            'uptime': uptime,
+            'requests': self.requests,
+            'errors': self.errors,
+            'batches': self.batches,
+            'meanBatchSize': self.batchedJobs / max(self.batches, 1),
+            'throughput': self.requests / uptime if uptime > 0 else 0.0,
+            'recentThroughput': recentThroughput,
+            'latency': None
+        }
+        if len(latencies) > 0:
+            stats['latency'] = {
+                'window': len(latencies),
+                'mean': sum(latencies) / len(latencies) * 1000,
+                'p50': percentile(.5),
+                'p90': percentile(.9),
+                'p99': percentile(.99),
+                'max': latencies[-1] * 1000,
+            }
+        return stats
+
+class ChantServer():
+    """An asyncio HTTP server that converts chants in a pool of worker
+    processes. Conversion requests are collected in batches: a batch is sent
+    to a worker when it contains ``maxBatchSize`` requests, or ``maxDelay``
+    seconds after its first request arrived.
+
+    >>> server = ChantServer(numWorkers=2)
+    >>> asyncio.run(server.serve(port=8021))
+
+    Attributes:
+        numWorkers (int): The number of worker processes
+        maxBatchSize (int): The maximum number of requests in a batch
+        maxDelay (float): The maximum time (in seconds) a request waits for
+            other requests to join its batch
+        limits: The limits on the conversion of every chant
+        stats: The request statistics, reported at ``/stats``
+    """
+
+    def __init__(self, numWorkers: int = None, maxBatchSize: int = 16,
+        maxDelay: float = 0.005, limits=DEFAULT_LIMITS):
+        """
+        Args:
+            numWorkers (int, optional): The number of worker processes.
+                Defaults to the number of processors.
+            maxBatchSize (int, optional): Defaults to 16.
+            maxDelay (float, optional): Defaults to 0.005 seconds.
+            limits (:obj:`chant21.limits.ConversionLimits` or :obj:`dict`,
+                optional): Limits on the conversion of every chant. Defaults
+                to :data:`DEFAULT_LIMITS`, at most 10 seconds of parsing.
+                Use None to disable the limits.
+        """
+        self.numWorkers = numWorkers or os.cpu_count() or 1
+        self.maxBatchSize = maxBatchSize
+        self.maxDelay = maxDelay
+        self.limits = limits
+        self.stats = None
+        self._executor = None
+        self._server = None
+        self._batch = []
+        self._flushHandle = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8021,
+        path: str = None):
+        """Start the workers and the server. The server listens on a Unix
+        socket if a path is passed, and on ``host:port`` otherwise. Returns
+        once all workers are ready.
+
+        Args:
+            host (str, optional): Defaults to ``127.0.0.1``.
+            port (int, optional): Defaults to 8021. Use 0 to pick a free port.
+            path (str, optional): Path of a Unix socket. Defaults to None.
+        """
+        loop = asyncio.get_running_loop()
+        self._executor = ProcessPoolExecutor(max_workers=self.numWorkers,
+            initializer=_initWorker, initargs=(self.limits,))
+
+        # Start all workers before accepting requests
+        await asyncio.gather(*[loop.run_in_executor(self._executor, _ping)
+            for _ in range(self.numWorkers)])
+
+        if path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handleConnection, path=path)
+        else:
+            self._server = await asyncio.start_server(
+                self._handleConnection, host=host, port=port)
+        self.stats = _Stats()
+        return self._server
+
+    @property
+    def address(self):
+        """The address the server listens on"""
+        return self._server.sockets[0].getsockname()
+
+    async def serve(self, *args, **kwargs):
+        """Start the server and serve until cancelled; see :meth:`start`"""
+        await self.start(*args, **kwargs)
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Stop the server and the workers"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # Batching
+
+    def submit(self, job: dict) -> asyncio.Future:
+        """Add a conversion job to the current batch.
+
+        Args:
+            job (dict): A dictionary with the ``action`` (``convert`` or
+                ``render``), ``format``, ``data`` and ``options``.
+
+        Returns:
+            asyncio.Future: A future with a ``(success, result)`` tuple
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch.append((job, future))
+        if len(self._batch) >= self.maxBatchSize:
+            self._flush()
+        elif self._flushHandle is None:
+            self._flushHandle = loop.call_later(self.maxDelay, self._flush)
+        return future
+
+    def _flush(self):
+        if self._flushHandle is not None:
+            self._flushHandle.cancel()
+            self._flushHandle = None
+        batch, self._batch = self._batch, []
+        if len(batch) == 0:
+            return
+        self.stats.addBatch(len(batch))
+        jobs = [job for job, _ in batch]
+        futures = [future for _, future in batch]
+        loop = asyncio.get_running_loop()
+        result = loop.run_in_executor(self._executor, _processBatch, jobs)
+        result.add_done_callback(
+            lambda result: self._distribute(result, futures))
+
+    @staticmethod
+    def _distribute(batchResult, futures):
+        if batchResult.exception() is not None:
+            error = batchResult.exception()
+            results = [(False, f'{type(error).__name__}: {error}')] * len(futures)
+        else:
+            results = batchResult.result()
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+
+    # HTTP
+
+    async def _handleConnection(self, reader, writer):
+        try:
+            keepAlive = True
+            while keepAlive:
+                request = await self._readRequest(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keepAlive = headers.get('connection', '').lower() != 'close'
+                start = time.monotonic()
+                status, contentType, content = await self._respond(
+                    method, path, body)
+                if path != '/stats':
+                    self.stats.addRequest(time.monotonic() - start,
+                        error=status != 200)
+                self._writeResponse(writer, status, contentType, content,
+                    keepAlive)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _readRequest(self, reader):
+        """Read an HTTP request; returns None when the connection is closed
+        or the request is malformed"""
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return None
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, _ = lines[0].split(' ', 2)
+        except ValueError:
+            return None
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                key, value = line.split(':', 1)
+                headers[key.strip().lower()] = value.strip()
+        # The body is not read if its length is invalid or too large, so the
+        # connection has to be closed after responding
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            headers['connection'] = 'close'
+            return method, target.split('?')[0], headers, _INVALID_LENGTH
+        if length > MAX_BODY_SIZE:
+            headers['connection'] = 'close'
+            return method, target.split('?')[0], headers, None
+        body = await reader.readexactly(length) if length > 0 else b''
+        return method, target.split('?')[0], headers, body
+
+    async def _respond(self, method, path, body):
+        """Returns a tuple (status, content type, content)"""
+        if path == '/stats':
+            if method != 'GET':
+                return self._error(405, 'Use GET')
+            return 200, 'application/json', json.dumps(self.stats.toObject())
+        elif path not in ACTIONS:
+            return self._error(404, f'Unknown endpoint: {path}')
+        elif method != 'POST':
+            return self._error(405, 'Use POST')
+        elif body is _INVALID_LENGTH:
+            return self._error(400, 'Invalid Content-Length header')
+        elif body is None:
+            return self._error(413, 'Request body too large')
+
+        try:
+            request = json.loads(body)
+            job = {
+                'action': ACTIONS[path],
+                'format': request['format'],
+                'data': request['data'],
+                'options': request.get('options', {})
+            }
+        except (ValueError, KeyError, TypeError) as error:
+            return self._error(400, f'Invalid request: {error}')
+        if job['format'] not in FORMATS:
+            return self._error(400, f'Unsupported format: {job["format"]}')
+        if not isinstance(job['options'], dict):
+            return self._error(400, 'Invalid request: options must be an object')
+        for key, value in job['options'].items():
+            if key not in OPTIONS[job['action']]:
+                return self._error(400, f'Unsupported option: {key}')
+            if not isinstance(value, bool):
+                return self._error(400, f'Invalid request: option {key} '
+                    'must be true or false')
+
+        success, result = await self.submit(job)
+        if not success:
+            return self._error(400, result)
+        elif job['action'] == 'convert':
+            return 200, 'application/json', result
+        else:
+            return 200, 'text/html; charset=utf-8', result
+
+    @staticmethod
+    def _error(status, message):
+        return status, 'application/json', json.dumps({'error': message})
+
+    @staticmethod
+    def _writeResponse(writer, status, contentType, content, keepAlive):
+        body = content.encode('utf-8')
+        head = (
+            f'HTTP/1.1 {status} {STATUS_MESSAGES[status]}\r\n'
+            f'Content-Type: {contentType}\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f'Connection: {"keep-alive" if keepAlive else "close"}\r\n'
+            '\r\n'
+        )
+        writer.write(head.encode('latin-1') + body)
+
+def serve(host: str = '127.0.0.1', port: int = 8021, path: str = None,
+    **kwargs):
+    """Run a :class:`ChantServer` until interrupted.
+
+    Args:
+        host (str, optional): Defaults to ``127.0.0.1``.
+        port (int, optional): Defaults to 8021.
+        path (str, optional): Path of a Unix socket. If set, the server
+            listens on the socket rather than on ``host:port``.
+        **kwargs: Passed to :class:`ChantServer`
+    """
+    server = ChantServer(**kwargs)
+    try:
+        asyncio.run(server.serve(host=host, port=port, path=path))
+    except KeyboardInterrupt:
+        pass
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m chant21.server',
+        description='A local service that converts chants to CHSON and HTML')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8021)
+    parser.add_argument('--socket', default=None,
+        help='Listen on a Unix socket instead of host:port')
+    parser.add_argument('--workers', type=int, default=None,
+        help='Number of worker processes (default: number of processors)')
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--batch-delay', type=float, default=0.005,
+        help='Maximum time (in seconds) requests wait to be batched')
+    parser.add_argument('--max-time', type=float,
+        default=DEFAULT_LIMITS['maxTime'],
+        help='Maximum time (in seconds) spent parsing a single chant')
+    parser.add_argument('--max-length', type=int, default=None,
+        help='Maximum length (in characters) of a single chant')
+    args = parser.parse_args(args)
+    limits = dict(maxTime=args.max_time, maxLength=args.max_length)
+    serve(host=args.host, port=args.port, path=args.socket,
+        numWorkers=args.workers, maxBatchSize=args.batch_size,
+        maxDelay=args.batch_delay, limits=limits)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,454 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+# Name:         sharding.py
+# Purpose:      sharded conversion of large corpora
+#
+# Authors:      Bas Cornelissen
+#
+# Copyright:    Copyright © 2020-present Bas Cornelissen
+# License:      see LICENSE
+# ------------------------------------------------------------------------------
+"""
+Sharded conversion of corpora that are too large for a single machine. The
+corpus is described by a manifest: a list of gabc files, or of the ids of
+chants in a Cantus CSV file (see :func:`chant21.cantus.readCantusCSV`).
+Every item is assigned to one of ``numShards`` shards using a stable hash of
+the item, so that every machine computes the same assignment without
+coordination. Every invocation of :func:`convertShard` converts a single
+shard, and :func:`mergeShards` combines the shards into a single corpus:
+
+.. code-block:: bash
+
+    # On every node, for shard in 0 ... 7:
+    python -m chant21.sharding convert manifest.txt --shard 3 \\
+        --num-shards 8 --output-dir shards/
+    # Once all shards are done:
+    python -m chant21.sharding merge shards/ corpus.chsonl.gz --num-shards 8
+
+Every shard is written to ``outputDir`` as a CHSON Lines file with an index
+(see :func:`chant21.chson.writeCHSONLines`), an error log with one JSON
+object per item that could not be converted, and finally a summary. The
+summary marks the shard as complete, and records the hash of the manifest,
+which is used to check that all shards were converted from the same manifest.
+The output only depends on the manifest and the shard: the items of a shard
+are converted in the order of the manifest (or of the CSV file, if there is
+no manifest), and converting the same shard twice gives identical files. 
+For Cantus data, the rows of a shard are kept in memory to restore the order
+of the manifest.
+
+The merged corpus contains the shards in order, with a global index of all
+chants by id: the path of the gabc file as listed in the manifest, or the
+Cantus id. The errors of all shards are merged into a single error log. For
+testing, :func:`convertShardsLocally` converts all shards in local processes
+that emulate the nodes.
+"""
+import os
+import json
+import hashlib
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from ._version import __version__
+from .chson import writeCHSONLines
+from .chson import _writeConversions
+from .chson import iterCHSONLines
+from .chson import CHSONLinesIndex
+from .gabc.converter import _convertGABCFileOrError
+from .cantus import readCantusCSV
+from .cantus import convertCantusData
+
+__all__ = [
+    'shardOf',
+    'readManifest',
+    'shardFilename',
+    'convertShard',
+    'mergeShards',
+    'convertShardsLocally'
+]
+
+FORMATS = ('gabc', 'cantus')
+
+EXTENSIONS = {
+    None: '.chsonl',
+    'gzip': '.chsonl.gz',
+    'zstd': '.chsonl.zst'
+}
+
+ERRORS_EXTENSION = '.errors.jsonl'
+
+SUMMARY_EXTENSION = '.json'
+
+def shardOf(item: str, numShards: int) -> int:
+    """Return the shard of an item. Unlike Python's ``hash``, the hash used is
+    the same in every process and on every machine.
+
+    >>> shardOf('kyrie.gabc', 8)
+    1
+
+    Args:
+        item (str): The item, such as a filename or Cantus id
+        numShards (int): The number of shards
+
+    Returns:
+        int: The shard, from 0 up to ``numShards - 1``
+    """
+    digest = hashlib.blake2b(str(item).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % numShards
+
+def readManifest(manifest) -> list:
+    """Read the items in a manifest. Empty lines and lines starting with
+    ``#`` are ignored, as are repeated items.
+
+    Args:
+        manifest (str or iterable): The filename of a text file with one item
+            per line, or the items themselves
+
+    Returns:
+        list: The items, in order
+    """
+    if isinstance(manifest, (str, os.PathLike)):
+        with open(manifest, 'r', encoding='utf-8') as handle:
+            lines = handle.read().splitlines()
+    else:
+        lines = manifest
+    items = {}
+    for line in lines:
+        item = str(line).strip()
+        if item and not item.startswith('#'):
+            items[item] = None
+    return list(items)
+
+def shardFilename(outputDir: str, shard: int, numShards: int,
+    extension: str = '.chsonl') -> str:
+    """Return the filename of a file of a shard, such as
+    ``shard-00003-of-00008.chsonl``.
+
+    Args:
+        outputDir (str): The output directory
+        shard (int): The shard
+        numShards (int): The number of shards
+        extension (str, optional): The extension. Defaults to ``.chsonl``.
+
+    Returns:
+        str: The filename
+    """
+    return os.path.join(outputDir,
+        f'shard-{shard:05d}-of-{numShards:05d}{extension}')
+
+class _ManifestHash():
+    """Incrementally hashes the items of a manifest"""
+
+    def __init__(self):
+        self._hash = hashlib.blake2b(digest_size=16)
+        self.numItems = 0
+
+    def update(self, item):
+        self._hash.update(str(item).encode('utf-8') + b'\n')
+        self.numItems += 1
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+def _convertCantusRowOrError(args):
+    row, limits, kwargs = args
+    try:
+        if row is None:
+            raise KeyError('The chant is not in the CSV file')
+        chant = convertCantusData(row, limits=limits)
+        return chant.toObject(**kwargs), None
+    except Exception as error:
+        return None, repr(error)
+
+def _mapConversions(func, tasks, numWorkers, chunksize):
+    if numWorkers == 1:
+        yield from map(func, tasks)
+    else:
+        with ProcessPoolExecutor(max_workers=numWorkers) as executor:
+            yield from executor.map(func, tasks, chunksize=chunksize)
+
+def _iterGABCTasks(manifest, shard, numShards, manifestHash, root, limits,
+    kwargs):
+    for item in readManifest(manifest):
+        manifestHash.update(item)
+        if shardOf(item, numShards) == shard:
+            filename = item if root is None else os.path.join(root, item)
+            yield item, (filename, limits, kwargs)
+
+def _iterCantusTasks(manifest, shard, numShards, manifestHash, csvFile,
+    idColumn, limits, kwargs):
+    if manifest is None:
+        for chunk in readCantusCSV(csvFile):
+            for row in chunk:
+                item = row[idColumn]
+                manifestHash.update(item)
+                if shardOf(item, numShards) == shard:
+                    yield item, (row, limits, kwargs)
+        return
+
+    # Collect the rows of the shard, so that they can be converted in the 
+    # order of the manifest. Items that are not in the CSV file result in
+    # errors.
+    items = readManifest(manifest)
+    rows = {}
+    for item in items:
+        manifestHash.update(item)
+        if shardOf(item, numShards) == shard:
+            rows[item] = None
+    for chunk in readCantusCSV(csvFile):
+        for row in chunk:
+            item = row[idColumn]
+            if item in rows and rows[item] is None:
+                rows[item] = row
+    for item, row in rows.items():
+        yield item, (row, limits, kwargs)
+
+def convertShard(manifest, shard: int, numShards: int, outputDir: str,
+    format: str = 'gabc', csvFile: str = None, idColumn: str = 'id',
+    root: str = None, compression: str = None, numWorkers: int = 1,
+    chunksize: int = 16, limits=None, **kwargs) -> dict:
+    """Convert one shard of a corpus. The chants are written to a CHSON Lines
+    file in ``outputDir`` (see :func:`shardFilename`), together with an
+    error log and a summary of the shard.
+
+    Args:
+        manifest (str or iterable): The manifest, see :func:`readManifest`.
+            For gabc, the items are filenames. For Cantus, the items are the
+            ids of chants in ``csvFile``; if the manifest is None, all chants
+            in the CSV file are used.
+        shard (int): The shard to convert
+        numShards (int): The number of shards
+        outputDir (str): The output directory
+        format (str, optional): ``'gabc'`` or ``'cantus'``. Defaults to
+            ``'gabc'``.
+        csvFile (str, optional): The Cantus CSV file
+        idColumn (str, optional): The column of the CSV file with the ids of
+            chants. Defaults to ``'id'``.
+        root (str, optional): The directory to which the gabc filenames in
+            the manifest are relative. Defaults to the current directory.
+        compression (str, optional): The compression of the CHSON Lines file:
+            None, ``'gzip'`` or ``'zstd'``. Defaults to None.
+        numWorkers (int, optional): The number of worker processes. Defaults
+            to 1: all chants are converted in the current process. If None,
+            the number of processors is used.
+        chunksize (int, optional): The number of chants sent to a worker at
+            once. Defaults to 16.
+        limits (:obj:`chant21.limits.ConversionLimits` or :obj:`dict`,
+            optional): Limits on the conversion of every chant
+        **kwargs: Other keywords are passed to :meth:`Chant.toObject`, for
+            example ``includeEditorial``.
+
+    Raises:
+        ValueError: If the format or shard is invalid
+
+    Returns:
+        dict: The summary of the shard
+    """
+    if format not in FORMATS:
+        raise ValueError(f'Unknown format: {format}')
+    if not 0 <= shard < numShards:
+        raise ValueError(f'Invalid shard {shard} of {numShards} shards')
+    if compression not in EXTENSIONS:
+        raise ValueError(f'Unknown compression: {compression}')
+    if format == 'cantus' and csvFile is None:
+        raise ValueError('Converting Cantus data requires a CSV file')
+    os.makedirs(outputDir, exist_ok=True)
+
+    manifestHash = _ManifestHash()
+    if format == 'gabc':
+        tasks = _iterGABCTasks(manifest, shard, numShards, manifestHash, root,
+            limits, kwargs)
+        convert = _convertGABCFileOrError
+    else:
+        tasks = _iterCantusTasks(manifest, shard, numShards, manifestHash,
+            csvFile, idColumn, limits, kwargs)
+        convert = _convertCantusRowOrError
+    # Items are queued when their task is submitted, and taken from the 
+    # queue when the result comes in
+    pending = deque()
+    numItems = 0
+    def iterTasks():
+        nonlocal numItems
+        for item, task in tasks:
+            pending.append(item)
+            numItems += 1
+            yield task
+    results = _mapConversions(convert, iterTasks(), numWorkers, chunksize)
+
+    results = ((pending.popleft(), obj, error) for obj, error in results)
+    filename = shardFilename(outputDir, shard, numShards,
+        EXTENSIONS[compression])
+    numConverted, errors = _writeConversions(results, filename,
+        compression=compression)
+    errorsFilename = shardFilename(outputDir, shard, numShards,
+        ERRORS_EXTENSION)
+    with open(errorsFilename, 'w', encoding='utf-8') as handle:
+        for item, error in errors:
+            handle.write(json.dumps({'id': item, 'error': error},
+                ensure_ascii=False) + '\n')
+
+    summary = dict(shard=shard, numShards=numShards, format=format,
+        manifestHash=manifestHash.hexdigest(),
+        manifestSize=manifestHash.numItems, numItems=numItems,
+        numConverted=numConverted, numErrors=len(errors),
+        compression=compression, chant21version=__version__)
+    # The summary is written last and marks the shard as complete
+    summaryFilename = shardFilename(outputDir, shard, numShards,
+        SUMMARY_EXTENSION)
+    with open(summaryFilename + '.tmp', 'w', encoding='utf-8') as handle:
+        json.dump(summary, handle, indent=2)
+    os.replace(summaryFilename + '.tmp', summaryFilename)
+    return summary
+
+def _readSummaries(outputDir: str, numShards: int) -> list:
+    summaries = []
+    for shard in range(numShards):
+        filename = shardFilename(outputDir, shard, numShards, SUMMARY_EXTENSION)
+        if not os.path.exists(filename):
+            raise ValueError(f'Shard {shard} of {numShards} is missing or '
+                'incomplete')
+        with open(filename, 'r', encoding='utf-8') as handle:
+            summaries.append(json.load(handle))
+    for key in ['format', 'manifestHash', 'chant21version']:
+        values = set(summary[key] for summary in summaries)
+        if len(values) > 1:
+            raise ValueError(f'The shards do not have the same {key}: '
+                f'{", ".join(sorted(values))}')
+    return summaries
+
+def mergeShards(outputDir: str, numShards: int, outputFile: str,
+    errorsFile: str = None, compression: str = 'infer',
+    blockSize: int = 256) -> dict:
+    """Merge all shards in a directory into a single CHSON Lines file with a
+    global index (see :func:`chant21.chson.writeCHSONLines`), and merge the
+    error logs of all shards.
+
+    Args:
+        outputDir (str): The directory with the shards
+        numShards (int): The number of shards
+        outputFile (str): The merged CHSON Lines file
+        errorsFile (str, optional): The merged error log. Defaults to
+            ``outputFile + '.errors.jsonl'``.
+        compression (str, optional): The compression of the merged file, see
+            :func:`chant21.chson.writeCHSONLines`. By default this is inferred
+            from the extension of ``outputFile``.
+        blockSize (int, optional): The number of chants per compressed
+            block. Defaults to 256.
+
+    Raises:
+        ValueError: If a shard is missing, or if the shards were converted
+            from different manifests
+
+    Returns:
+        dict: A summary of the merged corpus
+    """
+    summaries = _readSummaries(outputDir, numShards)
+    filenames = [shardFilename(outputDir, s['shard'], numShards,
+        EXTENSIONS[s['compression']]) for s in summaries]
+
+    seen = set()
+    def iterIds():
+        for filename in filenames:
+            for chantId in CHSONLinesIndex(filename).ids:
+                if chantId in seen:
+                    raise ValueError(f'Duplicate id: {chantId}')
+                seen.add(chantId)
+                yield chantId
+    def iterObjects():
+        for filename in filenames:
+            yield from iterCHSONLines(filename, asObject=True)
+    numConverted = writeCHSONLines(iterObjects(), outputFile,
+        compression=compression, ids=iterIds(), blockSize=blockSize)
+
+    if errorsFile is None:
+        errorsFile = str(outputFile) + ERRORS_EXTENSION
+    with open(errorsFile, 'w', encoding='utf-8') as output:
+        for shard in range(numShards):
+            filename = shardFilename(outputDir, shard, numShards,
+                ERRORS_EXTENSION)
+            with open(filename, 'r', encoding='utf-8') as handle:
+                for line in handle:
+                    output.write(line)
+
+    return dict(numShards=numShards, format=summaries[0]['format'],
+        manifestHash=summaries[0]['manifestHash'],
+        numItems=sum(s['numItems'] for s in summaries),
+        numConverted=numConverted,
+        numErrors=sum(s['numErrors'] for s in summaries))
+
+def _convertShardTask(args):
+    manifest, shard, numShards, outputDir, kwargs = args
+    return convertShard(manifest, shard, numShards, outputDir, **kwargs)
+
+def convertShardsLocally(manifest, numShards: int, outputDir: str,
+    numProcesses: int = None, **kwargs) -> list:
+    """Convert all shards, each in a separate local process that emulates a
+    node. This is mostly useful for testing. The shards can be merged using
+    :func:`mergeShards`.
+
+    Args:
+        manifest (str or iterable): The manifest, see :func:`convertShard`
+        numShards (int): The number of shards
+        outputDir (str): The output directory
+        numProcesses (int, optional): The number of processes. Defaults to
+            the number of processors.
+        **kwargs: Passed to :func:`convertShard`
+
+    Returns:
+        list: The summaries of all shards
+    """
+    if manifest is not None and not isinstance(manifest, (str, os.PathLike)):
+        manifest = readManifest(manifest)
+    tasks = [(manifest, shard, numShards, outputDir, kwargs)
+             for shard in range(numShards)]
+    with ProcessPoolExecutor(max_workers=numProcesses) as executor:
+        return list(executor.map(_convertShardTask, tasks))
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m chant21.sharding',
+        description='Sharded conversion of gabc and Cantus corpora')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    convert = subparsers.add_parser('convert', help='Convert a single shard')
+    convert.add_argument('manifest', nargs='?', default=None,
+        help='Text file with one gabc file or Cantus id per line')
+    convert.add_argument('--shard', type=int, required=True)
+    convert.add_argument('--num-shards', type=int, required=True)
+    convert.add_argument('--output-dir', required=True)
+    convert.add_argument('--format', choices=FORMATS, default='gabc')
+    convert.add_argument('--csv', default=None, help='Cantus CSV file')
+    convert.add_argument('--id-column', default='id')
+    convert.add_argument('--root', default=None,
+        help='Directory to which the gabc files are relative')
+    convert.add_argument('--compression', choices=['gzip', 'zstd'],
+        default=None)
+    convert.add_argument('--workers', type=int, default=1,
+        help='Number of worker processes (default: 1)')
+    convert.add_argument('--max-time', type=float, default=None,
+        help='Maximum time (in seconds) to parse a single chant')
+    convert.add_argument('--max-length', type=int, default=None,
+        help='Maximum length (in characters) of a single chant')
+
+    merge = subparsers.add_parser('merge', help='Merge all shards')
+    merge.add_argument('output_dir', help='Directory with the shards')
+    merge.add_argument('output', help='The merged CHSON Lines file')
+    merge.add_argument('--num-shards', type=int, required=True)
+    merge.add_argument('--errors', default=None,
+        help='The merged error log')
+
+    args = parser.parse_args(args)
+    if args.command == 'convert':
+        limits = None
+        if args.max_time is not None or args.max_length is not None:
+            limits = dict(maxTime=args.max_time, maxLength=args.max_length)
+        summary = convertShard(args.manifest, args.shard, args.num_shards,
+            args.output_dir, format=args.format, csvFile=args.csv,
+            idColumn=args.id_column, root=args.root,
+            compression=args.compression, numWorkers=args.workers,
+            limits=limits)
+    else:
+        summary = mergeShards(args.output_dir, args.num_shards, args.output,
+            errorsFile=args.errors)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+# Name:         similarity.py
+# Purpose:      batched melodic edit distances
+#
+# Authors:      Bas Cornelissen
+#
+# Copyright:    Copyright © 2020-present Bas Cornelissen
+# License:      see LICENSE
+# ------------------------------------------------------------------------------
+"""
+Edit distances between the melodies of many chants. Melodies are first encoded
+as arrays of integers: every note, neume or syllable (depending on the
+``granularity``) becomes a token. Distances are computed with the bit-parallel
+algorithm of Myers (1999), in the formulation of Hyyrö (2001), vectorized with
+NumPy to compare one melody against a whole batch of melodies at once:
+
+>>> melodies = ['1---f-g--h---g', '1---f-g--h---h', '1---c-d--e']
+>>> distanceMatrix(melodies)
+array([[0, 1, 4],
+       [1, 0, 4],
+       [4, 4, 0]], dtype=int32)
+>>> similarityMatrix(melodies, granularity='syllable')
+array([[1.       , 0.6666667, 0.       ],
+       [0.6666667, 1.       , 0.       ],
+       [0.       , 0.       , 1.       ]], dtype=float32)
+>>> indices, similarities = topKSimilar(melodies, k=1)
+>>> indices
+array([[1],
+       [0],
+       [0]])
+
+Melodies can be volpiano strings, :class:`chant21.chant.Chant` objects or
+sequences of pitches. The similarity of two melodies is one minus their edit
+distance divided by the length of the longest melody. The computations are
+split in chunks of at most ``chunkSize`` melodies, so memory use is bounded,
+and can be distributed over several worker processes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .melody import volpianoToSegments
+from .melody import chantToSegments
+
+__all__ = [
+    'encodeMelodies',
+    'editDistance',
+    'distanceMatrix',
+    'similarityMatrix',
+    'topKSimilar'
+]
+
+ONE = np.uint64(1)
+ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+def encodeMelodies(melodies, granularity: str = 'note') -> tuple:
+    """Encode melodies as integer arrays: every distinct note, neume or
+    syllable becomes a token.
+
+    Args:
+        melodies (list): A list of volpiano strings, chants, or sequences of
+            pitches (only for granularity ``'note'``)
+        granularity (str, optional): The tokens: ``'note'``, ``'neume'`` or
+            ``'syllable'``. Defaults to ``'note'``.
+
+    Returns:
+        tuple: A tuple ``(sequences, vocabulary)`` with a list of integer
+            arrays and a dictionary mapping segments (tuples of pitches) to
+            tokens
+    """
+    vocabulary = {}
+    sequences = []
+    for melody in melodies:
+        if isinstance(melody, str):
+            segments = volpianoToSegments(melody, granularity)
+        elif hasattr(melody, 'recurse'):
+            segments = chantToSegments(melody, granularity)
+        elif granularity == 'note':
+            segments = [(pitch,) for pitch in melody]
+        else:
+            raise ValueError('Pitch sequences can only be used with note granularity')
+        tokens = [vocabulary.setdefault(segment, len(vocabulary))
+                  for segment in segments]
+        sequences.append(np.array(tokens, dtype=np.int32))
+    return sequences, vocabulary
+
+def editDistance(a, b) -> int:
+    """The (Levenshtein) edit distance between two sequences, computed with
+    Myers' bit-parallel algorithm using Python integers as bit vectors.
+
+    >>> editDistance('kitten', 'sitting')
+    3
+
+    Args:
+        a: A sequence of hashable items
+        b: A sequence of hashable items
+
+    Returns:
+        int: The edit distance
+    """
+    m = len(a)
+    if m == 0:
+        return len(b)
+    peq = {}
+    for i, item in enumerate(a):
+        peq[item] = peq.get(item, 0) | (1 << i)
+    mask = (1 << m) - 1
+    topBit = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for item in b:
+        eq = peq.get(item, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & topBit:
+            score += 1
+        elif mh & topBit:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+def _peqTables(queries, queryLengths, vocabularySize):
+    """Match bit vectors of a block of queries: ``peq[w, q, t]`` has bit i set
+    if ``queries[q, 64 * w + i] == t``. The last row (the padding token) is
+    empty. The tables are flattened to shape ``(numWords, numQueries *
+    (vocabularySize + 1))``."""
+    numQueries = len(queries)
+    numWords = max((int(queryLengths.max()) + 63) // 64, 1)
+    peq = np.zeros((numWords, numQueries, vocabularySize + 1), dtype=np.uint64)
+    for q, (query, length) in enumerate(zip(queries, queryLengths)):
+        for i, token in enumerate(query[:length]):
+            peq[i // 64, q, token] |= ONE << np.uint64(i % 64)
+    return peq.reshape(numWords, -1)
+
+def _blockDistances(queries, queryLengths, texts, textLengths, vocabularySize):
+    """Edit distances between a block of queries and a block of texts, both
+    padded with the token ``vocabularySize``. All bit vectors have shape
+    ``(numWords, numQueries, numTexts)``: every query is compared to every
+    text in parallel. Multi-word vectors are combined with explicit carries
+    in additions and shifts."""
+    peq = _peqTables(queries, queryLengths, vocabularySize)
+    numWords, numQueries, numTexts = len(peq), len(queries), len(texts)
+    offsets = np.arange(numQueries)[:, None] * (vocabularySize + 1)
+    lastBit = np.maximum(queryLengths - 1, 0)
+    topWord = (lastBit // 64)[:, None]
+    topBit = (ONE << (lastBit % 64).astype(np.uint64))[:, None]
+    queryIndex = np.arange(numQueries)[:, None]
+    textIndex = np.arange(numTexts)[None, :]
+
+    shape = (numWords, numQueries, numTexts)
+    pv = np.full(shape, ALL_ONES, dtype=np.uint64)
+    mv = np.zeros(shape, dtype=np.uint64)
+    eq, xv, xh, ph, mh = (np.empty(shape, dtype=np.uint64) for _ in range(5))
+    shifted = np.empty(shape, dtype=np.uint64)
+    score = np.repeat(queryLengths[:, None], numTexts, axis=1).astype(np.int32)
+    one, carryShift = np.uint64(1), np.uint64(63)
+    for j in range(texts.shape[1]):
+        np.take(peq, offsets + texts[:, j], axis=1, out=eq)
+        np.bitwise_or(eq, mv, out=xv)
+
+        # xh = (((eq & pv) + pv) ^ pv) | eq, with carries between words
+        np.bitwise_and(eq, pv, out=xh)
+        np.add(xh, pv, out=xh)
+        if numWords > 1:
+            carry = xh[0] < pv[0]
+            for w in range(1, numWords):
+                overflow = xh[w] < pv[w]
+                xh[w] += carry
+                carry = overflow | (carry & (xh[w] == 0))
+        np.bitwise_xor(xh, pv, out=xh)
+        np.bitwise_or(xh, eq, out=xh)
+
+        # ph = mv | ~(xh | pv) and mh = pv & xh
+        np.bitwise_or(xh, pv, out=ph)
+        np.invert(ph, out=ph)
+        np.bitwise_or(ph, mv, out=ph)
+        np.bitwise_and(pv, xh, out=mh)
+
+        active = j < textLengths
+        if numWords == 1:
+            phTop, mhTop = ph[0], mh[0]
+        else:
+            phTop = ph[topWord, queryIndex, textIndex]
+            mhTop = mh[topWord, queryIndex, textIndex]
+        score += active & ((phTop & topBit) != 0)
+        score -= active & ((mhTop & topBit) != 0)
+
+        # Shift ph and mh left, carrying the top bit to the next word
+        np.left_shift(ph, one, out=shifted)
+        if numWords > 1:
+            shifted[1:] |= ph[:-1] >> carryShift
+        shifted[0] |= one
+        if numWords > 1:
+            mhCarry = mh[:-1] >> carryShift
+        np.left_shift(mh, one, out=mh)
+        if numWords > 1:
+            mh[1:] |= mhCarry
+        # pv = mh | ~(xv | ph) and mv = ph & xv
+        np.bitwise_or(xv, shifted, out=pv)
+        np.invert(pv, out=pv)
+        np.bitwise_or(pv, mh, out=pv)
+        np.bitwise_and(shifted, xv, out=mv)
+
+    # The distance to an empty query is the length of the text
+    empty = queryLengths == 0
+    score[empty] = textLengths
+    return score
+
+class _Corpus():
+    """Encoded melodies, sorted by length and padded to a matrix. Sorting
+    ensures that blocks of consecutive melodies have similar lengths, so
+    little time is lost on padding."""
+
+    def __init__(self, sequences, vocabularySize, blockSize, chunkSize):
+        self.vocabularySize = vocabularySize
+        self.blockSize = blockSize
+        self.chunkSize = chunkSize
+        lengths = np.array([len(s) for s in sequences], dtype=np.int64)
+        self.order = np.argsort(lengths, kind='stable')
+        self.lengths = lengths[self.order]
+        maxLength = max(self.lengths.max(initial=0), 1)
+        self.padded = np.full((len(sequences), maxLength), vocabularySize,
+            dtype=np.int32)
+        for row, index in enumerate(self.order):
+            sequence = sequences[index]
+            self.padded[row, :len(sequence)] = sequence
+
+    def __len__(self):
+        return len(self.order)
+
+    def blocks(self):
+        return [(start, min(start + self.blockSize, len(self)))
+                for start in range(0, len(self), self.blockSize)]
+
+    def chunks(self, rowStart, rowEnd, start=0):
+        """Iterate over the distances between the (sorted) melodies in rows
+        `rowStart` to `rowEnd` and chunks of the melodies from `start`"""
+        queryLengths = self.lengths[rowStart:rowEnd]
+        queries = self.padded[rowStart:rowEnd, :max(queryLengths[-1], 1)]
+        for chunkStart in range(start, len(self), self.chunkSize):
+            chunkEnd = min(chunkStart + self.chunkSize, len(self))
+            textLengths = self.lengths[chunkStart:chunkEnd]
+            texts = self.padded[chunkStart:chunkEnd, :max(textLengths[-1], 1)]
+            distances = _blockDistances(queries, queryLengths, texts,
+                textLengths, self.vocabularySize)
+            yield chunkStart, chunkEnd, distances
+
+_CORPUS = None
+
+def _initWorker(corpus):
+    global _CORPUS
+    _CORPUS = corpus
+
+def _similarities(distances, queryLengths, textLengths):
+    longest = np.maximum(np.maximum.outer(queryLengths, textLengths), 1)
+    return (1 - distances / longest).astype(np.float32)
+
+def _upperTriangle(block):
+    """Distances between a block of (sorted) melodies and all melodies from
+    the start of the block"""
+    rowStart, rowEnd = block
+    distances = [d for _, _, d in _CORPUS.chunks(rowStart, rowEnd, rowStart)]
+    return rowStart, rowEnd, np.concatenate(distances, axis=1)
+
+def _topK(block, k):
+    """The k most similar melodies of every melody in a block. Only the
+    current top k of every melody is kept while iterating over chunks."""
+    rowStart, rowEnd = block
+    numQueries = rowEnd - rowStart
+    rows = np.arange(rowStart, rowEnd)[:, None]
+    bestIndices = np.zeros((numQueries, 0), dtype=np.int64)
+    bestSimilarities = np.zeros((numQueries, 0), dtype=np.float32)
+    for chunkStart, chunkEnd, distances in _CORPUS.chunks(rowStart, rowEnd):
+        indices = np.arange(chunkStart, chunkEnd)
+        similarities = _similarities(distances, _CORPUS.lengths[rowStart:rowEnd],
+            _CORPUS.lengths[chunkStart:chunkEnd])
+        similarities[rows == indices] = -np.inf
+        indices = np.concatenate(
+            [bestIndices, np.broadcast_to(indices, distances.shape)], axis=1)
+        similarities = np.concatenate([bestSimilarities, similarities], axis=1)
+        if similarities.shape[1] > k:
+            best = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+            indices = np.take_along_axis(indices, best, axis=1)
+            similarities = np.take_along_axis(similarities, best, axis=1)
+        bestIndices, bestSimilarities = indices, similarities
+    # Sort by decreasing similarity, breaking ties by position
+    order = np.lexsort((bestIndices, -bestSimilarities), axis=1)
+    bestIndices = np.take_along_axis(bestIndices, order, axis=1)
+    bestSimilarities = np.take_along_axis(bestSimilarities, order, axis=1)
+    return rowStart, rowEnd, bestIndices, bestSimilarities
+
+def _run(corpus, function, numWorkers, *args):
+    """Apply a function to all blocks of the corpus, possibly in worker
+    processes"""
+    blocks = corpus.blocks()
+    if numWorkers == 1:
+        _initWorker(corpus)
+        for block in blocks:
+            yield function(block, *args)
+    else:
+        with ProcessPoolExecutor(numWorkers, initializer=_initWorker,
+            initargs=(corpus,)) as executor:
+            futures = [executor.submit(function, block, *args) for block in blocks]
+            for future in futures:
+                yield future.result()
+
+def distanceMatrix(melodies, granularity: str = 'note', numWorkers: int = 1,
+    blockSize: int = 64, chunkSize: int = 512) -> np.ndarray:
+    """Compute the edit distances between all pairs of melodies. Only half
+    of the pairs are computed, as the matrix is symmetric.
+
+    Args:
+        melodies (list): Volpiano strings, chants, or sequences of pitches
+        granularity (str, optional): ``'note'``, ``'neume'`` or
+            ``'syllable'``; see :func:`encodeMelodies`. Defaults to ``'note'``.
+        numWorkers (int, optional): The number of worker processes. Defaults
+            to 1, in which case no processes are started.
+        blockSize (int, optional): The number of melodies in a block. Every
+            block is a separate task for the workers. Defaults to 64.
+        chunkSize (int, optional): The number of melodies a block is compared
+            to at once. Memory use is proportional to ``blockSize *
+            chunkSize``. Defaults to 512.
+
+    Returns:
+        numpy.ndarray: An integer matrix of edit distances
+    """
+    sequences, vocabulary = encodeMelodies(melodies, granularity)
+    return _distanceMatrix(sequences, len(vocabulary), numWorkers=numWorkers,
+        blockSize=blockSize, chunkSize=chunkSize)
+
+def _distanceMatrix(sequences, vocabularySize, numWorkers: int = 1,
+    blockSize: int = 64, chunkSize: int = 512) -> np.ndarray:
+    """The distance matrix of encoded melodies, see :func:`distanceMatrix`"""
+    corpus = _Corpus(sequences, vocabularySize, blockSize, chunkSize)
+    order = corpus.order
+    distances = np.zeros((len(corpus), len(corpus)), dtype=np.int32)
+    for rowStart, rowEnd, block in _run(corpus, _upperTriangle, numWorkers):
+        rows, columns = order[rowStart:rowEnd], order[rowStart:]
+        distances[np.ix_(rows, columns)] = block
+        distances[np.ix_(columns, rows)] = block.T
+    return distances
+
+def similarityMatrix(melodies, granularity: str = 'note', **kwargs) -> np.ndarray:
+    """Compute the similarities between all pairs of melodies: one minus the
+    edit distance divided by the length of the longest melody. See
+    :func:`distanceMatrix` for the arguments.
+
+    Returns:
+        numpy.ndarray: A matrix of similarities between 0 and 1
+    """
+    sequences, vocabulary = encodeMelodies(melodies, granularity)
+    lengths = np.array([len(s) for s in sequences])
+    distances = _distanceMatrix(sequences, len(vocabulary), **kwargs)
+    return _similarities(distances, lengths, lengths)
+
+def topKSimilar(melodies, k: int = 10, granularity: str = 'note',
+    numWorkers: int = 1, blockSize: int = 64, chunkSize: int = 512) -> tuple:
+    """Find the k most similar melodies of every melody. Only k similarities
+    are stored per melody, so the memory use grows linearly with the number
+    of melodies. See :func:`distanceMatrix` for the other arguments.
+
+    Args:
+        melodies (list): Volpiano strings, chants, or sequences of pitches
+        k (int, optional): The number of most similar melodies. Defaults to 10.
+
+    Returns:
+        tuple: A tuple ``(indices, similarities)`` of two arrays of shape
+            ``(len(melodies), k)``: the indices of the most similar melodies,
+            from most to least similar, and their similarities
+    """
+    sequences, vocabulary = encodeMelodies(melodies, granularity)
+    if not 0 < k < len(sequences):
+        raise ValueError('k should be positive and smaller than the number of melodies')
+    corpus = _Corpus(sequences, len(vocabulary), blockSize, chunkSize)
+    order = corpus.order
+    indices = np.zeros((len(corpus), k), dtype=np.int64)
+    similarities = np.zeros((len(corpus), k), dtype=np.float32)
+    for rowStart, rowEnd, best, bestSimilarities in _run(corpus, _topK,
+        numWorkers, k):
+        indices[order[rowStart:rowEnd]] = order[best]
+        similarities[order[rowStart:rowEnd]] = bestSimilarities
+    return indices, similarities
@@ -45,6 +45,10 @@ setuptools.setup(
         "Jinja2>=2.11.1",
         "PyYAML==5.3.1"
     ],
+    extras_require={
+        # Compression of CHSON Lines files, see chant21.chson
+        "zstd": ["zstandard"]
+    },
 
     # Which data files to include, see 
     # https://setuptools.readthedocs.io/en/latest/setuptools.html#including-data-files
@@ -0,0 +1,96 @@
+"""Unittests for computing arrays directly from volpiano strings"""
+import unittest
+import random
+import numpy as np
+import pandas as pd
+from music21 import converter
+from chant21.cantus import ParserCantusVolpiano
+from chant21.cantus import volpianoToArrays
+from chant21.cantus.reader import EXAMPLES_CSV
+from chant21.chbin import encodeCHBIN
+from chant21.chbin import readCHBINArrays
+
+FIELDS = ['pitches', 'alterations', 'liquescent', 'pausas', 'neume',
+    'syllable', 'word', 'section']
+
+def convertVolpiano(volpiano, strict=False):
+    ch = converter.parse(volpiano, format='cantus', strict=strict,
+        forceSource=True, storePickle=False)
+    return readCHBINArrays(encodeCHBIN(ch.toObject()))
+
+class TestVolpianoArrays(unittest.TestCase):
+    def assertMatchesConverter(self, volpianos, strict=False):
+        arrays = volpianoToArrays(volpianos, strict=strict)
+        self.assertEqual(len(arrays), len(volpianos))
+        for i, volpiano in enumerate(volpianos):
+            if arrays.errors[i] is not None:
+                self.assertEqual(arrays.offsets[i], arrays.offsets[i + 1])
+                continue
+            expected = convertVolpiano(volpiano, strict=strict)
+            result = arrays[i]
+            for field in FIELDS:
+                np.testing.assert_array_equal(getattr(result, field),
+                    getattr(expected, field), err_msg=f'{field}: {volpiano}')
+            self.assertEqual(len(result.lyrics), len(expected.lyrics))
+
+    def test_basic(self):
+        arrays = volpianoToArrays(['1---f-g--h---3', '1---fy--j---4'])
+        self.assertEqual(len(arrays), 2)
+        self.assertEqual(arrays.offsets.tolist(), [0, 3, 5])
+        self.assertEqual(arrays.pitches.tolist(), [32, 33, 34, 32, 35])
+        self.assertEqual(arrays.alterations.tolist(), [0, 0, 0, 0, -1])
+        self.assertEqual(arrays.neume.tolist(), [0, 1, 2, 0, 1])
+        self.assertEqual(arrays.syllable.tolist(), [1, 1, 2, 1, 2])
+        self.assertEqual(arrays.pausas.tolist(), [0, 0, 3, 0, 4])
+        self.assertEqual(arrays[-1].pitches.tolist(), [32, 35])
+        with self.assertRaises(IndexError):
+            arrays[2]
+
+    def test_clefs_and_accidentals(self):
+        self.assertMatchesConverter([
+            '2---f--g', '1---f---2---f', '1---iyj--j---j', '1---ij--j-I-j',
+            '1---wxe--e-W-e---e', '1---f---3---j', '1---(-F-N'])
+
+    def test_sections(self):
+        arrays = volpianoToArrays(['1---f---3---g---3---h', '1---f---3',
+            '1---f---4---g--3---h---4'])
+        self.assertEqual(arrays.section.tolist(), [0, 1, 2, 0, 0, 1, 2])
+        self.assertMatchesConverter(['1---f---3---g---3---h',
+            '1---f---4---g--3---h---4', '1---f---3---4', '1---f--3--g---4'])
+
+    def test_errors(self):
+        arrays = volpianoToArrays(['1---f', 'f---g', None, '1---fä', '1---f.g',
+            '1---g'], strict=True)
+        self.assertEqual(arrays.errors.tolist(), [None, 'missing_clef',
+            'empty', 'invalid_character', 'dot', None])
+        self.assertEqual(arrays.offsets.tolist(), [0, 1, 1, 1, 1, 1, 2])
+        self.assertEqual(arrays.pitches.tolist(), [32, 33])
+
+    def test_cantus_examples(self):
+        examples = pd.read_csv(EXAMPLES_CSV, index_col=0)
+        volpianos = examples['volpiano'].tolist()
+        self.assertMatchesConverter(volpianos)
+        arrays = volpianoToArrays(volpianos, strict=True)
+        parser = ParserCantusVolpiano()
+        for volpiano, error in zip(volpianos, arrays.errors):
+            if error is None:
+                parser.preprocess(volpiano, strict=True)
+
+    def test_random_strings(self):
+        random.seed(0)
+        neumes = ['f', 'gh', 'j', 'e', 'iyj', 'ij', 'Ij', 'Yj', 'we', 'WE', 'J',
+            'jF', 'q', 'lk']
+        specials = ['3', '4', '6------6', '1', '2']
+        def randomWord():
+            if random.random() < .2:
+                return random.choice(specials)
+            syllables = ['-'.join(random.choices(neumes, k=random.randint(1, 3)))
+                for _ in range(random.randint(1, 3))]
+            return '--'.join(syllables)
+        volpianos = [random.choice(['1', '2']) + '---' + '---'.join(
+                randomWord() for _ in range(random.randint(0, 8)))
+            for _ in range(300)]
+        self.assertMatchesConverter(volpianos)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import io
+import json
+import pandas as pd
+from music21 import converter
+from chant21.cantus import readCantusCSV
+from chant21.cantus import convertCantusCSV
+from chant21.cantus import convertCantusData
+from chant21.cantus.reader import EXAMPLES_CSV
+
+class TestReadCantusCSV(unittest.TestCase):
+    def test_chunks(self):
+        examples = pd.read_csv(EXAMPLES_CSV)
+        chunks = list(readCantusCSV(EXAMPLES_CSV, chunkSize=20))
+        self.assertEqual([len(chunk) for chunk in chunks], [20, 20, 9])
+        rows = [row for chunk in chunks for row in chunk]
+        self.assertEqual(len(rows), len(examples))
+        for row, (_, data) in zip(rows, examples.iterrows()):
+            self.assertEqual(list(row.keys()), list(data.index))
+            for key, value in data.items():
+                if pd.isna(value):
+                    self.assertIsNone(row[key])
+                elif type(value) == str:
+                    self.assertEqual(row[key], value)
+
+    def test_columns(self):
+        chunk = next(readCantusCSV(EXAMPLES_CSV, columns=['id', 'volpiano']))
+        self.assertEqual(list(chunk[0].keys()), ['id', 'volpiano'])
+        
+    def test_file_object(self):
+        handle = io.StringIO('id,volpiano\nchant_1,1---f\nchant_2,\n')
+        rows = next(readCantusCSV(handle))
+        self.assertEqual(rows, [
+            dict(id='chant_1', volpiano='1---f'),
+            dict(id='chant_2', volpiano=None)
+        ])
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            next(readCantusCSV(EXAMPLES_CSV, chunkSize=0))
+
+class TestConvertCantusCSV(unittest.TestCase):
+    def test_convert_mapping(self):
+        examples = pd.read_csv(EXAMPLES_CSV, index_col=0)
+        data = examples.loc['chant_002241', :]
+        row = {key: None if pd.isna(value) else value 
+               for key, value in data.items()}
+        chant1 = convertCantusData(data)
+        chant2 = convertCantusData(row)
+        obj1 = chant1.toObject(includeEditorial=False)
+        obj2 = chant2.toObject(includeEditorial=False)
+        self.assertEqual(obj1['elements'], obj2['elements'])
+        self.assertEqual(chant2.editorial.metadata['siglum'], data['siglum'])
+
+    def test_chson_lines(self):
+        output = io.StringIO()
+        errors = convertCantusCSV(EXAMPLES_CSV, output, chunkSize=7)
+        lines = output.getvalue().splitlines()
+        numRows = sum(len(chunk) for chunk in readCantusCSV(EXAMPLES_CSV))
+        self.assertEqual(errors, [])
+        self.assertEqual(len(lines), numRows)
+        for line in lines:
+            chant = converter.parse(line, format='chson')
+            self.assertEqual(chant.editorial.metadata['id'],
+                json.loads(line)['metadata']['id'])
+
+    def test_errors(self):
+        handle = io.StringIO('id,volpiano\nchant_1,1---f\nchant_2,f---g\n')
+        output = io.StringIO()
+        errors = convertCantusCSV(handle, output)
+        self.assertEqual(len(output.getvalue().splitlines()), 1)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0][0], 'chant_2')
+        self.assertIn('ClefError', errors[0][1])
+
+if __name__ == '__main__':
+    unittest.main()
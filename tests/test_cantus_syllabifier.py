@@ -0,0 +1,133 @@
+import unittest
+import random
+import pandas as pd
+from chant21.cantus import ChantSyllabifier
+from chant21.cantus.syllabifier import CHANT_LATIN
+from chant21.cantus.cltk_syllabifier import Syllabifier
+from chant21.cantus import ParserCantusText
+from chant21.cantus import syllabifyText
+from chant21.cantus import syllabifyMany
+from arpeggio import NonTerminal
+
+def referenceSyllabify(text):
+    """Syllabify using the original CLTK implementation"""
+    lowercased = Syllabifier(CHANT_LATIN).syllabify(text.lower())
+    syllables, pos = [], 0
+    for syllable in lowercased:
+        syllables.append(text[pos:pos + len(syllable)])
+        pos += len(syllable)
+    return syllables
+
+class TestChantSyllabifier(unittest.TestCase):
+    def assertSameAsReference(self, words):
+        syllabifier = ChantSyllabifier()
+        for word in words:
+            self.assertListEqual(syllabifier.syllabify(word),
+                referenceSyllabify(word), word)
+
+    def test_cantus_examples(self):
+        examples = pd.read_csv('chant21/examples/cantus-volpiano-examples.csv')
+        words = set()
+        for column in ['full_text_manuscript', 'full_text', 'incipit']:
+            for text in examples[column].dropna():
+                words.update(text.split())
+        self.assertSameAsReference(sorted(words))
+
+    def test_exceptions(self):
+        self.assertSameAsReference(CHANT_LATIN['exceptions'].keys())
+        syllabifier = ChantSyllabifier()
+        syllables = syllabifier.syllabify('Euouae')
+        self.assertListEqual(syllables, ['E', 'u', 'o', 'u', 'a', 'e'])
+        # Results are not shared with the exception dictionary
+        syllables.append('x')
+        self.assertListEqual(syllabifier.syllabify('euouae'), 
+            ['e', 'u', 'o', 'u', 'a', 'e'])
+
+    def test_random_words(self):
+        random.seed(0)
+        characters = 'aeiouyqcpthbdgfrlmnsxáæ i'
+        words = [''.join(random.choices(characters, k=random.randint(0, 12)))
+                 for _ in range(5000)]
+        self.assertSameAsReference(words)
+
+    def test_prefixes(self):
+        syllabifier = ChantSyllabifier()
+        self.assertListEqual(syllabifier.syllabifyWord('inimicus'), 
+            ['in', 'i', 'mi', 'cus'])
+        self.assertListEqual(syllabifier.syllabifyWord('obsecro'), 
+            ['ob', 'se', 'cro'])
+        self.assertListEqual(syllabifier.syllabifyWord('in'), ['in'])
+        self.assertListEqual(syllabifier.syllabifyWord(''), [])
+
+
+def parsedWords(text):
+    """Return (section, index, start, word) for all words in the parse tree 
+    of a text, using the Cantus text parser. Missing pitches count as words."""
+    parse = ParserCantusText().parse(text)
+    words = []
+    section = 0
+    index = 0
+    def visit(node):
+        nonlocal section, index
+        if node.rule_name == 'barline':
+            section += 1
+        elif node.rule_name in ('tilda', 'ipsum'):
+            return
+        elif node.rule_name == 'missing_pitches':
+            index += 1
+        elif node.rule_name == 'word':
+            words.append((section, index, node.position, node.value))
+            index += 1
+        elif isinstance(node, NonTerminal):
+            for child in node:
+                visit(child)
+    visit(parse)
+    return words
+
+class TestSyllabifyText(unittest.TestCase):
+    def test_syllabify_text(self):
+        text = 'Ave maria {gratia} plena | ~Dominus tecum'
+        result = syllabifyText(text)
+        self.assertListEqual(result.syllables, 
+            ['A', 've', 'ma', 'ri', 'a', 'ple', 'na'])
+        self.assertListEqual(result.word.tolist(), [0, 0, 1, 1, 1, 3, 3])
+        self.assertListEqual(result.section.tolist(), [0] * 7)
+        self.assertListEqual(result.start.tolist(), [0, 1, 4, 6, 8, 19, 22])
+        self.assertListEqual(result.end.tolist(), [1, 3, 6, 8, 9, 22, 24])
+
+    def test_missing_pitches(self):
+        """Missing pitches take up a word, like in the text-music alignment"""
+        result = syllabifyText('Ave {ma}ria # glo')
+        self.assertListEqual(result.syllables, ['A', 've', 'ri', 'a', 'glo'])
+        self.assertListEqual(result.word.tolist(), [0, 0, 2, 2, 4])
+
+    def test_missing_texts(self):
+        result = syllabifyMany([None, float('nan'), '', 'Amen'])
+        self.assertListEqual(result.syllables, ['A', 'men'])
+        self.assertListEqual(result.text.tolist(), [3, 3])
+        self.assertEqual(len(syllabifyMany([])), 0)
+
+    def test_cantus_examples(self):
+        """Syllables should match those of the parser and visitor"""
+        examples = pd.read_csv('chant21/examples/cantus-volpiano-examples.csv')
+        texts = examples['full_text_manuscript'].tolist()
+        result = syllabifyMany(texts)
+        syllabifier = ChantSyllabifier()
+        syllables = result.syllables
+        for index, text in enumerate(texts):
+            if type(text) != str:
+                self.assertNotIn(index, result.text)
+                continue
+            expected = []
+            for section, word, start, value in parsedWords(text):
+                for syllable in syllabifier.syllabify(value):
+                    expected.append((section, word, start, syllable))
+                    start += len(syllable)
+            actual = [(section, word, start, syllable)
+                for i, section, word, start, syllable in zip(result.text,
+                    result.section, result.word, result.start, syllables) 
+                if i == index]
+            self.assertListEqual(actual, expected)
+
+if __name__ == '__main__':
+    unittest.main()
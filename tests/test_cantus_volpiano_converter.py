@@ -265,6 +265,12 @@ class TestConverter(unittest.TestCase):
         self.assertIsInstance(sect1, chant.Section)
         self.assertIsInstance(sect2, chant.Section)
 
+    def test_final_section(self):
+        ch = converter.parse('1---f---3---g---3---h', format='cantus')
+        self.assertEqual(len(ch), 3)
+        self.assertEqual([n.name for n in ch.flatNotes], ['F', 'G', 'A'])
+        self.assertEqual(ch[2].flatNotes[0].name, 'A')
+
     def test_clef(self):
         section, = converter.parse('1---fg---4', format='cantus')
         self.assertIsInstance(section[0], chant.Word)
@@ -0,0 +1,73 @@
+import unittest
+import random
+import pandas as pd
+from chant21.cantus import ParserCantusVolpiano
+from chant21.cantus import validateVolpiano
+from chant21.cantus import VOLPIANO_ERRORS
+
+class TestValidateVolpiano(unittest.TestCase):
+    def assertMatchesParser(self, volpianos, strict):
+        parser = ParserCantusVolpiano()
+        result = validateVolpiano(volpianos, strict=strict)
+        for volpiano, (_, row) in zip(volpianos, result.iterrows()):
+            try:
+                corrected = parser.preprocess(volpiano, strict=strict)
+                self.assertIsNone(row['error'], volpiano)
+                self.assertEqual(row['volpiano'], corrected)
+                self.assertEqual(row['corrected'], corrected != volpiano)
+            except IndexError:
+                self.assertEqual(row['error'], 'empty')
+            except Exception as error:
+                self.assertIsInstance(error, VOLPIANO_ERRORS[row['error']])
+                self.assertIsNone(row['volpiano'])
+
+    def test_errors(self):
+        volpianos = ['f---g', '1-f', '1--f---g', '1--f-g', '1---f----g',
+            '1---6-------6', '1---f--6------6---g', '1---f.g', '1---f---33',
+            '1---f---5', '1---f--4', '1---3--f', '1---f-g---4']
+        result = validateVolpiano(volpianos, strict=True)
+        self.assertEqual(result['error'].tolist(), [
+            'missing_clef', 'clef_hyphenation', 'mixed_hyphenation',
+            'no_word_boundaries', 'long_boundary', 'missing_pitches_hyphens',
+            'missing_pitches_boundary', 'dot', 'double_barline', 
+            'thick_barline', 'barline_preceding_hyphens',
+            'barline_following_hyphens', None])
+        self.assertMatchesParser(volpianos, strict=True)
+        self.assertMatchesParser(volpianos, strict=False)
+
+    def test_corrections(self):
+        volpianos = ['1---a----b-----c--d', '1---6---------6', 
+            '1---a--6------67--b', '1---f-33-g', '1---5', '1--fg-f--h']
+        result = validateVolpiano(volpianos)
+        self.assertTrue(result['error'].isna().all())
+        self.assertEqual(result['volpiano'].tolist(), [
+            '1---a---b---c--d', '1---6------6', '1---a---6------67---b',
+            '1---f---4---g', '1---4', '1---fg--f---h'])
+        self.assertTrue(result['corrected'].all())
+        
+    def test_missing_values(self):
+        series = pd.Series(['1---f', '', None, float('nan')], index=list('abcd'))
+        result = validateVolpiano(series)
+        self.assertEqual(list(result.index), list('abcd'))
+        self.assertEqual(result['error'].tolist(), [None, 'empty', 'empty', 'empty'])
+        self.assertEqual(result['volpiano'].tolist(), ['1---f', None, None, None])
+
+    def test_cantus_examples(self):
+        examples = pd.read_csv('chant21/examples/cantus-volpiano-examples.csv', index_col=0)
+        volpianos = examples['volpiano'].tolist()
+        self.assertMatchesParser(volpianos, strict=True)
+        self.assertMatchesParser(volpianos, strict=False)
+
+    def test_random_strings(self):
+        random.seed(0)
+        parts = ['-', '--', '---', '----', '-----', 'f', 'gh', '3', '4', '5',
+            '33', '6------6', '6-------6', '7', '.', '1', 'ä']
+        volpianos = [
+            random.choice(['1', '2', '1-', '1--', '1---', 'f']) 
+            + ''.join(random.choices(parts, k=random.randint(0, 10)))
+            for _ in range(2000)]
+        self.assertMatchesParser(volpianos, strict=True)
+        self.assertMatchesParser(volpianos, strict=False)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -131,6 +131,44 @@ class TestToObject(unittest.TestCase):
         targetObj = {'pitch': 'D-4', 'type': 'note', 'editorial': {'foo': 'bar'}}
         self.assertDictEqual(n.toObject(), targetObj)
 
+    def test_omitEmptyEditorial(self):
+        n = chant.Note('D-4')
+        n.editorial
+        self.assertDictEqual(n.toObject(),
+            {'type': 'note', 'editorial': {}, 'pitch': 'D-4'})
+        self.assertDictEqual(n.toObject(omitEmptyEditorial=True),
+            {'type': 'note', 'pitch': 'D-4'})
+
+    def test_repeatedExport(self):
+        """Exporting should not create editorial objects as a side effect"""
+        parser = ParserGABC(root='body')
+        parse = parser.parse('(c2) *(:) A(f)B(g) <sp>V/</sp>(::) C(h) (::)')
+        ch = visitParseTree(parse, VisitorGABC())
+        obj1 = ch.toObject(includeVolpiano=True)
+        obj2 = ch.toObject(includeVolpiano=True)
+        self.assertEqual(obj1, obj2)
+        self.assertEqual(obj1['elements'][1]['name'], 'verse')
+
+    def test_wordAnnotation(self):
+        parser = ParserGABC(root='body')
+        parse = parser.parse('(c2) *(:) A(f)')
+        ch = visitParseTree(parse, VisitorGABC())
+        word = ch.toObject()['elements'][0]['elements'][1]
+        self.assertIsNone(word['annotation'])
+        self.assertEqual(word['elements'][0]['annotation'], '*')
+
+    def test_customToObject(self):
+        class CustomNote(chant.Note):
+            def toObject(self, **kwargs):
+                obj = super().toObject(**kwargs)
+                obj['custom'] = True
+                return obj
+        neume = chant.Neume()
+        neume.append(CustomNote('C4'))
+        obj = neume.toObject()
+        self.assertDictEqual(obj['elements'][0],
+            {'type': 'customnote', 'pitch': 'C4', 'custom': True})
+
 class TestFromObject(unittest.TestCase):
     
     def test_typeError(self):
@@ -219,6 +257,281 @@ class TestToVolpiano(unittest.TestCase):
         n = chant.Note('C4')
         n.editorial.liquescence = True
         self.assertEqual(n.volpiano, 'C')
-       
+
+class TestNoteInfo(unittest.TestCase):
+    def test_interning(self):
+        info = chant.NoteInfo.intern(gabcPosition='f')
+        self.assertIs(info, chant.NoteInfo.intern(gabcPosition='f'))
+        self.assertIs(info.replace(liquescence=True), 
+            chant.NoteInfo.intern(gabcPosition='f', liquescence=True))
+        with self.assertRaises(AttributeError):
+            info.gabcPosition = 'g'
+
+    def test_shared_by_notes(self):
+        gabc = '(c4) A(f.) B(f.) C(g)'
+        ch = converter.parse(gabc, format='gabc', forceSource=True, storePickle=False)
+        n1, n2, n3 = ch.flat.notes
+        self.assertIs(n1.noteInfo, n2.noteInfo)
+        self.assertEqual(n3.noteInfo.gabcPosition, 'g')
+        self.assertIsNone(n1._editorial)
+
+    def test_editorial_view(self):
+        n = chant.Note()
+        n.noteInfo = chant.NoteInfo.intern(gabcPosition='f', 
+            gabcSuffixes=(('neumeShape', 'w'), ('rhythmicSign', '.')))
+        self.assertTrue(n.hasEditorialInformation)
+        self.assertEqual(n.editorial.gabcSuffixes, 
+            [{'neumeShape': 'w'}, {'rhythmicSign': '.'}])
+        # After materializing, changes to the editorial are reflected
+        n.editorial.gabcPosition = 'g'
+        n.editorial.liquescence = True
+        self.assertEqual(n.noteInfo.gabcPosition, 'g')
+        self.assertTrue(n.noteInfo.liquescence)
+        n.noteInfo = n.noteInfo.replace(gabcPosition='h')
+        self.assertEqual(n.editorial.gabcPosition, 'h')
+
+    def test_no_editorial(self):
+        n = chant.Note()
+        self.assertFalse(n.hasEditorialInformation)
+        self.assertNotIn('editorial', n.toObject())
+
+    def test_export(self):
+        gabc = '(c4) A(-f.) B(gw) C(hr)'
+        ch = converter.parse(gabc, format='gabc', forceSource=True, storePickle=False)
+        n1, n2, n3 = ch.flat.notes
+        self.assertEqual(n1.toObject()['editorial'], 
+            {'gabcPosition': 'f', 'gabcSuffixes': [{'rhythmicSign': '.'}],
+             'gabcPrefix': '-', 'liquescence': True})
+        self.assertEqual(n2.toObject()['editorial'], 
+            {'gabcPosition': 'g', 'gabcSuffixes': [{'neumeShape': 'w'}], 
+             'liquescence': True})
+        self.assertEqual(n3.toObject()['editorial'], 
+            {'gabcPosition': 'h', 'gabcSuffixes': [{'emptyNote': 'r'}]})
+        self.assertIsNone(n1._editorial)
+
+    def test_key_order(self):
+        """Editorial keys are exported in the order the converters set them"""
+        ch = converter.parse('cantus: 1---fG---3', forceSource=True,
+            storePickle=False)
+        self.assertIn('"editorial": {"volpianoPosition": "g", '
+            '"liquescence": true}', ch.toCHSON())
+
+        gabc = '(c4) A(-fo~.)'
+        ch = converter.parse(gabc, format='gabc', forceSource=True, storePickle=False)
+        self.assertIn('"editorial": {"gabcPosition": "f", "gabcSuffixes": '
+            '[{"neumeShape": "o~"}, {"rhythmicSign": "."}], "gabcPrefix": "-", '
+            '"liquescence": true}', ch.toCHSON())
+
+        # Suffixes were applied before prefixes by the gabc converter
+        gabc = '(c4) A(-fw) B(fw)'
+        ch = converter.parse(gabc, format='gabc', forceSource=True, storePickle=False)
+        chson = ch.toCHSON()
+        self.assertIn('"editorial": {"gabcPosition": "f", "gabcSuffixes": '
+            '[{"neumeShape": "w"}], "liquescence": true, "gabcPrefix": "-"}',
+            chson)
+        self.assertIn('"editorial": {"gabcPosition": "f", "gabcSuffixes": '
+            '[{"neumeShape": "w"}], "liquescence": true}', chson)
+
+    def test_fromObject(self):
+        obj = {'type': 'note', 'pitch': 'F4', 
+            'editorial': {'volpianoPosition': 'f', 'liquescence': True}}
+        n = chant.Note()
+        n.fromObject(obj)
+        self.assertIsNone(n._editorial)
+        self.assertEqual(n.noteInfo.volpianoPosition, 'f')
+        self.assertEqual(n.toObject(), obj)
+
+        # Unknown fields are stored in the editorial object
+        obj['editorial']['foo'] = 'bar'
+        n = chant.Note()
+        n.fromObject(obj)
+        self.assertEqual(n.editorial.foo, 'bar')
+        self.assertEqual(n.toObject(), obj)
+
+    def test_copy_and_pickle(self):
+        import copy
+        import pickle
+        n = chant.Note('F4')
+        n.noteInfo = chant.NoteInfo.intern(volpianoPosition='f')
+        self.assertIs(copy.deepcopy(n).noteInfo, n.noteInfo)
+        self.assertIs(pickle.loads(pickle.dumps(n)).noteInfo, n.noteInfo)
+
+class TestCachedIndexes(unittest.TestCase):
+    def parse(self, gabc):
+        return converter.parse(gabc, format='gabc', forceSource=True, 
+            storePickle=False)
+
+    def test_accessors(self):
+        from music21.stream.iterator import StreamIterator
+        ch = self.parse('(c4) A(fg)B(h) (::) C(g)')
+        self.assertEqual(ch.childrenByClass(chant.Section), 
+            tuple(ch.getElementsByClass(chant.Section)))
+        self.assertIs(ch.childrenByClass(chant.Section), 
+            ch.childrenByClass(chant.Section))
+        section = ch.sections[0]
+        word = section.words[1]
+        self.assertEqual(word.childrenByClass(chant.Syllable), 
+            tuple(word.getElementsByClass(chant.Syllable)))
+        self.assertEqual(word.flatLyrics, 'AB')
+        self.assertTrue(word.hasLyrics)
+
+        # The public accessors still return stream iterators
+        syllable = word.syllables[0]
+        for accessor in [ch.sections, section.words, word.syllables, 
+            syllable.neumes]:
+            self.assertIsInstance(accessor, StreamIterator)
+        self.assertEqual(list(syllable.neumes), 
+            list(syllable.childrenByClass(chant.Neume)))
+        self.assertEqual(len(ch.sections.stream()), 2)
+
+    def test_flatNotes(self):
+        ch = self.parse('(c4) A(fg)B(h) (::) C(g)')
+        self.assertEqual(ch.flatNotes, tuple(ch.flat.notes))
+        self.assertIs(ch.flatNotes, ch.flatNotes)
+        syllable = ch.sections[0].words[1].syllables[0]
+        self.assertEqual(syllable.flatNotes, tuple(syllable.flat.notes))
+
+    def test_invalidation(self):
+        ch = self.parse('(c4) A(fg)B(h) (::) C(g)')
+        section = ch.sections[0]
+        word = section.words[1]
+        syllable = word.syllables[1]
+        numNotes = len(ch.flatNotes)
+        self.assertEqual(len(word.syllables), 2)
+
+        # Changes in a neume invalidate the notes of all ancestors
+        neume = syllable.neumes[0]
+        newNote = chant.Note('C5')
+        neume.append(newNote)
+        self.assertEqual(len(ch.flatNotes), numNotes + 1)
+        self.assertIs(word.flatNotes[-1], newNote)
+        self.assertIs(syllable.flatNotes[-1], newNote)
+
+        word.remove(syllable)
+        self.assertEqual(len(word.syllables), 1)
+        self.assertEqual(word.flatLyrics, 'A')
+        self.assertEqual(len(ch.flatNotes), numNotes - 1)
+        
+        newSection = chant.Section()
+        ch.append(newSection)
+        self.assertIs(ch.sections[-1], newSection)
+
+    def test_copies(self):
+        import copy
+        ch = self.parse('(c4) A(fg)B(h) (::) C(g)')
+        sections = ch.sections
+        notes = ch.flatNotes
+        copied = copy.deepcopy(ch)
+        self.assertEqual(len(copied.sections), len(sections))
+        for original, copiedNote in zip(notes, copied.flatNotes):
+            self.assertIsNot(original, copiedNote)
+
+class TestCachedExports(unittest.TestCase):
+    def parse(self, gabc):
+        return converter.parse(gabc, format='gabc', forceSource=True, 
+            storePickle=False)
+
+    def test_cached_object(self):
+        ch = self.parse('(c4) A(fg)B(h) (::) C(g)')
+        obj = ch.toObject(includeVolpiano=True, cached=True)
+        self.assertIs(ch.toObject(includeVolpiano=True, cached=True), obj)
+        self.assertEqual(obj, ch.toObject(includeVolpiano=True))
+        self.assertIsNot(ch.toObject(includeVolpiano=True), obj)
+        self.assertIsNot(ch.toObject(cached=True), obj)
+
+    def test_cached_html(self):
+        import re
+        ch = self.parse('(c4) A(fg)B(h) (::) C(g)')
+        obj = ch.toObject(includeVolpiano=True, cached=True)
+        html1 = ch.toHTML(showOptions=True)
+        html2 = ch.toHTML(showOptions=True)
+        self.assertIs(ch.toObject(includeVolpiano=True, cached=True), obj)
+
+        # Every widget has its own id
+        pattern = r'chantContainer-(\w+)'
+        ids1 = set(re.findall(pattern, html1))
+        ids2 = set(re.findall(pattern, html2))
+        self.assertEqual(len(ids1), 1)
+        self.assertEqual(len(ids2), 1)
+        self.assertNotEqual(ids1, ids2)
+
+    def test_structural_changes(self):
+        ch = self.parse('(c4) A(fg)B(h) (::) C(g)')
+        html = ch.toHTML()
+        chson = ch.toCHSON()
+        neume = ch.sections[0].words[1].syllables[1].neumes[0]
+        neume.append(chant.Note('C5'))
+        self.assertNotEqual(ch.toHTML(), html)
+        self.assertNotEqual(ch.toCHSON(), chson)
+        self.assertEqual(ch.toObject(cached=True), ch.toObject())
+
+    def test_untracked_changes(self):
+        ch = self.parse('(c4) A(fg)B(h) (::) C(g)')
+        section = ch.sections[0]
+        syllable = section.words[1].syllables[0]
+        obj = ch.toObject(cached=True)
+
+        # Accidentals
+        syllable.flatNotes[0].pitch.accidental = 'flat'
+        newObj = ch.toObject(cached=True)
+        self.assertIsNot(newObj, obj)
+        self.assertEqual(newObj, ch.toObject())
+
+        # Lyrics, annotations, note information, pitches and editorial
+        note = syllable.flatNotes[0]
+        changes = [
+            lambda: setattr(syllable, 'lyric', 'Z'),
+            lambda: setattr(note, 'lyric', 'Y'),
+            lambda: setattr(note.pitch, 'step', 'A'),
+            lambda: setattr(note.pitch, 'octave', 3),
+            lambda: setattr(note, 'notehead', 'x'),
+            lambda: note.editorial.update(misalignment=True),
+            lambda: setattr(section, 'name', 'Kyrie'),
+            lambda: setattr(syllable, 'annotation', 'note'),
+            lambda: setattr(syllable.flatNotes[0], 'noteInfo', 
+                chant.NoteInfo.intern(liquescence=True)),
+            lambda: ch.fromObject({'type': 'chant', 'metadata': {'a': 1}})
+        ]
+        for change in changes:
+            obj = ch.toObject(includeVolpiano=True, cached=True)
+            change()
+            self.assertIsNot(ch.toObject(includeVolpiano=True, cached=True), obj)
+            self.assertEqual(ch.toObject(includeVolpiano=True, cached=True), 
+                ch.toObject(includeVolpiano=True))
+
+    def test_untracked_changes_in_exports(self):
+        ch = self.parse('(c4) A(fg)B(h) (::) C(g)')
+        note = ch.flatNotes[0]
+        html = ch.toHTML()
+        chson = ch.toCHSON()
+        chbin = ch.toCHBIN()
+        note.pitch.step = 'A'
+        self.assertNotEqual(ch.toHTML(), html)
+        self.assertNotEqual(ch.toCHSON(), chson)
+        self.assertNotEqual(ch.toCHBIN(), chbin)
+
+        chson = ch.toCHSON()
+        note.lyric = 'Z'
+        self.assertNotEqual(ch.toCHSON(), chson)
+        self.assertEqual(ch.toObject(cached=True), ch.toObject())
+
+    def test_cantus_text_and_metadata(self):
+        from chant21.cantus import addTextToChant
+        from chant21.cantus import addCantusMetadataToChant
+        ch = converter.parse('cantus: 1---f--g---3')
+        chson = ch.toCHSON()
+        addTextToChant(ch, 'a b')
+        self.assertNotEqual(ch.toCHSON(), chson)
+        chson = ch.toCHSON()
+        addCantusMetadataToChant(ch, {'id': 'chant_1'})
+        self.assertIn('chant_1', ch.toCHSON())
+
+    def test_copies(self):
+        import copy
+        ch = self.parse('(c4) A(fg)B(h) (::) C(g)')
+        obj = ch.toObject(cached=True)
+        copied = copy.deepcopy(ch)
+        self.assertIsNot(copied.toObject(cached=True), obj)
+
 if __name__  ==  '__main__':
     unittest.main()
\ No newline at end of file
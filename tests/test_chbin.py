@@ -0,0 +1,117 @@
+"""Unittests for the binary CHBIN format"""
+import json
+import os
+import tempfile
+import unittest
+from music21 import converter
+from chant21 import chant
+from chant21.chbin import encodeCHBIN
+from chant21.chbin import decodeCHBIN
+from chant21.chbin import readCHBINArrays
+from chant21.chbin import CHBINError
+from chant21.melody import chantToPitches
+from chant21.examples import gabcExamples
+
+def parseGABC(gabc):
+    return converter.parse(gabc, format='gabc', forceSource=True, storePickle=False)
+
+class TestEncoding(unittest.TestCase):
+
+    def test_examples(self):
+        for filename in gabcExamples.values():
+            ch = converter.parse(filename, format='gabc', forceSource=True, 
+                storePickle=False)
+            obj = ch.toObject()
+            data = encodeCHBIN(obj)
+            decoded = decodeCHBIN(data)
+            self.assertEqual(decoded, obj)
+            # Also the order of the fields is preserved
+            self.assertEqual(json.dumps(decoded), ch.toCHSON())
+            self.assertLess(len(data) * 5, len(ch.toCHSON()))
+
+    def test_values(self):
+        obj = {
+            'type': 'note',
+            'pitch': 'B-4',
+            'editorial': {
+                'none': None, 'true': True, 'false': False, 
+                'ints': [0, 1, -1, 127, 128, -1000, 2**40], 'float': 1.5,
+                'string': 'Kýrie', 'nested': [{'a': []}, {}]
+            },
+            'custom': {'x': 1}
+        }
+        self.assertEqual(decodeCHBIN(encodeCHBIN(obj)), obj)
+
+    def test_pitches(self):
+        for name in ['C4', 'B-4', 'F#3', 'E-5', 'G9', 'C0', 'B--4', 'C~4']:
+            obj = {'type': 'note', 'pitch': name}
+            self.assertEqual(decodeCHBIN(encodeCHBIN(obj))['pitch'], name)
+
+    def test_custom_types(self):
+        obj = {'type': 'foo', 'elements': [{'type': 'bar', 'baz': 'qux'}]}
+        self.assertEqual(decodeCHBIN(encodeCHBIN(obj)), obj)
+
+    def test_shared_values(self):
+        ch = parseGABC('(c4) A(f) B(f)')
+        obj = decodeCHBIN(ch.toCHBIN())
+        notes = []
+        todo = [obj]
+        while todo:
+            el = todo.pop()
+            if el['type'] == 'note':
+                notes.append(el)
+            todo.extend(el.get('elements', []))
+        n1, n2 = notes
+        self.assertEqual(n1['editorial'], n2['editorial'])
+        self.assertIsNot(n1['editorial'], n2['editorial'])
+
+    def test_unsupported_values(self):
+        with self.assertRaises(CHBINError):
+            encodeCHBIN({'type': 'note', 'editorial': {'foo': object()}})
+
+    def test_invalid_data(self):
+        data = encodeCHBIN(parseGABC('(c4) A(f)').toObject())
+        with self.assertRaises(CHBINError):
+            decodeCHBIN(b'foo' + data[3:])
+        with self.assertRaises(CHBINError):
+            decodeCHBIN(data[:-5])
+
+class TestArrays(unittest.TestCase):
+
+    def test_examples(self):
+        for filename in gabcExamples.values():
+            ch = converter.parse(filename, format='gabc', forceSource=True, 
+                storePickle=False)
+            arrays = readCHBINArrays(ch.toCHBIN())
+            self.assertEqual(arrays.pitches.tolist(), chantToPitches(ch))
+            self.assertEqual(arrays.metadata, ch.toObject()['metadata'])
+
+    def test_structure(self):
+        ch = parseGABC('(c4) A(fg) B(-h) (,) C(ixi/hg) (::)')
+        arrays = readCHBINArrays(ch.toCHBIN())
+        self.assertEqual(len(arrays), 6)
+        self.assertEqual(arrays.pitches.tolist(), [32, 33, 34, 35, 34, 33])
+        self.assertEqual(arrays.alterations.tolist(), [0, 0, 0, -1, 0, 0])
+        self.assertEqual(arrays.liquescent.tolist(), 
+            [False, False, True, False, False, False])
+        self.assertEqual(arrays.pausas.tolist(), [0, 0, 1, 0, 0, 4])
+        self.assertEqual(arrays.neume.tolist(), [0, 0, 1, 2, 3, 3])
+        # Syllables and words with only a clef or pausa are also counted
+        self.assertEqual(arrays.syllable.tolist(), [1, 1, 2, 4, 4, 4])
+        self.assertEqual(arrays.word.tolist(), [1, 1, 2, 4, 4, 4])
+        self.assertEqual(arrays.section.tolist(), [0] * 6)
+        self.assertEqual(arrays.lyrics, [None, 'A', 'B', None, 'C', None])
+
+class TestConverter(unittest.TestCase):
+
+    def test_parse_file(self):
+        ch = parseGABC('name:Test;\n%%\n(c4) A(fg) B(h) (::)')
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'test.chbin')
+            ch.toCHBIN(filename)
+            loaded = converter.parse(filename, forceSource=True, storePickle=False)
+        self.assertIsInstance(loaded, chant.Chant)
+        self.assertEqual(loaded.toObject(), ch.toObject())
+
+if __name__ == '__main__':
+    unittest.main()
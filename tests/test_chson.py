@@ -0,0 +1,171 @@
+"""Unittests for reading and writing CHSON Lines"""
+import os
+import io
+import gzip
+import json
+import tempfile
+import unittest
+from music21 import converter
+from chant21.chson import writeCHSONLines
+from chant21.chson import iterCHSONLines
+from chant21.chson import readCHSONLine
+from chant21.chson import CHSONLinesIndex
+from chant21.cantus import readCantusCSV
+from chant21.cantus import convertCantusCSV
+from chant21.cantus import convertCantusData
+from chant21.cantus.reader import EXAMPLES_CSV
+from chant21.gabc import convertGABCFiles
+from chant21.examples import gabcExamples
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+def loadCantusExamples(num=20):
+    rows = next(readCantusCSV(EXAMPLES_CSV, chunkSize=num))
+    return [convertCantusData(row) for row in rows]
+
+class TestCHSONLines(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.chants = loadCantusExamples()
+        cls.objects = [ch.toObject() for ch in cls.chants]
+        cls.ids = [ch.editorial.metadata['id'] for ch in cls.chants]
+        # Chants read from CHSON, as by the CHSON converter
+        cls.decoded = [converter.parse(json.dumps(obj), format='chson',
+            forceSource=True, storePickle=False).toObject()
+            for obj in cls.objects]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, filename):
+        return os.path.join(self.tmpdir.name, filename)
+
+    def test_roundtrip(self):
+        for filename in ['chants.chsonl', 'chants.chsonl.gz']:
+            path = self.path(filename)
+            count = writeCHSONLines(iter(self.chants), path, blockSize=3)
+            self.assertEqual(count, len(self.chants))
+            objects = list(iterCHSONLines(path, asObject=True))
+            self.assertEqual(objects, self.objects)
+            chants = list(iterCHSONLines(path))
+            self.assertEqual([ch.toObject() for ch in chants], self.decoded)
+
+    def test_gzip(self):
+        path = self.path('chants.chsonl.gz')
+        writeCHSONLines(self.chants, path, blockSize=7)
+        with gzip.open(path, 'rt', encoding='utf-8') as handle:
+            lines = handle.read().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], self.objects)
+
+    def test_index(self):
+        for filename in ['chants.chsonl', 'chants.chsonl.gz']:
+            path = self.path(filename)
+            writeCHSONLines(self.chants, path, blockSize=4)
+            index = CHSONLinesIndex(path)
+            self.assertEqual(index.ids, self.ids)
+            self.assertEqual(len(index), len(self.chants))
+            self.assertIn(self.ids[5], index)
+            for chantId, obj in zip(self.ids, self.objects):
+                self.assertEqual(readCHSONLine(path, chantId, index=index,
+                    asObject=True), obj)
+            chant = readCHSONLine(path, self.ids[-1])
+            self.assertEqual(chant.toObject(), self.decoded[-1])
+            with self.assertRaises(KeyError):
+                readCHSONLine(path, 'unknown', index=index)
+
+    def test_ids(self):
+        path = self.path('chants.chsonl')
+        writeCHSONLines(self.objects[:3], path, ids=['a', 'b', 'c'])
+        self.assertEqual(CHSONLinesIndex(path).ids, ['a', 'b', 'c'])
+        ch = converter.parse('cantus: 1---f--g---3')
+        writeCHSONLines([ch, ch], path)
+        self.assertEqual(CHSONLinesIndex(path).ids, [0, 1])
+        writeCHSONLines([ch], path, index=False)
+        with self.assertRaises(ValueError):
+            CHSONLinesIndex(path)
+
+    def test_duplicate_ids(self):
+        path = self.path('chants.chsonl')
+        with self.assertRaisesRegex(ValueError, 'Duplicate id: x'):
+            writeCHSONLines(self.objects[:2], path, ids=['x', 'x'])
+        with self.assertRaisesRegex(ValueError, 'Duplicate id'):
+            writeCHSONLines([self.objects[0]] * 2, path)
+        # Without an index, ids are not used
+        count = writeCHSONLines(self.objects[:2], path, ids=['x', 'x'], 
+            index=False)
+        self.assertEqual(count, 2)
+
+    def test_parallel(self):
+        path = self.path('chants.chsonl.gz')
+        writeCHSONLines(self.chants, path)
+        chants = list(iterCHSONLines(path, numWorkers=2, chunkSize=3))
+        self.assertEqual([ch.toObject() for ch in chants], self.decoded)
+
+    def test_cantus_csv_output(self):
+        output = io.StringIO()
+        convertCantusCSV(EXAMPLES_CSV, output)
+        path = self.path('cantus.chsonl')
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(output.getvalue())
+        objects = list(iterCHSONLines(path, asObject=True))
+        self.assertEqual(len(objects), len(output.getvalue().splitlines()))
+
+        # Compressed and indexed, like writeCHSONLines
+        path = self.path('cantus.chsonl.gz')
+        errors = convertCantusCSV(EXAMPLES_CSV, path, chunkSize=7)
+        self.assertEqual(errors, [])
+        self.assertEqual(list(iterCHSONLines(path, asObject=True)), objects)
+        self.assertEqual(CHSONLinesIndex(path).ids[:len(self.ids)], self.ids)
+        self.assertEqual(readCHSONLine(path, self.ids[3], asObject=True),
+            self.objects[3])
+
+    def test_gabc_files_output(self):
+        filenames = list(gabcExamples.values())
+        path = self.path('gabc.chsonl.gz')
+        errors = convertGABCFiles(filenames, path, numWorkers=1)
+        self.assertEqual(errors, [])
+        self.assertEqual(CHSONLinesIndex(path).ids, filenames)
+        chant = readCHSONLine(path, filenames[1])
+        expected = converter.parse(filenames[1], format='gabc', 
+            forceSource=True, storePickle=False)
+        self.assertEqual(len(chant.flat.notes), len(expected.flat.notes))
+
+    def test_file_objects(self):
+        text = io.StringIO()
+        writeCHSONLines(self.chants, text, blockSize=3)
+        binary = io.BytesIO()
+        writeCHSONLines(self.chants, binary, compression='gzip')
+        lines = gzip.decompress(binary.getvalue()).decode('utf-8')
+        self.assertEqual(text.getvalue(), lines)
+        self.assertEqual([json.loads(line) for line in lines.splitlines()],
+            self.objects)
+        with self.assertRaises(ValueError):
+            writeCHSONLines(self.chants, io.StringIO(), compression='gzip')
+
+    def test_invalid_compression(self):
+        with self.assertRaises(ValueError):
+            writeCHSONLines(self.chants, self.path('chants'),
+                compression='bz2')
+
+    @unittest.skipIf(zstandard is None, 'zstandard is not installed')
+    def test_zstd(self):
+        path = self.path('chants.chsonl.zst')
+        writeCHSONLines(self.chants, path, blockSize=6)
+        objects = list(iterCHSONLines(path, asObject=True))
+        self.assertEqual(objects, self.objects)
+        self.assertEqual(readCHSONLine(path, self.ids[7], asObject=True),
+            self.objects[7])
+
+    @unittest.skipIf(zstandard is not None, 'zstandard is installed')
+    def test_zstd_missing(self):
+        with self.assertRaises(ImportError):
+            writeCHSONLines(self.chants, self.path('chants.chsonl.zst'))
+
+if __name__ == '__main__':
+    unittest.main()
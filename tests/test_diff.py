@@ -0,0 +1,142 @@
+"""Unittests for structural diffs and patches of chants"""
+import json
+import copy
+import unittest
+from music21 import converter
+from chant21.diff import diff
+from chant21.diff import patch
+from chant21.diff import patchObject
+from chant21.diff import PatchError
+from chant21.cantus import readCantusCSV
+from chant21.cantus import convertCantusData
+from chant21.cantus.reader import EXAMPLES_CSV
+from chant21.examples import gabcExamples
+
+def parseCHSON(obj):
+    return converter.parse(json.dumps(obj), format='chson', forceSource=True,
+        storePickle=False)
+
+def iterObjects(obj):
+    yield obj
+    for child in obj.get('elements', []):
+        yield from iterObjects(child)
+
+class TestDiff(unittest.TestCase):
+    def test_identical(self):
+        chA = converter.parse('cantus: 1---f-g--h---3/Ky-ri-e')
+        chB = converter.parse('cantus: 1---f-g--h---3/Ky-ri-e')
+        delta = diff(chA, chB)
+        self.assertEqual(delta['ops'], [])
+        self.assertEqual(delta['base'], diff(chB, chA)['base'])
+
+    def test_note(self):
+        chA = converter.parse('cantus: 1---f-g--h---g--f---3/Ky-ri-e e-lei')
+        chB = converter.parse('cantus: 1---f-g--j---g--f---3/Ky-ri-e e-lei')
+        ops = diff(chA, chB)['ops']
+        self.assertEqual(len(ops), 1)
+        self.assertEqual(ops[0]['op'], 'splice')
+        self.assertEqual(ops[0]['path'], [0, 1, 1, 0])
+        self.assertEqual(ops[0]['elements'][0]['pitch'], 'B4')
+
+    def test_lyric(self):
+        chA = converter.parse('cantus: 1---f--g--h---3/Ky-ri-e')
+        chB = converter.parse('cantus: 1---f--g--h---3/Ky-ri-a')
+        ops = diff(chA, chB)['ops']
+        self.assertEqual(ops, [{'op': 'set', 'path': [0, 1, 2],
+            'fields': {'lyric': 'a'}}])
+
+    def test_insert_word(self):
+        chA = converter.parse('cantus: 1---f-g--h---3/Ky-ri-e')
+        chB = converter.parse('cantus: 1---f-g--h---g--f---3/Ky-ri-e e-lei')
+        ops = diff(chA, chB)['ops']
+        self.assertEqual(len(ops), 1)
+        self.assertEqual(ops[0]['op'], 'splice')
+        self.assertEqual(ops[0]['start'], ops[0]['stop'])
+        self.assertEqual(ops[0]['elements'][0]['type'], 'word')
+
+    def test_objects(self):
+        chA = converter.parse('cantus: 1---f-g--h---3/Ky-ri-e')
+        chB = converter.parse('cantus: 1---f-g--j---3/Ky-ri-e')
+        self.assertEqual(diff(chA.toObject(), chB.toObject()),
+            diff(chA, chB))
+
+    def test_type_mismatch(self):
+        ch = converter.parse('cantus: 1---f-g--h---3/Ky-ri-e')
+        with self.assertRaises(ValueError):
+            diff(ch, ch[0])
+
+    def test_cached_hashes(self):
+        chA = converter.parse('cantus: 1---f--g--h---3/Ky-ri-e')
+        chB = converter.parse('cantus: 1---f--g--h---3/Ky-ri-a')
+        self.assertEqual(len(diff(chA, chB)['ops']), 1)
+        chA[0][1][2].lyric = 'a'
+        self.assertEqual(diff(chA, chB)['ops'], [])
+        chA[0][1][2][0][0].pitch.accidental = 'flat'
+        self.assertEqual(len(diff(chA, chB)['ops']), 1)
+
+class TestPatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rows = next(readCantusCSV(EXAMPLES_CSV, chunkSize=20))
+        cls.cantusChants = [convertCantusData(row) for row in rows]
+        cls.gabcChants = [converter.parse(filename, format='gabc',
+            forceSource=True, storePickle=False)
+            for filename in list(gabcExamples.values())[:3]]
+
+    def assertPatches(self, chA, chB):
+        delta = json.loads(json.dumps(diff(chA, chB)))
+        obj = patchObject(copy.deepcopy(chA.toObject()), delta, verify=True)
+        self.assertEqual(obj, chB.toObject())
+        patch(chA, delta, verify=True)
+        self.assertEqual(chA.toObject(), chB.toObject())
+        offsets = [n.getOffsetInHierarchy(chA) for n in chA.flatNotes]
+        self.assertEqual(offsets, sorted(set(offsets)))
+
+    def test_cantus_chants(self):
+        chants = self.cantusChants
+        for chA, chB in zip(chants, chants[1:] + chants[:1]):
+            self.assertPatches(parseCHSON(chA.toObject()), chB)
+
+    def test_gabc_chants(self):
+        for chA in self.gabcChants:
+            for chB in self.gabcChants:
+                self.assertPatches(parseCHSON(chA.toObject()), chB)
+
+    def test_edits(self):
+        for chant in self.gabcChants + self.cantusChants[:5]:
+            obj = copy.deepcopy(chant.toObject())
+            objects = list(iterObjects(obj))
+            neume = next(o for o in objects if o['type'] == 'neume')
+            neume['elements'].pop()
+            syllables = [o for o in objects if o['type'] == 'syllable']
+            syllables[1]['lyric'] = 'ab'
+            syllables[2]['annotation'] = 'Ps.'
+            word = next(o for o in objects if o['type'] == 'word')
+            word['elements'].append(copy.deepcopy(word['elements'][0]))
+            obj['metadata']['mode'] = '9'
+            chA = parseCHSON(chant.toObject())
+            self.assertPatches(chA, parseCHSON(obj))
+
+    def test_original_chant(self):
+        chA = converter.parse('cantus: 1---f-g--h---g--f---3/Ky-ri-e e-lei')
+        chB = converter.parse('cantus: 1---g-f--h---g---3/Ky-ri-e e')
+        self.assertPatches(chA, chB)
+        self.assertEqual(chA.flatNotes[0].lyric, 'Ky-')
+        self.assertEqual(chA.flatNotes[0].nameWithOctave, 'G4')
+
+    def test_errors(self):
+        chA = converter.parse('cantus: 1---f-g--h---3/Ky-ri-e')
+        chB = converter.parse('cantus: 1---f-g--j---3/Ky-ri-e')
+        delta = diff(chA, chB)
+        with self.assertRaises(PatchError):
+            patch(chB, delta, verify=True)
+        with self.assertRaises(PatchError):
+            patch(chA, {'ops': [{'op': 'set', 'path': [5], 'fields': {}}]})
+        with self.assertRaises(PatchError):
+            patch(chA, {'ops': [{'op': 'splice', 'path': [], 'start': 2,
+                'stop': 1, 'elements': []}]})
+        with self.assertRaises(PatchError):
+            patchObject(chA.toObject(), {'ops': [{'op': 'move', 'path': []}]})
+
+if __name__ == '__main__':
+    unittest.main()
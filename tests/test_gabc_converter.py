@@ -11,6 +11,8 @@ from chant21.gabc import VisitorGABC
 from chant21.gabc import gabcPositionToStep
 from chant21.gabc import MissingClef
 from chant21.gabc import AlterationWarning
+from chant21.gabc import LazyChant
+from chant21.examples import gabcExamples
 
 def parseGABC(string):
     return converter.parse(string, format='gabc', forceSource=True, storePickle=False)
@@ -495,5 +497,36 @@ class TestConverter(unittest.TestCase):
         self.assertEqual(notes[2].name, 'E')
         self.assertEqual(notes[3].name, 'G')
 
+class TestLazyChant(unittest.TestCase):
+    def test_header(self):
+        ch = LazyChant('title:Title!;\nattr1:value1;%%\n\n(c2) a(f)b(g) c(h)')
+        self.assertEqual(ch.editorial.metadata['title'], 'Title!')
+        self.assertEqual(ch.editorial.metadata['attr1'], 'value1')
+        self.assertFalse(ch.isLoaded)
+        self.assertEqual(len(ch.flat.notes), 3)
+        self.assertTrue(ch.isLoaded)
+
+    def test_examples(self):
+        for filename in gabcExamples.values():
+            eager = converter.parse(filename, format='gabc', 
+                forceSource=True, storePickle=False)
+            lazy = converter.parse(filename, format='gabc', lazy=True,
+                forceSource=True, storePickle=False)
+            self.assertIsInstance(lazy, LazyChant)
+            self.assertFalse(lazy.isLoaded)
+            self.assertEqual(lazy.toCHSON(), eager.toCHSON())
+
+    def test_copy(self):
+        ch = LazyChant('(c2) a(f)b(g) c(h)')
+        copy = ch.__deepcopy__()
+        self.assertEqual(len(copy.flat.notes), 3)
+        self.assertEqual(len(ch.flat.notes), 3)
+
+    def test_parseError(self):
+        ch = LazyChant('name:Error;\n%%\n(c2) a(f)b(g')
+        self.assertEqual(ch.editorial.metadata['name'], 'Error')
+        self.assertRaises(Exception, lambda: ch.flat)
+        self.assertFalse(ch.isLoaded)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
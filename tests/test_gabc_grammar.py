@@ -10,7 +10,17 @@ TODO
 """
 import unittest
 from arpeggio import NoMatch
+from arpeggio import Terminal
 from chant21.gabc import ParserGABC
+from chant21.gabc import REFERENCE_GRAMMAR_PATH
+from chant21.examples import gabcExamples
+
+def treeToTuple(node):
+    """Represent a parse tree as nested tuples, for comparing trees"""
+    if isinstance(node, Terminal):
+        return (node.rule_name, node.position, node.position_end, node.value)
+    children = tuple(treeToTuple(child) for child in node)
+    return (node.rule_name, node.position, node.position_end, children)
 
 class TestFile(unittest.TestCase):
     def test_file(self):
@@ -597,4 +607,54 @@ class TestText(unittest.TestCase):
         for rule_name, example in examples:
             parse = parser.parse(example)
             self.assertEqual(parse[0].rule_name, rule_name)
-            self.assertEqual(parse[0].value, example)
\ No newline at end of file
+            self.assertEqual(parse[0].value, example)
+
+class TestOptimizedGrammar(unittest.TestCase):
+
+    def assertIdenticalParses(self, parser, reference, gabc):
+        try:
+            expected = treeToTuple(reference.parse(gabc))
+        except Exception as error:
+            self.assertRaises(type(error), lambda: parser.parse(gabc))
+            return
+        self.assertEqual(treeToTuple(parser.parse(gabc)), expected)
+
+    def test_examples(self):
+        parser = ParserGABC()
+        reference = ParserGABC(grammarPath=REFERENCE_GRAMMAR_PATH)
+        for filename in gabcExamples.values():
+            with open(filename, 'r') as handle:
+                gabc = handle.read()
+            self.assertIdenticalParses(parser, reference, gabc)
+    
+    def test_music(self):
+        parser = ParserGABC(root='music')
+        reference = ParserGABC(root='music', grammarPath=REFERENCE_GRAMMAR_PATH)
+        examples = [
+            'c4', 'cb2', 'f+', '+', 'F+', 'fx', 'fy', 'f#', '-fx', '-c4', 
+            'f,g`h;1i:j::', 'fo~g.h_0i\'1jr1', 'f/g//h/[-1]i!j@k z',
+            '{fxg}', '[ob:1;6mm]', '[nm1]', '[cs:foo]', '[alt:foo]', 'z0'
+        ]
+        for gabc in examples:
+            self.assertIdenticalParses(parser, reference, gabc)
+
+    def test_text(self):
+        parser = ParserGABC(root='syllable')
+        reference = ParserGABC(root='syllable', 
+            grammarPath=REFERENCE_GRAMMAR_PATH)
+        examples = [
+            'A(f)', '*(:)', '<c>*</c>(:)', 'Ky<i>ri</i>e(f)', 'A*(f)', 
+            '<i>Ps.</i>(f)', '<i>ij.</i>(f)', '<sp>V/</sp>.(f)', '+(f)',
+            '<v>\\ae</v>(f)', 'A+(f)', '<b>A</b>(f)'
+        ]
+        for gabc in examples:
+            self.assertIdenticalParses(parser, reference, gabc)
+
+    def test_selectiveMemoization(self):
+        parser = ParserGABC(memoization=['syllable', 'text'])
+        reference = ParserGABC(grammarPath=REFERENCE_GRAMMAR_PATH)
+        with open(gabcExamples['kyrie'], 'r') as handle:
+            gabc = handle.read()
+        self.assertIdenticalParses(parser, reference, gabc)
+        self.assertIdenticalParses(parser, reference, gabc)
+        self.assertRaises(ValueError, lambda: ParserGABC(memoization=['foo']))
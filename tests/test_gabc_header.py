@@ -0,0 +1,82 @@
+"""Unittests for the header-only gabc reader"""
+import os
+import unittest
+import tempfile
+from arpeggio import visit_parse_tree as visitParseTree
+from chant21.gabc import ParserGABC
+from chant21.gabc import VisitorGABC
+from chant21.gabc import IncompleteParseError
+from chant21.gabc import parseGABCHeader
+from chant21.gabc import readGABCHeader
+from chant21.gabc import indexGABCDirectory
+from chant21.examples import gabcExamples
+
+CUR_DIR = os.path.dirname(__file__)
+EXAMPLES_DIR = os.path.join(CUR_DIR, os.path.pardir, 'chant21', 'examples')
+
+def fullHeader(filename):
+    with open(filename, 'r') as handle:
+        contents = handle.read()
+    parse = ParserGABC(root='file').parse(contents)
+    ch = visitParseTree(parse, VisitorGABC())
+    metadata = dict(ch.editorial.metadata)
+    del metadata['conversion']
+    return metadata
+
+class TestHeader(unittest.TestCase):
+
+    def test_parseHeader(self):
+        header = parseGABCHeader('title:Title!;\nattr1:value1; still value1;\n')
+        self.assertDictEqual(header,
+            {'title': 'Title!', 'attr1': 'value1; still value1'})
+
+    def test_incompleteHeader(self):
+        self.assertRaises(IncompleteParseError,
+            lambda: parseGABCHeader('title Title!;\n'))
+
+    def test_examples(self):
+        for filename in gabcExamples.values():
+            self.assertDictEqual(readGABCHeader(filename), fullHeader(filename))
+
+    def test_separatorOnSameLine(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, 'test.gabc')
+            with open(filename, 'w') as handle:
+                handle.write('title:Title!;\r\nattr1:value1;%%\n\n(c2) a(f)')
+            header = readGABCHeader(filename)
+            self.assertDictEqual(header, {'title': 'Title!', 'attr1': 'value1'})
+
+    def test_noHeader(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, 'test.gabc')
+            with open(filename, 'w') as handle:
+                handle.write('(c2) a(f)b(g) c(h)')
+            self.assertDictEqual(readGABCHeader(filename), {})
+
+class TestIndex(unittest.TestCase):
+
+    def test_index(self):
+        index = indexGABCDirectory(EXAMPLES_DIR, numWorkers=1)
+        self.assertIn('minimal.gabc', index.index)
+        self.assertEqual(index.loc['minimal.gabc', 'attribute'], 'value')
+        self.assertEqual(index.loc['kyrie.gabc', 'office-part'], 'Kyriale')
+        self.assertTrue(index['error'].isnull().all())
+
+    def test_parallelIndex(self):
+        index = indexGABCDirectory(EXAMPLES_DIR, numWorkers=1)
+        parallelIndex = indexGABCDirectory(EXAMPLES_DIR, numWorkers=2)
+        self.assertTrue(index.equals(parallelIndex))
+
+    def test_errors(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            with open(os.path.join(dirname, 'good.gabc'), 'w') as handle:
+                handle.write('name:Good;\n%%\n(c2) a(f)')
+            with open(os.path.join(dirname, 'bad.gabc'), 'w') as handle:
+                handle.write('name Bad\n%%\n(c2) a(f)')
+            index = indexGABCDirectory(dirname, numWorkers=1)
+            self.assertEqual(index.loc['good.gabc', 'name'], 'Good')
+            self.assertTrue(index.isnull().loc['good.gabc', 'error'])
+            self.assertTrue(index.loc['bad.gabc', 'error'].startswith('Incomplete'))
+
+if __name__  ==  '__main__':
+    unittest.main()
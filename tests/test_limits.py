@@ -0,0 +1,142 @@
+"""Unittests for the limits on conversions"""
+import io
+import os
+import json
+import pickle
+import tempfile
+import unittest
+from music21 import converter
+from chant21.limits import ConversionLimits
+from chant21.limits import ConversionLimitError
+from chant21.gabc import ParserGABC
+from chant21.gabc import convertGABCFiles
+from chant21.cantus import ParserCantusVolpiano
+from chant21.cantus import convertCantusCSV
+from chant21.cantus.reader import EXAMPLES_CSV
+from chant21.examples import gabcExamples
+from chant21.profiling import getRules
+
+class TestConversionLimits(unittest.TestCase):
+    def test_create(self):
+        self.assertIsNone(ConversionLimits.create(None))
+        limits = ConversionLimits(maxTime=1)
+        self.assertIs(ConversionLimits.create(limits), limits)
+        limits = ConversionLimits.create(dict(maxLength=10))
+        self.assertEqual(limits.maxLength, 10)
+        with self.assertRaises(ValueError):
+            ConversionLimits(checkInterval=0)
+
+    def test_error(self):
+        error = ConversionLimitError('length', 10, 5)
+        self.assertEqual(str(error),
+            'Input length exceeds the limit: 10 > 5 characters')
+        copy = pickle.loads(pickle.dumps(error))
+        self.assertEqual((copy.limit, copy.value, copy.maximum),
+            ('length', 10, 5))
+
+    def test_length(self):
+        parser = ParserGABC(root='body')
+        with self.assertRaises(ConversionLimitError) as context:
+            parser.parse('(c4) A(f)', limits=dict(maxLength=5))
+        self.assertEqual(context.exception.limit, 'length')
+        parse = parser.parse('(c4) A(f)', limits=dict(maxLength=9))
+        self.assertEqual(parse.rule_name, 'body')
+
+    def test_time(self):
+        parser = ParserGABC(root='body')
+        limits = ConversionLimits(maxTime=0, checkInterval=1)
+        with self.assertRaises(ConversionLimitError) as context:
+            parser.parse('(c4) A(f)', limits=limits)
+        self.assertEqual(context.exception.limit, 'time')
+        parse = parser.parse('(c4) A(f)', limits=dict(maxTime=60))
+        self.assertEqual(parse.rule_name, 'body')
+
+    def test_memo_size(self):
+        gabc = '(c4) A(f)B(g) C(h) (::)'
+        limits = ConversionLimits(maxMemoSize=1, checkInterval=1)
+        for memoization in [True, ['syllable', 'note']]:
+            parser = ParserGABC(root='body', memoization=memoization)
+            with self.assertRaises(ConversionLimitError) as context:
+                parser.parse(gabc, limits=limits)
+            self.assertEqual(context.exception.limit, 'memo')
+            parser.parse(gabc, limits=dict(maxMemoSize=10_000))
+
+    def test_rules_restored(self):
+        parser = ParserGABC(root='body', memoization=['syllable'])
+        rules = getRules(parser.parser)
+        memoized = rules['syllable'].parse
+        limits = ConversionLimits(maxTime=0, checkInterval=1)
+        with self.assertRaises(ConversionLimitError):
+            parser.parse('(c4) A(f)', limits=limits)
+        self.assertIs(rules['syllable'].parse, memoized)
+        self.assertNotIn('parse', rules['note'].__dict__)
+        self.assertTrue(all(len(cache) == 0 for cache in parser._caches))
+        parse = parser.parse('(c4) A(f)')
+        self.assertEqual(parse.rule_name, 'body')
+
+    def test_volpiano(self):
+        parser = ParserCantusVolpiano()
+        with self.assertRaises(ConversionLimitError):
+            parser.parse('1---a-b--c---d-e---4', limits=dict(maxLength=10))
+        limits = ConversionLimits(maxTime=0, checkInterval=1)
+        with self.assertRaises(ConversionLimitError):
+            parser.parse('1---a-b--c---d-e---4', limits=limits)
+
+class TestConverterLimits(unittest.TestCase):
+    def test_gabc(self):
+        with self.assertRaises(ConversionLimitError):
+            converter.parse('(c4) A(f)', format='gabc',
+                limits=dict(maxLength=5))
+        ch = converter.parse('(c4) A(f)', format='gabc',
+            limits=dict(maxLength=9))
+        self.assertEqual(len(ch.flat.notes), 1)
+
+    def test_lazy_gabc(self):
+        ch = converter.parse('name:Kyrie;\n%%\n(c4) A(f)', format='gabc',
+            lazy=True, limits=dict(maxLength=5))
+        self.assertEqual(ch.editorial.metadata['name'], 'Kyrie')
+        with self.assertRaises(ConversionLimitError):
+            ch.load()
+
+    def test_cantus(self):
+        with self.assertRaises(ConversionLimitError):
+            converter.parse('cantus: 1---fg--h---3/Kyrie eleison Christe',
+                limits=dict(maxLength=13))
+        ch = converter.parse('cantus: 1---fg--h---3/Kyri',
+            limits=dict(maxLength=13))
+        self.assertEqual(len(ch.flat.notes), 3)
+
+    def test_convert_cantus_csv(self):
+        output = io.StringIO()
+        errors = convertCantusCSV(EXAMPLES_CSV, output,
+            limits=dict(maxLength=100))
+        lines = output.getvalue().splitlines()
+        self.assertGreater(len(errors), 0)
+        self.assertGreater(len(lines), 0)
+        self.assertTrue(all('ConversionLimitError' in error
+                            for _, error in errors))
+
+    def test_convert_gabc_files(self):
+        filenames = list(gabcExamples.values())[:4]
+        sizes = []
+        for filename in filenames:
+            with open(filename, 'r', encoding='utf-8') as handle:
+                sizes.append(len(handle.read()))
+        maxLength = sorted(sizes)[1]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            outputFile = os.path.join(tmpdir, 'chants.chsonl')
+            for numWorkers in [1, 2]:
+                errors = convertGABCFiles(filenames, outputFile,
+                    numWorkers=numWorkers, limits=dict(maxLength=maxLength))
+                failed = [fn for fn, size in zip(filenames, sizes)
+                          if size > maxLength]
+                self.assertEqual([fn for fn, _ in errors], failed)
+                self.assertTrue(all('ConversionLimitError' in error
+                                    for _, error in errors))
+                with open(outputFile, 'r', encoding='utf-8') as handle:
+                    lines = handle.read().splitlines()
+                self.assertEqual(len(lines), len(filenames) - len(failed))
+                self.assertEqual(json.loads(lines[0])['type'], 'chant')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Unittests for the MIDI writer"""
+import os
+import tempfile
+import unittest
+from music21 import converter
+from chant21.midi import toMIDI
+from chant21.midi import arraysToMIDI
+from chant21.midi import writeMIDIFiles
+from chant21.chbin import readCHBINArrays
+from chant21.examples import gabcExamples
+
+def parseGABC(gabc):
+    return converter.parse(gabc, format='gabc', forceSource=True, storePickle=False)
+
+def readMIDI(data):
+    """Returns (midi pitch, offset, duration) of all notes in MIDI data"""
+    stream = converter.parseData(data, format='midi')
+    return [(n.pitch.midi, float(n.offset), float(n.quarterLength))
+            for n in stream.flat.notes]
+
+class TestMIDI(unittest.TestCase):
+
+    def test_examples(self):
+        for filename in gabcExamples.values():
+            ch = parseGABC(filename)
+            notes = readMIDI(toMIDI(ch))
+            targets = [n.pitch.midi for n in ch.flat.notes]
+            self.assertEqual([pitch for pitch, _, _ in notes], targets)
+
+    def test_durations(self):
+        ch = parseGABC('(c4) A(fg) B(-h) (,) C(ixi/hg) (::)')
+        notes = readMIDI(toMIDI(ch))
+        self.assertEqual(notes, [(65, 0, 1), (67, 1, 1), (69, 2, 0.5),
+            (70, 3, 1), (69, 4, 1), (67, 5, 1)])
+        durations = dict(note=0.5, neumeEnd=1.5, liquescent=0.25, 
+            pausaMinima=1)
+        notes = readMIDI(toMIDI(ch, durations=durations))
+        self.assertEqual(notes, [(65, 0, 0.5), (67, 0.5, 1.5), (69, 2, 0.25),
+            (70, 3.25, 1.5), (69, 4.75, 0.5), (67, 5.25, 1.5)])
+
+    def test_pausas(self):
+        ch = parseGABC('(c4) A(f) (,) B(f) (;) C(f) (:) D(f) (::)')
+        notes = readMIDI(toMIDI(ch, durations=dict(pausaMinor=1.5)))
+        self.assertEqual([offset for _, offset, _ in notes], [0, 1.5, 4, 7])
+
+    def test_arrays(self):
+        ch = parseGABC('(c4) A(fg) B(-h) (,) C(ixi/hg) (::)')
+        arrays = readCHBINArrays(ch.toCHBIN())
+        self.assertEqual(toMIDI(arrays), toMIDI(ch))
+        data = arraysToMIDI([32, 33], alterations=[0, -1])
+        self.assertEqual(readMIDI(data), [(65, 0, 1), (66, 1, 1)])
+
+    def test_long_durations(self):
+        # Delta times of several bytes
+        data = arraysToMIDI([29, 30], pausas=[4, 0], 
+            durations=dict(pausaFinalis=100, neumeEnd=1000))
+        self.assertEqual(readMIDI(data), [(60, 0, 1000), (62, 1100, 1000)])
+
+    def test_liquescent_shapes(self):
+        ch = parseGABC('(c4) A(fg~) B(ho<) C(h>i)')
+        notes = readMIDI(toMIDI(ch))
+        self.assertEqual([duration for _, _, duration in notes], 
+            [1, 0.5, 0.5, 0.5, 1])
+        arrays = readCHBINArrays(ch.toCHBIN())
+        self.assertEqual(arrays.liquescent.tolist(), 
+            [False, True, True, True, False])
+        self.assertEqual(toMIDI(arrays), toMIDI(ch))
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, arraysToMIDI, [100])
+        for kwargs in [dict(channel=16), dict(channel=-1), 
+            dict(velocity=128), dict(velocity=-1), dict(program=128), 
+            dict(program=-1)]:
+            self.assertRaises(ValueError, arraysToMIDI, [30], **kwargs)
+
+    def test_invalid_durations_and_tempo(self):
+        with self.assertRaisesRegex(ValueError, 'Negative durations: note'):
+            arraysToMIDI([30, 31], neume=[0, 0], durations=dict(note=-1))
+        for tempo in [0, -60, 1]:
+            self.assertRaises(ValueError, arraysToMIDI, [30], tempo=tempo)
+        # The slowest tempo that can be encoded
+        data = arraysToMIDI([30], tempo=60_000_000 / (2 ** 24 - 1))
+        self.assertEqual(readMIDI(data), [(62, 0, 1)])
+        self.assertRaises(ValueError, arraysToMIDI, [29], 
+            durations=dict(unknown=1))
+
+    def test_write_files(self):
+        chants = [parseGABC('(c4) A(f)'), parseGABC('(c4) B(g)')]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            gabcFilename = os.path.join(tmpdir, 'chant.gabc')
+            with open(gabcFilename, 'w') as handle:
+                handle.write('name: Test;\n%%\n(c4) A(h)')
+            sources = chants + [gabcFilename, os.path.join(tmpdir, 'missing.gabc')]
+            filenames = [os.path.join(tmpdir, f'chant{i}.mid') for i in range(4)]
+            errors = writeMIDIFiles(sources, filenames, numWorkers=2)
+            self.assertEqual(errors[:3], [None, None, None])
+            self.assertIsNotNone(errors[3])
+            for chant, filename in zip(chants, filenames):
+                with open(filename, 'rb') as handle:
+                    self.assertEqual(handle.read(), chant.toMIDI())
+            with open(filenames[2], 'rb') as handle:
+                self.assertEqual(readMIDI(handle.read()), [(69, 0, 1)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Unittests for melody extraction and MinHash near-duplicate detection"""
+import os
+import tempfile
+import unittest
+import numpy as np
+from music21 import converter
+from chant21.melody import volpianoToPitches
+from chant21.melody import chantToPitches
+from chant21.melody import pitchesToIntervals
+from chant21.minhash import MinHashIndex
+from chant21.minhash import shingle
+
+class TestMelody(unittest.TestCase):
+
+    def test_volpiano(self):
+        pitches = volpianoToPitches('1---c-d--e---(-i-3')
+        self.assertEqual(pitches, [29, 30, 31, 25])
+
+    def test_chant(self):
+        volpiano = '1---f-g--h---g--f--h---g--fg---4'
+        chant = converter.parse('cantus: ' + volpiano)
+        self.assertEqual(chantToPitches(chant), volpianoToPitches(volpiano))
+
+    def test_intervals(self):
+        self.assertEqual(pitchesToIntervals([30, 32, 31]), [2, -1])
+        self.assertEqual(pitchesToIntervals([30]), [])
+
+class TestShingle(unittest.TestCase):
+
+    def test_deterministic(self):
+        hashes = shingle([1, 2, 3, 1, 2, 3], 3)
+        self.assertEqual(len(hashes), 3)
+        self.assertTrue(np.array_equal(hashes, shingle([1, 2, 3, 1, 2, 3], 3)))
+        self.assertEqual(len(shingle([1, 2], 3)), 0)
+
+    def test_order(self):
+        self.assertFalse(np.array_equal(shingle([1, 2, 3], 3), 
+            shingle([3, 2, 1], 3)))
+
+class TestMinHashIndex(unittest.TestCase):
+    melodies = {
+        'a': '1---f-g--h---g--f--h---g--fg--h-j-k--j',
+        'b': '1---f-g--h---g--f--h---g--fg--h-j-k--k',
+        'transposed': '1---g-h--j---h--g--j---h--gh--j-k-l--k',
+        'other': '1---c-d--c---e--d--c---d--cc--d-c-e--f',
+        'short': '1---c-d',
+    }
+
+    def test_clusters(self):
+        index = MinHashIndex(threshold=0.5)
+        index.update(self.melodies)
+        self.assertEqual(index.clusters(), [['a', 'b', 'transposed']])
+        self.assertEqual(index.query(self.melodies['a']), 
+            ['a', 'b', 'transposed'])
+        self.assertEqual(index.query(self.melodies['short']), [])
+
+    def test_pitches(self):
+        index = MinHashIndex(threshold=0.5, intervals=False)
+        index.update(self.melodies)
+        self.assertEqual(index.clusters(), [['a', 'b']])
+        self.assertEqual(index.similarity('a', 'a'), 1.0)
+        self.assertLess(index.similarity('a', 'other'), 0.5)
+
+    def test_threshold(self):
+        index = MinHashIndex(threshold=0.5)
+        index.update(self.melodies)
+        self.assertEqual(index.clusters(threshold=1.0), [['a', 'transposed']])
+
+    def test_chant(self):
+        index = MinHashIndex(threshold=0.5)
+        index.update(self.melodies)
+        chant = converter.parse('cantus: ' + self.melodies['a'])
+        self.assertTrue(np.array_equal(index.signature(chant), 
+            index.signatures[0]))
+
+    def test_bands(self):
+        self.assertRaises(ValueError, MinHashIndex, numPerm=8, bands=16)
+        self.assertRaises(ValueError, MinHashIndex, numPerm=8, bands=0)
+        self.assertRaises(ValueError, MinHashIndex, numPerm=0)
+        index = MinHashIndex(numPerm=10, bands=3)
+        self.assertEqual((index.bands, index.rows), (3, 3))
+        index = MinHashIndex(numPerm=8, bands=8)
+        self.assertEqual((index.bands, index.rows), (8, 1))
+
+    def test_duplicateKey(self):
+        index = MinHashIndex()
+        index.add('a', self.melodies['a'])
+        self.assertRaises(KeyError, lambda: index.add('a', self.melodies['b']))
+
+    def test_saveAndLoad(self):
+        index = MinHashIndex(threshold=0.5, k=4)
+        index.update({'a': self.melodies['a'], 'other': self.melodies['other']})
+        with tempfile.TemporaryDirectory() as dirname:
+            filepath = os.path.join(dirname, 'index.npz')
+            index.save(filepath)
+            loaded = MinHashIndex.load(filepath)
+        self.assertEqual(loaded.keys, ['a', 'other'])
+        self.assertEqual(loaded.k, 4)
+        self.assertEqual((loaded.bands, loaded.rows), (index.bands, index.rows))
+        self.assertTrue(np.array_equal(loaded.signatures, index.signatures))
+        
+        # Incremental updates
+        loaded.add('b', self.melodies['b'])
+        self.assertEqual(loaded.clusters(), [['a', 'b']])
+
+    def test_saveWithoutPickle(self):
+        index = MinHashIndex(k=4)
+        index.update({1: self.melodies['a'], 'b': self.melodies['b']})
+        with tempfile.TemporaryDirectory() as dirname:
+            filepath = os.path.join(dirname, 'index.npz')
+            index.save(filepath)
+            with np.load(filepath, allow_pickle=False) as data:
+                self.assertNotEqual(data['keys'].dtype, object)
+            self.assertEqual(MinHashIndex.load(filepath).keys, [1, 'b'])
+
+            index.add(('c', 1), self.melodies['other'])
+            self.assertRaises(TypeError, lambda: index.save(filepath))
+
+if __name__ == '__main__':
+    unittest.main()
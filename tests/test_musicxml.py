@@ -0,0 +1,86 @@
+"""Unittests for the direct MusicXML export"""
+import os
+import tempfile
+import unittest
+from music21 import converter
+from chant21.musicxml import toMusicXML
+from chant21.musicxml import writeMusicXML
+from chant21.examples import gabcExamples
+
+def parseGABC(gabc):
+    return converter.parse(gabc, format='gabc', forceSource=True, storePickle=False)
+
+def parseMusicXML(xml):
+    return converter.parseData(xml, format='musicxml', forceSource=True)
+
+class TestMusicXML(unittest.TestCase):
+
+    def test_notes_and_lyrics(self):
+        ch = converter.parse('cantus: 1---fg--h---3/Kyri')
+        xml = toMusicXML(ch)
+        self.assertTrue(xml.startswith('<?xml'))
+        self.assertEqual(xml.count('<note>'), 3)
+        self.assertEqual(xml.count('<lyric '), 2)
+        self.assertIn('<syllabic>begin</syllabic><text>Ky</text>', xml)
+        self.assertIn('<syllabic>single</syllabic><text>ri</text>', xml)
+
+    def test_neume_slurs(self):
+        ch = converter.parse('cantus: 1---fgh---3')
+        xml = toMusicXML(ch)
+        self.assertEqual(xml.count('<slur number="1" type="start"/>'), 1)
+        self.assertEqual(xml.count('<slur number="1" type="stop"/>'), 1)
+        xml = toMusicXML(ch, neumeSlurs=False)
+        self.assertNotIn('<slur', xml)
+
+    def test_pausas(self):
+        ch = parseGABC('(c4) A(f) (,) B(g) (;) C(h) (:) D(g) (::)')
+        xml = toMusicXML(ch)
+        self.assertEqual(xml.count('<measure '), 4)
+        self.assertEqual(xml.count('<breath-mark/>'), 2)
+        self.assertEqual(xml.count('<bar-style>dotted</bar-style>'), 2)
+        self.assertEqual(xml.count('<bar-style>regular</bar-style>'), 1)
+        self.assertEqual(xml.count('<bar-style>light-light</bar-style>'), 1)
+
+    def test_accidentals(self):
+        ch = parseGABC('(c4) A(ixi) B(i) C(iyi)')
+        xml = toMusicXML(ch)
+        self.assertEqual(xml.count('<alter>-1</alter>'), 1)
+        self.assertEqual(xml.count('<accidental>flat</accidental>'), 1)
+        self.assertEqual(xml.count('<accidental>natural</accidental>'), 1)
+
+    def test_clef(self):
+        ch = parseGABC('(c4) A(f)')
+        xml = toMusicXML(ch)
+        clef = ch.flat.getElementsByClass('Clef')[0]
+        self.assertIn(f'<clef><sign>{clef.sign}</sign><line>{clef.line}</line>'
+            '</clef>', xml)
+
+    def test_title(self):
+        ch = parseGABC('name: Title & more;\n%%\n(c4) A(f)')
+        xml = toMusicXML(ch)
+        self.assertIn('<work-title>Title &amp; more</work-title>', xml)
+
+    def test_parse_examples(self):
+        for filename in gabcExamples.values():
+            ch = parseGABC(filename)
+            score = parseMusicXML(toMusicXML(ch))
+            pitches = [n.nameWithOctave for n in score.flat.notes]
+            targets = [n.nameWithOctave for n in ch.flat.notes]
+            self.assertEqual(pitches, targets)
+            lyrics = [n.lyric for n in score.flat.notes]
+            targets = [n.lyric for n in ch.flatter.flat.notes]
+            self.assertEqual(lyrics, targets)
+
+    def test_files(self):
+        chants = [parseGABC('(c4) A(f)'), parseGABC('(c4) B(g)')]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filenames = [os.path.join(tmpdir, f'chant{i}.musicxml')
+                         for i in range(2)]
+            count = writeMusicXML(chants, filenames)
+            self.assertEqual(count, 2)
+            for chant, filename in zip(chants, filenames):
+                with open(filename, 'r', encoding='utf-8') as handle:
+                    self.assertEqual(handle.read(), chant.toMusicXML())
+
+if __name__ == '__main__':
+    unittest.main()
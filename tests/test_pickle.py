@@ -0,0 +1,170 @@
+"""Unittests for the compact pickling of chant21 objects"""
+import os
+import copy
+import pickle
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from music21 import converter
+from music21 import note
+from chant21 import chant
+from chant21.chant import encodeHierarchy
+from chant21.chant import decodeHierarchy
+from chant21.chant import UnencodableError
+from chant21.examples import gabcExamples
+from chant21.gabc import LazyChant
+
+def parseGABC(gabc):
+    return converter.parse(gabc, format='gabc', forceSource=True, storePickle=False)
+
+def roundTrip(obj):
+    return pickle.loads(pickle.dumps(obj))
+
+def _convert(gabc):
+    return parseGABC(gabc)
+
+class TestRoundTrip(unittest.TestCase):
+
+    def assertSameChant(self, ch1, ch2):
+        self.assertEqual(type(ch1), type(ch2))
+        self.assertEqual(ch1.toObject(), ch2.toObject())
+        self.assertEqual(ch1.toCHSON(), ch2.toCHSON())
+        for el1, el2 in zip(ch1.recurse(), ch2.recurse()):
+            self.assertEqual(type(el1), type(el2))
+            self.assertEqual(el1.offset, el2.offset)
+            self.assertEqual(el1.priority, el2.priority)
+
+    def test_examples(self):
+        for filename in gabcExamples.values():
+            ch = converter.parse(filename, format='gabc', forceSource=True, 
+                storePickle=False)
+            self.assertSameChant(ch, roundTrip(ch))
+
+    def test_cantus(self):
+        ch = converter.parse('cantus: 1---f-gy-j--h---3---c-d---4/A-b cd e')
+        self.assertSameChant(ch, roundTrip(ch))
+
+    def test_notes(self):
+        ch = parseGABC('(c4) A(-f.) B(gw) C(hr) D(ixi)')
+        copied = roundTrip(ch)
+        for n1, n2 in zip(ch.flat.notes, copied.flat.notes):
+            self.assertEqual(n1.nameWithOctave, n2.nameWithOctave)
+            self.assertEqual(n1.notehead, n2.notehead)
+            self.assertEqual(n1.noteheadFill, n2.noteheadFill)
+            self.assertEqual(n1.stemDirection, n2.stemDirection)
+            self.assertIs(n1.noteInfo, n2.noteInfo)
+            self.assertEqual(n1.lyric, n2.lyric)
+            if n1.lyric is not None:
+                self.assertEqual(n1.lyrics[0].syllabic, n2.lyrics[0].syllabic)
+
+    def test_editorial(self):
+        ch = parseGABC('name:Test;\n%%\n(c4) A(f)')
+        ch[0].editorial.foo = 'bar'
+        n = ch.flat.notes[0]
+        n.editorial.baz = 1
+        copied = roundTrip(ch)
+        self.assertEqual(copied.editorial.metadata['name'], 'Test')
+        self.assertEqual(copied[0].editorial.foo, 'bar')
+        self.assertEqual(copied.flat.notes[0].editorial.baz, 1)
+
+    def test_sites(self):
+        ch = roundTrip(parseGABC('(c4) A(fg) B(h)'))
+        n = list(ch.recurse().notes)[1]
+        self.assertIsInstance(n.activeSite, chant.Neume)
+        self.assertIsInstance(n.getContextByClass(chant.Word), chant.Word)
+
+    def test_elements(self):
+        n = chant.Note('F4')
+        n.noteInfo = chant.NoteInfo.intern(gabcPosition='f')
+        copied = roundTrip(n)
+        self.assertEqual(copied.nameWithOctave, 'F4')
+        self.assertEqual(copied.noteInfo.gabcPosition, 'f')
+        ch = parseGABC('(c4) A(fg)')
+        syllable = list(ch.recurse().getElementsByClass(chant.Syllable))[-1]
+        self.assertEqual(roundTrip(syllable).lyric, 'A')
+
+    def test_lazy_chant(self):
+        ch = LazyChant('name:Kyrie;\n%%\n(c4) Ky(f)ri(g)e(h)')
+        copied = roundTrip(ch)
+        self.assertIsInstance(copied, LazyChant)
+        self.assertTrue(copied.isLoaded)
+        self.assertEqual(len(copied.flat.notes), 3)
+        self.assertEqual(copied.toObject(), ch.toObject())
+
+    def test_size(self):
+        ch = converter.parse(gabcExamples['kyrie'], format='gabc', 
+            forceSource=True, storePickle=False)
+        numNotes = len(ch.flat.notes)
+        self.assertLess(len(pickle.dumps(ch)), 150 * numNotes)
+
+    def test_process_pool(self):
+        with ProcessPoolExecutor(1) as executor:
+            ch = executor.submit(_convert, '(c4) A(fg) B(h) (::)').result()
+        self.assertEqual(ch.toObject(), _convert('(c4) A(fg) B(h) (::)').toObject())
+
+class TestMusic21Cache(unittest.TestCase):
+    """By default, music21 caches parsed files as pickles, which are created 
+    by its StreamFreezer rather than by the compact encoding"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def assertParsesFile(self, filename, expected, **kwargs):
+        # The first parse stores the pickle, the second reads it
+        for _ in range(2):
+            ch = converter.parse(filename, **kwargs)
+            self.assertEqual(len(ch.flatNotes), len(expected.flatNotes))
+            self.assertEqual(ch.toObject(), expected.toObject())
+
+    def test_gabc(self):
+        filename = os.path.join(self.tmpdir.name, 'kyrie.gabc')
+        shutil.copy(gabcExamples['kyrie'], filename)
+        expected = parseGABC(gabcExamples['kyrie'])
+        self.assertGreater(len(expected), 0)
+        self.assertParsesFile(filename, expected)
+
+    def test_lazy_gabc(self):
+        filename = os.path.join(self.tmpdir.name, 'salve.gabc')
+        shutil.copy(gabcExamples['salveRegina'], filename)
+        expected = parseGABC(gabcExamples['salveRegina'])
+        self.assertParsesFile(filename, expected, lazy=True)
+
+    def test_chson_and_chbin(self):
+        expected = parseGABC(gabcExamples['kyrie'])
+        filename = os.path.join(self.tmpdir.name, 'kyrie.chson')
+        expected.toCHSON(filename)
+        self.assertParsesFile(filename, expected)
+        filename = os.path.join(self.tmpdir.name, 'kyrie.chbin')
+        with open(filename, 'wb') as handle:
+            handle.write(expected.toCHBIN())
+        self.assertParsesFile(filename, expected)
+
+class TestFallback(unittest.TestCase):
+
+    def test_unencodable(self):
+        ch = parseGABC('(c4) A(fg)')
+        ch.addNeumeSlurs()
+        with self.assertRaises(UnencodableError):
+            encodeHierarchy(ch)
+        # Falls back to default pickling
+        self.assertNotEqual(ch.__reduce_ex__(4)[0], decodeHierarchy)
+
+    def test_frozen_streams(self):
+        ch = parseGABC('(c4) A(fg)')
+        ch._storedElementOffsetTuples = []
+        self.assertNotEqual(ch.__reduce_ex__(4)[0], decodeHierarchy)
+
+    def test_copy(self):
+        # Shallow copies do not use the encoding
+        ch = parseGABC('(c4) A(fg)')
+        copied = copy.copy(ch)
+        self.assertIs(copied.elements[0], ch.elements[0])
+        deepCopied = copy.deepcopy(ch)
+        self.assertEqual(deepCopied.toObject(), ch.toObject())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+"""Unittests for the grammar profiler"""
+import unittest
+from chant21.gabc import ParserGABC
+from chant21.profiling import GrammarProfiler
+from chant21.profiling import profileGrammar
+from chant21.profiling import getRules
+
+class TestGrammarProfiler(unittest.TestCase):
+
+    def test_counts(self):
+        parser = ParserGABC(root='body')
+        stats = profileGrammar(parser, ['(c4) A(f)B(g) C(h) (::)'], repeat=2)
+        self.assertEqual(stats.loc['body', 'attempts'], 2)
+        self.assertEqual(stats.loc['clef', 'attempts'], 
+            stats.loc['clef', 'failures'] + 2)
+        self.assertTrue((stats['time'] >= stats['selfTime']).all())
+
+    def test_restoresParser(self):
+        parser = ParserGABC(root='body', memoization=['syllable'])
+        syllable = getRules(parser.parser)['syllable']
+        memoizedParse = syllable.parse
+        with GrammarProfiler(parser) as profiler:
+            parser.parse('(c4) A(f)')
+        attempts = profiler.stats['syllable'].attempts
+        self.assertGreater(attempts, 0)
+        
+        # The memoized rule is restored after profiling
+        self.assertIs(syllable.parse, memoizedParse)
+        parser.parse('(c4) A(f)')
+        self.assertEqual(profiler.stats['syllable'].attempts, attempts)
+
+if __name__  ==  '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+"""Unittests for the chant conversion service"""
+import os
+import json
+import socket
+import asyncio
+import tempfile
+import threading
+import unittest
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from chant21.server import ChantServer
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__('localhost')
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+class ServerTestCase(unittest.TestCase):
+    """Runs a server with a single worker in a background event loop"""
+    serverKwargs = {}
+    serverOptions = {}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.loop = asyncio.new_event_loop()
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+        cls.server = ChantServer(numWorkers=1, maxDelay=0.05,
+            **cls.serverOptions)
+        future = asyncio.run_coroutine_threadsafe(
+            cls.server.start(**cls.serverKwargs), cls.loop)
+        future.result(timeout=60)
+
+    @classmethod
+    def tearDownClass(cls):
+        future = asyncio.run_coroutine_threadsafe(cls.server.close(), cls.loop)
+        future.result(timeout=60)
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join()
+        cls.loop.close()
+
+    def connect(self):
+        host, port = self.server.address
+        return http.client.HTTPConnection(host, port, timeout=60)
+
+    def request(self, method, path, body=None, connection=None):
+        connection = connection or self.connect()
+        if body is not None and not isinstance(body, str):
+            body = json.dumps(body)
+        connection.request(method, path, body=body)
+        response = connection.getresponse()
+        return response.status, response.read().decode('utf-8')
+
+class TestServer(ServerTestCase):
+    serverKwargs = dict(host='127.0.0.1', port=0)
+
+    def test_convertGABC(self):
+        request = {'format': 'gabc', 'data': 'name:Test;\n%%\n(c4) A(f)B(g)'}
+        status, content = self.request('POST', '/convert', request)
+        self.assertEqual(status, 200)
+        obj = json.loads(content)
+        self.assertEqual(obj['type'], 'chant')
+        self.assertEqual(obj['metadata']['name'], 'Test')
+
+    def test_convertCantus(self):
+        request = {'format': 'cantus', 'data': '1---f-g--h---3/Abra cadabra',
+            'options': {'includeVolpiano': True}}
+        status, content = self.request('POST', '/convert', request)
+        self.assertEqual(status, 200)
+        self.assertIn('"volpiano": "f"', content)
+
+    def test_render(self):
+        request = {'format': 'gabc', 'data': '(c4) A(f)B(g)'}
+        status, content = self.request('POST', '/render', request)
+        self.assertEqual(status, 200)
+        self.assertIn('<div', content)
+
+    def test_errors(self):
+        status, content = self.request('POST', '/convert', 
+            {'format': 'gabc', 'data': '(c4) A(f'})
+        self.assertEqual(status, 400)
+        self.assertIn('error', json.loads(content))
+
+        status, _ = self.request('POST', '/convert', {'format': 'abc', 'data': ''})
+        self.assertEqual(status, 400)
+        status, _ = self.request('POST', '/convert', 'not json')
+        self.assertEqual(status, 400)
+        status, _ = self.request('GET', '/convert')
+        self.assertEqual(status, 405)
+        status, _ = self.request('GET', '/foo')
+        self.assertEqual(status, 404)
+
+    def test_options(self):
+        filepath = os.path.join(tempfile.mkdtemp(), 'chant.html')
+        for path, options in [('/render', {'filepath': filepath}),
+            ('/convert', {'includeChildren': False}), 
+            ('/convert', {'showWords': True}),
+            ('/render', {'showWords': 'yes'})]:
+            request = {'format': 'gabc', 'data': '(c4) A(f)', 'options': options}
+            status, content = self.request('POST', path, request)
+            self.assertEqual(status, 400)
+            self.assertIn('error', json.loads(content))
+        self.assertFalse(os.path.exists(filepath))
+
+        request = {'format': 'gabc', 'data': '(c4) A(f)', 
+            'options': {'showWords': True, 'showNeumes': False}}
+        status, content = self.request('POST', '/render', request)
+        self.assertEqual(status, 200)
+        self.assertIn('<div', content)
+
+    def test_invalid_content_length(self):
+        host, port = self.server.address
+        with socket.create_connection((host, port), timeout=60) as sock:
+            sock.sendall(b'POST /convert HTTP/1.1\r\nHost: localhost\r\n'
+                b'Content-Length: abc\r\n\r\n')
+            response = sock.makefile('rb').read().decode('utf-8')
+        self.assertTrue(response.startswith('HTTP/1.1 400'))
+        self.assertIn('Connection: close', response)
+
+    def test_keepAlive(self):
+        connection = self.connect()
+        request = {'format': 'gabc', 'data': '(c4) A(f)'}
+        for _ in range(3):
+            status, _ = self.request('POST', '/convert', request, connection)
+            self.assertEqual(status, 200)
+
+    def test_batching(self):
+        request = {'format': 'gabc', 'data': '(c4) A(f)B(g)'}
+        batchesBefore = self.server.stats.batches
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(
+                lambda _: self.request('POST', '/convert', request), range(8)))
+        self.assertTrue(all(status == 200 for status, _ in results))
+        self.assertLess(self.server.stats.batches - batchesBefore, 8)
+
+    def test_stats(self):
+        self.request('POST', '/convert', {'format': 'gabc', 'data': '(c4) A(f)'})
+        status, content = self.request('GET', '/stats')
+        self.assertEqual(status, 200)
+        stats = json.loads(content)
+        self.assertGreater(stats['requests'], 0)
+        self.assertIn('p99', stats['latency'])
+
+class TestLimits(ServerTestCase):
+    serverKwargs = dict(host='127.0.0.1', port=0)
+    serverOptions = dict(limits=dict(maxLength=100))
+
+    def test_limits(self):
+        request = {'format': 'gabc', 'data': '(c4) ' + 'A(f) ' * 50}
+        status, content = self.request('POST', '/convert', request)
+        self.assertEqual(status, 400)
+        self.assertIn('ConversionLimitError', json.loads(content)['error'])
+        request = {'format': 'cantus', 'data': '1---' + 'f-' * 100}
+        status, content = self.request('POST', '/convert', request)
+        self.assertEqual(status, 400)
+        request = {'format': 'gabc', 'data': '(c4) A(f)'}
+        status, _ = self.request('POST', '/convert', request)
+        self.assertEqual(status, 200)
+
+class TestUnixSocketServer(ServerTestCase):
+    tempdir = tempfile.mkdtemp()
+    serverKwargs = dict(path=os.path.join(tempdir, 'chant21.sock'))
+
+    def connect(self):
+        return UnixHTTPConnection(self.serverKwargs['path'])
+
+    def test_convert(self):
+        request = {'format': 'gabc', 'data': '(c4) A(f)B(g)'}
+        status, content = self.request('POST', '/convert', request)
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(content)['type'], 'chant')
+
+if __name__ == '__main__':
+    unittest.main()
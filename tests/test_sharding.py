@@ -0,0 +1,180 @@
+"""Unittests for sharded conversion"""
+import os
+import json
+import tempfile
+import unittest
+from chant21.sharding import shardOf
+from chant21.sharding import readManifest
+from chant21.sharding import shardFilename
+from chant21.sharding import convertShard
+from chant21.sharding import mergeShards
+from chant21.sharding import convertShardsLocally
+from chant21.sharding import main
+from chant21.chson import iterCHSONLines
+from chant21.chson import readCHSONLine
+from chant21.chson import CHSONLinesIndex
+from chant21.cantus import readCantusCSV
+from chant21.cantus.reader import EXAMPLES_CSV
+from chant21.examples import gabcExamples
+
+def readFile(filename):
+    with open(filename, 'rb') as handle:
+        return handle.read()
+
+def readErrors(filename):
+    with open(filename, 'r', encoding='utf-8') as handle:
+        return [json.loads(line) for line in handle]
+
+class TestSharding(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cantusIds = [row['id'] for chunk in readCantusCSV(EXAMPLES_CSV)
+                         for row in chunk]
+        cls.gabcRoot = os.path.dirname(list(gabcExamples.values())[0])
+        cls.gabcFiles = [os.path.basename(filename)
+                         for filename in gabcExamples.values()]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_shard_of(self):
+        shards = [shardOf(item, 4) for item in self.cantusIds]
+        self.assertEqual(shards, [shardOf(item, 4) for item in self.cantusIds])
+        self.assertEqual(set(shards), {0, 1, 2, 3})
+
+    def test_read_manifest(self):
+        filename = os.path.join(self.dir, 'manifest.txt')
+        with open(filename, 'w', encoding='utf-8') as handle:
+            handle.write('# A comment\na.gabc\n\n b.gabc \na.gabc\n')
+        self.assertEqual(readManifest(filename), ['a.gabc', 'b.gabc'])
+        self.assertEqual(readManifest(['x', 'y', 'x']), ['x', 'y'])
+
+    def test_convert_shard(self):
+        outputDir = os.path.join(self.dir, 'shards')
+        summaries = [convertShard(None, shard, 3, outputDir, format='cantus',
+                     csvFile=EXAMPLES_CSV) for shard in range(3)]
+        self.assertEqual(sum(s['numItems'] for s in summaries),
+            len(self.cantusIds))
+        for shard, summary in enumerate(summaries):
+            filename = shardFilename(outputDir, shard, 3)
+            ids = CHSONLinesIndex(filename).ids
+            self.assertTrue(all(shardOf(i, 3) == shard for i in ids))
+            self.assertEqual(len(ids), summary['numConverted'])
+            errors = readErrors(shardFilename(outputDir, shard, 3,
+                '.errors.jsonl'))
+            self.assertEqual(len(errors), summary['numErrors'])
+
+    def test_deterministic(self):
+        kwargs = dict(format='cantus', csvFile=EXAMPLES_CSV,
+            compression='gzip', limits=dict(maxLength=100))
+        outputs = []
+        for numWorkers, name in [(1, 'a'), (2, 'b')]:
+            outputDir = os.path.join(self.dir, name)
+            convertShard(self.cantusIds, 1, 2, outputDir,
+                numWorkers=numWorkers, chunksize=3, **kwargs)
+            filename = shardFilename(outputDir, 1, 2, '.chsonl.gz')
+            outputs.append([readFile(filename), readFile(filename + '.idx'),
+                readFile(shardFilename(outputDir, 1, 2, '.errors.jsonl'))])
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_merge(self):
+        limits = dict(maxLength=150)
+        merged = []
+        for numShards in [1, 3]:
+            outputDir = os.path.join(self.dir, f'shards-{numShards}')
+            outputFile = os.path.join(self.dir, f'corpus-{numShards}.chsonl.gz')
+            for shard in range(numShards):
+                convertShard(self.cantusIds, shard, numShards, outputDir,
+                    format='cantus', csvFile=EXAMPLES_CSV, limits=limits)
+            summary = mergeShards(outputDir, numShards, outputFile)
+            self.assertEqual(summary['numItems'], len(self.cantusIds))
+            self.assertGreater(summary['numErrors'], 0)
+            self.assertEqual(summary['numConverted'] + summary['numErrors'],
+                len(self.cantusIds))
+            errors = readErrors(outputFile + '.errors.jsonl')
+            self.assertEqual(len(errors), summary['numErrors'])
+            objects = dict(zip(CHSONLinesIndex(outputFile).ids,
+                iterCHSONLines(outputFile, asObject=True)))
+            merged.append((objects, sorted(e['id'] for e in errors)))
+        self.assertEqual(merged[0], merged[1])
+
+        chantId = next(iter(merged[0][0]))
+        obj = readCHSONLine(outputFile, chantId, asObject=True)
+        self.assertEqual(obj['metadata']['id'], chantId)
+
+    def test_merge_checks(self):
+        outputDir = os.path.join(self.dir, 'shards')
+        convertShard(self.cantusIds[:10], 0, 2, outputDir, format='cantus',
+            csvFile=EXAMPLES_CSV)
+        outputFile = os.path.join(self.dir, 'corpus.chsonl')
+        with self.assertRaises(ValueError):
+            mergeShards(outputDir, 2, outputFile)
+        convertShard(self.cantusIds[:11], 1, 2, outputDir, format='cantus',
+            csvFile=EXAMPLES_CSV)
+        with self.assertRaises(ValueError):
+            mergeShards(outputDir, 2, outputFile)
+        convertShard(self.cantusIds[:10], 1, 2, outputDir, format='cantus',
+            csvFile=EXAMPLES_CSV)
+        summary = mergeShards(outputDir, 2, outputFile)
+        self.assertEqual(summary['numItems'], 10)
+
+    def test_missing_items(self):
+        outputDir = os.path.join(self.dir, 'shards')
+        manifest = self.cantusIds[:3] + ['unknown']
+        convertShard(manifest, 0, 1, outputDir, format='cantus',
+            csvFile=EXAMPLES_CSV)
+        errors = readErrors(shardFilename(outputDir, 0, 1, '.errors.jsonl'))
+        self.assertEqual([e['id'] for e in errors], ['unknown'])
+
+    def test_manifest_order(self):
+        outputDir = os.path.join(self.dir, 'shards')
+        manifest = ['unknown'] + self.cantusIds[10:0:-1]
+        convertShard(manifest, 0, 1, outputDir, format='cantus',
+            csvFile=EXAMPLES_CSV)
+        index = CHSONLinesIndex(shardFilename(outputDir, 0, 1, '.chsonl'))
+        self.assertEqual(index.ids, self.cantusIds[10:0:-1])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            convertShard([], 2, 2, self.dir)
+        with self.assertRaises(ValueError):
+            convertShard([], 0, 2, self.dir, format='mei')
+        with self.assertRaises(ValueError):
+            convertShard([], 0, 2, self.dir, format='cantus')
+
+    def test_local_nodes(self):
+        manifest = os.path.join(self.dir, 'manifest.txt')
+        with open(manifest, 'w', encoding='utf-8') as handle:
+            handle.write('\n'.join(self.gabcFiles + ['missing.gabc']))
+        outputDir = os.path.join(self.dir, 'shards')
+        summaries = convertShardsLocally(manifest, 3, outputDir,
+            numProcesses=3, root=self.gabcRoot)
+        self.assertEqual([s['shard'] for s in summaries], [0, 1, 2])
+        outputFile = os.path.join(self.dir, 'corpus.chsonl')
+        summary = mergeShards(outputDir, 3, outputFile)
+        self.assertEqual(summary['numConverted'], len(self.gabcFiles))
+        self.assertEqual(sorted(CHSONLinesIndex(outputFile).ids),
+            sorted(self.gabcFiles))
+        errors = readErrors(outputFile + '.errors.jsonl')
+        self.assertEqual([e['id'] for e in errors], ['missing.gabc'])
+
+    def test_command_line(self):
+        outputDir = os.path.join(self.dir, 'shards')
+        manifest = os.path.join(self.dir, 'manifest.txt')
+        with open(manifest, 'w', encoding='utf-8') as handle:
+            handle.write('\n'.join(self.cantusIds[:5]))
+        for shard in range(2):
+            main(['convert', manifest, '--shard', str(shard), '--num-shards',
+                '2', '--output-dir', outputDir, '--format', 'cantus', '--csv',
+                EXAMPLES_CSV, '--compression', 'gzip'])
+        outputFile = os.path.join(self.dir, 'corpus.chsonl')
+        main(['merge', outputDir, outputFile, '--num-shards', '2'])
+        self.assertEqual(sorted(CHSONLinesIndex(outputFile).ids),
+            sorted(self.cantusIds[:5]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""Unittests for batched melodic edit distances"""
+import random
+import unittest
+import numpy as np
+from music21 import converter
+from chant21.melody import volpianoToSegments
+from chant21.melody import chantToSegments
+from chant21.similarity import encodeMelodies
+from chant21.similarity import editDistance
+from chant21.similarity import distanceMatrix
+from chant21.similarity import similarityMatrix
+from chant21.similarity import topKSimilar
+
+def levenshtein(a, b):
+    """Reference implementation: dynamic programming"""
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        previous, row[0] = row[0], i
+        for j in range(1, len(b) + 1):
+            current = row[j]
+            row[j] = min(row[j] + 1, row[j - 1] + 1, 
+                previous + (a[i - 1] != b[j - 1]))
+            previous = current
+    return row[-1]
+
+def randomMelodies(num, maxLength, seed=0):
+    rng = random.Random(seed)
+    melodies = [[rng.randint(25, 35) for _ in range(rng.randint(0, maxLength))]
+                for _ in range(num)]
+    # Add some near duplicates
+    for melody in melodies[:5]:
+        duplicate = list(melody)
+        if len(duplicate) > 0:
+            duplicate[len(duplicate) // 2] = 40
+        melodies.append(duplicate)
+    return melodies
+
+class TestSegments(unittest.TestCase):
+
+    def test_volpiano(self):
+        volpiano = '1---fg-h--g---f'
+        self.assertEqual(volpianoToSegments(volpiano, 'note'), 
+            [(32,), (33,), (34,), (33,), (32,)])
+        self.assertEqual(volpianoToSegments(volpiano, 'neume'), 
+            [(32, 33), (34,), (33,), (32,)])
+        self.assertEqual(volpianoToSegments(volpiano, 'syllable'), 
+            [(32, 33, 34), (33,), (32,)])
+        with self.assertRaises(ValueError):
+            volpianoToSegments(volpiano, 'word')
+
+    def test_chant(self):
+        volpiano = '1---fg-h--g---f--gh---4'
+        chant = converter.parse('cantus: ' + volpiano)
+        for granularity in ['note', 'neume', 'syllable']:
+            self.assertEqual(chantToSegments(chant, granularity),
+                volpianoToSegments(volpiano, granularity))
+
+class TestEncoding(unittest.TestCase):
+
+    def test_vocabulary(self):
+        sequences, vocabulary = encodeMelodies(
+            ['1---fg-h', '1---h-fg'], granularity='neume')
+        self.assertEqual(vocabulary, {(32, 33): 0, (34,): 1})
+        self.assertEqual(sequences[0].tolist(), [0, 1])
+        self.assertEqual(sequences[1].tolist(), [1, 0])
+
+    def test_pitches(self):
+        sequences, _ = encodeMelodies([[30, 31, 30]])
+        self.assertEqual(sequences[0].tolist(), [0, 1, 0])
+        with self.assertRaises(ValueError):
+            encodeMelodies([[30, 31, 30]], granularity='neume')
+
+class TestEditDistance(unittest.TestCase):
+
+    def test_examples(self):
+        self.assertEqual(editDistance('kitten', 'sitting'), 3)
+        self.assertEqual(editDistance('', 'abc'), 3)
+        self.assertEqual(editDistance('abc', ''), 3)
+        self.assertEqual(editDistance('abc', 'abc'), 0)
+
+    def test_random(self):
+        melodies = randomMelodies(20, 150)
+        for a in melodies:
+            for b in melodies[:5]:
+                self.assertEqual(editDistance(a, b), levenshtein(a, b))
+
+class TestDistanceMatrix(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Melodies longer than 64 notes need multiple words per bit vector
+        cls.melodies = randomMelodies(30, 150)
+        cls.expected = np.array([[levenshtein(a, b) for b in cls.melodies]
+                                 for a in cls.melodies])
+
+    def test_distances(self):
+        distances = distanceMatrix(self.melodies)
+        self.assertTrue(np.array_equal(distances, self.expected))
+
+    def test_chunks(self):
+        distances = distanceMatrix(self.melodies, blockSize=3, chunkSize=7)
+        self.assertTrue(np.array_equal(distances, self.expected))
+
+    def test_workers(self):
+        distances = distanceMatrix(self.melodies, numWorkers=2, blockSize=8)
+        self.assertTrue(np.array_equal(distances, self.expected))
+
+    def test_similarities(self):
+        similarities = similarityMatrix(self.melodies)
+        self.assertTrue(np.allclose(np.diag(similarities), 1))
+        self.assertTrue((similarities >= 0).all())
+        self.assertTrue((similarities <= 1).all())
+        self.assertTrue(np.allclose(similarities, similarities.T))
+
+    def test_similarities_of_iterators(self):
+        similarities = similarityMatrix(self.melodies, blockSize=8)
+        fromIterator = similarityMatrix(iter(self.melodies), blockSize=8)
+        self.assertTrue(np.array_equal(similarities, fromIterator))
+        self.assertEqual(similarityMatrix(iter(self.melodies)).shape, (35, 35))
+
+    def test_granularity(self):
+        melodies = ['1---fg-h--g---f', '1---fg-h--g---g', '1---f-gh--g---f']
+        distances = distanceMatrix(melodies, granularity='neume')
+        self.assertEqual(distances[0].tolist(), [0, 1, 2])
+        distances = distanceMatrix(melodies, granularity='syllable')
+        self.assertEqual(distances[0].tolist(), [0, 1, 0])
+
+class TestTopK(unittest.TestCase):
+
+    def test_top_k(self):
+        melodies = randomMelodies(40, 100)
+        similarities = similarityMatrix(melodies)
+        np.fill_diagonal(similarities, -np.inf)
+        indices, topSimilarities = topKSimilar(melodies, k=4, 
+            blockSize=8, chunkSize=10)
+        self.assertEqual(indices.shape, (45, 4))
+        expected = -np.sort(-similarities, axis=1)[:, :4]
+        self.assertTrue(np.allclose(topSimilarities, expected))
+        rows = np.arange(45)[:, None]
+        self.assertTrue(np.allclose(similarities[rows, indices], expected))
+
+    def test_near_duplicates(self):
+        melodies = randomMelodies(40, 100)
+        indices, _ = topKSimilar(melodies, k=1)
+        for i in range(5):
+            self.assertEqual(indices[40 + i, 0], i)
+
+    def test_invalid_k(self):
+        with self.assertRaises(ValueError):
+            topKSimilar(['1---f', '1---g'], k=2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,21 @@
+import gc, sys, tracemalloc, timeit, random
+from arpeggio import visit_parse_tree as visitParseTree
+from chant21.gabc import ParserGABC, VisitorGABC
+from chant21.examples import gabcExamples
+random.seed(0)
+notes = ['f', 'g', 'h', 'fo~', 'g.', '-h', 'hw', "e'", 'fr', 'g_', 'hv', 'f.1', 'Go', 'hs<']
+syl = ' '.join('la(' + ''.join(random.choices(notes, k=4)) + ')' for _ in range(2500))
+synthetic = 'name: synthetic;\n%%\n(c4) ' + syl + ' (::)'
+parser = ParserGABC()
+def measure(tree):
+    visitParseTree(tree, VisitorGABC())
+    gc.collect(); gc.disable()
+    tracemalloc.start()
+    ch = visitParseTree(tree, VisitorGABC())
+    cur, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop(); gc.enable()
+    t = min(timeit.repeat(lambda: visitParseTree(tree, VisitorGABC()), number=1, repeat=5))*1000
+    return cur, peak, t
+for name, gabc in [('salve', open(gabcExamples['salveRegina']).read()), ('synthetic', synthetic)]:
+    tree = parser.parse(gabc)
+    print(name, measure(tree))
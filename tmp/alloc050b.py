@@ -0,0 +1,27 @@
+import gc, tracemalloc, timeit, random
+from arpeggio import NonTerminal
+from chant21.gabc import ParserGABC, VisitorGABC
+from chant21.examples import gabcExamples
+random.seed(0)
+notes = ['f', 'g', 'h', 'fo~', 'g.', '-h', 'hw', "e'", 'fr', 'g_', 'hv', 'f.1', 'Go', 'hs<']
+syl = ' '.join('la(' + ''.join(random.choices(notes, k=4)) + ')' for _ in range(2500))
+synthetic = 'name: synthetic;\n%%\n(c4) ' + syl + ' (::)'
+parser = ParserGABC()
+def noteNodes(node):
+    if node.rule_name == 'note': yield node
+    elif isinstance(node, NonTerminal):
+        for c in node: yield from noteNodes(c)
+def measure(tree):
+    nodes = list(noteNodes(tree)); v = VisitorGABC()
+    for n in nodes: n.visit(v)
+    gc.collect(); tracemalloc.start(); total = 0; keep = []
+    for n in nodes:
+        start = tracemalloc.get_traced_memory()[0]; tracemalloc.reset_peak()
+        keep.append(n.visit(v))
+        total += tracemalloc.get_traced_memory()[1] - start
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    t = min(timeit.repeat(lambda: [n.visit(v) for n in nodes], number=1, repeat=5))*1000
+    return len(nodes), total/len(nodes), retained/len(nodes), t
+for name, gabc in [('salve', open(gabcExamples['salveRegina']).read()), ('synthetic', synthetic)]:
+    print(name, measure(parser.parse(gabc)))
@@ -0,0 +1,10 @@
+import timeit, io
+from chant21.cantus import convertCantusCSV
+from chant21.cantus.reader import EXAMPLES_CSV
+from music21 import converter
+from chant21.examples import gabcExamples
+fns=list(gabcExamples.values())
+t=min(timeit.repeat(lambda: convertCantusCSV(EXAMPLES_CSV, io.StringIO()), number=1, repeat=5))
+print('csv', t)
+t=min(timeit.repeat(lambda: [converter.parse(f, forceSource=True, storePickle=False) for f in fns[:20]], number=1, repeat=3))
+print('gabc', t)
@@ -0,0 +1,27 @@
+import json, random, time
+from music21 import converter
+from chant21.diff import diff, patch, patchObject
+from chant21.cantus import readCantusCSV, convertCantusData
+from chant21.cantus.reader import EXAMPLES_CSV
+from chant21.examples import gabcExamples
+rows = [r for c in readCantusCSV(EXAMPLES_CSV) for r in c]
+chants = [convertCantusData(r) for r in rows]
+parse = lambda o: converter.parse(json.dumps(o), format='chson', forceSource=True, storePickle=False)
+fails = 0; total=0; ratio=[]
+for i in range(len(chants)):
+    for j in random.Random(i).sample(range(len(chants)), 4):
+        a, b = chants[i], chants[j]
+        A = parse(a.toObject())
+        d = diff(A, b)
+        patch(A, d, verify=True)
+        total += 1
+        if A.toObject() != b.toObject():
+            fails += 1
+            if fails < 3: print('FAIL', i, j)
+        # offsets consistent
+        notes = list(A.flat.notes)
+        offs = [n.getOffsetInHierarchy(A) for n in A.flatNotes]
+        if offs != sorted(offs) or len(set(offs)) != len(offs): print('offsets', i, j)
+        o = a.toObject(); o2 = json.loads(json.dumps(o))
+        assert patchObject(o2, diff(a, b), verify=True) == b.toObject()
+print(total, fails)
@@ -0,0 +1,39 @@
+import json, random, copy
+from music21 import converter
+from chant21.diff import diff, patch
+from chant21.cantus import readCantusCSV, convertCantusData
+from chant21.cantus.reader import EXAMPLES_CSV
+from chant21.examples import gabcExamples
+parse = lambda o: converter.parse(json.dumps(o), format='chson', forceSource=True, storePickle=False)
+gabc = [converter.parse(fn, format='gabc', forceSource=True, storePickle=False) for fn in gabcExamples.values()]
+fails=0
+def mutate(obj, rng):
+    o = copy.deepcopy(obj)
+    def nodes(x, path=()):
+        yield x, path
+        for i, c in enumerate(x.get('elements', [])):
+            yield from nodes(c, path+(i,))
+    allnodes = list(nodes(o))
+    for _ in range(rng.randint(1, 4)):
+        n, _p = rng.choice(allnodes)
+        t = n['type']
+        r = rng.random()
+        if t == 'note': n['pitch'] = rng.choice(['F4','G4','A4','C5'])
+        elif t == 'syllable' and r < .5: n['lyric'] = 'xy'
+        elif t == 'syllable' and r < .7: n['annotation'] = 'A'
+        elif 'elements' in n and n['elements'] and r < .85: del n['elements'][rng.randrange(len(n['elements']))]
+        elif 'elements' in n and n['elements']: n['elements'].insert(rng.randrange(len(n['elements'])+1), copy.deepcopy(rng.choice(n['elements'])))
+        elif t == 'chant': n['metadata']['mode'] = '9'
+    return o
+rng = random.Random(0)
+count=0
+for a in gabc:
+    for b in gabc:
+        A = parse(a.toObject()); patch(A, diff(A, b)); count+=1
+        if A.toObject() != b.toObject(): fails+=1; print('gabc pair fail')
+    for k in range(20):
+        B = parse(mutate(a.toObject(), rng))
+        A = parse(a.toObject())
+        d = diff(A, B); patch(A, d, verify=True); count+=1
+        if A.toObject() != B.toObject(): fails+=1; print('mut fail', k)
+print(count, fails)
@@ -0,0 +1,15 @@
+import json, copy
+from music21 import converter
+from chant21.diff import diff, patch
+from chant21.examples import gabcExamples
+parse = lambda o: converter.parse(json.dumps(o), format='chson', forceSource=True, storePickle=False)
+for fn in gabcExamples.values():
+    a = converter.parse(fn, format='gabc', forceSource=True, storePickle=False)
+    o = copy.deepcopy(a.toObject()); o['elements'][0]['elements'][1]['elements'][0]['lyric']='zz'
+    def nodes(x):
+        yield x
+        for c in x.get('elements', []): yield from nodes(c)
+    neume = next(n for n in nodes(o) if n['type']=='neume' and len(n['elements'])>2)
+    neume['elements'].pop()
+    B = parse(o); d = diff(a, B); patch(a, d)
+    print(len(d['ops']), a.toObject() == B.toObject(), a.toObject()==o)
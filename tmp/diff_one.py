@@ -0,0 +1,20 @@
+import json
+from music21 import converter
+from chant21.diff import diff, patch
+from chant21.cantus import readCantusCSV, convertCantusData
+from chant21.cantus.reader import EXAMPLES_CSV
+rows = [r for c in readCantusCSV(EXAMPLES_CSV) for r in c]
+chants = [convertCantusData(r) for r in rows]
+a, b = chants[3], chants[15]
+A = converter.parse(json.dumps(a.toObject()), format='chson', forceSource=True, storePickle=False)
+print(A.toObject() == a.toObject())
+d = diff(A, b); print(len(d['ops']), [o['op'] for o in d['ops']][:10])
+patch(A, d)
+x, y = A.toObject(), b.toObject()
+def cmp(x, y, path=()):
+    if x.keys() != y.keys() or any(x[k]!=y[k] for k in x if k!='elements'):
+        print(path, {k:x.get(k) for k in x if k!='elements'}, {k:y.get(k) for k in y if k!='elements'}); return True
+    if len(x.get('elements',[])) != len(y.get('elements',[])): print(path,'len', len(x['elements']), len(y['elements'])); return True
+    for i,(c,d) in enumerate(zip(x.get('elements',[]), y.get('elements',[]))):
+        if cmp(c,d,path+(i,)): return True
+cmp(x,y)
@@ -0,0 +1,12 @@
+import sys, random, json
+from music21 import converter
+from chant21.examples import gabcExamples
+random.seed(1)
+notes = ['f', 'g', 'h', 'fo~', 'g.', '-h', '--hw', "e'", 'fr', 'fr0', 'fr1', 'gR', 'g_', 'hv', 'f.1', 'Go', 'hs<', 'fw.r', "g_0'1", 'ho<..', 'Fv', '-fr0']
+syl = ' '.join('la(' + ''.join(random.choices(notes, k=4)) + ')' for _ in range(300))
+texts = [open(f).read() for f in gabcExamples.values()] + ['name: x;\n%%\n(c4) ' + syl + ' (::)']
+out = []
+for t in texts:
+    ch = converter.parse(t, format='gabc', forceSource=True, storePickle=False)
+    out.append([ch.toCHSON(), [(n.notehead, n.noteheadFill) for n in ch.flatNotes]])
+json.dump(out, open(sys.argv[1], 'w'))
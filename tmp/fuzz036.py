@@ -0,0 +1,29 @@
+import random, pandas as pd
+from chant21.cantus import ParserCantusVolpiano, validateVolpiano, VOLPIANO_ERRORS
+from chant21.cantus.validation import VOLPIANO_ERRORS
+random.seed(1)
+alpha = ['-','-','--','---','----','-----','f','g','h','3','4','5','33','6------6','6-------6','7','.','1','2','fg']
+strs=[]
+for i in range(20000):
+    s = random.choice(['1','2','1-','1--','1---','f','']) + ''.join(random.choice(alpha) for _ in range(random.randint(0,10)))
+    strs.append(s)
+ex = pd.read_csv('chant21/examples/cantus-volpiano-examples.csv', index_col=0)['volpiano'].tolist()
+strs += ex
+p = ParserCantusVolpiano()
+for strict in [False, True]:
+    df = validateVolpiano(strs, strict=strict)
+    bad=0
+    for i,s in enumerate(strs):
+        try:
+            out = p.preprocess(s, strict=strict); err=None
+        except IndexError:
+            out=None; err=VOLPIANO_ERRORS['empty']
+        except Exception as e:
+            out=None; err=type(e)
+        row=df.iloc[i]
+        e2 = VOLPIANO_ERRORS[row.error] if row.error else None
+        o2 = row.volpiano if isinstance(row.volpiano,str) else None
+        if err is not e2 or out != o2:
+            bad+=1
+            if bad<5: print(strict, repr(s), out, err, o2, row.error)
+    print(strict, bad, len(strs))
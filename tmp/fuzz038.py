@@ -0,0 +1,19 @@
+import random, re, pandas as pd
+from chant21.cantus.syllabifier import ChantSyllabifier, CHANT_LATIN
+from chant21.cantus.cltk_syllabifier import Syllabifier
+ref = Syllabifier(CHANT_LATIN); fast = ChantSyllabifier()
+ex = pd.read_csv('chant21/examples/cantus-volpiano-examples.csv')
+words=set()
+for col in ['full_text_manuscript','incipit','full_text']:
+    for t in ex[col].dropna(): words.update(t.lower().split())
+words.update(CHANT_LATIN['exceptions'])
+random.seed(0)
+alpha='aeiouyqucpthbdgfrlmnsxáæœ i'
+for _ in range(200000):
+    words.add(''.join(random.choices(alpha,k=random.randint(0,12))))
+bad=0
+for w in words:
+    if ref.syllabify(w)!=fast.syllabifyWord(w):
+        bad+=1
+        if bad<5: print(repr(w), ref.syllabify(w), fast.syllabifyWord(w))
+print(bad, len(words))
@@ -0,0 +1,6 @@
+from music21 import converter, environment
+from chant21.examples import gabcExamples
+import glob, os
+for i in range(2):
+    ch = converter.parse(gabcExamples['kyrie'])
+    print(type(ch).__name__, len(ch), len(ch.flat.notes))
@@ -0,0 +1,14 @@
+from music21 import converter
+import os, tempfile
+from chant21.examples import gabcExamples
+d = tempfile.mkdtemp()
+for name, f in gabcExamples.items():
+    ref = converter.parse(f, forceSource=True, storePickle=False)
+    for i in range(2):
+        c = converter.parse(f); assert c.toObject() == ref.toObject(), (name, i)
+    for ext, data, mode in [('chson', ref.toCHSON(), 'w'), ('chbin', ref.toCHBIN(), 'wb')]:
+        p = os.path.join(d, name + '.' + ext)
+        open(p, mode).write(data)
+        for i in range(2):
+            c = converter.parse(p); assert c.toObject() == ref.toObject(), (name, ext, i)
+    print(name, 'ok', len(ref.flatNotes))
@@ -0,0 +1,25 @@
+import sys, pickle, pandas as pd
+sys.path.insert(0, '/root/package')
+from music21 import converter
+from chant21.examples import gabcExamples
+from chant21.cantus import convertCantusData
+out = {}
+def describe(s, depth=0):
+    lines = []
+    for el in s.elements:
+        lines.append((depth, type(el).__name__, float(el.offset), float(el.duration.quarterLength),
+            getattr(el, 'nameWithOctave', None), getattr(el, 'lyric', None) if not el.isStream else None))
+        if el.isStream:
+            lines.extend(describe(el, depth + 1))
+    return lines
+for name, fn in gabcExamples.items():
+    ch = converter.parse(fn, format='gabc', forceSource=True, storePickle=False)
+    out[name] = (describe(ch), ch.toCHSON())
+df = pd.read_csv('/root/package/chant21/examples/cantus-volpiano-examples.csv')
+for i, row in df.iterrows():
+    try:
+        ch = convertCantusData(row)
+        out[i] = (describe(ch), ch.toCHSON())
+    except Exception as e:
+        out[i] = repr(e)
+pickle.dump(out, open(sys.argv[1], 'wb'))
@@ -0,0 +1,24 @@
+import sys, pandas as pd
+sys.path.insert(0, '/root/package')
+from lxml import etree
+from music21 import converter
+import chant21
+from chant21.musicxml import toMusicXML
+from chant21.examples import gabcExamples
+from chant21.cantus import convertCantusData
+schema = etree.XMLSchema(etree.parse('/root/package/tmp/musicxml-local.xsd'))
+def check(ch, name):
+    xml = toMusicXML(ch)
+    doc = etree.fromstring(xml.encode())
+    if not schema.validate(doc):
+        print(name, schema.error_log.last_error); return False
+    return True
+ok = 0
+for name, fn in gabcExamples.items():
+    ok += check(converter.parse(fn, format='gabc', forceSource=True, storePickle=False), name)
+ex = pd.read_csv('/root/package/chant21/examples/cantus-volpiano-examples.csv', index_col=0)
+for idx, row in ex.iterrows():
+    try: ch = convertCantusData(row)
+    except Exception as e: continue
+    ok += check(ch, idx)
+print('valid', ok)